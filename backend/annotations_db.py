@@ -0,0 +1,167 @@
+"""
+User annotations of parsed shapes, kept apart from the parse output.
+
+Descriptions and dragged positions are rows of one SQLite table keyed by
+(project, slide, shape key) and laid over the parsed document when it is
+read (see utils.shape_utils.apply_annotations). An edit is a single-row
+upsert, and a reparse, which rewrites the project JSON, leaves them alone.
+
+The shape key is the shape's name when no other shape on the slide has
+that name, since PowerPoint keeps names across edits and reparses, and
+``#<shape_index>`` otherwise. Each write takes the next value of a global
+revision counter; the highest revision among a project's rows versions its
+overlay (part of the ETags the project endpoints send).
+"""
+
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+ANNOTATION_FIELDS = ("description", "left", "top")
+
+
+class AnnotationsDatabase:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS shape_annotations (
+                project_id TEXT NOT NULL,
+                slide_index INTEGER NOT NULL,
+                shape_key TEXT NOT NULL,
+                shape_index TEXT,
+                description TEXT,
+                "left" REAL,
+                "top" REAL,
+                rev INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (project_id, slide_index, shape_key)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS annotations_rev (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                rev INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("INSERT OR IGNORE INTO annotations_rev (id, rev) VALUES (1, 0)")
+        conn.commit()
+        conn.close()
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _upsert(
+        self, project_id: str, rows: Iterable[Tuple], columns: Tuple[str, ...], on_conflict: str
+    ) -> int:
+        rows = list(rows)
+        if not rows:
+            return 0
+        names = ", ".join(f'"{column}"' for column in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("UPDATE annotations_rev SET rev = rev + 1 WHERE id = 1")
+                rev = conn.execute("SELECT rev FROM annotations_rev WHERE id = 1").fetchone()[0]
+                now = time.time()
+                cursor = conn.executemany(
+                    f"""
+                    INSERT INTO shape_annotations
+                        (project_id, slide_index, shape_key, shape_index, {names}, rev, updated_at)
+                    VALUES (?, ?, ?, ?, {placeholders}, ?, ?)
+                    ON CONFLICT(project_id, slide_index, shape_key) DO {on_conflict}
+                    """,
+                    [(project_id, *row, rev, now) for row in rows],
+                )
+                changed = cursor.rowcount
+        finally:
+            conn.close()
+        return changed
+
+    def set_description(
+        self, project_id: str, slide_index: int, shape_key: str, shape_index: Any, description: str
+    ):
+        """Record the description of one shape."""
+        self._upsert(
+            project_id,
+            [(slide_index, shape_key, str(shape_index), description)],
+            ("description",),
+            """UPDATE SET description = excluded.description, shape_index = excluded.shape_index,
+                rev = excluded.rev, updated_at = excluded.updated_at""",
+        )
+
+    def set_positions(self, project_id: str, positions: Iterable[Tuple]) -> int:
+        """Record (slide_index, shape_key, shape_index, left, top) positions in one transaction."""
+        return self._upsert(
+            project_id,
+            [
+                (slide_index, shape_key, str(shape_index), left, top)
+                for slide_index, shape_key, shape_index, left, top in positions
+            ],
+            ("left", "top"),
+            """UPDATE SET "left" = excluded."left", "top" = excluded."top",
+                shape_index = excluded.shape_index, rev = excluded.rev,
+                updated_at = excluded.updated_at""",
+        )
+
+    def import_descriptions(self, project_id: str, descriptions: Iterable[Tuple]) -> int:
+        """Record (slide_index, shape_key, shape_index, description) rows not annotated yet.
+
+        Used for descriptions older releases wrote into the project JSON; a
+        description already in the table wins.
+        """
+        return self._upsert(
+            project_id,
+            descriptions,
+            ("description",),
+            """UPDATE SET description = excluded.description, rev = excluded.rev,
+                updated_at = excluded.updated_at
+                WHERE shape_annotations.description IS NULL""",
+        )
+
+    def _select(self, columns: str, project_id: str, first: int, last: Optional[int]):
+        query = f"SELECT {columns} FROM shape_annotations WHERE project_id = ? AND slide_index >= ?"
+        params: list = [project_id, first]
+        if last is not None:
+            query += " AND slide_index <= ?"
+            params.append(last)
+        conn = self.get_connection()
+        try:
+            return conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+    def for_project(
+        self, project_id: str, first: int = 1, last: Optional[int] = None
+    ) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """{slide_index: {shape_key: {field: value}}} of slides ``first``..``last``."""
+        annotations: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for row in self._select("*", project_id, first, last):
+            fields = {name: row[name] for name in ANNOTATION_FIELDS if row[name] is not None}
+            annotations.setdefault(row["slide_index"], {})[row["shape_key"]] = fields
+        return annotations
+
+    def revision(self, project_id: str, first: int = 1, last: Optional[int] = None) -> int:
+        """Revision of the latest annotation of slides ``first``..``last`` (0 if there is none)."""
+        row = self._select("MAX(rev)", project_id, first, last)[0]
+        return row[0] or 0
+
+    def delete_project(self, project_id: str) -> int:
+        conn = self.get_connection()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM shape_annotations WHERE project_id = ?", (project_id,)
+                )
+        finally:
+            conn.close()
+        return cursor.rowcount
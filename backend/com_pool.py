@@ -0,0 +1,578 @@
+"""
+PowerPoint COM Worker Pool
+
+Keeps a small set of worker processes alive, each holding one warm
+PowerPoint.Application instance. Parse, metadata and reconstruction jobs are
+submitted to a shared queue instead of dispatching COM inline, so callers no
+longer pay the PowerPoint cold start on every request.
+
+Workers are recycled after ``max_jobs_per_worker`` documents or as soon as the
+health check on their PowerPoint instance fails. The dispatcher and health check
+are injectable (module-level callables, so they survive process spawning), which
+lets the pool run against a fake object model on Linux.
+
+Jobs submitted with a ``stall_timeout`` are watched: every progress report
+(parse_presentation reports one per slide) resets the clock, and a job that
+goes quiet for longer is failed with PowerPointJobTimeout. Its worker is
+killed and ``restart_powerpoint`` runs with the id of the PowerPoint process
+the worker was attached to, because a call stuck inside PowerPoint cannot be
+interrupted from Python.
+
+Note: PowerPoint is a single-instance COM server per user session, so several
+workers on one host share the same POWERPNT.EXE; extra workers mostly overlap
+the Python-side work (file I/O, JSON building) with COM calls. Restarting that
+instance interrupts the jobs of the workers sharing it; those jobs are queued
+again instead of failing.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import queue
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Set
+
+from ppt_parser.tracing import configure_logging
+from ppt_parser.utils import dispatch_powerpoint
+
+logger = logging.getLogger(__name__)
+
+
+class PowerPointJobError(Exception):
+    """A job raised inside a worker process."""
+
+    def __init__(self, message: str, worker_traceback: str = ""):
+        super().__init__(message)
+        self.worker_traceback = worker_traceback
+
+
+class PowerPointWorkerCrashed(PowerPointJobError):
+    """The worker process died while running the job."""
+
+
+class PowerPointJobTimeout(PowerPointWorkerCrashed):
+    """The job reported no progress within its stall timeout; its worker was killed."""
+
+
+def kill_powerpoint(pid: Optional[int] = None):
+    """Default restart hook: end the stalled worker's PowerPoint on Windows.
+
+    Only the process tree of ``pid`` is killed; when the worker could not tell
+    which process it was attached to, every POWERPNT.EXE of the session is.
+    """
+    if sys.platform != "win32":
+        return
+    target = ["/PID", str(pid), "/T"] if pid else ["/IM", "POWERPNT.EXE"]
+    subprocess.run(
+        ["taskkill", "/F", *target],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+
+
+def powerpoint_process_id(app) -> Optional[int]:
+    """Default: id of the process owning the instance's window (None if unknown)."""
+    try:
+        import win32process
+
+        return win32process.GetWindowThreadProcessId(app.HWND)[1]
+    except Exception:
+        return None
+
+
+def _ignore_progress(percent, message):
+    pass
+
+
+def check_powerpoint(app) -> bool:
+    """Default health check: a live instance answers a trivial property read."""
+    try:
+        app.Presentations.Count
+        return True
+    except Exception:
+        return False
+
+
+def _co_initialize() -> bool:
+    try:
+        import pythoncom
+    except ImportError:
+        return False
+    pythoncom.CoInitialize()
+    return True
+
+
+def _co_uninitialize():
+    try:
+        import pythoncom
+    except ImportError:
+        return
+    pythoncom.CoUninitialize()
+
+
+def _worker_main(
+    worker_id: int,
+    dispatcher: Callable[[], Any],
+    health_check: Callable[[Any], bool],
+    process_id: Callable[[Any], Optional[int]],
+    max_jobs: int,
+    job_queue,
+    event_queue,
+    current_job,
+):
+    """Worker process loop: one warm PowerPoint instance, jobs from the shared queue.
+
+    ``current_job`` is a shared Value holding the job id being worked on; unlike
+    queue messages it survives a hard crash of the worker process.
+    """
+    configure_logging()
+    com_initialized = _co_initialize()
+    app = None
+    handled = 0
+    healthy = True
+    dispatch_error = None
+
+    try:
+        app = dispatcher()
+        event_queue.put(("powerpoint", worker_id, process_id(app)))
+    except Exception as e:
+        dispatch_error = f"Failed to start PowerPoint: {type(e).__name__}: {e}"
+
+    try:
+        while True:
+            job = job_queue.get()
+            if job is None:
+                break
+
+            job_id, target, args, kwargs, wants_progress = job
+            current_job.value = job_id
+            event_queue.put(("started", job_id, worker_id))
+
+            if dispatch_error:
+                # Fail the job we picked up, then exit so the pool can retry a fresh worker
+                event_queue.put(("failed", job_id, dispatch_error, ""))
+                healthy = False
+                break
+
+            if wants_progress:
+
+                def progress_callback(percent, message, _job_id=job_id):
+                    event_queue.put(("progress", _job_id, percent, message))
+
+                kwargs["progress_callback"] = progress_callback
+
+            try:
+                result = target(*args, powerpoint=app, **kwargs)
+                event_queue.put(("done", job_id, result))
+            except Exception as e:
+                event_queue.put(
+                    ("failed", job_id, f"{type(e).__name__}: {e}", traceback.format_exc())
+                )
+
+            handled += 1
+            if max_jobs and handled >= max_jobs:
+                break
+            if not health_check(app):
+                healthy = False
+                break
+    finally:
+        if app is not None and not healthy:
+            # Wedged instance: make sure the next worker gets a fresh PowerPoint
+            try:
+                app.Quit()
+            except Exception:
+                pass
+        app = None
+        if com_initialized:
+            _co_uninitialize()
+        event_queue.put(("exited", worker_id, handled))
+
+
+class PowerPointPool:
+    """Pool of worker processes, each keeping one warm PowerPoint instance.
+
+    Job targets are module-level callables accepting a ``powerpoint`` keyword
+    argument (the worker's Application object), e.g.
+    ``ppt_parser.parse_presentation`` or ``ppt_reconstructor.reconstruct_presentation``.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_jobs_per_worker: int = 25,
+        dispatcher: Callable[[], Any] = dispatch_powerpoint,
+        health_check: Callable[[Any], bool] = check_powerpoint,
+        mp_context=None,
+        restart_backoff: float = 1.0,
+        restart_powerpoint: Optional[Callable[[Optional[int]], None]] = kill_powerpoint,
+        process_id: Callable[[Any], Optional[int]] = powerpoint_process_id,
+    ):
+        """
+        Args:
+            size: Number of worker processes
+            max_jobs_per_worker: Recycle a worker after this many documents (0 = never)
+            dispatcher: Callable returning a PowerPoint Application (picklable)
+            health_check: Callable(app) -> bool run after every job (picklable)
+            mp_context: multiprocessing context (defaults to the platform default)
+            restart_backoff: Seconds to wait before replacing a worker that failed to start
+            restart_powerpoint: Called with the PowerPoint process id (None if unknown)
+                after a stalled job's worker is killed (None = skip)
+            process_id: Callable(app) -> PowerPoint process id or None (picklable)
+        """
+        self.size = max(1, int(size))
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.dispatcher = dispatcher
+        self.health_check = health_check
+        self.restart_backoff = restart_backoff
+        self.restart_powerpoint = restart_powerpoint
+        self.process_id = process_id
+        self._ctx = mp_context or multiprocessing.get_context()
+
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._futures: Dict[int, Future] = {}
+        self._payloads: Dict[int, tuple] = {}  # job_id -> (target, args, kwargs, wants_progress)
+        self._progress: Dict[int, Callable[[int, str], None]] = {}
+        self._running: Dict[int, int] = {}  # job_id -> worker_id
+        self._stall_timeouts: Dict[int, float] = {}  # job_id -> seconds
+        self._last_seen: Dict[int, float] = {}  # job_id -> monotonic time of last report
+        self._workers: Dict[int, Any] = {}  # worker_id -> Process
+        self._current_jobs: Dict[int, Any] = {}  # worker_id -> shared job id Value
+        self._powerpoint_pids: Dict[int, Optional[int]] = {}  # worker_id -> PowerPoint pid
+        self._interrupted: Set[int] = set()  # workers whose PowerPoint was restarted under them
+        self._worker_ids = itertools.count(1)
+        self._started = False
+        self._closing = False
+        self._job_queue = None
+        self._event_queue = None
+        self._monitor = None
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "recycled": 0,
+            "timed_out": 0,
+            "requeued": 0,
+        }
+
+    # ---------- lifecycle ----------
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._job_queue = self._ctx.Queue()
+            self._event_queue = self._ctx.Queue()
+            self._closing = False
+            for _ in range(self.size):
+                self._spawn_worker()
+            self._monitor = threading.Thread(
+                target=self._monitor_loop, name="ppt-pool-monitor", daemon=True
+            )
+            self._started = True
+            self._monitor.start()
+
+    def shutdown(self, wait: bool = True, timeout: float = 30.0):
+        with self._lock:
+            if not self._started:
+                return
+            self._closing = True
+            workers = list(self._workers.values())
+            for _ in workers:
+                self._job_queue.put(None)
+
+        if wait:
+            deadline = time.monotonic() + timeout
+            for proc in workers:
+                proc.join(max(0.0, deadline - time.monotonic()))
+
+        for proc in workers:
+            if proc.is_alive():
+                proc.terminate()
+
+        if self._monitor is not None:
+            self._monitor.join(timeout=5)
+
+        with self._lock:
+            pending = list(self._futures.items())
+            self._futures.clear()
+            self._payloads.clear()
+            self._progress.clear()
+            self._running.clear()
+            self._stall_timeouts.clear()
+            self._last_seen.clear()
+            self._workers.clear()
+            self._current_jobs.clear()
+            self._powerpoint_pids.clear()
+            self._interrupted.clear()
+            self._started = False
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(PowerPointJobError("Pool shut down"))
+
+    # ---------- job submission ----------
+
+    def submit(
+        self,
+        target: Callable[..., Any],
+        *args,
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        stall_timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Future:
+        """Queue ``target(*args, powerpoint=<app>, **kwargs)`` on a worker.
+
+        If ``progress_callback`` is given, the target receives a
+        ``progress_callback`` keyword whose calls are forwarded back to it.
+        ``stall_timeout`` (seconds) fails the job with PowerPointJobTimeout
+        once it runs that long without a progress report; the target must
+        then accept ``progress_callback``.
+        """
+        if stall_timeout and progress_callback is None:
+            # Progress reports are the watchdog's heartbeat
+            progress_callback = _ignore_progress
+        self.start()
+        future: Future = Future()
+        with self._lock:
+            job_id = next(self._job_ids)
+            self._futures[job_id] = future
+            self._payloads[job_id] = (target, args, kwargs, progress_callback is not None)
+            if progress_callback is not None:
+                self._progress[job_id] = progress_callback
+            if stall_timeout:
+                self._stall_timeouts[job_id] = stall_timeout
+            self._stats["submitted"] += 1
+        self._job_queue.put((job_id, *self._payloads[job_id]))
+        return future
+
+    def run(self, target: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs):
+        """Submit a job and block until its result is available."""
+        return self.submit(target, *args, **kwargs).result(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "workers": sum(1 for p in self._workers.values() if p.is_alive()),
+                "pending": len(self._futures) - len(self._running),
+                "running": len(self._running),
+            }
+
+    # ---------- internals ----------
+
+    def _spawn_worker(self):
+        worker_id = next(self._worker_ids)
+        current_job = self._ctx.Value("q", 0)
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                self.dispatcher,
+                self.health_check,
+                self.process_id,
+                self.max_jobs_per_worker,
+                self._job_queue,
+                self._event_queue,
+                current_job,
+            ),
+            name=f"ppt-worker-{worker_id}",
+            daemon=True,
+        )
+        proc.start()
+        self._workers[worker_id] = proc
+        self._current_jobs[worker_id] = current_job
+
+    def _monitor_loop(self):
+        while True:
+            with self._lock:
+                if self._closing and not any(
+                    p.is_alive() for p in self._workers.values()
+                ):
+                    break
+            try:
+                event = self._event_queue.get(timeout=0.5)
+            except queue.Empty:
+                event = None
+            except (EOFError, OSError):
+                break
+
+            if event is not None:
+                self._handle_event(event)
+            self._kill_stalled_jobs()
+            self._reap_dead_workers()
+
+        # Drain anything left after the last worker exited
+        self._drain_events()
+
+    def _drain_events(self):
+        while True:
+            try:
+                event = self._event_queue.get_nowait()
+            except (queue.Empty, EOFError, OSError):
+                return
+            self._handle_event(event)
+
+    def _handle_event(self, event):
+        kind = event[0]
+        if kind == "started":
+            _, job_id, worker_id = event
+            with self._lock:
+                self._running[job_id] = worker_id
+                self._last_seen[job_id] = time.monotonic()
+                future = self._futures.get(job_id)
+            if future is not None and not future.running():
+                # Queued again after an interruption, it is already running
+                future.set_running_or_notify_cancel()
+        elif kind == "progress":
+            _, job_id, percent, message = event
+            with self._lock:
+                if job_id in self._last_seen:
+                    self._last_seen[job_id] = time.monotonic()
+            callback = self._progress.get(job_id)
+            if callback is not None:
+                try:
+                    callback(percent, message)
+                except Exception as e:
+                    logger.warning("Progress callback failed for job %s: %s", job_id, e)
+        elif kind == "done":
+            _, job_id, result = event
+            future = self._finish_job(job_id, "completed")
+            if future is not None and not future.done():
+                future.set_result(result)
+        elif kind == "failed":
+            _, job_id, message, worker_tb = event
+            if self._requeue_interrupted(job_id):
+                return
+            future = self._finish_job(job_id, "failed")
+            if future is not None and not future.done():
+                future.set_exception(PowerPointJobError(message, worker_tb))
+        elif kind == "powerpoint":
+            _, worker_id, pid = event
+            with self._lock:
+                self._powerpoint_pids[worker_id] = pid
+        elif kind == "exited":
+            _, worker_id, handled = event
+            proc = self._workers.get(worker_id)
+            if proc is not None:
+                proc.join(timeout=5)
+            self._replace_worker(worker_id, started_ok=handled > 0)
+
+    def _finish_job(self, job_id: int, outcome: str) -> Optional[Future]:
+        with self._lock:
+            self._running.pop(job_id, None)
+            self._progress.pop(job_id, None)
+            self._stall_timeouts.pop(job_id, None)
+            self._last_seen.pop(job_id, None)
+            self._payloads.pop(job_id, None)
+            self._stats[outcome] += 1
+            return self._futures.pop(job_id, None)
+
+    def _requeue_interrupted(self, job_id: int, worker_id: Optional[int] = None) -> bool:
+        """Queue a job again if it failed because its PowerPoint was restarted under it."""
+        with self._lock:
+            if worker_id is None:
+                worker_id = self._running.get(job_id)
+            payload = self._payloads.get(job_id)
+            if worker_id not in self._interrupted or payload is None:
+                return False
+            # Each such worker loses at most the one job it was running
+            self._interrupted.discard(worker_id)
+            self._running.pop(job_id, None)
+            self._last_seen.pop(job_id, None)
+            self._stats["requeued"] += 1
+        logger.info("Job %s lost PowerPoint on worker %s; queued again", job_id, worker_id)
+        self._job_queue.put((job_id, *payload))
+        return True
+
+    def _kill_stalled_jobs(self):
+        now = time.monotonic()
+        with self._lock:
+            stalled = [
+                (job_id, self._running[job_id], timeout)
+                for job_id, timeout in self._stall_timeouts.items()
+                if job_id in self._running and now - self._last_seen.get(job_id, now) > timeout
+            ]
+        for job_id, worker_id, timeout in stalled:
+            logger.warning(
+                "Job %s stalled for %gs; restarting worker %s", job_id, timeout, worker_id
+            )
+            with self._lock:
+                proc = self._workers.get(worker_id)
+                pid = self._powerpoint_pids.get(worker_id)
+            if proc is not None:
+                # The reaper replaces the worker once it is gone
+                proc.kill()
+                proc.join(timeout=5)
+            if self.restart_powerpoint is not None:
+                with self._lock:
+                    # Workers on the same (or an unknown) instance lose it too
+                    self._interrupted.update(
+                        other
+                        for other in self._workers
+                        if other != worker_id
+                        and (pid is None or self._powerpoint_pids.get(other) in (pid, None))
+                    )
+                try:
+                    self.restart_powerpoint(pid)
+                except Exception as e:
+                    logger.warning("Restarting PowerPoint failed: %s", e)
+
+            # Fail the job only now, so a caller retrying right away gets a fresh instance
+            future = self._finish_job(job_id, "failed")
+            with self._lock:
+                self._stats["timed_out"] += 1
+            if future is not None and not future.done():
+                future.set_exception(
+                    PowerPointJobTimeout(
+                        f"Job {job_id} made no progress for {timeout:g}s on worker {worker_id}"
+                    )
+                )
+
+    def _reap_dead_workers(self):
+        with self._lock:
+            dead = [
+                wid for wid, proc in self._workers.items() if not proc.is_alive()
+            ]
+        for worker_id in dead:
+            # Flush events the worker managed to send before it died
+            self._drain_events()
+            with self._lock:
+                if worker_id not in self._workers:
+                    continue
+                orphaned = {j for j, w in self._running.items() if w == worker_id}
+                current_job = self._current_jobs.get(worker_id)
+                if current_job is not None and current_job.value in self._futures:
+                    orphaned.add(current_job.value)
+            for job_id in orphaned:
+                if self._requeue_interrupted(job_id, worker_id):
+                    continue
+                future = self._finish_job(job_id, "failed")
+                if future is not None and not future.done():
+                    future.set_exception(
+                        PowerPointWorkerCrashed(
+                            f"Worker {worker_id} died while running job {job_id}"
+                        )
+                    )
+            self._replace_worker(worker_id, started_ok=True)
+
+    def _replace_worker(self, worker_id: int, started_ok: bool):
+        with self._lock:
+            self._current_jobs.pop(worker_id, None)
+            self._powerpoint_pids.pop(worker_id, None)
+            self._interrupted.discard(worker_id)
+            if self._workers.pop(worker_id, None) is None:
+                return
+            if self._closing:
+                return
+            self._stats["recycled"] += 1
+        if not started_ok and self.restart_backoff:
+            time.sleep(self.restart_backoff)
+        with self._lock:
+            if not self._closing:
+                self._spawn_worker()
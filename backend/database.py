@@ -73,6 +73,14 @@ class Database:
                 print("WARNING: Could not remove phenomenon_data column (SQLite version < 3.35.0)")
                 print("The column is unused and can be safely ignored.")
 
+        # Migration: Add content_hash column (SHA-256 of the uploaded deck)
+        if "content_hash" not in columns:
+            cursor.execute("ALTER TABLE projects ADD COLUMN content_hash TEXT")
+            print("Added content_hash column to projects table")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_projects_content_hash ON projects(content_hash)"
+        )
+
         # Create activity_logs table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS activity_logs (
@@ -92,31 +100,53 @@ class Database:
         return sqlite3.connect(self.db_path)
 
     def add_project(self, project_data: Dict[str, Any]):
+        self.add_projects([project_data])
+
+    def add_projects(self, projects: List[Dict[str, Any]]):
+        """Insert (or replace) several projects in one transaction."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute(
+        cursor.executemany(
             """
             INSERT OR REPLACE INTO projects (
                 id, original_filename, created_at, status, slide_count,
-                title, subject, author, last_modified_by, revision_number
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                title, subject, author, last_modified_by, revision_number,
+                content_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
-            (
-                project_data["id"],
-                project_data["original_filename"],
-                project_data["created_at"],
-                project_data["status"],
-                project_data.get("slide_count", 0),
-                project_data.get("title", ""),
-                project_data.get("subject", ""),
-                project_data.get("author", "Unknown"),
-                project_data.get("last_modified_by", ""),
-                project_data.get("revision_number", ""),
-            ),
+            [
+                (
+                    project_data["id"],
+                    project_data["original_filename"],
+                    project_data["created_at"],
+                    project_data["status"],
+                    project_data.get("slide_count", 0),
+                    project_data.get("title", ""),
+                    project_data.get("subject", ""),
+                    project_data.get("author", "Unknown"),
+                    project_data.get("last_modified_by", ""),
+                    project_data.get("revision_number", ""),
+                    project_data.get("content_hash"),
+                )
+                for project_data in projects
+            ],
         )
         conn.commit()
         conn.close()
 
+    def find_projects_by_hash(self, content_hash: str) -> List[Dict[str, Any]]:
+        """Projects uploaded from a file with this SHA-256, oldest first."""
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM projects WHERE content_hash = ? ORDER BY created_at",
+            (content_hash,),
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
     def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
         conn = self.get_connection()
         conn.row_factory = sqlite3.Row
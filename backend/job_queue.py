@@ -0,0 +1,450 @@
+"""
+Persistent Job Scheduler
+
+Long PowerPoint work (upload parsing, full and single-slide reparses,
+reconstruction for download) is queued here instead of running inside a
+request thread or an unbounded BackgroundTasks thread. The endpoint stores a
+row in the ``jobs`` table of a SQLite database and returns its id; a
+dispatcher thread starts queued jobs in priority order under these limits:
+
+- ``max_running`` jobs at a time overall, and at most ``limits[kind]`` of one kind
+- one job per project at a time, so a slide reparse never races a full
+  reparse writing the same project JSON
+
+A lower ``priority`` runs first; ties run in submission order.
+PRIORITY_INTERACTIVE (single-slide reparse) goes ahead of PRIORITY_NORMAL
+(reparse all, download) and PRIORITY_BULK (upload ingest). Submitting a job
+whose ``dedupe_key`` matches a queued or running job returns that job instead
+of adding another; a queued duplicate is moved up to the better priority.
+
+Several API worker processes may run a JobQueue on the same database. The
+limits above hold across all of them: a job is claimed inside a
+``BEGIN IMMEDIATE`` transaction that counts the running rows of every
+process, and the claiming UPDATE only matches a row still "queued". Each
+running row records its ``owner`` (host, pid and a per-instance token) and a
+``heartbeat_at`` the owner's dispatcher renews every few seconds. A running
+job whose heartbeat is older than ``stale_after`` belongs to a process that
+died or was restarted; it is queued again, with its ``attempts`` count kept,
+so handlers can resume instead of starting over. Jobs of live processes are
+never requeued, and a process only finishes rows it still owns.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 10
+PRIORITY_BULK = 20
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Seconds between heartbeats of a process's running jobs, and the age after
+# which a running job counts as orphaned
+HEARTBEAT_INTERVAL = 5.0
+STALE_AFTER = 30.0
+
+# handler(job, report) -> JSON-serializable result; report(percent, message)
+JobHandler = Callable[[Dict[str, Any], Callable[[int, str], None]], Any]
+
+
+class JobQueue:
+    """SQLite-backed job queue with priorities, concurrency limits and deduplication."""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_running: int = 1,
+        limits: Optional[Dict[str, int]] = None,
+        poll_interval: float = 1.0,
+        stale_after: float = STALE_AFTER,
+    ):
+        """
+        Args:
+            db_path: SQLite file holding the ``jobs`` table
+            max_running: Jobs running at the same time, all kinds together
+            limits: Per-kind caps, e.g. {"parse": 1}; kinds not listed only count
+                against ``max_running``
+            poll_interval: Seconds between queue checks when nothing wakes the dispatcher
+            stale_after: Seconds without a heartbeat after which another
+                process's running job is queued again
+        """
+        self.db_path = db_path
+        self.max_running = max(1, int(max_running))
+        self.limits = dict(limits or {})
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._heartbeat_interval = min(HEARTBEAT_INTERVAL, stale_after / 3)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._last_heartbeat = 0.0
+        self._handlers: Dict[str, JobHandler] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._init_db()
+
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT UNIQUE NOT NULL,
+                kind TEXT NOT NULL,
+                project_id TEXT,
+                params TEXT,
+                priority INTEGER NOT NULL,
+                dedupe_key TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                progress INTEGER NOT NULL DEFAULT 0,
+                message TEXT,
+                result TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                owner TEXT,
+                heartbeat_at REAL
+            )
+        """)
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            cursor.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        if "heartbeat_at" not in columns:
+            cursor.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_priority
+            ON jobs(status, priority, seq)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_dedupe_key
+            ON jobs(dedupe_key, status)
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_project_id ON jobs(project_id)")
+        conn.commit()
+        conn.close()
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ---------- lifecycle ----------
+
+    def register(self, kind: str, handler: JobHandler):
+        """Run jobs of ``kind`` with ``handler(job, report)``."""
+        self._handlers[kind] = handler
+
+    def start(self):
+        """Start dispatching (orphaned running jobs are requeued as the queue is checked)."""
+        with self._lock:
+            if self._dispatcher is not None:
+                return
+            self._stopping.clear()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_running, thread_name_prefix="job"
+            )
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name="job-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+
+    def shutdown(self, wait: bool = True):
+        """Stop starting jobs; running ones finish unless ``wait`` is False."""
+        with self._lock:
+            dispatcher, executor = self._dispatcher, self._executor
+            self._dispatcher = self._executor = None
+        if dispatcher is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        dispatcher.join(timeout=5)
+        executor.shutdown(wait=wait)
+
+    # ---------- submission and status ----------
+
+    def submit(
+        self,
+        kind: str,
+        project_id: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_NORMAL,
+        dedupe_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Queue a job and return it; ``"deduplicated": True`` if an active one was reused."""
+        with self._lock:
+            conn = self.get_connection()
+            try:
+                if dedupe_key is not None:
+                    row = conn.execute(
+                        f"""
+                        SELECT * FROM jobs WHERE dedupe_key = ?
+                        AND status IN ({",".join("?" * len(ACTIVE_STATUSES))})
+                        ORDER BY seq LIMIT 1
+                        """,
+                        (dedupe_key, *ACTIVE_STATUSES),
+                    ).fetchone()
+                    if row is not None:
+                        if row["status"] == "queued" and priority < row["priority"]:
+                            conn.execute(
+                                "UPDATE jobs SET priority = ? WHERE id = ?", (priority, row["id"])
+                            )
+                            conn.commit()
+                        job = self._row_to_job(conn.execute(
+                            "SELECT * FROM jobs WHERE id = ?", (row["id"],)
+                        ).fetchone())
+                        job["deduplicated"] = True
+                        return job
+
+                job_id = uuid.uuid4().hex
+                conn.execute(
+                    """
+                    INSERT INTO jobs (
+                        id, kind, project_id, params, priority, dedupe_key,
+                        status, message, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, 'queued', 'Queued', ?)
+                    """,
+                    (
+                        job_id,
+                        kind,
+                        project_id,
+                        json.dumps(params or {}, ensure_ascii=False),
+                        priority,
+                        dedupe_key,
+                        datetime.now().isoformat(),
+                    ),
+                )
+                conn.commit()
+                job = self._row_to_job(
+                    conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                )
+            finally:
+                conn.close()
+        self._wake.set()
+        job["deduplicated"] = False
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = self._row_to_job(row)
+            if job["status"] == "queued":
+                # Jobs that start before this one
+                job["queue_position"] = conn.execute(
+                    """
+                    SELECT COUNT(*) FROM jobs WHERE status = 'queued'
+                    AND (priority < ? OR (priority = ? AND seq < ?))
+                    """,
+                    (row["priority"], row["priority"], row["seq"]),
+                ).fetchone()[0]
+            return job
+        finally:
+            conn.close()
+
+    def list_jobs(
+        self,
+        project_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM jobs WHERE 1 = 1"
+        args: List[Any] = []
+        if project_id is not None:
+            query += " AND project_id = ?"
+            args.append(project_id)
+        if status is not None:
+            query += " AND status = ?"
+            args.append(status)
+        query += " ORDER BY seq DESC LIMIT ?"
+        args.append(limit)
+        conn = self.get_connection()
+        try:
+            return [self._row_to_job(row) for row in conn.execute(query, args).fetchall()]
+        finally:
+            conn.close()
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet."""
+        with self._lock:
+            conn = self.get_connection()
+            try:
+                cancelled = conn.execute(
+                    """
+                    UPDATE jobs SET status = 'cancelled', message = 'Cancelled', finished_at = ?
+                    WHERE id = ? AND status = 'queued'
+                    """,
+                    (datetime.now().isoformat(), job_id),
+                ).rowcount
+                conn.commit()
+            finally:
+                conn.close()
+        return bool(cancelled)
+
+    def report(self, job_id: str, percent: int, message: str):
+        """Record the progress of a running job."""
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                """
+                UPDATE jobs SET progress = ?, message = ?
+                WHERE id = ? AND status = 'running' AND owner = ?
+                """,
+                (max(0, min(100, int(percent))), message, job_id, self.owner),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ---------- internals ----------
+
+    @staticmethod
+    def _row_to_job(row) -> Dict[str, Any]:
+        job = dict(row)
+        job.pop("seq", None)
+        job["params"] = json.loads(job["params"]) if job.get("params") else {}
+        job["result"] = json.loads(job["result"]) if job.get("result") else None
+        return job
+
+    def _heartbeat(self):
+        """Renew the heartbeat of this process's running jobs (at most every few seconds)."""
+        now = time.time()
+        if now - self._last_heartbeat < self._heartbeat_interval:
+            return
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = 'running'",
+                (now, self.owner),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self._last_heartbeat = now
+
+    def _dispatch_loop(self):
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                self._heartbeat()
+                while not self._stopping.is_set():
+                    job = self._claim_next()
+                    if job is None:
+                        break
+                    self._executor.submit(self._run, job)
+            except Exception as e:
+                logger.warning("Job dispatcher error: %s", e)
+            self._wake.wait(min(self.poll_interval, self._heartbeat_interval))
+
+    def _claim_next(self) -> Optional[Dict[str, Any]]:
+        """Mark the first startable queued job as running (owned by this process) and return it."""
+        with self._lock:
+            conn = self.get_connection()
+            try:
+                # One claim at a time across processes: the limits count every worker's jobs
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                requeued = conn.execute(
+                    """
+                    UPDATE jobs SET status = 'queued', owner = NULL, heartbeat_at = NULL,
+                    message = ?
+                    WHERE status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)
+                    """,
+                    ("Interrupted by a restart, queued again", now - self.stale_after),
+                ).rowcount
+                if requeued:
+                    logger.info("Requeued %s interrupted job(s)", requeued)
+
+                running = conn.execute(
+                    "SELECT kind, project_id FROM jobs WHERE status = 'running'"
+                ).fetchall()
+                if len(running) >= self.max_running:
+                    conn.commit()
+                    return None
+                per_kind: Dict[str, int] = {}
+                for row in running:
+                    per_kind[row["kind"]] = per_kind.get(row["kind"], 0) + 1
+                busy_projects = {row["project_id"] for row in running if row["project_id"]}
+
+                for row in conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY priority, seq"
+                ).fetchall():
+                    kind = row["kind"]
+                    if kind not in self._handlers:
+                        continue
+                    if kind in self.limits and per_kind.get(kind, 0) >= self.limits[kind]:
+                        continue
+                    if row["project_id"] and row["project_id"] in busy_projects:
+                        continue
+                    claimed = conn.execute(
+                        """
+                        UPDATE jobs SET status = 'running', attempts = attempts + 1,
+                        started_at = ?, message = 'Started', owner = ?, heartbeat_at = ?
+                        WHERE id = ? AND status = 'queued'
+                        """,
+                        (datetime.now().isoformat(), self.owner, now, row["id"]),
+                    ).rowcount
+                    if not claimed:
+                        continue
+                    job = self._row_to_job(
+                        conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                    )
+                    conn.commit()
+                    return job
+                conn.commit()
+                return None
+            finally:
+                conn.close()
+
+    def _run(self, job: Dict[str, Any]):
+        job_id = job["id"]
+        try:
+            result = self._handlers[job["kind"]](
+                job, lambda percent, message: self.report(job_id, percent, message)
+            )
+            self._finish(job_id, "done", result=result, message="Done")
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job_id, job["kind"])
+            self._finish(job_id, "error", error=f"{type(e).__name__}: {e}", message=str(e))
+        finally:
+            # A slot is free: start the next job right away
+            self._wake.set()
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: str = None, message=""):
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, result = ?, error = ?, message = ?,
+                progress = CASE WHEN ? = 'done' THEN 100 ELSE progress END, finished_at = ?
+                WHERE id = ? AND status = 'running' AND owner = ?
+                """,
+                (
+                    status,
+                    None if result is None else json.dumps(result, ensure_ascii=False, default=str),
+                    error,
+                    message,
+                    status,
+                    datetime.now().isoformat(),
+                    job_id,
+                    self.owner,
+                ),
+            )
+            conn.commit()
+        finally:
+            conn.close()
@@ -1,23 +1,26 @@
 import os
 import uvicorn
 import sys
-import shutil
 
 import json
 import hashlib
 from datetime import datetime
 from typing import List, Dict, Any
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, StreamingResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-import pythoncom
 
 import uuid
 import ppt_parser as parsing
+import ppt_reconstructor
+from com_pool import PowerPointPool, PowerPointWorkerCrashed
+from job_queue import JobQueue, PRIORITY_BULK, PRIORITY_INTERACTIVE, PRIORITY_NORMAL
+from progress_db import ProgressDatabase
+from project_cache import ProjectDocumentCache, accepts_encoding, etag_matches
 from database import Database
 from attachments_db import AttachmentsDatabase
+from annotations_db import AnnotationsDatabase
 import asyncio
 from attributes.manager import AttributeManager
 from llm_service import LLMService
@@ -25,9 +28,12 @@ from typing import Optional
 
 # Import utility modules
 from utils import (
+    annotated_descriptions,
+    apply_annotations,
     create_file_resolver,
-    extract_preserved_descriptions,
-    update_shape_property,
+    shape_annotation_keys,
+    ResultStaticFiles,
+    store_upload,
 )
 
 
@@ -50,24 +56,34 @@ def calculate_prompt_version(settings: dict) -> str:
 
 app = FastAPI()
 
-# Database setup
-DB_PATH = os.path.join(
+# Database setup; PPT_DATA_DIR moves the SQLite files (the tests use a temporary one)
+DATA_DIR = os.environ.get("PPT_DATA_DIR") or os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
     "backend",
     "data",
-    "projects.db",
 )
+DB_PATH = os.path.join(DATA_DIR, "projects.db")
+os.makedirs(DATA_DIR, exist_ok=True)
 db = Database(DB_PATH)
 
 # Attachments database (separate DB for BLOB storage)
-ATTACHMENTS_DB_PATH = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-    "backend",
-    "data",
-    "attachments.db",
-)
+ATTACHMENTS_DB_PATH = os.path.join(DATA_DIR, "attachments.db")
 attachments_db = AttachmentsDatabase(ATTACHMENTS_DB_PATH)
 
+# Job queue database (parse / reparse / reconstruction jobs, see job_queue.py)
+JOBS_DB_PATH = os.path.join(DATA_DIR, "jobs.db")
+
+# Parse progress, shared by all API worker processes (see progress_db.py)
+PROGRESS_DB_PATH = os.path.join(DATA_DIR, "progress.db")
+progress_db = ProgressDatabase(
+    PROGRESS_DB_PATH,
+    retention_seconds=float(os.environ.get("PPT_PROGRESS_RETENTION_HOURS", "24")) * 3600,
+)
+
+# Shape descriptions and dragged positions, laid over the parse output (see annotations_db.py)
+ANNOTATIONS_DB_PATH = os.path.join(DATA_DIR, "annotations.db")
+annotations_db = AnnotationsDatabase(ANNOTATIONS_DB_PATH)
+
 
 # CORS settings
 app.add_middleware(
@@ -94,11 +110,233 @@ file_resolver = create_file_resolver(BASE_DIR, UPLOAD_DIR, db)
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(RESULT_DIR, exist_ok=True)
 
-# Mount static files for images - serve from project-specific directories
-app.mount("/api/results", StaticFiles(directory=RESULT_DIR), name="results")
+# Content-addressed image store shared by all projects ("assets/<sha256><ext>")
+ASSET_DIR = os.environ.get("PPT_ASSET_DIR") or os.path.join(BASE_DIR, "assets")
+asset_store = parsing.AssetStore(ASSET_DIR)
+
+# Parsed master/layout blocks reused across decks sharing a template (COM engine)
+MASTER_CACHE_DIR = os.environ.get("PPT_MASTER_CACHE_DIR") or os.path.join(
+    BASE_DIR, "cache", "masters"
+)
+master_cache = parsing.MasterCache(MASTER_CACHE_DIR, assets=asset_store)
+
+# Smaller project JSON is sent uncompressed even to clients that accept gzip
+PASSTHROUGH_GZIP_MIN_BYTES = 1024
+# Parsed project JSON documents shared by the read endpoints (see project_cache.py)
+project_cache = ProjectDocumentCache(
+    int(float(os.environ.get("PPT_PROJECT_CACHE_MB", "256")) * 1024 * 1024)
+)
+
+
+def save_project_json(json_path: str, data: dict):
+    """Write a project JSON and drop its cached document; every edit here goes through this."""
+    parsing.save_project_json(json_path, data)
+    project_cache.invalidate(json_path)
+
+
+def save_project_slides(json_path: str, slides: List[dict]):
+    """Write changed slides of a project (only their files when it is sharded)."""
+    parsing.save_project_slides(json_path, slides)
+    project_cache.invalidate(json_path)
+
+
+def load_annotated_project(project_id: str) -> dict:
+    """The cached project document with the user's annotations laid over it."""
+    json_path = os.path.join(RESULT_DIR, project_id, f"{project_id}.json")
+    data, _ = project_cache.get(json_path)
+    annotations = annotations_db.for_project(project_id)
+    if annotations:
+        data = dict(data, slides=apply_annotations(data.get("slides", []), annotations))
+    return data
+
+
+def done_message(json_path: str) -> str:
+    """Final progress message of a parsed project, naming any slides it gave up on."""
+    try:
+        data, _ = project_cache.get(json_path)
+    except (OSError, ValueError):
+        return "Done"
+    skipped = data.get(parsing.SKIPPED_SLIDES_KEY) or []
+    if not skipped:
+        return "Done"
+    return f"Done (slide(s) {', '.join(map(str, skipped))} could not be parsed)"
+
+
+def import_legacy_descriptions(project_id: str, slides: List[dict]):
+    """Move descriptions older releases wrote into the JSON to the annotations table."""
+    try:
+        annotations_db.import_descriptions(project_id, annotated_descriptions(slides))
+    except Exception as e:
+        print(f"[WARN] Failed to import descriptions of {project_id}: {e}")
+
+# Mount static files for images - serve from project-specific directories;
+# <project_id>/assets/<hash> resolves to the asset store
+app.mount(
+    "/api/results",
+    ResultStaticFiles(directory=RESULT_DIR, asset_store=asset_store),
+    name="results",
+)
+
+# Parser / reconstructor log level (PPT_LOG_LEVEL, default INFO); per-shape lines are DEBUG
+parsing.configure_logging()
+
+# Render slide thumbnails after the JSON is written instead of inside the parse loop
+DEFERRED_THUMBNAILS = os.environ.get("PPT_DEFERRED_THUMBNAILS", "1") != "0"
+
+# Slide ranges of one deck parsed side by side (COM engine); 1 = sequential
+PARSE_WORKERS = max(1, int(os.environ.get("PPT_PARSE_WORKERS", "1")))
+
+# Warm PowerPoint worker processes shared by parsing, metadata and reconstruction.
+# Workers start lazily on the first COM job.
+com_pool = PowerPointPool(
+    size=max(int(os.environ.get("PPT_POOL_SIZE", "1")), PARSE_WORKERS),
+    max_jobs_per_worker=int(os.environ.get("PPT_POOL_MAX_JOBS", "25")),
+)
+
+
+# A COM parse that finishes no slide for this long is killed and PowerPoint restarted (0 = no limit)
+SLIDE_TIMEOUT = float(os.environ.get("PPT_SLIDE_TIMEOUT", "300")) or None
+
+# Times an interrupted parse resumes from its checkpoint before the project is marked as failed
+PARSE_RETRIES = max(0, int(os.environ.get("PPT_PARSE_RETRIES", "2")))
+
+
+# Long COM work is queued and run here instead of inside requests. Jobs run
+# side by side up to the pool size; uploads (bulk ingest) take PPT_PARSE_JOBS slots at most.
+job_queue = JobQueue(
+    JOBS_DB_PATH,
+    max_running=int(os.environ.get("PPT_JOB_CONCURRENCY", "0")) or com_pool.size,
+    limits={"parse": max(1, int(os.environ.get("PPT_PARSE_JOBS", "1")))},
+)
+
+
+@app.on_event("shutdown")
+def shutdown_com_pool():
+    job_queue.shutdown(wait=False)
+    com_pool.shutdown()
 
-# Global progress store: { project_id: { "percent": int, "message": str, "status": "processing"|"done"|"error" } }
-progress_store: Dict[str, Dict[str, Any]] = {}
+
+# Parser used when a request does not pick one ("com" or "ooxml")
+DEFAULT_PARSER_ENGINE = os.environ.get("PPT_PARSER_ENGINE", "com")
+
+
+def resolve_parser_engine(engine: Optional[str], ppt_path: str) -> str:
+    """Validate the requested engine for a file; raises HTTPException(400)."""
+    engine = (engine or DEFAULT_PARSER_ENGINE).lower()
+    if engine not in parsing.PARSER_ENGINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown parser engine '{engine}'. Use one of {list(parsing.PARSER_ENGINES)}",
+        )
+    if engine == "ooxml" and not str(ppt_path).lower().endswith((".pptx", ".pptm")):
+        raise HTTPException(
+            status_code=400,
+            detail="The ooxml engine only reads .pptx/.pptm files; use engine=com",
+        )
+    return engine
+
+
+def run_presentation_parser(engine: str, ppt_path: str, project_dir: str, **kwargs):
+    """Full parse with the selected engine (COM jobs run on the worker pool)."""
+    kwargs.setdefault("asset_dir", ASSET_DIR)
+    if engine == "ooxml":
+        # No PowerPoint to hang: an interrupted OOXML parse simply starts over
+        kwargs.pop("resume", None)
+        return parsing.parse_presentation_ooxml(ppt_path, project_dir, **kwargs)
+    kwargs.setdefault("master_cache_dir", MASTER_CACHE_DIR)
+    kwargs.setdefault("thumbnails", not DEFERRED_THUMBNAILS)
+    kwargs.setdefault("stall_timeout", SLIDE_TIMEOUT)
+    if PARSE_WORKERS > 1:
+        return parsing.parse_presentation_parallel(
+            ppt_path, project_dir, pool=com_pool, workers=PARSE_WORKERS, **kwargs
+        )
+    return com_pool.run(parsing.parse_presentation, ppt_path, project_dir, **kwargs)
+
+
+def run_slide_parser(engine: str, ppt_path: str, slide_index: int, project_dir: str, **kwargs):
+    """Single-slide parse with the selected engine."""
+    kwargs.setdefault("asset_dir", ASSET_DIR)
+    if engine == "ooxml":
+        return parsing.parse_single_slide_ooxml(ppt_path, slide_index, project_dir, **kwargs)
+    return com_pool.run(
+        parsing.parse_single_slide, ppt_path, slide_index, project_dir, **kwargs
+    )
+
+
+def run_thumbnail_stage(project_id: str, ppt_path: str, engine: str):
+    """Render missing slide PNGs (COM) and their Pillow variants, then record them."""
+    project_dir = os.path.join(RESULT_DIR, project_id)
+    json_path = os.path.join(project_dir, f"{project_id}.json")
+    try:
+        data = parsing.load_project_json(json_path)
+
+        rendered = {}
+        if engine == "com":
+            missing = [
+                s["slide_index"]
+                for s in data.get("slides", [])
+                # A slide given up on would only stall the renderer again
+                if not s.get("error")
+                and (
+                    not s.get("thumbnail")
+                    or not os.path.exists(
+                        os.path.join(project_dir, "thumbnails", s["thumbnail"])
+                    )
+                )
+            ]
+            if missing:
+                rendered = com_pool.run(
+                    parsing.render_slide_thumbnails,
+                    ppt_path,
+                    project_dir,
+                    slide_indices=missing,
+                )
+        for slide in data.get("slides", []):
+            if slide.get("slide_index") in rendered:
+                slide["thumbnail"] = rendered[slide["slide_index"]]
+        parsing.generate_thumbnail_variants(project_dir, data)
+
+        # Re-read so edits made while rendering are kept; only thumbnail fields change
+        thumbs = {
+            s.get("slide_index"): (s.get("thumbnail"), s.get("thumbnails"))
+            for s in data.get("slides", [])
+        }
+        data = parsing.load_project_json(json_path)
+        for slide in data.get("slides", []):
+            thumbnail, variants = thumbs.get(slide.get("slide_index"), (None, None))
+            if thumbnail:
+                slide["thumbnail"] = thumbnail
+            if variants:
+                slide["thumbnails"] = variants
+        save_project_json(json_path, data)
+    except Exception as e:
+        print(f"[WARN] Thumbnail stage failed for {project_id}: {e}")
+
+
+def llm_thumbnail_path(project_dir: str, slide_index: int) -> Optional[str]:
+    """LLM-sized slide image, falling back to the full-size PNG."""
+    try:
+        path = parsing.ensure_variant(project_dir, slide_index, "llm")
+    except Exception as e:
+        print(f"[WARN] LLM thumbnail for slide {slide_index} unavailable: {e}")
+        path = None
+    if path:
+        return path
+    thumb_path = os.path.join(project_dir, "thumbnails", f"slide_{slide_index:03d}_thumb.png")
+    return thumb_path if os.path.exists(thumb_path) else None
+
+
+def sync_project_assets(project_id: str, data: Optional[dict] = None):
+    """Record the assets a project's JSON refers to (and drop orphaned ones)."""
+    try:
+        if data is None:
+            json_path = os.path.join(RESULT_DIR, project_id, f"{project_id}.json")
+            data, _ = project_cache.get(json_path)
+        removed = asset_store.sync_project(project_id, data)
+        if removed:
+            print(f"[INFO] Removed {removed} unreferenced asset(s)")
+    except Exception as e:
+        print(f"[WARN] Failed to update asset references for {project_id}: {e}")
 
 
 def sync_legacy_projects():
@@ -119,8 +357,7 @@ def sync_legacy_projects():
         json_path = os.path.join(folder_path, f"{folder_name}.json")
         if os.path.exists(json_path):
             try:
-                with open(json_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = parsing.load_project_json(json_path)
 
                 stats = os.stat(json_path)
                 created_at = datetime.fromtimestamp(stats.st_ctime).isoformat()
@@ -147,61 +384,174 @@ def sync_legacy_projects():
 
 # Sync on startup
 sync_legacy_projects()
+try:
+    asset_store.collect_garbage()
+except Exception as e:
+    print(f"[WARN] Asset store cleanup failed: {e}")
 
 
-def update_progress(project_id: str, percent: int, message: str):
-    if project_id not in progress_store:
-        progress_store[project_id] = {
-            "percent": 0,
-            "message": "",
-            "status": "processing",
-        }
-
-    progress_store[project_id]["percent"] = percent
-    progress_store[project_id]["message"] = message
-
-    if percent >= 100:
-        progress_store[project_id]["status"] = "done"
-    elif percent < 0:
-        progress_store[project_id]["status"] = "error"
-
-
-# extract_preserved_descriptions is now imported from utils.shape_utils
-
-
-def run_parsing_task(file_path: str, project_dir: str, project_id: str):
-    # Initialize COM for this thread
-    pythoncom.CoInitialize()
+def update_progress(project_id: str, percent: int, message: str, status: Optional[str] = None):
+    try:
+        progress_db.set(project_id, percent, message, status)
+    except Exception as e:
+        # Progress is informational; never fail a parse over it
+        print(f"[WARN] Failed to record progress for {project_id}: {e}")
+
+
+def run_parsing_task(
+    file_path: str,
+    project_dir: str,
+    project_id: str,
+    engine: str = "com",
+    resume: bool = False,
+    report=None,
+) -> bool:
+    """Parse an uploaded deck; after a worker crash or slide timeout, resume from the checkpoint.
+
+    ``report(percent, message)`` additionally receives the progress (the job's).
+    Returns whether the project is done.
+    """
     try:
 
         def callback(p, m):
             update_progress(project_id, p, m)
+            if report is not None and p >= 0:
+                report(p, m)
 
-        update_progress(project_id, 0, "Starting...")
-        json_path = parsing.parse_presentation(
-            file_path, project_dir, debug=False, progress_callback=callback
+        update_progress(
+            project_id, 0, "Resuming..." if resume else "Starting...", status="processing"
         )
+        attempt = 0
+        while True:
+            try:
+                json_path = run_presentation_parser(
+                    engine,
+                    file_path,
+                    project_dir,
+                    debug=False,
+                    progress_callback=callback,
+                    progressive=True,
+                    resume=resume,
+                )
+                break
+            except PowerPointWorkerCrashed as e:
+                if attempt >= PARSE_RETRIES:
+                    raise
+                attempt += 1
+                resume = True
+                print(
+                    f"[WARN] Parse of {project_id} interrupted ({e}); "
+                    f"resuming ({attempt}/{PARSE_RETRIES})"
+                )
+                last = progress_db.get(project_id) or {}
+                update_progress(
+                    project_id,
+                    max(last.get("percent", 0), 0),
+                    "PowerPoint restarted, resuming...",
+                    status="processing",
+                )
 
+        project_cache.invalidate(os.path.join(project_dir, f"{project_id}.json"))
         if not json_path:
             update_progress(project_id, -1, "Parsing failed to produce JSON")
             db.update_project_status(project_id, "error")
-            return
+            return False
 
         # JSON 읽어서 메타데이터 추출 (필요하다면)
         # with open(json_path, "r", encoding="utf-8") as f:
         #     data = json.load(f)
+        sync_project_assets(project_id)
 
         db.update_project_status(project_id, "done")
 
-        update_progress(project_id, 100, "Done")
+        update_progress(project_id, 100, done_message(json_path))
+
+        # Thumbnails follow once the project is usable
+        run_thumbnail_stage(project_id, file_path, engine)
+        try:
+            # Later uploads of the same file start from this parse
+            parsing.snapshot_project_json(project_dir)
+        except OSError as e:
+            print(f"[WARN] Could not keep the parse snapshot of {project_id}: {e}")
+        return True
 
     except Exception as e:
         print(f"Background task error: {e}")
         update_progress(project_id, -1, str(e))
         db.update_project_status(project_id, "error")
-    finally:
-        # Uninitialize COM when done
-        pythoncom.CoUninitialize()
+        return False
+
+
+def submit_parse_job(project_id: str, file_path: str, engine: str, resume: bool = False) -> dict:
+    """Queue the upload parse of a project (one active parse job per project)."""
+    return job_queue.submit(
+        "parse",
+        project_id,
+        {"file_path": file_path, "engine": engine, "resume": resume},
+        priority=PRIORITY_BULK,
+        dedupe_key=f"parse:{project_id}",
+    )
+
+
+def parse_job(job: dict, report) -> dict:
+    params = job["params"]
+    project_id = job["project_id"]
+    done = run_parsing_task(
+        params["file_path"],
+        os.path.join(RESULT_DIR, project_id),
+        project_id,
+        params.get("engine", "com"),
+        # A job restarted after a backend restart carries on from its checkpoint
+        resume=params.get("resume", False) or job["attempts"] > 1,
+        report=report,
+    )
+    if not done:
+        last = progress_db.get(project_id) or {}
+        raise RuntimeError(last.get("message") or "Parsing failed")
+    return {"project_id": project_id}
+
+
+def resume_interrupted_parses():
+    """Queue a resumed parse for projects a restart left "processing" without a parse job."""
+    for project in db.list_projects():
+        if project.get("status") != "processing":
+            continue
+        project_id = project["id"]
+        project_dir = os.path.join(RESULT_DIR, project_id)
+        if os.path.exists(os.path.join(project_dir, f"{project_id}.json")):
+            # Stopped after the JSON was written; only the status update was lost
+            db.update_project_status(project_id, "done")
+            continue
+
+        manifest = parsing.read_partial_manifest(project_dir) or {}
+        ppt_path = file_resolver.resolve_ppt_path(
+            (manifest.get("header") or {}).get("ppt_path"), project_id, raise_on_not_found=False
+        )
+        if not ppt_path:
+            print(f"[WARN] Cannot resume {project_id}: source deck not found")
+            db.update_project_status(project_id, "error")
+            continue
+        try:
+            engine = resolve_parser_engine(
+                (manifest.get("header") or {}).get("parser_engine"), ppt_path
+            )
+        except HTTPException:
+            engine = "com"
+
+        job = submit_parse_job(project_id, ppt_path, engine, resume=True)
+        if not job["deduplicated"]:
+            print(f"[INFO] Resuming interrupted parse of {project_id}")
+        update_progress(project_id, 0, "Resuming...", status="processing")
+
+
+@app.on_event("startup")
+def start_job_queue():
+    try:
+        progress_db.purge()
+    except Exception as e:
+        print(f"[WARN] Progress cleanup failed: {e}")
+    job_queue.start()
+    resume_interrupted_parses()
 
 
 class ProjectSummary(BaseModel):
@@ -489,107 +839,176 @@ def get_filters():
 
 
 def get_metadata_with_com(file_path):
-    """Wrapper to run metadata extraction in a separate thread with COM init."""
-    pythoncom.CoInitialize()
+    """Run metadata extraction on a warm PowerPoint worker."""
     try:
-        return parsing.get_presentation_metadata(file_path)
-    finally:
-        pythoncom.CoUninitialize()
+        return com_pool.run(parsing.get_presentation_metadata, file_path)
+    except Exception as e:
+        print(f"[ERROR] Metadata job failed for {file_path}: {e}")
+        return None
 
 
-@app.post("/api/upload")
-async def upload_ppt(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
-    filename = file.filename
+def get_upload_metadata(file_path):
+    """Metadata for the deterministic UID.
 
-    # Save to uploads with ORIGINAL filename
-    # WARNING: This overwrites existing files with the same name!
-    upload_filename = filename
-    file_path = os.path.join(UPLOAD_DIR, upload_filename)
+    .pptx packages are probed from their XML parts (raises parsing.OOXMLError if
+    the file is corrupt or not OOXML); only legacy binary .ppt files go to COM.
+    """
+    if parsing.is_legacy_ppt(file_path):
+        return get_metadata_with_com(file_path)
+    return parsing.probe_presentation_metadata(file_path)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
 
-    # Extract metadata for deterministic UID
-    # Run in thread pool to avoid blocking event loop
-    loop = asyncio.get_event_loop()
-    metadata = await loop.run_in_executor(None, get_metadata_with_com, file_path)
+def find_reusable_parse(content_hash: str, engine: str) -> Optional[tuple]:
+    """(project, parse snapshot) of a finished parse of the same file with ``engine``, or None."""
+    for project in db.find_projects_by_hash(content_hash):
+        if project.get("status") != "done":
+            continue
+        snapshot_path = parsing.project_snapshot_path(os.path.join(RESULT_DIR, project["id"]))
+        if not os.path.exists(snapshot_path):
+            continue
+        try:
+            data = parsing.load_project_json(snapshot_path)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Unreadable parse snapshot of {project['id']}: {e}")
+            continue
+        # A parse that gave up on slides is not worth copying; parse again
+        if data.get("parser_engine", "com") == engine and not data.get(
+            parsing.SKIPPED_SLIDES_KEY
+        ):
+            return project, data
+    return None
+
+
+def reuse_parse(source_id: str, project_id: str, file_path: str, data: dict) -> bool:
+    """Give a new project the parse artifacts of ``source_id``; False leaves it to a parse."""
+    project_dir = os.path.join(RESULT_DIR, project_id)
+    try:
+        if not parsing.clone_project_artifacts(os.path.join(RESULT_DIR, source_id), project_dir):
+            return False
+    except OSError as e:
+        print(f"[WARN] Could not reuse the parse of {source_id}: {e}")
+        return False
+
+    if data.get("ppt_path") != file_path:
+        # Stored under the same hash, so normally already the same path
+        data["ppt_path"] = file_path
+        save_project_json(os.path.join(project_dir, f"{project_id}.json"), data)
+    sync_project_assets(project_id, data)
+    db.update_project_status(project_id, "done")
+    update_progress(project_id, 100, "Done")
+    print(f"[INFO] Reused the parse of {source_id} for {project_id}")
+    return True
+
+
+def inspect_upload(filename: str, file_path: str, content_hash: str, engine: str) -> dict:
+    """Work out the project a stored upload becomes, without writing to the DB.
+
+    Returns the project record to add with the ``existing`` project of the same
+    UID and a ``reusable`` earlier parse (either may be None). Raises
+    HTTPException(400) if the file is not a PowerPoint file.
+    """
+    # The same bytes were parsed before: reuse that parse instead of opening PowerPoint
+    reusable = find_reusable_parse(content_hash, engine)
+    if reusable is not None:
+        source_project, _ = reusable
+        metadata = {
+            key: source_project.get(key) or default
+            for key, default in (
+                ("title", ""),
+                ("slide_count", 0),
+                ("subject", ""),
+                ("author", ""),
+                ("last_modified_by", ""),
+                ("revision_number", ""),
+            )
+        }
+    else:
+        # Extract metadata for deterministic UID
+        try:
+            metadata = get_upload_metadata(file_path)
+        except parsing.OOXMLError as e:
+            if not db.find_projects_by_hash(content_hash):
+                os.remove(file_path)
+            raise HTTPException(
+                status_code=400, detail=f"Not a valid PowerPoint file: {e}"
+            )
 
     if metadata is None:
         print(f"[WARN] Could not extract metadata for {filename}. Using random UUID.")
         project_id = str(uuid.uuid4())
-        # Default values
-        slide_count = 0
-        title = ""
-        subject = ""
-        author = ""
-        last_modified_by = ""
-        revision_number = ""
+        metadata = {}
     else:
-        title = metadata.get("title", "")
-        slide_count = metadata.get("slide_count", 0)
-        subject = metadata.get("subject", "")
-        author = metadata.get("author", "")
-        last_modified_by = metadata.get("last_modified_by", "")
-        revision_number = metadata.get("revision_number", "")
-
         # Generate deterministic UID
         # Seed: filename|title|slide_count
-        seed = f"{filename}|{title}|{slide_count}"
+        seed = f"{filename}|{metadata.get('title', '')}|{metadata.get('slide_count', 0)}"
 
         APP_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, "pipiitiii.local")
         project_id = str(uuid.uuid5(APP_NAMESPACE, seed))
 
         print(f"[INFO] Generated UID {project_id} for {filename}")
 
-    # Check if project already exists
-    existing_project = db.get_project(project_id)
-    if existing_project:
-        print(f"[INFO] Project {project_id} already exists. Returning existing status.")
-        status = existing_project.get("status", "unknown")
-        return {
+    return {
+        "file_path": file_path,
+        "engine": engine,
+        "existing": db.get_project(project_id),
+        "reusable": reusable,
+        "project": {
             "id": project_id,
-            "message": "Project already exists (duplicate detected)",
-            "status": status,
-            "is_duplicate": True,
-        }
+            "original_filename": filename,
+            "created_at": datetime.now().isoformat(),
+            "status": "processing",
+            "slide_count": metadata.get("slide_count", 0),
+            "title": metadata.get("title", ""),
+            "subject": metadata.get("subject", ""),
+            "author": metadata.get("author", ""),
+            "last_modified_by": metadata.get("last_modified_by", ""),
+            "revision_number": metadata.get("revision_number", ""),
+            "content_hash": content_hash,
+        },
+    }
 
-    # Create result directory
-    project_dir = os.path.join(RESULT_DIR, project_id)
-    os.makedirs(project_dir, exist_ok=True)
 
-    # Initialize progress
-    progress_store[project_id] = {
-        "percent": 0,
-        "message": "Uploaded",
-        "status": "processing",
+def duplicate_upload_response(project: dict) -> dict:
+    print(f"[INFO] Project {project['id']} already exists. Returning existing status.")
+    return {
+        "id": project["id"],
+        "message": "Project already exists (duplicate detected)",
+        "status": project.get("status", "unknown"),
+        "is_duplicate": True,
     }
 
+
+def register_uploads(uploads: List[dict]):
+    """Add the projects of inspected uploads to the DB (one transaction)."""
+    for upload in uploads:
+        project_id = upload["project"]["id"]
+        # Create result directory
+        os.makedirs(os.path.join(RESULT_DIR, project_id), exist_ok=True)
+        # Initialize progress
+        update_progress(project_id, 0, "Uploaded", status="processing")
     # Add to DB with FULL metadata
-    db.add_project(
-        {
-            "id": project_id,
-            "original_filename": filename,
-            "created_at": datetime.now().isoformat(),
-            "status": "processing",
-            "slide_count": slide_count,
-            "title": title,
-            "subject": subject,
-            "author": author,
-            "last_modified_by": last_modified_by,
-            "revision_number": revision_number,
-        }
-    )
+    db.add_projects([upload["project"] for upload in uploads])
+
+
+def start_upload(upload: dict) -> dict:
+    """Attributes and activity log of a registered upload, then its parse (or reused parse)."""
+    project = upload["project"]
+    project_id = project["id"]
+    filename = project["original_filename"]
 
     # Calculate and save dynamic attributes
     try:
         project_data = {
-            "original_filename": filename,
-            "title": title,
-            "slide_count": slide_count,
-            "subject": subject,
-            "author": author,
-            "last_modified_by": last_modified_by,
-            "revision_number": revision_number,
+            key: project[key]
+            for key in (
+                "original_filename",
+                "title",
+                "slide_count",
+                "subject",
+                "author",
+                "last_modified_by",
+                "revision_number",
+            )
         }
         attributes = attr_manager.calculate_attributes(project_data)
         db.update_project_attributes(project_id, attributes)
@@ -601,41 +1020,399 @@ async def upload_ppt(background_tasks: BackgroundTasks, file: UploadFile = File(
         action_type="project_upload",
         summary=f"프로젝트 업로드: {filename}",
         project_id=project_id,
-        details={"filename": filename, "slide_count": slide_count, "title": title},
+        details={
+            "filename": filename,
+            "slide_count": project["slide_count"],
+            "title": project["title"],
+        },
     )
 
-    # Run parsing in background
-    background_tasks.add_task(run_parsing_task, file_path, project_dir, project_id)
+    if upload["reusable"] is not None:
+        source_project, data = upload["reusable"]
+        if reuse_parse(source_project["id"], project_id, upload["file_path"], data):
+            return {
+                "id": project_id,
+                "job_id": None,
+                "reused_from": source_project["id"],
+                "message": "Upload successful, reused the parse of an identical file",
+            }
 
-    return {"id": project_id, "message": "Upload successful, processing started"}
+    # Parse on the job queue
+    job = submit_parse_job(project_id, upload["file_path"], upload["engine"])
+
+    return {
+        "id": project_id,
+        "job_id": job["id"],
+        "message": "Upload successful, processing started",
+    }
+
+
+async def store_and_inspect_upload(file: UploadFile, engine: Optional[str]) -> dict:
+    """Stream an upload into content-addressed storage and inspect it, off the event loop."""
+    filename = file.filename
+    engine = resolve_parser_engine(engine, filename)
+    loop = asyncio.get_event_loop()
+    # Stream into content-addressed storage (uploads/<sha256><ext>)
+    file_path, content_hash = await loop.run_in_executor(
+        None, store_upload, file.file, UPLOAD_DIR, filename
+    )
+    return await loop.run_in_executor(
+        None, inspect_upload, filename, file_path, content_hash, engine
+    )
+
+
+@app.post("/api/upload")
+async def upload_ppt(
+    file: UploadFile = File(...),
+    engine: Optional[str] = None,
+):
+    upload = await store_and_inspect_upload(file, engine)
+
+    # Check if project already exists
+    if upload["existing"]:
+        return duplicate_upload_response(upload["existing"])
+
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, register_uploads, [upload])
+    return await loop.run_in_executor(None, start_upload, upload)
+
+
+@app.post("/api/upload/batch")
+async def upload_batch(
+    files: List[UploadFile] = File(...),
+    engine: Optional[str] = None,
+):
+    """Upload many decks in one request; ``results`` has one entry per file, in order.
+
+    Each entry has the ``filename`` and a ``status``: "queued" (with ``job_id``),
+    "reused" (with ``reused_from``), "duplicate" or "error" (with ``detail``).
+    """
+    inspected = await asyncio.gather(
+        *(store_and_inspect_upload(file, engine) for file in files), return_exceptions=True
+    )
+
+    results, new_uploads, seen = [], [], set()
+    for file, upload in zip(files, inspected):
+        if isinstance(upload, HTTPException):
+            results.append({"filename": file.filename, "status": "error", "detail": upload.detail})
+            continue
+        if isinstance(upload, BaseException):
+            print(f"[ERROR] Batch upload of {file.filename} failed: {upload}")
+            results.append({"filename": file.filename, "status": "error", "detail": str(upload)})
+            continue
+
+        project = upload["project"]
+        if upload["existing"] or project["id"] in seen:
+            # Uploaded before, or twice in this batch
+            existing = upload["existing"] or project
+            results.append(
+                {
+                    "filename": file.filename,
+                    "id": project["id"],
+                    "status": "duplicate",
+                    "project_status": existing.get("status", "unknown"),
+                }
+            )
+            continue
+        seen.add(project["id"])
+        new_uploads.append(upload)
+        results.append(upload)
+
+    loop = asyncio.get_event_loop()
+    if new_uploads:
+        await loop.run_in_executor(None, register_uploads, new_uploads)
+    for index, upload in enumerate(results):
+        if "project" not in upload:
+            continue
+        filename = upload["project"]["original_filename"]
+        try:
+            started = await loop.run_in_executor(None, start_upload, upload)
+        except Exception as e:
+            print(f"[ERROR] Could not start processing {filename}: {e}")
+            update_progress(upload["project"]["id"], -1, str(e))
+            db.update_project_status(upload["project"]["id"], "error")
+            results[index] = {
+                "filename": filename,
+                "id": upload["project"]["id"],
+                "status": "error",
+                "detail": str(e),
+            }
+            continue
+        results[index] = {
+            "filename": filename,
+            "status": "reused" if started.get("reused_from") else "queued",
+            **started,
+        }
+
+    return {
+        "results": results,
+        "queued": sum(1 for r in results if r["status"] == "queued"),
+        "reused": sum(1 for r in results if r["status"] == "reused"),
+        "duplicates": sum(1 for r in results if r["status"] == "duplicate"),
+        "errors": sum(1 for r in results if r["status"] == "error"),
+    }
+
+
+def progress_payload(row: dict) -> dict:
+    """Public form of a progress row, with the slides a progressive parse has ready."""
+    status = {
+        "project_id": row["project_id"],
+        "percent": row["percent"],
+        "message": row["message"],
+        "status": row["status"],
+    }
+    if row["status"] == "processing":
+        manifest = parsing.read_partial_manifest(os.path.join(RESULT_DIR, row["project_id"]))
+        if manifest is not None:
+            # Slides already viewable through /api/project/{id}
+            status["ready_slides"] = len(manifest.get("ready") or [])
+    return status
 
 
 @app.get("/api/project/{project_id}/status")
 def get_project_status(project_id: str):
-    if project_id in progress_store:
-        return progress_store[project_id]
+    row = progress_db.get(project_id)
+    if row is not None:
+        return progress_payload(row)
+    return stored_project_status(project_id)
+
 
-    # If not in memory, check if it exists on disk (maybe restarted server?)
+def stored_project_status(project_id: str) -> dict:
+    """Status of a project without a progress row (never tracked, or past the retention)."""
     project_dir = os.path.join(RESULT_DIR, project_id)
     json_path = os.path.join(project_dir, f"{project_id}.json")
     if os.path.exists(json_path):
-        return {"percent": 100, "message": "Done", "status": "done"}
+        return {
+            "project_id": project_id,
+            "percent": 100,
+            "message": done_message(json_path),
+            "status": "done",
+        }
+
+    return {
+        "project_id": project_id,
+        "percent": 0,
+        "message": "Unknown project",
+        "status": "error",
+    }
+
 
-    return {"percent": 0, "message": "Unknown project", "status": "error"}
+# How often an event stream checks the progress table, and sends a keep-alive when idle
+PROGRESS_POLL_INTERVAL = float(os.environ.get("PPT_PROGRESS_POLL_INTERVAL", "0.5"))
+PROGRESS_KEEPALIVE = 15.0
+
+
+async def progress_events(
+    project_ids: Optional[List[str]], last_rev: Optional[int], is_disconnected
+):
+    """Server-Sent Events for progress rows changed after ``last_rev``.
+
+    Without ``last_rev`` (a new stream) the current state of the projects comes
+    first. Rows are read from the shared table, so updates made by any worker
+    process reach every stream.
+    """
+    yield "retry: 3000\n\n"
+    rev = last_rev or 0
+    if last_rev is None and project_ids:
+        rows = await asyncio.to_thread(progress_db.changes, 0, project_ids)
+        tracked = {row["project_id"] for row in rows}
+        for project_id in project_ids:
+            if project_id not in tracked:
+                # Finished before the retention ran out, or never parsed here
+                payload = await asyncio.to_thread(stored_project_status, project_id)
+                data = json.dumps(payload, ensure_ascii=False)
+                yield f"event: progress\ndata: {data}\n\n"
+    idle = 0.0
+    while not await is_disconnected():
+        rows = await asyncio.to_thread(progress_db.changes, rev, project_ids)
+        for row in rows:
+            payload = await asyncio.to_thread(progress_payload, row)
+            rev = row["rev"]
+            data = json.dumps(payload, ensure_ascii=False)
+            yield f"id: {rev}\nevent: progress\ndata: {data}\n\n"
+        if rows:
+            idle = 0.0
+        elif idle >= PROGRESS_KEEPALIVE:
+            idle = 0.0
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(PROGRESS_POLL_INTERVAL)
+        idle += PROGRESS_POLL_INTERVAL
+
+
+@app.get("/api/progress/stream")
+async def stream_progress(
+    request: Request, project_ids: Optional[str] = None, last_event_id: Optional[int] = None
+):
+    """Push progress updates of one or many projects (comma separated; all if omitted)."""
+    ids = [p for p in (project_ids or "").split(",") if p] or None
+    header = request.headers.get("last-event-id")
+    if header and header.isdigit():
+        # EventSource sends it when it reconnects
+        last_event_id = int(header)
+    return StreamingResponse(
+        progress_events(ids, last_event_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/api/project/{project_id}")
-def get_project(project_id: str):
+def get_project(project_id: str, request: Request, fields: Optional[str] = None):
+    """The project JSON; ``fields=slides,title`` returns only those top-level keys.
+
+    The stored bytes are sent as they are: a compressed project file with its
+    Content-Encoding, a plain one as is or gzip-compressed once and kept as
+    <id>.json.gz. A compressed file is decompressed on the way out for clients
+    that don't accept its coding, and the slide files of a sharded project are
+    joined on the way out. The document is only decoded for a field filter or
+    when the file is stored with an interned palette.
+
+    User annotations are laid over the stored document: only the annotated
+    slides of a sharded project are decoded, a single-file project is decoded
+    whole. The ETag of an annotated project carries the annotation revision.
+    """
     project_dir = os.path.join(RESULT_DIR, project_id)
     json_path = os.path.join(project_dir, f"{project_id}.json")
 
     if not os.path.exists(json_path):
+        # Still parsing: serve the slides finished so far ("partial": true)
+        partial = parsing.load_partial_result(project_dir)
+        if partial is not None:
+            return partial
         raise HTTPException(status_code=404, detail="Project not found")
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    wanted = [name.strip() for name in (fields or "").split(",") if name.strip()]
+    info = project_cache.file_info(json_path)
+    accept_encoding = request.headers.get("accept-encoding")
+    revision = annotations_db.revision(project_id)
+    passthrough = not wanted and not info["interned"] and (info["sharded"] or not revision)
+    stored = info["encoding"]
+    if not passthrough or revision:
+        served = None
+    elif stored:
+        served = stored if accepts_encoding(accept_encoding, stored) else None
+    elif (
+        info["sharded"] or os.path.getsize(json_path) >= PASSTHROUGH_GZIP_MIN_BYTES
+    ) and accepts_encoding(accept_encoding, "gzip"):
+        served = "gzip"
+    else:
+        served = None
+
+    # One ETag per representation, all derived from the stored file's
+    etag = info["etag"]
+    if wanted:
+        etag = etag[:-1] + "-f" + hashlib.sha256(",".join(wanted).encode()).hexdigest()[:8] + '"'
+    elif passthrough and served != stored:
+        etag = etag[:-1] + f'-{served or "identity"}"'
+    if revision:
+        etag = etag[:-1] + f'-a{revision}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if passthrough:
+        if served:
+            headers["Content-Encoding"] = served
+        if served == stored and not info["sharded"]:
+            return FileResponse(json_path, media_type="application/json", headers=headers)
+        if served == "gzip" and not stored:
+            return FileResponse(
+                project_cache.gzip_variant(json_path),
+                media_type="application/json",
+                headers=headers,
+            )
+        annotations = annotations_db.for_project(project_id) if revision else {}
+        return StreamingResponse(
+            parsing.iter_project_document(
+                json_path,
+                overlay=lambda slide: apply_annotations([slide], annotations)[0],
+                overlay_slides=annotations.keys(),
+            ),
+            media_type="application/json",
+            headers=headers,
+        )
+
+    data = load_annotated_project(project_id) if revision else project_cache.get(json_path)[0]
+    if wanted:
+        data = {name: data[name] for name in wanted if name in data}
+    return JSONResponse(data, headers=headers)
+
+
+def project_slides_response(
+    project_id: str, request: Request, first: int, last: Optional[int], single: bool = False
+):
+    """Slides ``first``..``last`` of a project, reading only their files when it is sharded."""
+    json_path = os.path.join(RESULT_DIR, project_id, f"{project_id}.json")
+    if not os.path.exists(json_path):
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    info = project_cache.file_info(json_path)
+    by_content = info["sharded"] and not info["interned"]
+    revision = annotations_db.revision(project_id, first, last)
+
+    def slides_etag(slide_files):
+        # Slide files are named by content: the ETag follows only the slides served
+        version = ",".join(slide_files or []) if by_content else f"{info['etag']}:{first}:{last}"
+        if revision:
+            version += f":a{revision}"
+        return f'"{hashlib.sha256(version.encode()).hexdigest()[:32]}"'
+
+    slide_files = (
+        parsing.project_slide_files(json_path, first=first, last=last) if by_content else None
+    )
+    headers = {"ETag": slides_etag(slide_files), "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    if info["sharded"]:
+        slides, slide_files = parsing.load_project_slides(json_path, first=first, last=last)
+        # The manifest may have been replaced since the ETag was computed
+        headers["ETag"] = slides_etag(slide_files)
+    else:
+        data, _ = project_cache.get(json_path)
+        slides = []
+        for slide in data.get("slides", []):
+            slide_index = slide.get("slide_index") or 0
+            if first <= slide_index and (last is None or slide_index <= last):
+                slides.append(slide)
+    if revision:
+        slides = apply_annotations(slides, annotations_db.for_project(project_id, first, last))
+    if single:
+        if not slides:
+            raise HTTPException(status_code=404, detail="Slide not found")
+        return JSONResponse(slides[0], headers=headers)
+    return JSONResponse({"slides": slides}, headers=headers)
+
+
+@app.get("/api/project/{project_id}/slides")
+def get_project_slides(
+    project_id: str, request: Request, start: int = 1, end: Optional[int] = None
+):
+    """Slides ``start`` to ``end`` (inclusive, by slide_index) of a project."""
+    return project_slides_response(project_id, request, start, end)
+
+
+@app.get("/api/project/{project_id}/slides/{slide_index}")
+def get_project_slide(project_id: str, slide_index: int, request: Request):
+    """One slide of a project."""
+    return project_slides_response(project_id, request, slide_index, slide_index, single=True)
 
-    return data
+
+@app.get("/api/project/{project_id}/thumbnails/{slide_index}")
+def get_slide_thumbnail(project_id: str, slide_index: int, variant: str = "grid"):
+    """A thumbnail variant (grid/viewer/llm), rendered from the slide PNG on first request."""
+    if variant not in parsing.THUMBNAIL_VARIANTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown variant '{variant}'. Use one of {list(parsing.THUMBNAIL_VARIANTS)}",
+        )
+    project_dir = os.path.join(RESULT_DIR, project_id)
+    if not os.path.isdir(project_dir):
+        raise HTTPException(status_code=404, detail="Project not found")
+    path = parsing.ensure_variant(project_dir, slide_index, variant)
+    if not path:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    return FileResponse(path, headers={"Cache-Control": "no-cache"})
 
 
 @app.post("/api/project/{project_id}/update_positions")
@@ -646,39 +1423,30 @@ def update_project_positions(project_id: str, bulk_update: BulkPositionUpdate):
     if not os.path.exists(json_path):
         raise HTTPException(status_code=404, detail="Project not found")
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # The slides are only read to resolve the shapes; positions go to the annotations table
+    slides, _ = parsing.load_project_slides(
+        json_path, indices={update.slide_index for update in bulk_update.updates}
+    )
 
-    # Create a map for faster lookup: slide_index -> {shape_index -> shape_obj}
+    # slide_index -> {shape_index -> annotation key}
     slide_map = {}
-    for slide in data.get("slides", []):
-        s_idx = slide.get("slide_index")
-        shape_map = {}
-
-        def map_shapes(shapes):
-            for shape in shapes:
-                shape_map[str(shape.get("shape_index"))] = shape
-                if "children" in shape:
-                    map_shapes(shape["children"])
-
-        map_shapes(slide.get("shapes", []))
-        slide_map[s_idx] = shape_map
+    for slide in slides:
+        slide_map[slide.get("slide_index")] = {
+            str(shape.get("shape_index")): key
+            for key, shape in shape_annotation_keys(slide.get("shapes", [])).items()
+        }
 
-    # Apply updates
-    updated_count = 0
+    positions = []
     for update in bulk_update.updates:
-        if update.slide_index in slide_map:
-            shape_map = slide_map[update.slide_index]
-            if str(update.shape_index) in shape_map:
-                shape = shape_map[str(update.shape_index)]
-                shape["left"] = update.left
-                shape["top"] = update.top
-                updated_count += 1
+        key = slide_map.get(update.slide_index, {}).get(str(update.shape_index))
+        if key is not None:
+            positions.append(
+                (update.slide_index, key, update.shape_index, update.left, update.top)
+            )
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    annotations_db.set_positions(project_id, positions)
 
-    return {"status": "success", "updated": updated_count}
+    return {"status": "success", "updated": len(positions)}
 
 
 @app.post("/api/project/{project_id}/update_description")
@@ -689,149 +1457,143 @@ def update_project_description(project_id: str, update: DescriptionUpdate):
     if not os.path.exists(json_path):
         raise HTTPException(status_code=404, detail="Project not found")
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    target_slide = None
-    for slide in data.get("slides", []):
-        if slide.get("slide_index") == update.slide_index:
-            target_slide = slide
-            break
+    slides, _ = parsing.load_project_slides(json_path, indices=[update.slide_index])
+    target_slide = slides[0] if slides else None
 
     if not target_slide:
         raise HTTPException(status_code=404, detail="Slide not found")
 
-    # Use shape_utils to update shape description
-    found = update_shape_property(
-        target_slide.get("shapes", []),
-        str(update.shape_index),
-        {"description": update.description},
+    key = next(
+        (
+            key
+            for key, shape in shape_annotation_keys(target_slide.get("shapes", [])).items()
+            if str(shape.get("shape_index")) == str(update.shape_index)
+        ),
+        None,
     )
 
-    if not found:
+    if key is None:
         raise HTTPException(status_code=404, detail="Shape not found")
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    annotations_db.set_description(
+        project_id, update.slide_index, key, update.shape_index, update.description
+    )
 
     return {"status": "success"}
 
 
-@app.post("/api/project/{project_id}/reparse_all")
-def reparse_all_project(project_id: str):
+def load_project_for_reparse(project_id: str, engine: Optional[str]):
+    """(project data, source deck path, engine) of a project; raises 404/400 HTTPException."""
     project_dir = os.path.join(RESULT_DIR, project_id)
     json_path = os.path.join(project_dir, f"{project_id}.json")
 
     if not os.path.exists(json_path):
         raise HTTPException(status_code=404, detail="Project not found")
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = parsing.load_project_json(json_path)
 
     ppt_path = data.get("ppt_path")
     # Use file resolver to find PPT file
     ppt_path = file_resolver.resolve_ppt_path(ppt_path, project_id)
+    engine = resolve_parser_engine(engine or data.get("parser_engine"), ppt_path)
+    return data, ppt_path, engine
 
-    try:
-        # Extract existing descriptions to preserve them
-        preserved_data = {}
-        for slide in data.get("slides", []):
-            extract_preserved_descriptions(
-                slide.get("shapes", []), slide.get("slide_index"), preserved_data
-            )
-
-        # Initialize COM for this thread
-        pythoncom.CoInitialize()
 
-        # Re-run parsing with preserved data
-        new_json_path = parsing.parse_presentation(
-            ppt_path, project_dir, debug=False, preserved_data=preserved_data
-        )
-
-        if not new_json_path:
-            raise HTTPException(status_code=500, detail="Reparsing failed")
+def job_accepted(job: dict, message: str) -> dict:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "deduplicated": job["deduplicated"],
+        "message": message,
+    }
 
-        return {"status": "success", "message": "Project reparsed successfully"}
 
-    except Exception as e:
-        print(f"Reparse error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Uninitialize COM when done
-        pythoncom.CoUninitialize()
+@app.post("/api/project/{project_id}/reparse_all", status_code=202)
+def reparse_all_project(project_id: str, engine: Optional[str] = None, full: bool = False):
+    """Queue a reparse of the deck; unchanged slides are kept unless ``full`` is set."""
+    _, _, engine = load_project_for_reparse(project_id, engine)
+    job = job_queue.submit(
+        "reparse_all",
+        project_id,
+        {"engine": engine, "full": full},
+        priority=PRIORITY_NORMAL,
+        dedupe_key=f"reparse_all:{project_id}:{engine}:{full}",
+    )
+    return job_accepted(job, "Reparse queued")
 
 
-@app.post("/api/project/{project_id}/slides/{slide_index}/reparse")
-def reparse_slide_endpoint(project_id: str, slide_index: int):
+def reparse_all_job(job: dict, report) -> dict:
+    project_id = job["project_id"]
     project_dir = os.path.join(RESULT_DIR, project_id)
-    json_path = os.path.join(project_dir, f"{project_id}.json")
-
-    if not os.path.exists(json_path):
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    ppt_path = data.get("ppt_path")
-    # Use file resolver to find PPT file
-    ppt_path = file_resolver.resolve_ppt_path(ppt_path, project_id)
-
-    try:
-        # Extract existing descriptions to preserve them
-        preserved_data = {}
-        target_slide = next(
-            (s for s in data.get("slides", []) if s.get("slide_index") == slide_index),
-            None,
-        )
-        if target_slide:
-            extract_preserved_descriptions(
-                target_slide.get("shapes", []), slide_index, preserved_data
-            )
+    data, ppt_path, engine = load_project_for_reparse(project_id, job["params"]["engine"])
+
+    # Annotations are kept apart from the JSON the parse rewrites
+    import_legacy_descriptions(project_id, data.get("slides", []))
+
+    new_json_path = run_presentation_parser(
+        engine,
+        ppt_path,
+        project_dir,
+        debug=False,
+        progress_callback=lambda p, m: report(p, m) if p >= 0 else None,
+        previous_result=None if job["params"].get("full") else data,
+    )
 
-        # Initialize COM for this thread
-        pythoncom.CoInitialize()
+    project_cache.invalidate(os.path.join(project_dir, f"{project_id}.json"))
+    if not new_json_path:
+        raise RuntimeError("Reparsing failed")
+    sync_project_assets(project_id)
+    run_thumbnail_stage(project_id, ppt_path, engine)
+
+    return {"message": "Project reparsed successfully"}
+
+
+@app.post("/api/project/{project_id}/slides/{slide_index}/reparse", status_code=202)
+def reparse_slide_endpoint(project_id: str, slide_index: int, engine: Optional[str] = None):
+    """Queue a single-slide reparse; it runs ahead of bulk and full-deck jobs."""
+    _, _, engine = load_project_for_reparse(project_id, engine)
+    job = job_queue.submit(
+        "reparse_slide",
+        project_id,
+        {"slide_index": slide_index, "engine": engine},
+        priority=PRIORITY_INTERACTIVE,
+        dedupe_key=f"reparse_slide:{project_id}:{slide_index}:{engine}",
+    )
+    return job_accepted(job, f"Reparse of slide {slide_index} queued")
 
-        # Parse single slide
-        new_slide_info = parsing.parse_single_slide(
-            ppt_path, slide_index, project_dir, preserved_data=preserved_data
-        )
 
-        if not new_slide_info:
-            raise HTTPException(status_code=500, detail="Slide parsing failed")
+def reparse_slide_job(job: dict, report) -> dict:
+    project_id = job["project_id"]
+    slide_index = job["params"]["slide_index"]
+    project_dir = os.path.join(RESULT_DIR, project_id)
+    json_path = os.path.join(project_dir, f"{project_id}.json")
+    data, ppt_path, engine = load_project_for_reparse(project_id, job["params"]["engine"])
 
-        # Update slide in data
-        slides = data.get("slides", [])
-        found = False
-        for i, slide in enumerate(slides):
-            if slide.get("slide_index") == slide_index:
-                slides[i] = new_slide_info
-                found = True
-                break
+    # Annotations are kept apart from the JSON the parse rewrites
+    import_legacy_descriptions(
+        project_id, [s for s in data.get("slides", []) if s.get("slide_index") == slide_index]
+    )
 
-        if not found:
-            # If for some reason it wasn't there, append it (though index order might be off)
-            slides.append(new_slide_info)
-            # Sort by slide_index just in case
-            slides.sort(key=lambda x: x.get("slide_index", 0))
+    # Parse single slide with the project's engine
+    new_slide_info = run_slide_parser(engine, ppt_path, slide_index, project_dir)
 
-        data["slides"] = slides
+    if not new_slide_info:
+        raise RuntimeError("Slide parsing failed")
 
-        # Save updated JSON
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    parsing.generate_thumbnail_variants(
+        project_dir, {"slides": [new_slide_info]}, slide_indices=[slide_index]
+    )
 
-        return {
-            "status": "success",
-            "message": f"Slide {slide_index} reparsed successfully",
-            "slide": new_slide_info,
-        }
+    # Only this slide is written: edits to other slides made meanwhile are kept
+    save_project_slides(json_path, [new_slide_info])
+    sync_project_assets(project_id)
 
-    except Exception as e:
-        print(f"Slide reparse error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Uninitialize COM when done
-        pythoncom.CoUninitialize()
+    return {
+        "message": f"Slide {slide_index} reparsed successfully",
+        "slide": apply_annotations(
+            [new_slide_info], annotations_db.for_project(project_id, slide_index, slide_index)
+        )[0],
+    }
 
 
 def get_default_workflow_steps() -> dict:
@@ -966,6 +1728,12 @@ def _diff_settings(old: dict, new: dict) -> List[str]:
     return changes
 
 
+@app.get("/api/cache/masters")
+def get_master_cache_stats():
+    """Hit/miss counts of the master/layout parse cache, per template."""
+    return master_cache.stats()
+
+
 @app.get("/api/settings")
 def get_settings():
     """Get application settings."""
@@ -1493,10 +2261,8 @@ async def generate_summary(
     slide_indices = request.slide_indices[:3]
     thumbnail_paths = []
     for idx in slide_indices:
-        thumb_path = os.path.join(
-            project_dir, "thumbnails", f"slide_{idx:03d}_thumb.png"
-        )
-        if os.path.exists(thumb_path):
+        thumb_path = llm_thumbnail_path(project_dir, idx)
+        if thumb_path:
             thumbnail_paths.append(thumb_path)
 
     if not thumbnail_paths:
@@ -1550,10 +2316,8 @@ async def generate_text(project_id: str, request: GenerateTextRequest):
     thumbnail_paths = []
     if request.slide_indices:
         for idx in request.slide_indices[:3]:
-            thumb_path = os.path.join(
-                project_dir, "thumbnails", f"slide_{idx:03d}_thumb.png"
-            )
-            if os.path.exists(thumb_path):
+            thumb_path = llm_thumbnail_path(project_dir, idx)
+            if thumb_path:
                 thumbnail_paths.append(thumb_path)
 
     system_prompt = request.system_prompt or "당신은 PPT 프레젠테이션을 분석하는 전문가입니다."
@@ -1581,16 +2345,24 @@ async def generate_text(project_id: str, request: GenerateTextRequest):
     )
 
 
-@app.get("/api/project/{project_id}/download")
+@app.post("/api/project/{project_id}/download", status_code=202)
 def download_project(project_id: str):
-    project_dir = os.path.join(RESULT_DIR, project_id)
-    json_path = os.path.join(project_dir, f"{project_id}.json")
-
+    """Queue the reconstruction of the deck; fetch it from /api/jobs/{job_id}/file when done."""
+    json_path = os.path.join(RESULT_DIR, project_id, f"{project_id}.json")
     if not os.path.exists(json_path):
         raise HTTPException(status_code=404, detail="Project not found")
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    job = job_queue.submit(
+        "reconstruct", project_id, priority=PRIORITY_NORMAL, dedupe_key=f"reconstruct:{project_id}"
+    )
+    return job_accepted(job, "Reconstruction queued")
+
+
+def reconstruct_job(job: dict, report) -> dict:
+    project_id = job["project_id"]
+    project_dir = os.path.join(RESULT_DIR, project_id)
+
+    data = load_annotated_project(project_id)
 
     # Reconstruct PPT
     # We'll save it to a temporary file or directly to the result dir with a specific name
@@ -1606,26 +2378,62 @@ def download_project(project_id: str):
     # In ppt_reconstructor.py, it takes image_dir.
     # Let's pass UPLOAD_DIR as image_dir fallback?
 
-    # Run reconstruction in a separate thread because it uses COM
-    # We need a wrapper for COM initialization
-    def reconstruct_task():
-        pythoncom.CoInitialize()
-        try:
-            import ppt_reconstructor
+    # Run reconstruction on a warm PowerPoint worker
+    success = com_pool.run(
+        ppt_reconstructor.reconstruct_presentation,
+        data,
+        output_path,
+        image_dir=UPLOAD_DIR,
+        asset_dir=ASSET_DIR,
+    )
+    if not success:
+        raise RuntimeError("Failed to reconstruct presentation")
 
-            return ppt_reconstructor.reconstruct_presentation(
-                data, output_path, image_dir=UPLOAD_DIR
-            )
-        finally:
-            pythoncom.CoUninitialize()
+    return {"filename": output_filename}
 
-    success = reconstruct_task()
 
-    if not success:
-        raise HTTPException(
-            status_code=500, detail="Failed to reconstruct presentation"
-        )
+job_queue.register("parse", parse_job)
+job_queue.register("reparse_all", reparse_all_job)
+job_queue.register("reparse_slide", reparse_slide_job)
+job_queue.register("reconstruct", reconstruct_job)
 
+
+@app.get("/api/jobs")
+def list_jobs(project_id: Optional[str] = None, status: Optional[str] = None, limit: int = 100):
+    return job_queue.list_jobs(project_id=project_id, status=status, limit=limit)
+
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.delete("/api/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """Cancel a job that has not started yet."""
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job already started")
+    return {"status": "cancelled"}
+
+
+@app.get("/api/jobs/{job_id}/file")
+def get_job_file(job_id: str):
+    """The deck a finished reconstruct job produced."""
+    job = job_queue.get(job_id)
+    if job is None or job["kind"] != "reconstruct":
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+    output_filename = job["result"]["filename"]
+    output_path = os.path.join(RESULT_DIR, job["project_id"], output_filename)
+    if not os.path.exists(output_path):
+        raise HTTPException(status_code=404, detail="Reconstructed file no longer exists")
     return FileResponse(
         output_path,
         filename=output_filename,
@@ -1728,8 +2536,7 @@ async def batch_generate_summary(request: BatchGenerateSummaryRequest):
                     yield f"data: {json.dumps({'type': 'error', 'project_id': project_id, 'message': 'Project data not found'})}\n\n"
                     continue
 
-                with open(json_path, "r", encoding="utf-8") as f:
-                    project_data = json.load(f)
+                project_data, _ = project_cache.get(json_path)
 
                 # Use provided slide indices or first 3 slides
                 if request.slide_indices:
@@ -1741,10 +2548,8 @@ async def batch_generate_summary(request: BatchGenerateSummaryRequest):
                 # Build thumbnail paths
                 thumbnail_paths = []
                 for si in slide_indices:
-                    thumb_path = os.path.join(
-                        project_dir, "thumbnails", f"slide_{si:03d}_thumb.png"
-                    )
-                    if os.path.exists(thumb_path):
+                    thumb_path = llm_thumbnail_path(project_dir, si)
+                    if thumb_path:
                         thumbnail_paths.append(thumb_path)
 
                 if not thumbnail_paths:
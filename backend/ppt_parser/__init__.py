@@ -1,9 +1,81 @@
-from .slides import parse_presentation, parse_single_slide, get_presentation_metadata
+from .slides import (
+    parse_presentation,
+    parse_single_slide,
+    get_presentation_metadata,
+    render_slide_thumbnails,
+)
+from .ooxml import (
+    OOXMLError,
+    is_legacy_ppt,
+    parse_presentation_ooxml,
+    parse_single_slide_ooxml,
+    probe_presentation_metadata,
+)
+from .parallel import parse_presentation_parallel
+from .assets import AssetStore
+from .master_cache import MasterCache
+from .palette import intern_styles, resolve_styles
+from .storage import (
+    clone_project_artifacts,
+    decode_project_bytes,
+    iter_project_document,
+    load_partial_result,
+    load_project_json,
+    load_project_slides,
+    open_project_json,
+    project_json_encoding,
+    project_slide_files,
+    project_snapshot_path,
+    read_partial_manifest,
+    save_project_json,
+    save_project_slides,
+    snapshot_project_json,
+    SKIPPED_SLIDES_KEY,
+)
+from .tracing import configure_logging, export_chrome_trace, span, trace_job
+from .thumbnails import THUMBNAIL_VARIANTS, ensure_variant, generate_thumbnail_variants
 from .utils import make_safe_filename
 
+# Parsing engines: "com" drives PowerPoint, "ooxml" reads the .pptx package directly
+PARSER_ENGINES = ("com", "ooxml")
+
 __all__ = [
     "parse_presentation",
     "parse_single_slide",
     "get_presentation_metadata",
+    "render_slide_thumbnails",
+    "parse_presentation_parallel",
+    "parse_presentation_ooxml",
+    "parse_single_slide_ooxml",
+    "probe_presentation_metadata",
+    "is_legacy_ppt",
+    "OOXMLError",
+    "PARSER_ENGINES",
+    "AssetStore",
+    "MasterCache",
+    "load_partial_result",
+    "read_partial_manifest",
+    "load_project_json",
+    "save_project_json",
+    "open_project_json",
+    "decode_project_bytes",
+    "project_json_encoding",
+    "load_project_slides",
+    "save_project_slides",
+    "project_slide_files",
+    "iter_project_document",
+    "project_snapshot_path",
+    "snapshot_project_json",
+    "SKIPPED_SLIDES_KEY",
+    "clone_project_artifacts",
+    "intern_styles",
+    "resolve_styles",
+    "configure_logging",
+    "trace_job",
+    "span",
+    "export_chrome_trace",
+    "THUMBNAIL_VARIANTS",
+    "ensure_variant",
+    "generate_thumbnail_variants",
     "make_safe_filename",
 ]
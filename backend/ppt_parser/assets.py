@@ -0,0 +1,258 @@
+"""
+Content-addressed store for parsed images.
+
+The same logo or background picture used to be written once per shape, per
+project and per reparse under ``results/<id>/images/``. With an ``AssetStore``
+every image is stored once, named by the SHA-256 of its bytes:
+
+    <root>/<hh>/<sha256><ext>
+
+Shape JSON refers to it as ``"assets/<sha256><ext>"``; the ``/api/results``
+mount resolves ``/api/results/<project_id>/assets/<name>`` to the store, so the
+URL is the same for every project and reparse that produces the same picture.
+When a name is already stored the write is skipped.
+
+Reference counts (how many shapes of each project use an asset) live in
+``<root>/assets.db``. ``sync_project`` replaces a project's references after
+each parse and deletes assets nothing refers to any more. Parsers only write
+files; the database is touched by the API process.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+ASSET_PREFIX = "assets/"
+
+# Assets younger than this are never collected: a parse running elsewhere may
+# have just written (or reused) them without its project references recorded yet
+DEFAULT_GC_GRACE_SECONDS = 3600
+
+_CHUNK = 1024 * 1024
+
+
+def asset_name(digest: str, ext: str) -> str:
+    return f"{digest}{ext.lower()}"
+
+
+def is_asset_path(rel_path: Optional[str]) -> bool:
+    return isinstance(rel_path, str) and rel_path.startswith(ASSET_PREFIX)
+
+
+def iter_image_files(data: Dict[str, Any]) -> Iterable[str]:
+    """Every ``image_file`` in a project JSON (masters, layouts, slides, groups, tables)."""
+
+    def walk_shapes(shapes):
+        for shape in shapes or []:
+            if shape.get("image_file"):
+                yield shape["image_file"]
+            yield from walk_shapes(shape.get("children"))
+            table = shape.get("table") or {}
+            for cell in table.get("cells") or []:
+                if isinstance(cell, dict) and cell.get("image_file"):
+                    yield cell["image_file"]
+
+    for master in data.get("masters") or []:
+        yield from walk_shapes(master.get("shapes"))
+        for layout in master.get("layouts") or []:
+            yield from walk_shapes(layout.get("shapes"))
+    for slide in data.get("slides") or []:
+        yield from walk_shapes(slide.get("shapes"))
+
+
+class AssetStore:
+    """Hash-named image files plus per-project reference counts."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.db_path = os.path.join(root, "assets.db")
+        self._db_lock = threading.Lock()
+        self._db_ready = False
+
+    # ---------- files ----------
+
+    def path(self, name: str) -> str:
+        """Absolute path of a stored asset name (``<sha256><ext>``)."""
+        name = os.path.basename(name)
+        return os.path.join(self.root, name[:2], name)
+
+    def exists(self, name: str) -> bool:
+        return os.path.isfile(self.path(name))
+
+    def reuse(self, name: str) -> bool:
+        """True (and the grace period renewed) if ``name`` is already stored."""
+        path = self.path(name)
+        if not os.path.isfile(path):
+            return False
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True
+
+    def put_bytes(self, data: bytes, ext: str, digest: Optional[str] = None) -> str:
+        """Store bytes under their hash (or ``digest``); returns the asset name."""
+        name = asset_name(digest or hashlib.sha256(data).hexdigest(), ext)
+        if self.reuse(name):
+            return name
+        target = self.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, target)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return name
+
+    def put_file(self, src_path: str, ext: Optional[str] = None) -> str:
+        """Move a written file into the store (dropping it if already stored)."""
+        ext = ext or os.path.splitext(src_path)[1]
+        sha = hashlib.sha256()
+        with open(src_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK), b""):
+                sha.update(chunk)
+        name = asset_name(sha.hexdigest(), ext)
+        if self.reuse(name):
+            os.remove(src_path)
+            return name
+        target = self.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.replace(src_path, target)
+        except OSError:
+            # Different volume: copy then drop the source
+            shutil.move(src_path, target)
+        return name
+
+    def resolve(self, rel_path: str) -> Optional[str]:
+        """Absolute path for an ``assets/<name>`` JSON path, None if not an asset path."""
+        if not is_asset_path(rel_path):
+            return None
+        return self.path(rel_path[len(ASSET_PREFIX):])
+
+    # ---------- reference counts ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.root, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._db_ready:
+            with self._db_lock:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS asset_refs (
+                        project_id TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        refs INTEGER NOT NULL,
+                        updated_at TEXT NOT NULL,
+                        PRIMARY KEY (project_id, name)
+                    )
+                """)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_asset_refs_name ON asset_refs(name)"
+                )
+                conn.commit()
+                self._db_ready = True
+        return conn
+
+    def refcount(self, name: str) -> int:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(refs), 0) FROM asset_refs WHERE name = ?", (name,)
+            ).fetchone()
+            return int(row[0])
+        finally:
+            conn.close()
+
+    def sync_project(
+        self,
+        project_id: str,
+        data: Dict[str, Any],
+        grace_seconds: float = DEFAULT_GC_GRACE_SECONDS,
+    ) -> int:
+        """Record the assets a project JSON uses; returns how many orphans were deleted."""
+        counts = Counter(
+            path[len(ASSET_PREFIX):] for path in iter_image_files(data) if is_asset_path(path)
+        )
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            with conn:
+                previous = {
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT name FROM asset_refs WHERE project_id = ?", (project_id,)
+                    )
+                }
+                conn.execute("DELETE FROM asset_refs WHERE project_id = ?", (project_id,))
+                conn.executemany(
+                    "INSERT INTO asset_refs (project_id, name, refs, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(project_id, name, refs, now) for name, refs in counts.items()],
+                )
+        finally:
+            conn.close()
+        return self._collect(previous - set(counts), grace_seconds)
+
+    def release_project(
+        self, project_id: str, grace_seconds: float = DEFAULT_GC_GRACE_SECONDS
+    ) -> int:
+        """Drop every reference of a deleted project."""
+        return self.sync_project(project_id, {}, grace_seconds)
+
+    def _collect(self, candidates: Iterable[str], grace_seconds: float) -> int:
+        removed = 0
+        cutoff = time.time() - grace_seconds
+        for name in candidates:
+            if self.refcount(name) > 0:
+                continue
+            path = self.path(name)
+            try:
+                if os.path.getmtime(path) <= cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _stored_files(self):
+        if not os.path.isdir(self.root):
+            return
+        for entry in os.scandir(self.root):
+            if entry.is_dir():
+                for asset in os.scandir(entry.path):
+                    if asset.is_file() and not asset.name.endswith(".tmp"):
+                        yield asset
+
+    def collect_garbage(self, grace_seconds: float = DEFAULT_GC_GRACE_SECONDS) -> int:
+        """Delete every stored asset without references (full scan; run at startup)."""
+        conn = self._connect()
+        try:
+            referenced = {row[0] for row in conn.execute("SELECT DISTINCT name FROM asset_refs")}
+        finally:
+            conn.close()
+        orphans = [a.name for a in self._stored_files() if a.name not in referenced]
+        return self._collect(orphans, grace_seconds)
+
+    def stats(self) -> Dict[str, int]:
+        """Stored assets/bytes and total references (for diagnostics)."""
+        assets = size = 0
+        for asset in self._stored_files():
+            assets += 1
+            size += asset.stat().st_size
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT COALESCE(SUM(refs), 0) FROM asset_refs").fetchone()
+        finally:
+            conn.close()
+        return {"assets": assets, "bytes": size, "references": int(row[0])}
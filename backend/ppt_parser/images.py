@@ -1,9 +1,21 @@
+import logging
 import os
 from .utils import make_safe_filename
 from .constants import PP_SHAPE_FORMAT_PNG, SHAPE_PNG_SIZE
+from .tracing import traced
 
+logger = logging.getLogger(__name__)
+
+
+@traced("image", lambda shape, slide_index, shape_index, *args, **kwargs: f"image {shape_index}")
+def export_shape_image(shape, slide_index, shape_index, image_dir, media=None):
+    # Pictures embedded in the package are copied as-is (see media.MediaExtractor);
+    # Export stays for vector/chart/3D shapes and legacy .ppt files
+    if media is not None:
+        rel_path = media.extract(shape, slide_index, shape_index)
+        if rel_path:
+            return rel_path
 
-def export_shape_image(shape, slide_index, shape_index, image_dir):
     os.makedirs(image_dir, exist_ok=True)
 
     shape_name_safe = make_safe_filename(shape.Name)
@@ -55,18 +67,23 @@ def export_shape_image(shape, slide_index, shape_index, image_dir):
             if text_range is not None and orig_font_size is not None:
                 text_range.Font.Size = orig_font_size * scale
 
-            # Always use forward slashes for cross-platform compatibility
-            shape.Export(full_path, PP_SHAPE_FORMAT_PNG)
-
-            # === 원본 크기 복원 ===
-            shape.Width = orig_width
-            shape.Height = orig_height
+            try:
+                # Always use forward slashes for cross-platform compatibility
+                shape.Export(full_path, PP_SHAPE_FORMAT_PNG)
+            finally:
+                # === 원본 크기 복원 (Export 실패 시에도 덱을 변경된 채로 두지 않음) ===
+                shape.Width = orig_width
+                shape.Height = orig_height
 
-            if text_range is not None and orig_font_size is not None:
-                text_range.Font.Size = orig_font_size
+                if text_range is not None and orig_font_size is not None:
+                    text_range.Font.Size = orig_font_size
+        if media is not None:
+            # Moves the render into the asset store when one is configured
+            return media.store_export(full_path)
         return f"images/{filename}"
     except Exception as e:
-        print(
-            f"[WARN] Failed to export image for slide {slide_index}, shape {shape_index} ({shape.Name}): {e}"
+        logger.warning(
+            "Failed to export image for slide %s, shape %s (%s): %s",
+            slide_index, shape_index, shape.Name, e,
         )
         return None
@@ -0,0 +1,137 @@
+"""
+Per-slide fingerprints for incremental reparses.
+
+Each parsed slide records ``"fingerprint"``: a SHA-256 over its slide XML,
+its relationships and every part it refers to (pictures, charts, embedded
+objects), plus the layout, master and theme it inherits from (and their
+media), since those change what the slide renders. The deck-wide settings
+of ``ppt/presentation.xml`` that do so too (slide size and default text
+style) go into every slide's fingerprint; the rest of that part, such as the
+slide list, is left out so adding or reordering slides keeps the others.
+Speaker notes are left out because they do not show on the slide.
+
+On ``reparse_all`` the previous project JSON is handed to the parser.
+``reusable_slides`` returns the slides whose fingerprint (at the same slide
+index, with the same engine) is unchanged and whose thumbnail and images are
+still on disk. The parser keeps those dicts as they are, descriptions
+included, and only walks the changed slides through COM.
+"""
+
+import hashlib
+import os
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Optional
+
+from .assets import AssetStore, is_asset_path, iter_image_files
+
+# Bump when what a slide's JSON depends on changes (forces one full reparse)
+SLIDE_FINGERPRINT_VERSION = 2
+
+# Structural relationships: layout/master are hashed once via the inheritance
+# chain, notes do not render, and a master lists every layout of the template
+_SKIPPED_RELS = ("/slide", "/slideLayout", "/slideMaster", "/notesSlide")
+
+# Elements of ppt/presentation.xml that change how every slide renders
+_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+_PRESENTATION_SETTINGS = (f"{_P}sldSz", f"{_P}defaultTextStyle")
+
+
+class SlideFingerprinter:
+    """Fingerprints slides of one ``ooxml.OOXMLPackage``, hashing each shared part once."""
+
+    def __init__(self, package):
+        self.package = package
+        self._tree_hashes: Dict[str, str] = {}
+        self._settings_hash: Optional[str] = None
+
+    def _presentation_settings_hash(self) -> str:
+        """Hash of the deck-wide settings every slide depends on."""
+        if self._settings_hash is None:
+            presentation = self.package.presentation()
+            sha = hashlib.sha256()
+            for tag in _PRESENTATION_SETTINGS:
+                element = presentation.find(tag)
+                sha.update(b"|" + (ET.tostring(element) if element is not None else b"-"))
+            self._settings_hash = sha.hexdigest()
+        return self._settings_hash
+
+    def _tree_hash(self, part: str, visiting=()) -> str:
+        """Hash of a part plus, recursively, the parts it embeds (media, charts...)."""
+        if part in self._tree_hashes:
+            return self._tree_hashes[part]
+        if part in visiting or not self.package.has_part(part):
+            return "-"
+        sha = hashlib.sha256(self.package.read(part))
+        for r_id, rel in sorted(self.package.rels(part).items()):
+            if rel["type"].endswith(_SKIPPED_RELS):
+                continue
+            if rel["external"]:
+                target_hash = "external"
+            else:
+                target_hash = self._tree_hash(rel["target"], visiting + (part,))
+            sha.update(f"|{r_id}:{rel['target']}:{target_hash}".encode("utf-8"))
+        self._tree_hashes[part] = sha.hexdigest()
+        return self._tree_hashes[part]
+
+    def fingerprint(self, slide_part: str) -> str:
+        layout = self.package.layout_of(slide_part)
+        master = self.package.master_of(layout)
+        sha = hashlib.sha256(f"v{SLIDE_FINGERPRINT_VERSION}".encode("ascii"))
+        sha.update(f"|presentation:{self._presentation_settings_hash()}".encode("utf-8"))
+        for part in (slide_part, layout, master):
+            sha.update(f"|{part}:{self._tree_hash(part) if part else '-'}".encode("utf-8"))
+        return sha.hexdigest()
+
+
+def slide_fingerprints(package) -> Dict[int, str]:
+    """{slide_index: fingerprint} for every slide, in presentation order."""
+    fingerprinter = SlideFingerprinter(package)
+    return {
+        index: fingerprinter.fingerprint(part)
+        for index, (_, part) in enumerate(package.slide_parts(), start=1)
+    }
+
+
+def slide_fingerprint(package, slide_index: int) -> Optional[str]:
+    """Fingerprint of one slide (1-based), or None if the index is out of range."""
+    parts = package.slide_parts()
+    if slide_index < 1 or slide_index > len(parts):
+        return None
+    return SlideFingerprinter(package).fingerprint(parts[slide_index - 1][1])
+
+
+def reusable_slides(
+    previous: Optional[Dict[str, Any]],
+    fingerprints: Dict[int, str],
+    out_dir: str,
+    engine: str,
+    asset_dir: Optional[str] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """Slides of ``previous`` that can be kept as-is: {slide_index: slide dict}."""
+    if not previous or not fingerprints:
+        return {}
+    if previous.get("parser_engine", "com") != engine:
+        return {}
+
+    assets = AssetStore(asset_dir) if asset_dir else None
+    reusable = {}
+    for slide in previous.get("slides") or []:
+        index = slide.get("slide_index")
+        fingerprint = slide.get("fingerprint")
+        if not fingerprint or fingerprints.get(index) != fingerprint:
+            continue
+        thumbnail = slide.get("thumbnail")
+        if thumbnail and not os.path.exists(os.path.join(out_dir, "thumbnails", thumbnail)):
+            continue
+        if all(
+            _image_exists(rel_path, out_dir, assets)
+            for rel_path in iter_image_files({"slides": [slide]})
+        ):
+            reusable[index] = slide
+    return reusable
+
+
+def _image_exists(rel_path: str, out_dir: str, assets: Optional[AssetStore]) -> bool:
+    if is_asset_path(rel_path):
+        return assets is not None and os.path.exists(assets.resolve(rel_path))
+    return os.path.exists(os.path.join(out_dir, rel_path))
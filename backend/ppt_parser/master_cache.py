@@ -0,0 +1,249 @@
+"""
+Master/layout parse cache shared across projects.
+
+Walking every design, master shape and CustomLayout through COM (and exporting
+their pictures) is repeated for each upload and reparse, although most decks
+use one of a few corporate templates. ``MasterCache`` keeps the parsed
+``masters`` block per template fingerprint:
+
+- .pptx/.pptm: SHA-256 over the slide master, theme and layout parts and every
+  part they embed (logos, backgrounds), in presentation order
+- legacy .ppt: design names plus a signature of master/layout shapes read
+  through COM (``com_template_signature``), which avoids the exports
+
+Entries live in ``<root>/<fingerprint>/masters.json``. Per-project
+``images/...`` files the block refers to are copied into the entry and back
+into the project on a hit; ``assets/...`` paths are shared already and only
+checked for existence. Hit/miss counts are kept in ``<root>/stats.db`` so the
+API can report them across worker processes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .assets import AssetStore, is_asset_path, iter_image_files
+from .ooxml import REL_LAYOUT, REL_MASTER, OOXMLPackage
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the cached masters block changes
+MASTER_CACHE_VERSION = 1
+
+
+def template_fingerprint(package: OOXMLPackage, engine: str = "com") -> Optional[str]:
+    """Fingerprint of a package's masters, layouts, themes and their media."""
+    masters = package.master_parts()
+    if not masters:
+        return None
+    sha = hashlib.sha256(f"v{MASTER_CACHE_VERSION}|{engine}".encode("utf-8"))
+    seen = set()
+
+    def add_part(part: str, follow_layouts: bool):
+        if part in seen or not package.has_part(part):
+            return
+        seen.add(part)
+        sha.update(part.encode("utf-8"))
+        sha.update(package.read(part))
+        layouts = []
+        for _, rel in sorted(package.rels(part).items()):
+            if rel["external"] or rel["type"].endswith(REL_MASTER):
+                continue
+            if rel["type"].endswith(REL_LAYOUT):
+                layouts.append(rel["target"])
+                continue
+            add_part(rel["target"], False)
+        if follow_layouts:
+            for layout in layouts:
+                add_part(layout, False)
+
+    for master in masters:
+        add_part(master, True)
+    return sha.hexdigest()
+
+
+def com_template_signature(presentation) -> Optional[str]:
+    """Fallback fingerprint for legacy .ppt: design names and master/layout shape geometry."""
+    sha = hashlib.sha256(f"v{MASTER_CACHE_VERSION}|com-signature".encode("utf-8"))
+    try:
+        designs = presentation.Designs
+        for d_idx in range(1, designs.Count + 1):
+            design = designs.Item(d_idx)
+            master = design.SlideMaster
+            containers = [master] + [
+                master.CustomLayouts.Item(i)
+                for i in range(1, master.CustomLayouts.Count + 1)
+            ]
+            sha.update(f"design:{design.Name}".encode("utf-8"))
+            for container in containers:
+                sha.update(f"|{container.Name}:{container.Shapes.Count}".encode("utf-8"))
+                for shape in container.Shapes:
+                    sha.update(
+                        f"|{shape.Name}:{shape.Type}:{shape.Left:.2f}:{shape.Top:.2f}"
+                        f":{shape.Width:.2f}:{shape.Height:.2f}".encode("utf-8")
+                    )
+    except Exception as e:
+        logger.warning("Failed to fingerprint masters: %s", e)
+        return None
+    return sha.hexdigest()
+
+
+class MasterCache:
+    """Parsed ``masters`` blocks keyed by template fingerprint."""
+
+    def __init__(self, root: str, assets: Optional[AssetStore] = None):
+        self.root = root
+        self.assets = assets
+        self.stats_path = os.path.join(root, "stats.db")
+
+    def _entry_dir(self, fingerprint: str) -> str:
+        return os.path.join(self.root, os.path.basename(fingerprint))
+
+    # ---------- entries ----------
+
+    def load(self, fingerprint: Optional[str], image_dir: str) -> Optional[List[Dict[str, Any]]]:
+        """The cached masters block (images restored into image_dir), or None on a miss."""
+        if not fingerprint:
+            return None
+        entry_dir = self._entry_dir(fingerprint)
+        try:
+            with open(os.path.join(entry_dir, "masters.json"), "r", encoding="utf-8") as f:
+                masters = json.load(f)
+        except (OSError, ValueError):
+            self.record(fingerprint, hit=False)
+            return None
+
+        for rel_path in iter_image_files({"masters": masters}):
+            if is_asset_path(rel_path):
+                if self.assets is None or not os.path.exists(self.assets.resolve(rel_path)):
+                    # Asset collected since the entry was written: parse again
+                    self.record(fingerprint, hit=False)
+                    return None
+                continue
+            src = os.path.join(entry_dir, rel_path)
+            if not os.path.exists(src):
+                self.record(fingerprint, hit=False)
+                return None
+            dst = os.path.join(os.path.dirname(image_dir), rel_path)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copyfile(src, dst)
+
+        self.record(fingerprint, hit=True, designs=masters)
+        return masters
+
+    def store(self, fingerprint: Optional[str], masters: List[Dict[str, Any]], image_dir: str):
+        """Save a freshly parsed masters block (and its per-project images)."""
+        if not fingerprint or not masters:
+            return
+        entry_dir = self._entry_dir(fingerprint)
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            for rel_path in iter_image_files({"masters": masters}):
+                if is_asset_path(rel_path):
+                    continue
+                src = os.path.join(os.path.dirname(image_dir), rel_path)
+                if os.path.exists(src):
+                    dst = os.path.join(tmp_dir, rel_path)
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    shutil.copyfile(src, dst)
+            with open(os.path.join(tmp_dir, "masters.json"), "w", encoding="utf-8") as f:
+                json.dump(masters, f, ensure_ascii=False, default=str)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+            self.record(fingerprint, hit=None, designs=masters)
+        except OSError as e:
+            logger.warning("Failed to cache masters %s: %s", fingerprint[:12], e)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # ---------- stats ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.root, exist_ok=True)
+        conn = sqlite3.connect(self.stats_path, timeout=30)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS master_cache_stats (
+                fingerprint TEXT PRIMARY KEY,
+                design_names TEXT,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0,
+                last_used_at TEXT NOT NULL
+            )
+        """)
+        return conn
+
+    def record(
+        self,
+        fingerprint: str,
+        hit: Optional[bool],
+        designs: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """Count a hit (True) or miss (False); None only records the design names."""
+        names = None
+        if designs:
+            names = ", ".join(str(m.get("design_name") or "") for m in designs)
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        """
+                        INSERT INTO master_cache_stats
+                            (fingerprint, design_names, hits, misses, last_used_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(fingerprint) DO UPDATE SET
+                            design_names = COALESCE(excluded.design_names, design_names),
+                            hits = hits + excluded.hits,
+                            misses = misses + excluded.misses,
+                            last_used_at = excluded.last_used_at
+                        """,
+                        (
+                            fingerprint,
+                            names,
+                            int(hit is True),
+                            int(hit is False),
+                            datetime.now().isoformat(),
+                        ),
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Failed to record master cache stats: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals plus one row per cached template."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT fingerprint, design_names, hits, misses, last_used_at "
+                "FROM master_cache_stats ORDER BY hits DESC"
+            ).fetchall()
+        finally:
+            conn.close()
+        hits = sum(r[2] for r in rows)
+        misses = sum(r[3] for r in rows)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "entries": sum(
+                1 for r in rows if os.path.exists(os.path.join(self._entry_dir(r[0]), "masters.json"))
+            ),
+            "templates": [
+                {
+                    "fingerprint": r[0],
+                    "design_names": r[1],
+                    "hits": r[2],
+                    "misses": r[3],
+                    "last_used_at": r[4],
+                }
+                for r in rows
+            ],
+        }
+
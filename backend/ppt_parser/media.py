@@ -0,0 +1,285 @@
+"""
+Direct picture extraction from the package's ppt/media parts.
+
+``export_shape_image`` renders a picture by resizing the shape, calling
+``Shape.Export`` and restoring it: four or more COM writes plus a render per
+picture. For a .pptx/.pptm the original bytes already sit in ``ppt/media``,
+reachable through the slide part's relationships, so ``MediaExtractor`` looks
+the picture up by its shape id (``cNvPr@id`` == ``Shape.Id``) and copies the
+embedded media instead. Crops and format conversions run before a path is
+returned, so a picture Pillow cannot convert still goes through Export; the
+file writes run on a small thread pool while the parser keeps talking to
+PowerPoint. ``publish`` waits for them before a slide is served and drops the
+paths whose write failed.
+
+Anything it cannot serve (legacy .ppt, linked pictures, vector EMF/WMF media,
+charts/3D models and other non-``p:pic`` shapes) returns None and the caller
+falls back to ``Shape.Export``. Paths keep the ``images/slideNN_shapeX_<name>``
+layout; only the extension follows the media format.
+
+With an ``AssetStore`` the extractor is also where exported images end up:
+media is named by its hash (``assets/<sha256><ext>``) and not written at all
+when the store already has it (or a write of it is pending), and
+``Shape.Export`` output is moved into the store by ``store_export``.
+
+``table_element`` looks up the a:tbl of a table shape the same way, so
+tables.parse_table() can take merged spans from the XML.
+"""
+
+import hashlib
+import logging
+import os
+import posixpath
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+
+from .assets import ASSET_PREFIX, AssetStore
+from .constants import MSO_TYPE_PICTURE, MSO_TYPE_PLACEHOLDER
+from .ooxml import (
+    OOXMLError,
+    OOXMLPackage,
+    WEB_IMAGE_EXTENSIONS,
+    _nv_props,
+    _q,
+    media_image_bytes,
+    picture_file_stem,
+    picture_media,
+    table_of_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+# Vector media only PowerPoint renders faithfully; these keep using Shape.Export
+VECTOR_MEDIA_EXTENSIONS = (".emf", ".wmf")
+
+DEFAULT_MEDIA_WORKERS = 4
+
+
+def _pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class MediaExtractor:
+    """Copies embedded picture media for COM-parsed slides; see the module docstring."""
+
+    def __init__(
+        self,
+        ppt_path: str,
+        image_dir: str,
+        max_workers: int = DEFAULT_MEDIA_WORKERS,
+        assets: Optional[AssetStore] = None,
+    ):
+        self.image_dir = image_dir
+        self.assets = assets
+        self.package: Optional[OOXMLPackage] = None
+        self._slide_parts: Dict[int, str] = {}
+        self._elements: Dict[Tuple[int, str], Dict[int, object]] = {}
+        # Published path -> pending write; paths whose write failed
+        self._futures: Dict[str, Future] = {}
+        self._failed: Set[str] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.extracted = 0
+        self.reused = 0
+        try:
+            self.package = OOXMLPackage(ppt_path)
+            self._slide_parts = {
+                index: part
+                for index, (_, part) in enumerate(self.package.slide_parts(), start=1)
+            }
+        except OOXMLError:
+            # Legacy .ppt or unreadable package: every picture goes through Export
+            self.package = None
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ppt-media"
+        )
+
+    @property
+    def active(self) -> bool:
+        return self.package is not None
+
+    def _slide_elements(self, slide_index: int, tag: str):
+        """{cNvPr id: (name, element)} for one element type of a slide, group children included."""
+        key = (slide_index, tag)
+        if key not in self._elements:
+            found = {}
+            part = self._slide_parts.get(slide_index)
+            tree = self.package.xml(part) if part else None
+            if tree is not None:
+                for element in tree.iter(_q(tag)):
+                    c_nv_pr, _ = _nv_props(element)
+                    if c_nv_pr is not None and c_nv_pr.get("id", "").isdigit():
+                        found[int(c_nv_pr.get("id"))] = (c_nv_pr.get("name", ""), element)
+            self._elements[key] = found
+        return self._elements[key]
+
+    def _picture_elements(self, slide_index: int):
+        return self._slide_elements(slide_index, "p:pic")
+
+    def table_element(self, shape, slide_index) -> Optional[ET.Element]:
+        """The a:tbl behind a COM table shape, or None when the package cannot tell."""
+        if not self.active or not isinstance(slide_index, int):
+            return None
+        try:
+            name, frame = self._slide_elements(slide_index, "p:graphicFrame").get(
+                int(shape.Id), (None, None)
+            )
+            if frame is None or name != shape.Name:
+                return None
+            return table_of_frame(frame)
+        except Exception as e:
+            logger.warning("Table lookup failed for slide %s: %s", slide_index, e)
+            return None
+
+    def extract(self, shape, slide_index, shape_index) -> Optional[str]:
+        """Return "images/<file>" for a slide picture, or None to fall back to Export."""
+        if not self.active or not isinstance(slide_index, int):
+            return None
+        try:
+            if shape.Type not in (MSO_TYPE_PICTURE, MSO_TYPE_PLACEHOLDER):
+                return None
+            name, pic = self._picture_elements(slide_index).get(int(shape.Id), (None, None))
+            # Name check too: table-cell and other nested shapes may reuse ids
+            if pic is None or name != shape.Name:
+                return None
+            found = picture_media(pic, self.package, self._slide_parts[slide_index])
+            if not found:
+                return None
+            media_part, src_rect = found
+            media_ext = ext = posixpath.splitext(media_part)[1].lower()
+            if ext in VECTOR_MEDIA_EXTENSIONS:
+                return None
+            cropped = src_rect is not None and any(
+                int(src_rect.get(k, "0")) for k in ("l", "t", "r", "b")
+            )
+            converted = cropped or ext not in WEB_IMAGE_EXTENSIONS
+            if converted:
+                # Pillow does the crop / conversion; the name must be known up front
+                if not _pillow_available():
+                    return None
+                ext = ".png"
+            data = self.package.read(media_part)
+        except Exception as e:
+            logger.warning(
+                "Media lookup failed for slide %s, shape %s: %s",
+                slide_index, shape_index, e,
+            )
+            return None
+
+        if self.assets is not None:
+            digest = hashlib.sha256(data)
+            if converted:
+                # Derived renders are addressed by their source bytes and crop
+                crop = "" if src_rect is None else repr(sorted(src_rect.attrib.items()))
+                digest.update(f"|png|{crop}".encode("utf-8"))
+            name = f"{digest.hexdigest()}{ext}"
+            if ASSET_PREFIX + name in self._futures or self.assets.reuse(name):
+                self.reused += 1
+                return ASSET_PREFIX + name
+            image = self._convert(data, media_ext, src_rect, slide_index, shape_index)
+            if image is None:
+                return None
+            return self._submit(
+                ASSET_PREFIX + name,
+                self.assets.put_bytes, image, ext, digest=digest.hexdigest(),
+            )
+
+        image = self._convert(data, media_ext, src_rect, slide_index, shape_index)
+        if image is None:
+            return None
+        filename = picture_file_stem(slide_index, shape_index, shape.Name) + ext
+        os.makedirs(self.image_dir, exist_ok=True)
+        return self._submit(f"images/{filename}", self._write, image, filename)
+
+    def _submit(self, rel_path: str, write, *args, **kwargs) -> str:
+        """Queue a media write; ``publish`` checks it before the path is served."""
+        self._futures[rel_path] = self._executor.submit(write, *args, **kwargs)
+        self.extracted += 1
+        return rel_path
+
+    def _convert(
+        self, data: bytes, ext: str, src_rect, slide_index, shape_index
+    ) -> Optional[bytes]:
+        """Media bytes cropped / converted for serving, or None (the caller exports instead)."""
+        try:
+            image = media_image_bytes(data, ext, src_rect)
+        except Exception as e:
+            logger.warning(
+                "Media conversion failed for slide %s, shape %s: %s",
+                slide_index, shape_index, e,
+            )
+            return None
+        if image is None:
+            logger.warning(
+                "Could not convert %s media for slide %s, shape %s; exporting it",
+                ext, slide_index, shape_index,
+            )
+            return None
+        return image[0]
+
+    def _write(self, image: bytes, filename: str):
+        with open(os.path.join(self.image_dir, filename), "wb") as f:
+            f.write(image)
+
+    def store_export(self, full_path: str) -> str:
+        """Move a Shape.Export result into the asset store (when one is configured)."""
+        if self.assets is None:
+            return "images/" + os.path.basename(full_path)
+        return ASSET_PREFIX + self.assets.put_file(full_path)
+
+    def flush(self):
+        """Wait for the writes queued so far, remembering the ones that failed."""
+        for rel_path, future in self._futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning("Failed to write media image %s: %s", rel_path, e)
+                self._failed.add(rel_path)
+        self._futures = {}
+
+    def publish(self, data):
+        """Flush, then drop ``image_file`` references to failed writes from ``data``.
+
+        ``data`` is a slide (or a list / result holding slides); group children
+        and table cells are walked too.
+        """
+        self.flush()
+        if self._failed:
+            self._drop_failed(data)
+        return data
+
+    def _drop_failed(self, node):
+        if isinstance(node, dict):
+            if node.get("image_file") in self._failed:
+                del node["image_file"]
+            for value in node.values():
+                self._drop_failed(value)
+        elif isinstance(node, list):
+            for item in node:
+                self._drop_failed(item)
+
+    def close(self):
+        """Wait for pending writes and release the package."""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.package is not None:
+            self.package.close()
+            self.package = None
+            if self.extracted or self.reused:
+                logger.info(
+                    "Copied %s picture(s) from package media, %s already in the asset store",
+                    self.extracted, self.reused,
+                )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,1635 @@
+"""
+Pure-Python OOXML parsing engine.
+
+Reads the .pptx package directly (slides, layouts, masters, themes and
+``ppt/media``) and emits the same slide/shape JSON structure as the COM engine
+in ``slides.py`` / ``shapes.py``, so projects can be parsed without PowerPoint,
+in parallel processes and on non-Windows hosts.
+
+Values are reported the way PowerPoint COM reports them: geometry in points,
+1-based indices, RGB lists, MsoShapeType codes. Things only a renderer knows are
+approximated: text style is the effective style of the first run (COM reports
+a "mixed" value for ranges with several styles), theme color transforms
+(lumMod/lumOff/...) are ignored and no slide thumbnails are rendered.
+"""
+
+import io
+import logging
+import os
+import posixpath
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constants import (
+    MSO_TYPE_FREEFORM,
+    MSO_TYPE_GROUP,
+    MSO_TYPE_LINE,
+    MSO_TYPE_PICTURE,
+    MSO_TYPE_PLACEHOLDER,
+    MSO_TYPE_TABLE,
+    shape_type_map,
+)
+from .storage import (
+    SKIPPED_SLIDES_KEY,
+    PartialResultWriter,
+    project_trace_path,
+    skipped_slide,
+    write_presentation_json,
+)
+from .tracing import span, trace_job, traced
+from .assets import ASSET_PREFIX, AssetStore
+from .incremental import SlideFingerprinter, reusable_slides
+from .utils import make_safe_filename, project_relative_path
+
+logger = logging.getLogger(__name__)
+
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "cp": "http://schemas.openxmlformats.org/package/2006/metadata/core-properties",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "dcterms": "http://purl.org/dc/terms/",
+    "ep": "http://schemas.openxmlformats.org/officeDocument/2006/extended-properties",
+    "cup": "http://schemas.openxmlformats.org/officeDocument/2006/custom-properties",
+    "vt": "http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes",
+    "mc": "http://schemas.openxmlformats.org/markup-compatibility/2006",
+}
+
+REL_SLIDE = "/slide"
+REL_LAYOUT = "/slideLayout"
+REL_MASTER = "/slideMaster"
+REL_THEME = "/theme"
+REL_IMAGE = "/image"
+
+EMU_PER_POINT = 12700
+
+MSO_TYPE_AUTOSHAPE = 1
+MSO_TYPE_CHART = 3
+MSO_TYPE_EMBEDDED_OLE = 7
+MSO_TYPE_MEDIA = 16
+MSO_TYPE_TEXTBOX = 17
+MSO_TYPE_SMARTART = 24
+
+MSO_FILL_SOLID = 1
+MSO_FILL_PATTERNED = 2
+MSO_FILL_GRADIENT = 3
+MSO_FILL_PICTURE = 6
+MSO_FILL_BACKGROUND = 5
+
+# DrawingML preset geometry -> MsoAutoShapeType (most common presets)
+PRESET_AUTO_SHAPE_TYPES = {
+    "rect": 1,
+    "parallelogram": 2,
+    "trapezoid": 3,
+    "diamond": 4,
+    "roundRect": 5,
+    "octagon": 6,
+    "triangle": 7,
+    "rtTriangle": 8,
+    "ellipse": 9,
+    "hexagon": 10,
+    "plus": 11,
+    "pentagon": 51,
+    "can": 13,
+    "cube": 14,
+    "bevel": 15,
+    "foldedCorner": 16,
+    "smileyFace": 17,
+    "donut": 18,
+    "noSmoking": 19,
+    "blockArc": 20,
+    "heart": 21,
+    "lightningBolt": 22,
+    "sun": 23,
+    "moon": 24,
+    "arc": 25,
+    "bracketPair": 26,
+    "bracePair": 27,
+    "plaque": 28,
+    "leftBracket": 29,
+    "rightBracket": 30,
+    "leftBrace": 31,
+    "rightBrace": 32,
+    "rightArrow": 33,
+    "leftArrow": 34,
+    "upArrow": 35,
+    "downArrow": 36,
+    "leftRightArrow": 37,
+    "upDownArrow": 38,
+    "quadArrow": 39,
+    "chevron": 52,
+    "star5": 92,
+    "flowChartProcess": 61,
+    "flowChartDecision": 63,
+    "flowChartTerminator": 69,
+    "wedgeRectCallout": 105,
+    "wedgeRoundRectCallout": 106,
+    "wedgeEllipseCallout": 107,
+    "cloudCallout": 108,
+    "cloud": 179,
+    "snip1Rect": 155,
+    "round1Rect": 151,
+    "round2SameRect": 152,
+    "line": -2,
+    "straightConnector1": -2,
+    "bentConnector2": -2,
+    "bentConnector3": -2,
+    "curvedConnector3": -2,
+}
+
+# Media formats browsers display directly; anything else is converted to PNG
+WEB_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg")
+
+# a:prstDash -> MsoLineDashStyle
+DASH_STYLES = {
+    "solid": 1,
+    "sysDot": 3,
+    "sysDash": 10,
+    "dash": 4,
+    "dashDot": 5,
+    "lgDash": 7,
+    "lgDashDot": 8,
+    "lgDashDotDot": 9,
+    "dot": 3,
+    "sysDashDot": 11,
+    "sysDashDotDot": 12,
+}
+
+# a:ln@cmpd -> MsoLineStyle
+LINE_STYLES = {"sng": 1, "dbl": 2, "thinThick": 3, "thickThin": 4, "tri": 5}
+
+# Scheme color names used in text/shape XML -> theme color slots (default clrMap)
+DEFAULT_CLR_MAP = {
+    "bg1": "lt1",
+    "tx1": "dk1",
+    "bg2": "lt2",
+    "tx2": "dk2",
+}
+
+BUILTIN_CORE_PROPERTIES = {
+    ("dc", "title"): "Title",
+    ("dc", "subject"): "Subject",
+    ("dc", "creator"): "Author",
+    ("cp", "keywords"): "Keywords",
+    ("dc", "description"): "Comments",
+    ("cp", "lastModifiedBy"): "Last Author",
+    ("cp", "revision"): "Revision Number",
+    ("cp", "category"): "Category",
+    ("cp", "contentStatus"): "Content status",
+    ("dcterms", "created"): "Creation Date",
+    ("dcterms", "modified"): "Last Save Time",
+    ("cp", "lastPrinted"): "Last Print Date",
+}
+
+BUILTIN_APP_PROPERTIES = {
+    "Application": "Application Name",
+    "Company": "Company",
+    "Manager": "Manager",
+    "Template": "Template",
+    "Slides": "Number of Slides",
+    "Notes": "Number of Notes",
+    "HiddenSlides": "Number of Hidden Slides",
+    "Words": "Number of Words",
+    "Paragraphs": "Number of Paragraphs",
+    "PresentationFormat": "Format",
+    "TotalTime": "Total Editing Time",
+    "HyperlinkBase": "Hyperlink base",
+}
+
+
+class OOXMLError(Exception):
+    """The file is not a readable .pptx package."""
+
+
+def _q(tag: str) -> str:
+    prefix, local = tag.split(":", 1)
+    return f"{{{NS[prefix]}}}{local}"
+
+
+def emu_to_pt(value) -> float:
+    try:
+        return float(int(value)) / EMU_PER_POINT
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def hex_to_rgb(value: str) -> Optional[List[int]]:
+    try:
+        return [int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)]
+    except (TypeError, ValueError):
+        return None
+
+
+class OOXMLPackage:
+    """Read-only view over a .pptx zip with cached XML parts and relationships."""
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            self.zip = zipfile.ZipFile(path)
+        except (zipfile.BadZipFile, OSError) as e:
+            raise OOXMLError(f"Not an OOXML package: {e}") from e
+        self._names = set(self.zip.namelist())
+        if "ppt/presentation.xml" not in self._names:
+            self.zip.close()
+            raise OOXMLError("Missing ppt/presentation.xml")
+        self._xml_cache: Dict[str, ET.Element] = {}
+        self._rels_cache: Dict[str, Dict[str, Dict[str, str]]] = {}
+        # Set by the parsers when images go to a content-addressed AssetStore
+        self.asset_store: Optional[AssetStore] = None
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def has_part(self, name: str) -> bool:
+        return name in self._names
+
+    def read(self, name: str) -> bytes:
+        return self.zip.read(name)
+
+    def xml(self, name: str) -> Optional[ET.Element]:
+        if name not in self._xml_cache:
+            if name not in self._names:
+                return None
+            try:
+                self._xml_cache[name] = ET.fromstring(self.zip.read(name))
+            except (ET.ParseError, zipfile.BadZipFile, zlib.error) as e:
+                raise OOXMLError(f"Malformed part {name}: {e}") from e
+        return self._xml_cache[name]
+
+    def rels(self, part_name: str) -> Dict[str, Dict[str, str]]:
+        """{rId: {"type": ..., "target": <absolute part name>, "external": bool}}"""
+        if part_name in self._rels_cache:
+            return self._rels_cache[part_name]
+        directory, base = posixpath.split(part_name)
+        rels_name = posixpath.join(directory, "_rels", f"{base}.rels")
+        result = {}
+        root = self.xml(rels_name)
+        if root is not None:
+            for rel in root.findall(_q("rel:Relationship")):
+                external = rel.get("TargetMode") == "External"
+                target = rel.get("Target", "")
+                if not external:
+                    if target.startswith("/"):
+                        target = target.lstrip("/")
+                    else:
+                        target = posixpath.normpath(posixpath.join(directory, target))
+                result[rel.get("Id")] = {
+                    "type": rel.get("Type", ""),
+                    "target": target,
+                    "external": external,
+                }
+        self._rels_cache[part_name] = result
+        return result
+
+    def related(self, part_name: str, rel_suffix: str) -> List[str]:
+        return [
+            r["target"]
+            for r in self.rels(part_name).values()
+            if r["type"].endswith(rel_suffix) and not r["external"]
+        ]
+
+    # ---------- presentation-level lookups ----------
+
+    def presentation(self) -> ET.Element:
+        return self.xml("ppt/presentation.xml")
+
+    def slide_parts(self) -> List[Tuple[int, str]]:
+        """[(slide_id, part_name)] in presentation order."""
+        rels = self.rels("ppt/presentation.xml")
+        result = []
+        sld_id_lst = self.presentation().find(_q("p:sldIdLst"))
+        if sld_id_lst is None:
+            return result
+        for sld_id in sld_id_lst.findall(_q("p:sldId")):
+            rel = rels.get(sld_id.get(_q("r:id")))
+            if rel and not rel["external"]:
+                result.append((int(sld_id.get("id", 0)), rel["target"]))
+        return result
+
+    def master_parts(self) -> List[str]:
+        rels = self.rels("ppt/presentation.xml")
+        result = []
+        lst = self.presentation().find(_q("p:sldMasterIdLst"))
+        if lst is None:
+            return result
+        for master_id in lst.findall(_q("p:sldMasterId")):
+            rel = rels.get(master_id.get(_q("r:id")))
+            if rel and not rel["external"]:
+                result.append(rel["target"])
+        return result
+
+    def slide_size(self) -> Tuple[float, float]:
+        sld_sz = self.presentation().find(_q("p:sldSz"))
+        if sld_sz is None:
+            return 720.0, 540.0
+        return emu_to_pt(sld_sz.get("cx")), emu_to_pt(sld_sz.get("cy"))
+
+    def layout_of(self, slide_part: str) -> Optional[str]:
+        layouts = self.related(slide_part, REL_LAYOUT)
+        return layouts[0] if layouts else None
+
+    def master_of(self, layout_part: Optional[str]) -> Optional[str]:
+        if not layout_part:
+            return None
+        masters = self.related(layout_part, REL_MASTER)
+        return masters[0] if masters else None
+
+    def theme_of(self, master_part: Optional[str]) -> Optional[str]:
+        if not master_part:
+            return None
+        themes = self.related(master_part, REL_THEME)
+        return themes[0] if themes else None
+
+
+def part_name(root: Optional[ET.Element]) -> str:
+    """cSld@name of a slide/layout/master part."""
+    if root is None:
+        return ""
+    c_sld = root.find(_q("p:cSld"))
+    return c_sld.get("name", "") if c_sld is not None else ""
+
+
+class ThemeContext:
+    """Resolves theme fonts/colors and master text styles for one slide's inheritance chain."""
+
+    def __init__(self, package: OOXMLPackage, master_part: Optional[str]):
+        self.package = package
+        self.master_part = master_part
+        self.master = package.xml(master_part) if master_part else None
+        theme_part = package.theme_of(master_part)
+        self.theme = package.xml(theme_part) if theme_part else None
+        self.colors: Dict[str, List[int]] = {}
+        self.major_font = None
+        self.minor_font = None
+        self.line_styles: List[ET.Element] = []
+        self.clr_map = dict(DEFAULT_CLR_MAP)
+
+        if self.theme is not None:
+            scheme = self.theme.find(f"{_q('a:themeElements')}/{_q('a:clrScheme')}")
+            if scheme is not None:
+                for slot in scheme:
+                    local = slot.tag.split("}", 1)[-1]
+                    rgb = self._element_rgb(slot)
+                    if rgb:
+                        self.colors[local] = rgb
+            fonts = self.theme.find(f"{_q('a:themeElements')}/{_q('a:fontScheme')}")
+            if fonts is not None:
+                major = fonts.find(f"{_q('a:majorFont')}/{_q('a:latin')}")
+                minor = fonts.find(f"{_q('a:minorFont')}/{_q('a:latin')}")
+                self.major_font = major.get("typeface") if major is not None else None
+                self.minor_font = minor.get("typeface") if minor is not None else None
+            ln_lst = self.theme.find(
+                f"{_q('a:themeElements')}/{_q('a:fmtScheme')}/{_q('a:lnStyleLst')}"
+            )
+            if ln_lst is not None:
+                self.line_styles = list(ln_lst)
+
+        if self.master is not None:
+            clr_map = self.master.find(_q("p:clrMap"))
+            if clr_map is not None:
+                self.clr_map.update(clr_map.attrib)
+
+    @staticmethod
+    def _element_rgb(slot: ET.Element) -> Optional[List[int]]:
+        srgb = slot.find(_q("a:srgbClr"))
+        if srgb is not None:
+            return hex_to_rgb(srgb.get("val"))
+        sys_clr = slot.find(_q("a:sysClr"))
+        if sys_clr is not None:
+            return hex_to_rgb(sys_clr.get("lastClr", "000000"))
+        return None
+
+    def scheme_rgb(self, name: str) -> Optional[List[int]]:
+        slot = self.clr_map.get(name, name)
+        return self.colors.get(slot)
+
+    def color_of(self, parent: Optional[ET.Element]) -> Optional[List[int]]:
+        """RGB of the first color child (srgbClr/schemeClr/sysClr/prstClr) of parent."""
+        if parent is None:
+            return None
+        for child in parent:
+            local = child.tag.split("}", 1)[-1]
+            if local == "srgbClr":
+                return hex_to_rgb(child.get("val"))
+            if local == "schemeClr":
+                return self.scheme_rgb(child.get("val"))
+            if local == "sysClr":
+                return hex_to_rgb(child.get("lastClr", "000000"))
+            if local == "prstClr":
+                return {"black": [0, 0, 0], "white": [255, 255, 255]}.get(child.get("val"))
+        return None
+
+    def font(self, typeface: Optional[str]) -> Optional[str]:
+        if typeface in ("+mj-lt", "+mj-ea", "+mj-cs"):
+            return self.major_font
+        if typeface in ("+mn-lt", "+mn-ea", "+mn-cs"):
+            return self.minor_font
+        return typeface
+
+    def master_text_style(self, placeholder_type: Optional[str]) -> Optional[ET.Element]:
+        if self.master is None:
+            return None
+        tx_styles = self.master.find(_q("p:txStyles"))
+        if tx_styles is None:
+            return None
+        if placeholder_type in ("title", "ctrTitle"):
+            return tx_styles.find(_q("p:titleStyle"))
+        if placeholder_type in ("body", "subTitle", "obj"):
+            return tx_styles.find(_q("p:bodyStyle"))
+        return tx_styles.find(_q("p:otherStyle"))
+
+
+class SlidePartContext:
+    """Everything needed to resolve inheritance for shapes of one slide/layout/master part."""
+
+    def __init__(self, package: OOXMLPackage, part: str, kind: str):
+        self.package = package
+        self.part = part
+        self.kind = kind  # "slide" | "layout" | "master"
+        self.layout_part = None
+        self.master_part = None
+        if kind == "slide":
+            self.layout_part = package.layout_of(part)
+            self.master_part = package.master_of(self.layout_part)
+        elif kind == "layout":
+            self.layout_part = part
+            self.master_part = package.master_of(part)
+        else:
+            self.master_part = part
+        self.theme = ThemeContext(package, self.master_part)
+        self._ph_cache: Dict[str, List[Tuple[ET.Element, Optional[str], Optional[str]]]] = {}
+
+    def _placeholders(self, part: Optional[str]):
+        if not part:
+            return []
+        if part not in self._ph_cache:
+            root = self.package.xml(part)
+            found = []
+            if root is not None:
+                for sp in root.iter(_q("p:sp")):
+                    ph = sp.find(f"{_q('p:nvSpPr')}/{_q('p:nvPr')}/{_q('p:ph')}")
+                    if ph is not None:
+                        found.append((sp, ph.get("type"), ph.get("idx")))
+            self._ph_cache[part] = found
+        return self._ph_cache[part]
+
+    def inherited_placeholders(self, ph_type: Optional[str], ph_idx: Optional[str]) -> List[ET.Element]:
+        """Matching placeholder shapes on the layout, then the master."""
+        chain = []
+        parts = []
+        if self.kind == "slide":
+            parts = [self.layout_part, self.master_part]
+        elif self.kind == "layout":
+            parts = [self.master_part]
+        for part in parts:
+            candidates = self._placeholders(part)
+            match = None
+            if ph_idx is not None:
+                match = next((sp for sp, _t, i in candidates if i == ph_idx), None)
+            if match is None:
+                wanted = ph_type or "body"
+                if wanted == "ctrTitle":
+                    wanted_set = {"ctrTitle", "title"}
+                elif wanted == "subTitle":
+                    wanted_set = {"subTitle", "body"}
+                else:
+                    wanted_set = {wanted}
+                match = next(
+                    (sp for sp, t, _i in candidates if (t or "body") in wanted_set), None
+                )
+            if match is not None:
+                chain.append(match)
+        return chain
+
+
+# ---------- shape property helpers ----------
+
+
+def _nv_props(element: ET.Element) -> Tuple[Optional[ET.Element], Optional[ET.Element]]:
+    """(cNvPr, nvPr) for any p:sp / p:pic / p:grpSp / p:graphicFrame / p:cxnSp."""
+    for child in element:
+        local = child.tag.split("}", 1)[-1]
+        if local.startswith("nv") and local.endswith("Pr"):
+            return child.find(_q("p:cNvPr")), child.find(_q("p:nvPr"))
+    return None, None
+
+
+def _sp_pr(element: ET.Element) -> Optional[ET.Element]:
+    sp_pr = element.find(_q("p:spPr"))
+    if sp_pr is None:
+        sp_pr = element.find(_q("p:grpSpPr"))
+    return sp_pr
+
+
+def _xfrm(element: ET.Element) -> Optional[ET.Element]:
+    if element.tag == _q("p:graphicFrame"):
+        return element.find(_q("p:xfrm"))
+    sp_pr = _sp_pr(element)
+    if sp_pr is None:
+        return None
+    return sp_pr.find(_q("a:xfrm"))
+
+
+def _placeholder(element: ET.Element) -> Optional[ET.Element]:
+    _, nv_pr = _nv_props(element)
+    if nv_pr is None:
+        return None
+    return nv_pr.find(_q("p:ph"))
+
+
+def _shape_type_code(element: ET.Element) -> int:
+    local = element.tag.split("}", 1)[-1]
+    ph = _placeholder(element)
+    if local == "grpSp":
+        return MSO_TYPE_GROUP
+    if local == "pic":
+        if ph is not None:
+            return MSO_TYPE_PLACEHOLDER
+        nv_pr = _nv_props(element)[1]
+        if nv_pr is not None and (
+            nv_pr.find(_q("a:videoFile")) is not None
+            or nv_pr.find(_q("a:audioFile")) is not None
+        ):
+            return MSO_TYPE_MEDIA
+        return MSO_TYPE_PICTURE
+    if local == "cxnSp":
+        geom = element.find(f"{_q('p:spPr')}/{_q('a:prstGeom')}")
+        if geom is not None and geom.get("prst") == "line":
+            return MSO_TYPE_LINE
+        return MSO_TYPE_AUTOSHAPE
+    if local == "graphicFrame":
+        if ph is not None:
+            return MSO_TYPE_PLACEHOLDER
+        graphic_data = element.find(f"{_q('a:graphic')}/{_q('a:graphicData')}")
+        uri = graphic_data.get("uri", "") if graphic_data is not None else ""
+        if uri.endswith("/table"):
+            return MSO_TYPE_TABLE
+        if uri.endswith("/chart"):
+            return MSO_TYPE_CHART
+        if uri.endswith("/diagram"):
+            return MSO_TYPE_SMARTART
+        if uri.endswith("/ole"):
+            return MSO_TYPE_EMBEDDED_OLE
+        return 28  # Graphic
+    # p:sp
+    if ph is not None:
+        return MSO_TYPE_PLACEHOLDER
+    c_nv_sp_pr = element.find(f"{_q('p:nvSpPr')}/{_q('p:cNvSpPr')}")
+    if c_nv_sp_pr is not None and c_nv_sp_pr.get("txBox") == "1":
+        return MSO_TYPE_TEXTBOX
+    sp_pr = element.find(_q("p:spPr"))
+    if sp_pr is not None:
+        if sp_pr.find(_q("a:custGeom")) is not None:
+            return MSO_TYPE_FREEFORM
+        geom = sp_pr.find(_q("a:prstGeom"))
+        if geom is not None and geom.get("prst") == "line":
+            return MSO_TYPE_LINE
+    return MSO_TYPE_AUTOSHAPE
+
+
+def _preset(element: ET.Element) -> Optional[ET.Element]:
+    sp_pr = element.find(_q("p:spPr"))
+    if sp_pr is None:
+        return None
+    return sp_pr.find(_q("a:prstGeom"))
+
+
+def _geometry_box(element: ET.Element, ctx: SlidePartContext) -> Tuple[float, float, float, float, float, bool, bool]:
+    """(left, top, width, height, rotation, flipH, flipV) in the element's own coordinate space."""
+    xfrm = _xfrm(element)
+    if xfrm is None or xfrm.find(_q("a:off")) is None:
+        ph = _placeholder(element)
+        if ph is not None:
+            for inherited in ctx.inherited_placeholders(ph.get("type"), ph.get("idx")):
+                candidate = _xfrm(inherited)
+                if candidate is not None and candidate.find(_q("a:off")) is not None:
+                    xfrm = candidate
+                    break
+    if xfrm is None:
+        return 0.0, 0.0, 0.0, 0.0, 0.0, False, False
+    off = xfrm.find(_q("a:off"))
+    ext = xfrm.find(_q("a:ext"))
+    left = emu_to_pt(off.get("x")) if off is not None else 0.0
+    top = emu_to_pt(off.get("y")) if off is not None else 0.0
+    width = emu_to_pt(ext.get("cx")) if ext is not None else 0.0
+    height = emu_to_pt(ext.get("cy")) if ext is not None else 0.0
+    rotation = int(xfrm.get("rot", "0")) / 60000.0
+    return (
+        left,
+        top,
+        width,
+        height,
+        rotation,
+        xfrm.get("flipH") == "1",
+        xfrm.get("flipV") == "1",
+    )
+
+
+class _GroupTransform:
+    """Maps a group's child coordinate space (chOff/chExt) to slide coordinates."""
+
+    def __init__(self, parent=None, xfrm: Optional[ET.Element] = None):
+        self.parent = parent
+        self.scale_x = self.scale_y = 1.0
+        self.off_x = self.off_y = 0.0
+        self.ch_off_x = self.ch_off_y = 0.0
+        if xfrm is not None:
+            off, ext = xfrm.find(_q("a:off")), xfrm.find(_q("a:ext"))
+            ch_off, ch_ext = xfrm.find(_q("a:chOff")), xfrm.find(_q("a:chExt"))
+            if off is not None:
+                self.off_x, self.off_y = emu_to_pt(off.get("x")), emu_to_pt(off.get("y"))
+            if ch_off is not None:
+                self.ch_off_x = emu_to_pt(ch_off.get("x"))
+                self.ch_off_y = emu_to_pt(ch_off.get("y"))
+            if ext is not None and ch_ext is not None:
+                cx, cy = emu_to_pt(ch_ext.get("cx")), emu_to_pt(ch_ext.get("cy"))
+                if cx:
+                    self.scale_x = emu_to_pt(ext.get("cx")) / cx
+                if cy:
+                    self.scale_y = emu_to_pt(ext.get("cy")) / cy
+
+    def apply(self, left, top, width, height):
+        left = self.off_x + (left - self.ch_off_x) * self.scale_x
+        top = self.off_y + (top - self.ch_off_y) * self.scale_y
+        width *= self.scale_x
+        height *= self.scale_y
+        if self.parent is not None:
+            return self.parent.apply(left, top, width, height)
+        return left, top, width, height
+
+
+# ---------- text ----------
+
+
+def _text_body(element: ET.Element) -> Optional[ET.Element]:
+    return element.find(_q("p:txBody"))
+
+
+def text_of_body(tx_body: Optional[ET.Element]) -> str:
+    """Paragraphs joined by '\\r' and line breaks as '\\v', like TextRange.Text."""
+    if tx_body is None:
+        return ""
+    paragraphs = []
+    for p in tx_body.findall(_q("a:p")):
+        parts = []
+        for child in p:
+            local = child.tag.split("}", 1)[-1]
+            if local in ("r", "fld"):
+                t = child.find(_q("a:t"))
+                if t is not None and t.text:
+                    parts.append(t.text)
+            elif local == "br":
+                parts.append("\v")
+        paragraphs.append("".join(parts))
+    text = "\r".join(paragraphs)
+    return text if text.strip("\r") else ""
+
+
+def _level_props(lst_style: Optional[ET.Element], level: int) -> Optional[ET.Element]:
+    if lst_style is None:
+        return None
+    lvl = lst_style.find(_q(f"a:lvl{level}pPr"))
+    if lvl is None:
+        return None
+    return lvl.find(_q("a:defRPr"))
+
+
+def _first_run_props(tx_body: ET.Element) -> Tuple[Optional[ET.Element], int, Optional[ET.Element]]:
+    """(rPr of first text run, paragraph level (1-based), paragraph endParaRPr/defRPr)."""
+    for p in tx_body.findall(_q("a:p")):
+        p_pr = p.find(_q("a:pPr"))
+        level = int(p_pr.get("lvl", "0")) + 1 if p_pr is not None else 1
+        para_def = p_pr.find(_q("a:defRPr")) if p_pr is not None else None
+        for child in p:
+            local = child.tag.split("}", 1)[-1]
+            if local in ("r", "fld"):
+                t = child.find(_q("a:t"))
+                if t is not None and t.text:
+                    return child.find(_q("a:rPr")), level, para_def
+    return None, 1, None
+
+
+def resolve_text_style(
+    element: ET.Element, ctx: SlidePartContext, tx_body: Optional[ET.Element] = None
+) -> Optional[Dict[str, Any]]:
+    """Effective style of the first run, walking run -> list styles -> placeholders -> master."""
+    tx_body = tx_body if tx_body is not None else _text_body(element)
+    if tx_body is None or not text_of_body(tx_body):
+        return None
+
+    run_pr, level, para_def = _first_run_props(tx_body)
+    chain: List[Optional[ET.Element]] = [run_pr, para_def]
+    chain.append(_level_props(tx_body.find(_q("a:lstStyle")), level))
+
+    ph = _placeholder(element)
+    ph_type = None
+    if ph is not None:
+        ph_type = ph.get("type", "body")
+        for inherited in ctx.inherited_placeholders(ph.get("type"), ph.get("idx")):
+            inherited_body = _text_body(inherited)
+            if inherited_body is not None:
+                chain.append(_level_props(inherited_body.find(_q("a:lstStyle")), level))
+    chain.append(_level_props(ctx.theme.master_text_style(ph_type), level))
+    chain.append(
+        _level_props(ctx.package.presentation().find(_q("p:defaultTextStyle")), level)
+    )
+    chain = [c for c in chain if c is not None]
+
+    def first_attr(name):
+        for props in chain:
+            if props.get(name) is not None:
+                return props.get(name)
+        return None
+
+    def first_child(tag):
+        for props in chain:
+            found = props.find(_q(tag))
+            if found is not None:
+                return found
+        return None
+
+    style: Dict[str, Any] = {}
+    size = first_attr("sz")
+    if size:
+        style["font_size"] = int(size) / 100.0
+
+    latin = first_child("a:latin")
+    font_name = ctx.theme.font(latin.get("typeface")) if latin is not None else None
+    if not font_name:
+        font_name = ctx.theme.minor_font
+    if font_name:
+        style["font_name"] = font_name
+
+    style["bold"] = first_attr("b") in ("1", "true")
+    style["italic"] = first_attr("i") in ("1", "true")
+    underline = first_attr("u")
+    style["underline"] = bool(underline) and underline != "none"
+
+    color = None
+    fill = first_child("a:solidFill")
+    if fill is not None:
+        color = ctx.theme.color_of(fill)
+    if color is None:
+        font_ref = element.find(f"{_q('p:style')}/{_q('a:fontRef')}")
+        if font_ref is not None:
+            color = ctx.theme.color_of(font_ref)
+    if color is None:
+        color = ctx.theme.scheme_rgb("tx1")
+    if color:
+        style["color_rgb"] = color
+
+    return style or None
+
+
+# ---------- fill / line ----------
+
+
+def _fill_from(parent: Optional[ET.Element], theme: ThemeContext) -> Optional[Dict[str, Any]]:
+    if parent is None:
+        return None
+    for child in parent:
+        local = child.tag.split("}", 1)[-1]
+        if local == "noFill":
+            return {"visible": False}
+        if local == "solidFill":
+            info = {"visible": True, "fill_type": MSO_FILL_SOLID}
+            rgb = theme.color_of(child)
+            if rgb:
+                info["fore_color_rgb"] = rgb
+            return info
+        if local == "gradFill":
+            info = {"visible": True, "fill_type": MSO_FILL_GRADIENT}
+            stops = child.findall(f"{_q('a:gsLst')}/{_q('a:gs')}")
+            if stops:
+                fore = theme.color_of(stops[0])
+                back = theme.color_of(stops[-1])
+                if fore:
+                    info["fore_color_rgb"] = fore
+                if back:
+                    info["back_color_rgb"] = back
+            return info
+        if local == "pattFill":
+            info = {"visible": True, "fill_type": MSO_FILL_PATTERNED}
+            fore = theme.color_of(child.find(_q("a:fgClr")))
+            back = theme.color_of(child.find(_q("a:bgClr")))
+            if fore:
+                info["fore_color_rgb"] = fore
+            if back:
+                info["back_color_rgb"] = back
+            return info
+        if local == "blipFill":
+            return {"visible": True, "fill_type": MSO_FILL_PICTURE}
+        if local == "grpFill":
+            return {"visible": True, "fill_type": MSO_FILL_BACKGROUND}
+    return None
+
+
+def extract_fill(element: ET.Element, ctx: SlidePartContext) -> Optional[Dict[str, Any]]:
+    fill = _fill_from(element.find(_q("p:spPr")), ctx.theme)
+    if fill is None:
+        fill_ref = element.find(f"{_q('p:style')}/{_q('a:fillRef')}")
+        if fill_ref is not None and fill_ref.get("idx", "0") != "0":
+            fill = {"visible": True, "fill_type": MSO_FILL_SOLID}
+            rgb = ctx.theme.color_of(fill_ref)
+            if rgb:
+                fill["fore_color_rgb"] = rgb
+    if fill is None:
+        fill = {"visible": False}
+    return fill
+
+
+def _line_from(ln: ET.Element, theme: ThemeContext) -> Dict[str, Any]:
+    info: Dict[str, Any] = {}
+    fill = _fill_from(ln, theme)
+    if fill is not None:
+        info["visible"] = fill.get("visible", True)
+        if "fore_color_rgb" in fill:
+            info["color_rgb"] = fill["fore_color_rgb"]
+    if ln.get("w") is not None:
+        info["weight"] = emu_to_pt(ln.get("w"))
+    dash = ln.find(_q("a:prstDash"))
+    if dash is not None and dash.get("val") in DASH_STYLES:
+        info["dash_style"] = DASH_STYLES[dash.get("val")]
+    if ln.get("cmpd") in LINE_STYLES:
+        info["line_style"] = LINE_STYLES[ln.get("cmpd")]
+    return info
+
+
+def extract_line(element: ET.Element, ctx: SlidePartContext) -> Optional[Dict[str, Any]]:
+    sp_pr = element.find(_q("p:spPr"))
+    ln = sp_pr.find(_q("a:ln")) if sp_pr is not None else None
+    info: Dict[str, Any] = {}
+
+    ln_ref = element.find(f"{_q('p:style')}/{_q('a:lnRef')}")
+    if ln_ref is not None and ln_ref.get("idx", "0") != "0":
+        info["visible"] = True
+        rgb = ctx.theme.color_of(ln_ref)
+        if rgb:
+            info["color_rgb"] = rgb
+        idx = int(ln_ref.get("idx")) - 1
+        if 0 <= idx < len(ctx.theme.line_styles):
+            themed = _line_from(ctx.theme.line_styles[idx], ctx.theme)
+            info.setdefault("weight", themed.get("weight"))
+            if "dash_style" in themed:
+                info["dash_style"] = themed["dash_style"]
+            if "line_style" in themed:
+                info["line_style"] = themed["line_style"]
+
+    if ln is not None:
+        info.update(_line_from(ln, ctx.theme))
+
+    if "visible" not in info:
+        info["visible"] = False
+    info.setdefault("weight", 0.75)
+    info.setdefault("dash_style", 1)
+    info.setdefault("line_style", 1)
+    return {k: v for k, v in info.items() if v is not None} or None
+
+
+# ---------- images ----------
+
+
+def picture_media(
+    element: ET.Element, package: OOXMLPackage, part: str
+) -> Optional[Tuple[str, Optional[ET.Element]]]:
+    """(media part name, a:srcRect) of a picture's embedded blip, or None (linked/missing)."""
+    blip_fill = element.find(_q("p:blipFill"))
+    if blip_fill is None:
+        return None
+    blip = blip_fill.find(_q("a:blip"))
+    if blip is None:
+        return None
+    rel = package.rels(part).get(blip.get(_q("r:embed")))
+    if not rel or rel["external"] or not package.has_part(rel["target"]):
+        return None
+    return rel["target"], blip_fill.find(_q("a:srcRect"))
+
+
+def picture_file_stem(slide_index, shape_index, shape_name: str) -> str:
+    """Same naming as images.export_shape_image(), without the extension."""
+    return f"slide{slide_index:02d}_shape{shape_index}_{make_safe_filename(shape_name)}"
+
+
+def media_image_bytes(
+    data: bytes, ext: str, src_rect: Optional[ET.Element]
+) -> Optional[Tuple[bytes, str]]:
+    """(bytes, extension) ready to serve: web formats as-is, cropped/other formats as PNG."""
+    cropped = src_rect is not None and any(
+        int(src_rect.get(k, "0")) for k in ("l", "t", "r", "b")
+    )
+    if not cropped and ext in WEB_IMAGE_EXTENSIONS:
+        return data, ext
+    png = _render_png(data, src_rect if cropped else None)
+    if png is None:
+        return None
+    return png, ".png"
+
+
+@traced("image", lambda element, ctx, slide_index, shape_index, *a, **kw: f"image {shape_index}")
+def extract_picture(
+    element: ET.Element,
+    ctx: SlidePartContext,
+    slide_index,
+    shape_index,
+    shape_name: str,
+    image_dir: str,
+) -> Optional[str]:
+    """Write the picture's media bytes to image_dir (or the package's asset store).
+
+    Returns "images/<file>" / "assets/<sha256><ext>", or None.
+    """
+    found = picture_media(element, ctx.package, ctx.part)
+    if not found:
+        return None
+    media_part, src_rect = found
+
+    ext = posixpath.splitext(media_part)[1].lower() or ".png"
+    image = media_image_bytes(ctx.package.read(media_part), ext, src_rect)
+    if image is None:
+        logger.warning("Unsupported picture format %s for %s; skipped", ext, shape_name)
+        return None
+    data, ext = image
+
+    if ctx.package.asset_store is not None:
+        return ASSET_PREFIX + ctx.package.asset_store.put_bytes(data, ext)
+
+    os.makedirs(image_dir, exist_ok=True)
+    filename = picture_file_stem(slide_index, shape_index, shape_name) + ext
+    with open(os.path.join(image_dir, filename), "wb") as f:
+        f.write(data)
+    return f"images/{filename}"
+
+
+def _render_png(data: bytes, src_rect: Optional[ET.Element]) -> Optional[bytes]:
+    """Convert (and crop, per a:srcRect in 1/1000 %) an image to PNG with Pillow."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if src_rect is not None:
+                w, h = img.size
+                left = int(w * int(src_rect.get("l", "0")) / 100000)
+                top = int(h * int(src_rect.get("t", "0")) / 100000)
+                right = w - int(w * int(src_rect.get("r", "0")) / 100000)
+                bottom = h - int(h * int(src_rect.get("b", "0")) / 100000)
+                if right > left and bottom > top:
+                    img = img.crop((left, top, right, bottom))
+            out = io.BytesIO()
+            img.save(out, format="PNG")
+            return out.getvalue()
+    except Exception:
+        return None
+
+
+# ---------- tables ----------
+
+
+def table_of_frame(frame: ET.Element) -> Optional[ET.Element]:
+    """The a:tbl inside a graphicFrame, or None for charts/diagrams/OLE frames."""
+    return frame.find(f"{_q('a:graphic')}/{_q('a:graphicData')}/{_q('a:tbl')}")
+
+
+def table_merges(
+    tbl: ET.Element,
+) -> Tuple[Dict[Tuple[int, int], Tuple[int, int]], Dict[Tuple[int, int], Tuple[int, int]]]:
+    """(span_of, origin_of) for a:tbl: {origin: (rowSpan, gridSpan)}, {position: origin}."""
+    origin_of: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    span_of: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    for r, tr in enumerate(tbl.findall(_q("a:tr")), start=1):
+        for c, tc in enumerate(tr.findall(_q("a:tc")), start=1):
+            if tc.get("hMerge") == "1" or tc.get("vMerge") == "1":
+                continue
+            row_span = int(tc.get("rowSpan", "1"))
+            grid_span = int(tc.get("gridSpan", "1"))
+            span_of[(r, c)] = (row_span, grid_span)
+            for dr in range(row_span):
+                for dc in range(grid_span):
+                    origin_of[(r + dr, c + dc)] = (r, c)
+    return span_of, origin_of
+
+
+def parse_table_element(
+    frame: ET.Element, ctx: SlidePartContext, left: float, top: float
+) -> Optional[Dict[str, Any]]:
+    """{"rows","cols","cells"} for a graphicFrame holding a:tbl (cells in slide points)."""
+    tbl = table_of_frame(frame)
+    if tbl is None:
+        return None
+
+    col_widths = [emu_to_pt(gc.get("w")) for gc in tbl.findall(f"{_q('a:tblGrid')}/{_q('a:gridCol')}")]
+    rows_xml = tbl.findall(_q("a:tr"))
+    row_heights = [emu_to_pt(tr.get("h")) for tr in rows_xml]
+    col_offsets = [left]
+    for w in col_widths:
+        col_offsets.append(col_offsets[-1] + w)
+    row_offsets = [top]
+    for h in row_heights:
+        row_offsets.append(row_offsets[-1] + h)
+
+    rows, cols = len(rows_xml), len(col_widths)
+    # Merged areas: covered positions report the merge origin's cell
+    span_of, origin_of = table_merges(tbl)
+    tc_at: Dict[Tuple[int, int], ET.Element] = {}
+    for r, tr in enumerate(rows_xml, start=1):
+        for c, tc in enumerate(tr.findall(_q("a:tc")), start=1):
+            tc_at[(r, c)] = tc
+
+    cells = []
+    for r in range(1, rows + 1):
+        for c in range(1, cols + 1):
+            origin = origin_of.get((r, c), (r, c))
+            tc = tc_at.get(origin)
+            if tc is None:
+                continue
+            row_span, grid_span = span_of.get(origin, (1, 1))
+            o_r, o_c = origin
+            end_r = min(o_r - 1 + row_span, rows)
+            end_c = min(o_c - 1 + grid_span, cols)
+
+            tx_body = tc.find(_q("a:txBody"))
+            text = text_of_body(tx_body)
+            preview = ""
+            if text.strip():
+                preview = text.replace("\r", " ").replace("\n", " ")
+                if len(preview) > 80:
+                    preview = preview[:80] + "..."
+
+            tc_pr = tc.find(_q("a:tcPr"))
+            fill = _fill_from(tc_pr, ctx.theme) if tc_pr is not None else None
+            borders = {}
+            if tc_pr is not None:
+                for side, tag in (("top", "a:lnT"), ("bottom", "a:lnB"), ("left", "a:lnL"), ("right", "a:lnR")):
+                    ln = tc_pr.find(_q(tag))
+                    if ln is not None:
+                        side_info = _line_from(ln, ctx.theme)
+                        if side_info:
+                            borders[side] = side_info
+
+            cells.append(
+                {
+                    "row": r,
+                    "col": c,
+                    "left": col_offsets[o_c - 1],
+                    "top": row_offsets[o_r - 1],
+                    "width": col_offsets[end_c] - col_offsets[o_c - 1],
+                    "height": row_offsets[end_r] - row_offsets[o_r - 1],
+                    "text": text,
+                    "text_preview": preview,
+                    "text_style": resolve_text_style(frame, ctx, tx_body) if text else None,
+                    "fill": fill,
+                    "borders": borders or None,
+                    "image_file": None,
+                }
+            )
+
+    return {"rows": rows, "cols": cols, "cells": cells}
+
+
+# ---------- shapes ----------
+
+
+def _iter_shape_elements(tree: ET.Element):
+    """Shape children of an spTree/grpSp, unwrapping mc:AlternateContent."""
+    shape_tags = {_q("p:sp"), _q("p:pic"), _q("p:grpSp"), _q("p:graphicFrame"), _q("p:cxnSp")}
+    for child in tree:
+        if child.tag in shape_tags:
+            yield child
+        elif child.tag == _q("mc:AlternateContent"):
+            branch = child.find(_q("mc:Fallback"))
+            if branch is None:
+                branch = child.find(_q("mc:Choice"))
+            if branch is not None:
+                yield from (c for c in branch if c.tag in shape_tags)
+
+
+@traced("shape", lambda element, ctx, slide_index, shape_index, *a, **kw: f"shape {shape_index}")
+def parse_shape_element(
+    element: ET.Element,
+    ctx: SlidePartContext,
+    slide_index,
+    shape_index,
+    image_dir: str,
+    max_z=None,
+    z_pos=None,
+    context="slide",
+    transform: Optional[_GroupTransform] = None,
+) -> Dict[str, Any]:
+    """XML counterpart of shapes.parse_shape(); returns the same dict layout."""
+    c_nv_pr, _ = _nv_props(element)
+    name = c_nv_pr.get("name", "") if c_nv_pr is not None else ""
+    type_code = _shape_type_code(element)
+    type_name = shape_type_map.get(type_code, f"Unknown({type_code})")
+
+    left, top, width, height, rotation, flip_h, flip_v = _geometry_box(element, ctx)
+    if transform is not None:
+        left, top, width, height = transform.apply(left, top, width, height)
+
+    tx_body = _text_body(element)
+    text = text_of_body(tx_body)
+    text_style = resolve_text_style(element, ctx, tx_body) if tx_body is not None else None
+
+    z_level = None
+    if z_pos is not None and max_z:
+        if z_pos == 1:
+            z_level = "back"
+        elif z_pos == max_z:
+            z_level = "front"
+        else:
+            z_level = "middle"
+
+    preserved_index = None
+    alt_text = c_nv_pr.get("descr", "") if c_nv_pr is not None else ""
+    if alt_text and "##idx_" in alt_text:
+        start_pos = alt_text.find("##idx_") + len("##idx_")
+        end_pos = alt_text.find("##", start_pos)
+        if end_pos > start_pos:
+            preserved_index = alt_text[start_pos:end_pos]
+    final_shape_index = preserved_index if preserved_index else shape_index
+
+    preset = _preset(element)
+    auto_shape_type = None
+    if type_code == MSO_TYPE_AUTOSHAPE and preset is not None:
+        auto_shape_type = PRESET_AUTO_SHAPE_TYPES.get(preset.get("prst"), 1)
+
+    fill_info = line_info = None
+    if type_code != MSO_TYPE_GROUP:
+        fill_info = extract_fill(element, ctx)
+        line_info = extract_line(element, ctx)
+
+    if type_code == MSO_TYPE_LINE:
+        geometry = {"kind": "line"}
+    elif type_code == MSO_TYPE_FREEFORM:
+        geometry = {"kind": "freeform"}
+        paths = element.findall(f".//{_q('a:path')}")
+        nodes = sum(
+            1
+            for path in paths
+            for seg in path
+            if seg.tag.split("}", 1)[-1] in ("moveTo", "lnTo", "cubicBezTo", "quadBezTo", "arcTo")
+        )
+        if nodes:
+            geometry["nodes_count"] = nodes
+    else:
+        geometry = {"kind": "shape"}
+
+    preview = ""
+    if text.strip():
+        preview = text.replace("\r", " ").replace("\n", " ")
+        if len(preview) > 80:
+            preview = preview[:80] + "..."
+
+    shape_info = {
+        "shape_index": final_shape_index,
+        "name": name,
+        "context": context,
+        "type_code": type_code,
+        "type_name": type_name,
+        "auto_shape_type": auto_shape_type,
+        "left": float(left),
+        "top": float(top),
+        "parsed_left": float(left),
+        "parsed_top": float(top),
+        "width": float(width),
+        "height": float(height),
+        "rotation": float(rotation),
+        "text": text,
+        "text_preview": preview,
+        "text_style": text_style,
+        "description": "",
+        "image_file": None,
+        "z_order_position": z_pos,
+        "z_order_level": z_level,
+        "fill": fill_info,
+        "line": line_info,
+        "geometry": geometry,
+        "children": [],
+        "table": None,
+        "is_connector": False,
+        "horizontal_flip": False,
+        "vertical_flip": False,
+        "adjustments": [],
+    }
+
+    if element.tag == _q("p:cxnSp"):
+        shape_info["is_connector"] = True
+        shape_info["horizontal_flip"] = flip_h
+        shape_info["vertical_flip"] = flip_v
+        if preset is not None:
+            adjustments = []
+            for gd in preset.findall(f"{_q('a:avLst')}/{_q('a:gd')}"):
+                fmla = gd.get("fmla", "")
+                if fmla.startswith("val "):
+                    try:
+                        adjustments.append(int(fmla[4:]) / 100000.0)
+                    except ValueError:
+                        pass
+            shape_info["adjustments"] = adjustments
+
+    if element.tag == _q("p:pic"):
+        rel_image_path = extract_picture(
+            element, ctx, slide_index, shape_index, name, image_dir
+        )
+        if rel_image_path:
+            shape_info["image_file"] = rel_image_path
+
+    if type_code == MSO_TYPE_TABLE:
+        shape_info["table"] = parse_table_element(element, ctx, left, top)
+
+    if type_code == MSO_TYPE_GROUP:
+        group_transform = _GroupTransform(transform, _xfrm(element))
+        child_elements = list(_iter_shape_elements(element))
+        children = []
+        for i, child in enumerate(child_elements, start=1):
+            children.append(
+                parse_shape_element(
+                    child,
+                    ctx,
+                    slide_index=slide_index,
+                    shape_index=f"{shape_index}_{i}",
+                    image_dir=image_dir,
+                    max_z=len(child_elements),
+                    z_pos=i,
+                    context=context,
+                    transform=group_transform,
+                )
+            )
+        shape_info["children"] = children
+
+    return shape_info
+
+
+def parse_part_shapes(
+    package: OOXMLPackage,
+    part: str,
+    kind: str,
+    slide_index,
+    index_prefix: str,
+    image_dir: str,
+    context: str,
+) -> List[Dict[str, Any]]:
+    root = package.xml(part)
+    if root is None:
+        return []
+    sp_tree = root.find(f"{_q('p:cSld')}/{_q('p:spTree')}")
+    if sp_tree is None:
+        return []
+    ctx = SlidePartContext(package, part, kind)
+    elements = list(_iter_shape_elements(sp_tree))
+    shapes = []
+    for idx, element in enumerate(elements, start=1):
+        try:
+            shapes.append(
+                parse_shape_element(
+                    element,
+                    ctx,
+                    slide_index=slide_index,
+                    shape_index=f"{index_prefix}{idx}" if index_prefix else idx,
+                    image_dir=image_dir,
+                    max_z=len(elements),
+                    z_pos=idx,
+                    context=context,
+                )
+            )
+        except Exception as e:
+            logger.warning("Failed to parse %s shape %s in %s: %s", context, idx, part, e)
+    return shapes
+
+
+# ---------- presentation ----------
+
+
+def extract_metadata(package: OOXMLPackage) -> dict:
+    """BuiltIn/Custom document properties, keyed like BuiltInDocumentProperties."""
+    metadata = {"builtin_properties": {}, "custom_properties": {}}
+    builtin = metadata["builtin_properties"]
+
+    core = package.xml("docProps/core.xml")
+    if core is not None:
+        for (prefix, local), prop_name in BUILTIN_CORE_PROPERTIES.items():
+            node = core.find(_q(f"{prefix}:{local}"))
+            if node is not None:
+                builtin[prop_name] = (node.text or "").strip()
+
+    app = package.xml("docProps/app.xml")
+    if app is not None:
+        for local, prop_name in BUILTIN_APP_PROPERTIES.items():
+            node = app.find(_q(f"ep:{local}"))
+            if node is not None and node.text is not None:
+                value = node.text.strip()
+                builtin[prop_name] = int(value) if value.isdigit() else value
+
+    custom = package.xml("docProps/custom.xml")
+    if custom is not None:
+        for prop in custom.findall(_q("cup:property")):
+            value = None
+            for child in prop:
+                value = child.text
+                local = child.tag.split("}", 1)[-1]
+                if local in ("i1", "i2", "i4", "i8", "int", "ui1", "ui2", "ui4", "ui8", "uint"):
+                    try:
+                        value = int(value)
+                    except (TypeError, ValueError):
+                        pass
+                elif local in ("r4", "r8", "decimal"):
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        pass
+                elif local == "bool":
+                    value = (value or "").lower() in ("1", "true")
+                break
+            metadata["custom_properties"][prop.get("name")] = value
+
+    return metadata
+
+
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+def is_legacy_ppt(ppt_path: str) -> bool:
+    """True for an OLE compound file (binary .ppt), which only COM can read."""
+    try:
+        with open(ppt_path, "rb") as f:
+            return f.read(len(OLE_SIGNATURE)) == OLE_SIGNATURE
+    except OSError:
+        return False
+
+
+def probe_presentation_metadata(ppt_path: str) -> dict:
+    """COM-free get_presentation_metadata() for .pptx packages.
+
+    Only reads docProps/core.xml, docProps/app.xml and ppt/presentation.xml.
+    Raises OOXMLError if the file is not a readable OOXML presentation.
+    """
+    with OOXMLPackage(ppt_path) as package:
+        builtin = extract_metadata(package)["builtin_properties"]
+        sld_id_lst = package.presentation().find(_q("p:sldIdLst"))
+        slide_count = (
+            len(sld_id_lst.findall(_q("p:sldId"))) if sld_id_lst is not None else 0
+        )
+
+    def get_prop(name):
+        value = builtin.get(name)
+        return str(value) if value else ""
+
+    return {
+        "title": get_prop("Title"),
+        "subject": get_prop("Subject"),
+        "author": get_prop("Author"),
+        "last_modified_by": get_prop("Last Author"),
+        "revision_number": get_prop("Revision Number"),
+        "slide_count": slide_count,
+    }
+
+
+def design_name_of(package: OOXMLPackage, master_part: Optional[str]) -> Optional[str]:
+    """COM Design.Name: the theme name of the slide's master."""
+    theme_part = package.theme_of(master_part)
+    theme = package.xml(theme_part) if theme_part else None
+    if theme is not None and theme.get("name"):
+        return theme.get("name")
+    return part_name(package.xml(master_part)) if master_part else None
+
+
+@traced("master", lambda *args, **kwargs: "masters")
+def parse_masters(package: OOXMLPackage, image_dir: str) -> List[Dict[str, Any]]:
+    masters = []
+    for d_idx, master_part in enumerate(package.master_parts(), start=1):
+        try:
+            design_name = design_name_of(package, master_part) or f"Design{d_idx}"
+            master_shapes = parse_part_shapes(
+                package, master_part, "master", 0, "M", image_dir, "master"
+            )
+            master_info = {
+                "design_name": design_name,
+                "master_name": part_name(package.xml(master_part)) or design_name,
+                "shapes_count": len(master_shapes),
+                "shapes": master_shapes,
+                "layouts": [],
+            }
+
+            master_root = package.xml(master_part)
+            layout_ids = master_root.find(_q("p:sldLayoutIdLst")) if master_root is not None else None
+            rels = package.rels(master_part)
+            layout_parts = []
+            if layout_ids is not None:
+                for layout_id in layout_ids.findall(_q("p:sldLayoutId")):
+                    rel = rels.get(layout_id.get(_q("r:id")))
+                    if rel and not rel["external"]:
+                        layout_parts.append(rel["target"])
+            else:
+                layout_parts = package.related(master_part, REL_LAYOUT)
+
+            for l_idx, layout_part in enumerate(layout_parts, start=1):
+                layout_shapes = parse_part_shapes(
+                    package, layout_part, "layout", 0, f"L{l_idx}_", image_dir, "layout"
+                )
+                master_info["layouts"].append(
+                    {
+                        "layout_index": l_idx,
+                        "layout_name": part_name(package.xml(layout_part)),
+                        "shapes_count": len(layout_shapes),
+                        "shapes": layout_shapes,
+                    }
+                )
+            masters.append(master_info)
+        except Exception as e:
+            logger.warning("Failed to parse master %s: %s", master_part, e)
+    return masters
+
+
+@traced("slide", lambda package, slide_index, *args, **kwargs: f"slide {slide_index}")
+def parse_slide_part(
+    package: OOXMLPackage,
+    slide_index: int,
+    slide_id: int,
+    slide_part: str,
+    image_dir: str,
+    preserved_data=None,
+) -> Dict[str, Any]:
+    layout_part = package.layout_of(slide_part)
+    master_part = package.master_of(layout_part)
+    shapes = parse_part_shapes(
+        package, slide_part, "slide", slide_index, "", image_dir, "slide"
+    )
+
+    if preserved_data:
+        for shape_info in shapes:
+            key = (slide_index, shape_info["name"])
+            if key in preserved_data:
+                shape_info["description"] = preserved_data[key]
+
+    return {
+        "slide_index": slide_index,
+        "slide_id": slide_id,
+        "shapes_count": len(shapes),
+        "design_name": design_name_of(package, master_part),
+        "layout_name": part_name(package.xml(layout_part)) if layout_part else None,
+        "thumbnail": None,  # No renderer without PowerPoint
+        "shapes": shapes,
+    }
+
+
+def parse_presentation_ooxml(
+    ppt_path,
+    out_dir,
+    debug=False,
+    progress_callback=None,
+    preserved_data=None,
+    asset_dir=None,
+    previous_result=None,
+    progressive=False,
+):
+    """Same contract as slides.parse_presentation(), without PowerPoint."""
+    if not os.path.exists(ppt_path):
+        logger.error("File not found: %s", ppt_path)
+        return None
+
+    os.makedirs(out_dir, exist_ok=True)
+    image_dir = os.path.join(out_dir, "images")
+    os.makedirs(image_dir, exist_ok=True)
+
+    logger.info("=== Parsing PowerPoint (OOXML): %s ===", ppt_path)
+    partial = PartialResultWriter(out_dir) if progressive else None
+
+    document = os.path.basename(ppt_path)
+    with trace_job(project_trace_path(out_dir)), span(document, "document", engine="ooxml"):
+        try:
+            with OOXMLPackage(ppt_path) as package:
+                if asset_dir:
+                    package.asset_store = AssetStore(asset_dir)
+                slide_width, slide_height = package.slide_size()
+                slide_parts = package.slide_parts()
+                logger.info("Slides Count: %s", len(slide_parts))
+
+                result = {
+                    "ppt_path": project_relative_path(ppt_path),
+                    "parser_engine": "ooxml",
+                    "slides_count": len(slide_parts),
+                    "slide_width": slide_width,
+                    "slide_height": slide_height,
+                    "metadata": extract_metadata(package),
+                    "masters": [],
+                    "slides": [],
+                }
+
+                if progress_callback:
+                    progress_callback(10, "Parsing Masters...")
+                result["masters"] = parse_masters(package, image_dir)
+                if partial is not None:
+                    partial.begin(result)
+
+                fingerprinter = SlideFingerprinter(package)
+                fingerprints = {
+                    i: fingerprinter.fingerprint(part)
+                    for i, (_, part) in enumerate(slide_parts, start=1)
+                }
+                unchanged = reusable_slides(
+                    previous_result, fingerprints, out_dir, "ooxml", asset_dir=asset_dir
+                )
+                if unchanged:
+                    logger.info(
+                        "%s/%s slide(s) unchanged since last parse",
+                        len(unchanged), len(slide_parts),
+                    )
+
+                total_slides = len(slide_parts)
+                for i, (slide_id, slide_part) in enumerate(slide_parts):
+                    slide_index = i + 1
+                    if progress_callback:
+                        percent = 10 + int((i / total_slides) * 80)
+                        progress_callback(percent, f"Parsing Slide {i + 1}/{total_slides}")
+                    if slide_index in unchanged:
+                        result["slides"].append(unchanged[slide_index])
+                        if partial is not None:
+                            partial.add_slide(unchanged[slide_index])
+                        continue
+                    try:
+                        slide_info = parse_slide_part(
+                            package,
+                            slide_index,
+                            slide_id,
+                            slide_part,
+                            image_dir,
+                            preserved_data=preserved_data,
+                        )
+                        slide_info["fingerprint"] = fingerprints[slide_index]
+                        result["slides"].append(slide_info)
+                        if partial is not None:
+                            partial.add_slide(slide_info)
+                    except Exception as e:
+                        logger.error("Failed to parse slide %s: %s", slide_index, e)
+                        placeholder = skipped_slide(slide_index, "parse failed")
+                        result["slides"].append(placeholder)
+                        result.setdefault(SKIPPED_SLIDES_KEY, []).append(slide_index)
+                        if partial is not None:
+                            partial.add_slide(placeholder)
+
+            if progress_callback:
+                progress_callback(95, "Saving JSON...")
+
+            json_path = write_presentation_json(result, out_dir)
+            logger.info("JSON metadata saved to: %s", json_path)
+
+            if progress_callback:
+                progress_callback(100, "Done")
+            return json_path
+
+        except Exception as e:
+            logger.error("Parsing failed: %s", e)
+            if progress_callback:
+                progress_callback(-1, f"Error: {e}")
+            return None
+        finally:
+            if partial is not None:
+                partial.finish()
+
+
+def parse_single_slide_ooxml(
+    ppt_path, slide_index, out_dir, preserved_data=None, asset_dir=None
+):
+    """Same contract as slides.parse_single_slide(), without PowerPoint."""
+    if not os.path.exists(ppt_path):
+        logger.error("File not found: %s", ppt_path)
+        return None
+
+    image_dir = os.path.join(out_dir, "images")
+    os.makedirs(image_dir, exist_ok=True)
+
+    with trace_job(project_trace_path(out_dir), truncate=False):
+        try:
+            with OOXMLPackage(ppt_path) as package:
+                if asset_dir:
+                    package.asset_store = AssetStore(asset_dir)
+                slide_parts = package.slide_parts()
+                if slide_index < 1 or slide_index > len(slide_parts):
+                    logger.error("Slide %s not found.", slide_index)
+                    return None
+                slide_id, slide_part = slide_parts[slide_index - 1]
+                slide_info = parse_slide_part(
+                    package,
+                    slide_index,
+                    slide_id,
+                    slide_part,
+                    image_dir,
+                    preserved_data=preserved_data,
+                )
+                slide_info["fingerprint"] = SlideFingerprinter(package).fingerprint(slide_part)
+                slide_info["metadata"] = extract_metadata(package)
+                return slide_info
+        except Exception as e:
+            logger.error("Parsing failed: %s", e)
+            return None
@@ -0,0 +1,91 @@
+"""
+Style interning for project JSON.
+
+Every shape and table cell carries its own ``text_style``, ``fill``,
+``line`` and ``borders`` dict, and on a typical deck most of them are
+identical (theme fonts, colors, line weights). In the interned form each
+distinct style is stored once in a top-level ``"style_palette"`` list and
+the shape fields hold ``{"$style": <index>}`` instead:
+
+    {"style_palette": [{"font_name": "Arial", ...}, ...],
+     "slides": [{"shapes": [{"text_style": {"$style": 0}, ...}]}]}
+
+``intern_styles`` builds that form, ``resolve_styles`` expands it back.
+Resolving is a no-op for JSON without a palette, so inline (legacy)
+projects load unchanged. Only the stored file is interned; everything
+reading a project goes through storage.load_project_json(), which resolves.
+"""
+
+import json
+from typing import Any, Dict, List
+
+PALETTE_KEY = "style_palette"
+STYLE_REF = "$style"
+STYLE_KEYS = ("text_style", "fill", "line", "borders")
+
+
+def is_interned(data: Any) -> bool:
+    return isinstance(data, dict) and PALETTE_KEY in data
+
+
+def _style_key(style: Dict[str, Any]) -> str:
+    return json.dumps(style, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def intern_styles(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Interned copy of a project dict (``data`` itself is left untouched)."""
+    if is_interned(data):
+        data = resolve_styles(_copy(data))
+    palette: List[Dict[str, Any]] = []
+    index_of: Dict[str, int] = {}
+
+    def walk(value):
+        if isinstance(value, list):
+            return [walk(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        out = {}
+        for key, item in value.items():
+            if key in STYLE_KEYS and isinstance(item, dict) and item:
+                style_key = _style_key(item)
+                if style_key not in index_of:
+                    index_of[style_key] = len(palette)
+                    palette.append(_copy(item))
+                out[key] = {STYLE_REF: index_of[style_key]}
+            else:
+                out[key] = walk(item)
+        return out
+
+    interned = walk(data)
+    interned[PALETTE_KEY] = palette
+    return interned
+
+
+def resolve_styles(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand style references in place and drop the palette; returns ``data``."""
+    if not is_interned(data):
+        return data
+    palette = data.pop(PALETTE_KEY) or []
+
+    def walk(value):
+        if isinstance(value, list):
+            for item in value:
+                walk(item)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if key in STYLE_KEYS and isinstance(item, dict) and STYLE_REF in item:
+                    # Each shape gets its own copy, so editing one never touches another
+                    value[key] = _copy(palette[item[STYLE_REF]])
+                else:
+                    walk(item)
+
+    walk(data)
+    return data
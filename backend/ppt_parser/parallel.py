@@ -0,0 +1,241 @@
+"""
+Slide-range parallel parsing of one large deck.
+
+parse_presentation() walks a deck slide by slide through one PowerPoint
+instance. parse_presentation_parallel() splits the slide range into
+contiguous chunks and runs slides.parse_slide_range() for each of them on the
+COM worker pool (com_pool.PowerPointPool), every chunk on its own read-only
+copy of the file. The first chunk also parses the masters. Partial results
+are merged in slide order into the usual <out_dir>/<basename>.json; workers
+write thumbnails and images straight into out_dir (file names carry the slide
+index, so chunks never collide).
+
+Chunks only run side by side when the pool has at least ``workers``
+processes. PowerPoint is single-instance per session, so the gain comes from
+overlapping the per-call COM round-trips and Python-side work of several
+workers rather than from several PowerPoint processes.
+"""
+
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import threading
+from concurrent.futures import wait
+from typing import Callable, List, Optional, Tuple
+
+from .ooxml import OOXMLError, OOXMLPackage
+from .slides import parse_presentation, parse_slide_range
+from .storage import (
+    SKIPPED_SLIDES_KEY,
+    PartialResultWriter,
+    open_checkpoint,
+    project_trace_path,
+    write_presentation_json,
+)
+from .tracing import span, trace_job
+from .utils import project_relative_path
+
+logger = logging.getLogger(__name__)
+
+# Below this many slides per chunk the copy and hand-off cost more than they save
+MIN_SLIDES_PER_WORKER = 20
+
+
+def split_slide_range(
+    slides_count: int, workers: int, min_slides: int = MIN_SLIDES_PER_WORKER
+) -> List[Tuple[int, int]]:
+    """Contiguous 1-based (first, last) ranges, at most ``workers`` of them."""
+    if slides_count <= 0:
+        return []
+    chunks = max(1, min(int(workers), slides_count // max(1, min_slides)))
+    base, extra = divmod(slides_count, chunks)
+    ranges = []
+    first = 1
+    for k in range(chunks):
+        size = base + (1 if k < extra else 0)
+        ranges.append((first, first + size - 1))
+        first += size
+    return ranges
+
+
+def count_slides(ppt_path: str) -> Optional[int]:
+    """Slide count from the package XML (None for legacy .ppt or unreadable files)."""
+    try:
+        with OOXMLPackage(ppt_path) as package:
+            return len(package.slide_parts())
+    except OOXMLError:
+        return None
+
+
+class ChunkProgress:
+    """Folds the progress of every chunk into one 10-90% range for progress_callback."""
+
+    def __init__(self, callback: Callable[[int, str], None], ranges: List[Tuple[int, int]]):
+        self.callback = callback
+        self.sizes = [last - first + 1 for first, last in ranges]
+        self.total = sum(self.sizes)
+        self.done = [0.0] * len(ranges)
+        self.percent = 10
+        self._lock = threading.Lock()
+
+    def for_chunk(self, k: int) -> Callable[[int, str], None]:
+        def report(percent, message):
+            if percent < 10:
+                # Chunk failures surface through the job result
+                return
+            with self._lock:
+                # parse_slide_range maps its own slides to 10-90%
+                self.done[k] = self.sizes[k] * min(percent - 10, 80) / 80
+                done = sum(self.done)
+                self.percent = max(self.percent, 10 + int(done / self.total * 80))
+                self.callback(
+                    self.percent, f"Parsing Slide {min(int(done) + 1, self.total)}/{self.total}"
+                )
+
+        return report
+
+
+def _read_only_copy(ppt_path: str, copy_dir: str, k: int) -> str:
+    copy_path = os.path.join(copy_dir, f"part{k}{os.path.splitext(ppt_path)[1]}")
+    shutil.copyfile(ppt_path, copy_path)
+    os.chmod(copy_path, stat.S_IREAD)
+    return copy_path
+
+
+def _remove_copies(copy_dir: str):
+    for name in os.listdir(copy_dir):
+        try:
+            os.chmod(os.path.join(copy_dir, name), stat.S_IREAD | stat.S_IWRITE)
+        except OSError:
+            pass
+    shutil.rmtree(copy_dir, ignore_errors=True)
+
+
+def parse_presentation_parallel(
+    ppt_path,
+    out_dir,
+    pool,
+    workers=2,
+    debug=False,
+    progress_callback=None,
+    preserved_data=None,
+    asset_dir=None,
+    master_cache_dir=None,
+    previous_result=None,
+    thumbnails=True,
+    progressive=False,
+    resume=False,
+    stall_timeout=None,
+    min_slides_per_worker=MIN_SLIDES_PER_WORKER,
+):
+    """
+    Same contract as parse_presentation(), with slide ranges parsed side by side.
+
+    ``pool`` is a com_pool.PowerPointPool (or anything with the same
+    ``submit``). Decks too small for two chunks of ``min_slides_per_worker``
+    slides, and legacy .ppt files whose slides cannot be counted from the
+    package, run as a single parse_presentation() job.
+
+    ``resume`` carries on from the checkpoint of an interrupted parse, handing
+    each chunk its finished slides. ``stall_timeout`` is passed to
+    ``pool.submit``: a job that reports no progress for that long is killed,
+    and the error is raised to the caller, so it can resume.
+    """
+    if not os.path.exists(ppt_path):
+        logger.error("File not found: %s", ppt_path)
+        return None
+
+    ranges = split_slide_range(count_slides(ppt_path) or 0, workers, min_slides_per_worker)
+    common = {
+        "preserved_data": preserved_data,
+        "asset_dir": asset_dir,
+        "previous_result": previous_result,
+        "thumbnails": thumbnails,
+        "progressive": progressive or resume,
+    }
+    if len(ranges) < 2:
+        return pool.submit(
+            parse_presentation,
+            ppt_path,
+            out_dir,
+            debug=debug,
+            progress_callback=progress_callback,
+            stall_timeout=stall_timeout,
+            master_cache_dir=master_cache_dir,
+            resume=resume,
+            **common,
+        ).result()
+
+    logger.info("=== Parsing PowerPoint in %s slide ranges: %s ===", len(ranges), ppt_path)
+    os.makedirs(out_dir, exist_ok=True)
+    copy_dir = tempfile.mkdtemp(prefix=".parallel-", dir=out_dir)
+    progress = ChunkProgress(progress_callback, ranges) if progress_callback else None
+    futures = []
+    resumed_slides, skip_slides = (
+        open_checkpoint(out_dir, ppt_path, resume) if common["progressive"] else ({}, [])
+    )
+
+    job_span = span(os.path.basename(ppt_path), "document", engine="com", chunks=len(ranges))
+    with trace_job(project_trace_path(out_dir)), job_span:
+        try:
+            for k, (first, last) in enumerate(ranges):
+                futures.append(
+                    pool.submit(
+                        parse_slide_range,
+                        _read_only_copy(ppt_path, copy_dir, k),
+                        out_dir,
+                        first=first,
+                        last=last,
+                        include_masters=k == 0,
+                        read_only=True,
+                        progress_callback=progress.for_chunk(k) if progress else None,
+                        stall_timeout=stall_timeout,
+                        master_cache_dir=master_cache_dir if k == 0 else None,
+                        resumed_slides={
+                            i: s for i, s in resumed_slides.items() if first <= i <= last
+                        },
+                        skip_slides=[i for i in skip_slides if first <= i <= last],
+                        **common,
+                    )
+                )
+            wait(futures)
+
+            result = None
+            for (first, last), future in zip(ranges, futures):
+                part = future.result()
+                if part is None:
+                    raise RuntimeError(f"slides {first}-{last} could not be parsed")
+                if result is None:
+                    result = part
+                else:
+                    result["slides"].extend(part["slides"])
+                    if part.get(SKIPPED_SLIDES_KEY):
+                        result.setdefault(SKIPPED_SLIDES_KEY, []).extend(part[SKIPPED_SLIDES_KEY])
+            result["ppt_path"] = project_relative_path(ppt_path)
+
+            if progress_callback:
+                progress_callback(95, "Saving JSON...")
+            json_path = write_presentation_json(result, out_dir)
+            logger.info("JSON metadata saved to: %s", json_path)
+            if common["progressive"]:
+                PartialResultWriter(out_dir).finish()
+
+            if progress_callback:
+                progress_callback(100, "Done")
+            return json_path
+
+        except Exception as e:
+            logger.error("Parsing failed: %s", e)
+            if progress_callback:
+                progress_callback(-1, f"Error: {e}")
+            if any(f.done() and f.exception() is e for f in futures):
+                # A chunk's worker died or stalled: the caller may resume from the checkpoint
+                raise
+            return None
+        finally:
+            # Workers may still hold their copy open if submitting failed half-way
+            wait(futures)
+            _remove_copies(copy_dir)
+            logger.info("=== Parse Done ===")
@@ -0,0 +1,230 @@
+"""
+Opt-in COM call profiler.
+
+``ComProfiler.wrap(app)`` returns a proxy of the PowerPoint Application; every
+object reached through it is proxied as well, and each property get, property
+set and method call is counted and timed. Records are keyed by member name and
+by the labels of the object they were made on:
+
+- ``shape_type``: set on a shape proxy when its ``Type`` is read, inherited by
+  everything reached from it (TextFrame, Fill, table cells...)
+- ``context`` / ``slide_index``: attached by the parser with ``label_com_object``
+
+Enable it with ``profile=True`` on ``parse_presentation`` /
+``reconstruct_presentation`` or with ``PPT_COM_PROFILE=1``. The report (top-N hot
+members, COM time per slide, per shape type and per context) is written as JSON
+next to the project JSON. Works the same with the fake object model in tests.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import types
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from .constants import shape_type_map
+
+logger = logging.getLogger(__name__)
+
+_PLAIN_TYPES = (str, bytes, int, float, bool, complex, type(None), tuple, list, dict)
+_METHOD_TYPES = (types.MethodType, types.BuiltinMethodType, types.FunctionType)
+
+UNLABELED = "-"
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get("PPT_COM_PROFILE", "").lower() in ("1", "true", "yes", "on")
+
+
+class ComProfiler:
+    """Collects timed COM member accesses made through its proxies."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (kind, name, shape_type, context, slide_index) -> [count, seconds]
+        self._records: Dict[tuple, list] = defaultdict(lambda: [0, 0.0])
+        self.started_at = time.perf_counter()
+
+    def wrap(self, com_object, **labels):
+        return _wrap(com_object, self, labels)
+
+    def record(self, kind: str, name: str, labels: Dict[str, Any], seconds: float):
+        key = (
+            kind,
+            name,
+            labels.get("shape_type", UNLABELED),
+            labels.get("context", UNLABELED),
+            labels.get("slide_index"),
+        )
+        with self._lock:
+            entry = self._records[key]
+            entry[0] += 1
+            entry[1] += seconds
+
+    # ---------- reporting ----------
+
+    def report(self, top_n: int = 25) -> Dict[str, Any]:
+        with self._lock:
+            records = {k: tuple(v) for k, v in self._records.items()}
+
+        def group(key_fn):
+            grouped = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+            for key, (count, seconds) in records.items():
+                bucket = grouped[key_fn(key)]
+                bucket["calls"] += count
+                bucket["seconds"] += seconds
+            return grouped
+
+        members = group(lambda k: (k[0], k[1]))
+        top = sorted(members.items(), key=lambda item: item[1]["seconds"], reverse=True)
+        slides = group(lambda k: k[4])
+
+        return {
+            "wall_seconds": round(time.perf_counter() - self.started_at, 6),
+            "total": _rounded(
+                {
+                    "calls": sum(c for c, _ in records.values()),
+                    "seconds": sum(s for _, s in records.values()),
+                }
+            ),
+            "by_kind": {k: _rounded(v) for k, v in group(lambda k: k[0]).items()},
+            "top_members": [
+                {"kind": kind, "name": name, **_rounded(stats)}
+                for (kind, name), stats in top[:top_n]
+            ],
+            "by_shape_type": {k: _rounded(v) for k, v in group(lambda k: k[2]).items()},
+            "by_context": {k: _rounded(v) for k, v in group(lambda k: k[3]).items()},
+            "slides": [
+                {"slide_index": idx, **_rounded(slides[idx])}
+                for idx in sorted(idx for idx in slides if idx is not None)
+            ],
+        }
+
+    def write_report(self, path: str, top_n: int = 25) -> str:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(top_n), f, ensure_ascii=False, indent=2)
+        logger.info("COM profile saved to: %s", path)
+        return path
+
+
+def _rounded(stats: Dict[str, Any]) -> Dict[str, Any]:
+    return {"calls": stats["calls"], "seconds": round(stats["seconds"], 6)}
+
+
+class ProfiledCom:
+    """Proxy that times every member access on a COM object."""
+
+    __slots__ = ("_prof_target", "_prof_profiler", "_prof_labels", "_prof_item")
+
+    def __init__(self, target, profiler: ComProfiler, labels: Dict[str, Any], item=False):
+        object.__setattr__(self, "_prof_target", target)
+        object.__setattr__(self, "_prof_profiler", profiler)
+        object.__setattr__(self, "_prof_labels", dict(labels))
+        # Collection items and cell.Shape may be shapes: their Type relabels them
+        object.__setattr__(self, "_prof_item", item)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        start = time.perf_counter()
+        try:
+            value = getattr(self._prof_target, name)
+        except Exception:
+            self._prof_profiler.record(
+                "get", name, self._prof_labels, time.perf_counter() - start
+            )
+            raise
+        elapsed = time.perf_counter() - start
+        if isinstance(value, _METHOD_TYPES):
+            return self._timed_method(name, value)
+        self._prof_profiler.record("get", name, self._prof_labels, elapsed)
+        if name == "Type" and isinstance(value, int) and (
+            self._prof_item or "shape_type" not in self._prof_labels
+        ):
+            # A shape's own Type labels everything reached from it from now on
+            self._prof_labels["shape_type"] = shape_type_map.get(value, f"Unknown({value})")
+        return _wrap(value, self._prof_profiler, self._prof_labels, item=name == "Shape")
+
+    def __setattr__(self, name, value):
+        start = time.perf_counter()
+        try:
+            setattr(self._prof_target, name, _unwrap(value))
+        finally:
+            self._prof_profiler.record(
+                "set", name, self._prof_labels, time.perf_counter() - start
+            )
+
+    def _timed_method(self, name, method):
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = method(
+                    *(_unwrap(a) for a in args),
+                    **{k: _unwrap(v) for k, v in kwargs.items()},
+                )
+            finally:
+                self._prof_profiler.record(
+                    "call", name, self._prof_labels, time.perf_counter() - start
+                )
+            return _wrap(result, self._prof_profiler, self._prof_labels, item=True)
+
+        return call
+
+    def __call__(self, *args, **kwargs):
+        # Collection default member, e.g. presentation.Slides(1)
+        return self._timed_method("Item", self._prof_target)(*args, **kwargs)
+
+    def __iter__(self):
+        start = time.perf_counter()
+        items = list(self._prof_target)
+        self._prof_profiler.record(
+            "call", "_NewEnum", self._prof_labels, time.perf_counter() - start
+        )
+        return iter(
+            [_wrap(i, self._prof_profiler, self._prof_labels, item=True) for i in items]
+        )
+
+    def __len__(self):
+        return len(self._prof_target)
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return f"<ProfiledCom of {self._prof_target!r}>"
+
+
+def _wrap(value, profiler: ComProfiler, labels: Dict[str, Any], item=False):
+    if isinstance(value, (_PLAIN_TYPES, ProfiledCom)):
+        return value
+    return ProfiledCom(value, profiler, labels, item)
+
+
+def _unwrap(value):
+    if isinstance(value, ProfiledCom):
+        return value._prof_target
+    return value
+
+
+def label_com_object(com_object, **labels):
+    """Attach profile labels (context, slide_index...) to a proxied COM object.
+
+    No-op when profiling is off. Accepts ComSnapshot-wrapped objects too.
+    """
+    from .snapshot import ComSnapshot
+
+    if isinstance(com_object, ComSnapshot):
+        com_object = com_object.com_object
+    if isinstance(com_object, ProfiledCom):
+        com_object._prof_labels.update(labels)
+    return com_object
+
+
+def start_profiler(profile: Optional[bool]) -> Optional[ComProfiler]:
+    """A new ComProfiler if ``profile`` is True (or None and PPT_COM_PROFILE is set)."""
+    if profile is None:
+        profile = profiling_enabled()
+    return ComProfiler() if profile else None
@@ -1,3 +1,4 @@
+import logging
 from .utils import get_shape_type_name
 from .styles import (
     get_text_and_style_from_shape,
@@ -7,6 +8,9 @@ from .styles import (
 )
 from .images import export_shape_image
 from .tables import parse_table
+from .snapshot import snapshot
+from .profiler import label_com_object
+from .tracing import traced
 from .constants import (
     MSO_TYPE_PICTURE,
     MSO_TYPE_LINKED_PICTURE,
@@ -15,7 +19,10 @@ from .constants import (
     MSO_TYPE_GROUP,
 )
 
+logger = logging.getLogger(__name__)
 
+
+@traced("shape", lambda shape, slide_index, shape_index, *args, **kwargs: f"shape {shape_index}")
 def parse_shape(
     shape,
     slide_index,
@@ -24,8 +31,12 @@ def parse_shape(
     indent=0,
     max_z=None,
     context="slide",  # "slide" | "master" | "layout"
+    media=None,
 ):
     prefix = " " * indent
+    # Each COM property is fetched once and reused by styles/tables/images below
+    shape = snapshot(shape)
+    label_com_object(shape, context=context)
 
     shape_type_name = get_shape_type_name(shape)
     text, text_style = get_text_and_style_from_shape(shape)
@@ -44,7 +55,7 @@ def parse_shape(
         else:
             z_level = "middle"
 
-    print(f"{prefix}- [{context}] Shape Name : {shape.Name} ({shape_type_name})")
+    logger.debug("%s- [%s] Shape Name : %s (%s)", prefix, context, shape.Name, shape_type_name)
 
     # Extract embedded shape_index from AlternativeText if present (for AB/BA consistency)
     preserved_index = None
@@ -167,7 +178,7 @@ def parse_shape(
             except Exception:
                 pass
     except Exception as e:
-        print(f"{prefix}  [WARN] Failed to extract connector info: {e}")
+        logger.warning("Failed to extract connector info: %s", e)
 
     # 이미지 도형 (그림/그래픽/3D 등)
     if shape.Type in (
@@ -179,10 +190,12 @@ def parse_shape(
         30,
         31,
     ):
-        rel_image_path = export_shape_image(shape, slide_index, shape_index, image_dir)
+        rel_image_path = export_shape_image(
+            shape, slide_index, shape_index, image_dir, media=media
+        )
         if rel_image_path:
             shape_info["image_file"] = rel_image_path
-            print(f"{prefix}  Image : {rel_image_path}")
+            logger.debug("%s  Image : %s", prefix, rel_image_path)
 
     # 테이블
     if shape.Type == MSO_TYPE_TABLE or shape_type_name == "Table":
@@ -192,6 +205,7 @@ def parse_shape(
             shape_index=shape_index,
             image_dir=image_dir,
             indent=indent + 2,
+            media=media,
         )
         shape_info["table"] = table_info
 
@@ -211,11 +225,11 @@ def parse_shape(
                     indent=indent + 2,
                     max_z=group_items.Count,
                     context=context,
+                    media=media,
                 )
                 children.append(child_info)
             shape_info["children"] = children
         except Exception as e:
-            print(f"{prefix}  [WARN] Failed to parse group items: {e}")
+            logger.warning("Failed to parse group items: %s", e)
 
-    print()
     return shape_info
@@ -1,10 +1,40 @@
+import logging
 import os
-import json
-import win32com.client as win32
+from .assets import AssetStore
+from .incremental import reusable_slides, slide_fingerprint, slide_fingerprints
+from .master_cache import MasterCache, com_template_signature, template_fingerprint
+from .media import MediaExtractor
 from .shapes import parse_shape
-
-
-def parse_single_master(master, image_dir, design_name=""):
+from .thumbnails import base_thumbnail_filename
+from .snapshot import snapshot_stats
+from .profiler import label_com_object, start_profiler
+from .storage import (
+    SKIPPED_SLIDES_KEY,
+    PartialResultWriter,
+    open_checkpoint,
+    project_profile_path,
+    project_trace_path,
+    skipped_slide,
+    write_presentation_json,
+)
+from .tracing import span, trace_job, traced
+from .utils import dispatch_powerpoint, project_relative_path
+
+logger = logging.getLogger(__name__)
+
+
+def report_snapshot_stats():
+    stats = snapshot_stats.as_dict()
+    logger.info(
+        "COM property reads: %s fetched, %s round-trips saved by snapshots",
+        stats['fetched'], stats['saved'],
+    )
+    return stats
+
+
+@traced("master", lambda master, image_dir, design_name="", *a, **kw: f"master {design_name}")
+def parse_single_master(master, image_dir, design_name="", media=None):
+    label_com_object(master, context="master")
     master_info = {
         "design_name": design_name,
         "master_name": getattr(master, "Name", ""),
@@ -25,15 +55,17 @@ def parse_single_master(master, image_dir, design_name=""):
                 indent=2,
                 max_z=shapes_count,
                 context="master",
+                media=media,
             )
             master_info["shapes"].append(shape_info)
         except Exception as e:
-            print(f"[WARN] Failed to parse master shape {idx}: {e}")
+            logger.warning("Failed to parse master shape %s: %s", idx, e)
 
     try:
         layouts = master.CustomLayouts
         for l_idx in range(1, layouts.Count + 1):
             layout = layouts.Item(l_idx)
+            label_com_object(layout, context="layout")
             layout_shapes_count = layout.Shapes.Count
 
             layout_info = {
@@ -54,23 +86,26 @@ def parse_single_master(master, image_dir, design_name=""):
                         indent=4,
                         max_z=layout_shapes_count,
                         context="layout",
+                        media=media,
                     )
                     layout_info["shapes"].append(lshape_info)
                 except Exception as e_ls:
-                    print(
-                        f"[WARN] Failed to parse layout {l_idx} shape {s_idx}: {e_ls}"
+                    logger.warning(
+                        "Failed to parse layout %s shape %s: %s",
+                        l_idx, s_idx, e_ls,
                     )
 
             master_info["layouts"].append(layout_info)
     except Exception as e:
-        print(
-            f"[WARN] Failed to parse CustomLayouts for master '{master_info['master_name']}': {e}"
+        logger.warning(
+            "Failed to parse CustomLayouts for master '%s': %s",
+            master_info['master_name'], e,
         )
 
     return master_info
 
 
-def parse_masters(presentation, image_dir):
+def parse_masters(presentation, image_dir, media=None):
     masters = []
 
     try:
@@ -80,23 +115,25 @@ def parse_masters(presentation, image_dir):
                 design = designs.Item(d_idx)
                 master = design.SlideMaster
                 design_name = getattr(design, "Name", f"Design{d_idx}")
-                print(f"=== Parsing Master: {design_name} ===")
+                logger.info("=== Parsing Master: %s ===", design_name)
                 master_info = parse_single_master(
-                    master, image_dir, design_name=design_name
+                    master, image_dir, design_name=design_name, media=media
                 )
                 masters.append(master_info)
             except Exception as e_d:
-                print(f"[WARN] Failed to parse design {d_idx}: {e_d}")
+                logger.warning("Failed to parse design %s: %s", d_idx, e_d)
     except Exception as e:
-        print(f"[WARN] Failed to access presentation.Designs: {e}")
+        logger.warning("Failed to access presentation.Designs: %s", e)
 
     if not masters:
         try:
             sm = presentation.SlideMaster
             if sm is not None:
-                print("=== Parsing default SlideMaster ===")
+                logger.info("=== Parsing default SlideMaster ===")
                 masters.append(
-                    parse_single_master(sm, image_dir, design_name="Default")
+                    parse_single_master(
+                        sm, image_dir, design_name="Default", media=media
+                    )
                 )
         except Exception:
             pass
@@ -104,13 +141,45 @@ def parse_masters(presentation, image_dir):
     return masters
 
 
-def parse_single_slide(ppt_path, slide_index, out_dir, preserved_data=None):
+def parse_masters_cached(presentation, image_dir, media=None, cache=None):
+    """parse_masters() through the template cache; returns (masters, fingerprint)."""
+    if cache is None:
+        return parse_masters(presentation, image_dir, media=media), None
+
+    if media is not None and media.active:
+        fingerprint = template_fingerprint(media.package)
+    else:
+        fingerprint = com_template_signature(presentation)
+
+    masters = cache.load(fingerprint, image_dir)
+    if masters is not None:
+        logger.info(
+            "Master cache hit (%s): reusing %s master(s)",
+            fingerprint[:12], len(masters),
+        )
+        return masters, fingerprint
+
+    masters = parse_masters(presentation, image_dir, media=media)
+    cache.store(fingerprint, masters, image_dir)
+    return masters, fingerprint
+
+
+def parse_single_slide(
+    ppt_path,
+    slide_index,
+    out_dir,
+    preserved_data=None,
+    powerpoint=None,
+    asset_dir=None,
+):
     """
     단일 슬라이드만 파싱하여 해당 슬라이드의 정보(dict)를 반환합니다.
     이미지도 out_dir/images 에 새로 export 됩니다.
+    powerpoint: 이미 떠 있는 PowerPoint.Application (worker pool). 없으면 새로 dispatch.
+    asset_dir: 지정 시 이미지를 content-addressed AssetStore 에 저장 ("assets/<sha256>.png").
     """
     if not os.path.exists(ppt_path):
-        print(f"[ERROR] File not found: {ppt_path}")
+        logger.error("File not found: %s", ppt_path)
         return None
 
     os.makedirs(out_dir, exist_ok=True)
@@ -119,85 +188,98 @@ def parse_single_slide(ppt_path, slide_index, out_dir, preserved_data=None):
     thumbnail_dir = os.path.join(out_dir, "thumbnails")
     os.makedirs(thumbnail_dir, exist_ok=True)
 
-    print(f"=== Parsing Single Slide {slide_index}: {ppt_path} ===")
+    logger.info("=== Parsing Single Slide %s: %s ===", slide_index, ppt_path)
+    snapshot_stats.reset()
 
-    powerpoint = win32.gencache.EnsureDispatch("PowerPoint.Application")
+    if powerpoint is None:
+        powerpoint = dispatch_powerpoint()
+    media = MediaExtractor(
+        ppt_path, image_dir, assets=AssetStore(asset_dir) if asset_dir else None
+    )
     presentation = None
 
-    try:
-        # Untitled=True로 열어서 사본으로 작업 (Protected View 등 회피 시도)
-        presentation = powerpoint.Presentations.Open(
-            ppt_path, ReadOnly=False, Untitled=False, WithWindow=True
-        )
-
+    trace_path = project_trace_path(out_dir)
+    with trace_job(trace_path, truncate=False), span(f"slide {slide_index}", "slide"):
         try:
-            slide = presentation.Slides.Item(slide_index)
-        except Exception:
-            print(f"[ERROR] Slide {slide_index} not found.")
-            return None
+            # Untitled=True로 열어서 사본으로 작업 (Protected View 등 회피 시도)
+            presentation = powerpoint.Presentations.Open(
+                ppt_path, ReadOnly=False, Untitled=False, WithWindow=True
+            )
 
-        shapes_count = slide.Shapes.Count
+            try:
+                slide = presentation.Slides.Item(slide_index)
+            except Exception:
+                logger.error("Slide %s not found.", slide_index)
+                return None
 
-        try:
-            design_name = slide.Design.Name
-        except Exception:
-            design_name = None
+            shapes_count = slide.Shapes.Count
 
-        try:
-            layout_name = slide.CustomLayout.Name
-        except Exception:
-            layout_name = None
+            try:
+                design_name = slide.Design.Name
+            except Exception:
+                design_name = None
 
-        # Generate thumbnail for this slide
-        thumbnail_filename = generate_slide_thumbnail(
-            slide, slide_index, thumbnail_dir
-        )
+            try:
+                layout_name = slide.CustomLayout.Name
+            except Exception:
+                layout_name = None
 
-        slide_info = {
-            "slide_index": slide_index,
-            "slide_id": slide.SlideID,
-            "shapes_count": shapes_count,
-            "design_name": design_name,
-            "layout_name": layout_name,
-            "thumbnail": thumbnail_filename,
-            "metadata": extract_metadata(presentation),
-            "shapes": [],
-        }
+            # Generate thumbnail for this slide
+            thumbnail_filename = generate_slide_thumbnail(
+                slide, slide_index, thumbnail_dir
+            )
 
-        print(f"--- Slide {slide_index} (Design: {design_name}) ---")
+            slide_info = {
+                "slide_index": slide_index,
+                "slide_id": slide.SlideID,
+                "shapes_count": shapes_count,
+                "design_name": design_name,
+                "layout_name": layout_name,
+                "thumbnail": thumbnail_filename,
+                "metadata": extract_metadata(presentation),
+                "shapes": [],
+            }
+            if media.active:
+                slide_info["fingerprint"] = slide_fingerprint(media.package, slide_index)
 
-        for shape_index, shape in enumerate(slide.Shapes):
-            try:
-                shape_index += 1
-                shape_info_data = parse_shape(
-                    shape,
-                    slide_index=slide_index,
-                    shape_index=shape_index,
-                    image_dir=image_dir,
-                    indent=2,
-                )
+            logger.info("--- Slide %s (Design: %s) ---", slide_index, design_name)
 
-                # Apply preserved description if available
-                if preserved_data:
-                    key = (slide_index, shape.Name)
-                    if key in preserved_data:
-                        shape_info_data["description"] = preserved_data[key]
-                        print(f"  [INFO] Preserved description for {shape.Name}")
-
-                slide_info["shapes"].append(shape_info_data)
-            except Exception as e:
-                print(
-                    f"[WARN] Failed to parse shape {shape_index} on slide {slide_index}: {e}"
-                )
+            for shape_index, shape in enumerate(slide.Shapes):
+                try:
+                    shape_index += 1
+                    shape_info_data = parse_shape(
+                        shape,
+                        slide_index=slide_index,
+                        shape_index=shape_index,
+                        image_dir=image_dir,
+                        indent=2,
+                        media=media,
+                    )
 
-        return slide_info
+                    # Apply preserved description if available
+                    if preserved_data:
+                        key = (slide_index, shape_info_data["name"])
+                        if key in preserved_data:
+                            shape_info_data["description"] = preserved_data[key]
+                            logger.debug("Preserved description for %s", key[1])
+
+                    slide_info["shapes"].append(shape_info_data)
+                except Exception as e:
+                    logger.warning(
+                        "Failed to parse shape %s on slide %s: %s",
+                        shape_index, slide_index, e,
+                    )
 
-    except Exception as e:
-        print(f"[ERROR] Parsing failed: {e}")
-        return None
-    finally:
-        if presentation:
-            presentation.Close()
+            report_snapshot_stats()
+            return media.publish(slide_info)
+
+        except Exception as e:
+            logger.error("Parsing failed: %s", e)
+            return None
+        finally:
+            media.close()
+            if presentation:
+                presentation.Close()
 
 
 def extract_metadata(presentation) -> dict:
@@ -215,7 +297,7 @@ def extract_metadata(presentation) -> dict:
                 value = None
             metadata["builtin_properties"][name] = value
     except Exception as e:
-        print(f"[WARN] Failed to extract BuiltInDocumentProperties: {e}")
+        logger.warning("Failed to extract BuiltInDocumentProperties: %s", e)
 
     try:
         for prop in presentation.CustomDocumentProperties:
@@ -226,12 +308,12 @@ def extract_metadata(presentation) -> dict:
                 value = None
             metadata["custom_properties"][name] = value
     except Exception as e:
-        print(f"[WARN] Failed to extract CustomDocumentProperties: {e}")
+        logger.warning("Failed to extract CustomDocumentProperties: %s", e)
 
     return metadata
 
 
-def get_presentation_metadata(ppt_path):
+def get_presentation_metadata(ppt_path, powerpoint=None):
     """
     Opens the presentation to extract metadata needed for deterministic UID generation.
     Returns a dict with 'title' and 'slide_count'.
@@ -239,7 +321,8 @@ def get_presentation_metadata(ppt_path):
     if not os.path.exists(ppt_path):
         return None
 
-    powerpoint = win32.gencache.EnsureDispatch("PowerPoint.Application")
+    if powerpoint is None:
+        powerpoint = dispatch_powerpoint()
     presentation = None
 
     try:
@@ -267,7 +350,7 @@ def get_presentation_metadata(ppt_path):
         }
 
     except Exception as e:
-        print(f"[ERROR] Failed to extract metadata from {ppt_path}: {e}")
+        logger.error("Failed to extract metadata from %s: %s", ppt_path, e)
         return None
     finally:
         if presentation:
@@ -277,6 +360,7 @@ def get_presentation_metadata(ppt_path):
                 pass
 
 
+@traced("thumbnail", lambda slide, slide_index, *args, **kwargs: f"thumbnail {slide_index}")
 def generate_slide_thumbnail(slide, slide_index, thumbnail_dir, max_dimension=1920):
     """
     Generate a thumbnail image for a single slide.
@@ -285,7 +369,7 @@ def generate_slide_thumbnail(slide, slide_index, thumbnail_dir, max_dimension=19
     """
     try:
         os.makedirs(thumbnail_dir, exist_ok=True)
-        thumbnail_filename = f"slide_{slide_index:03d}_thumb.png"
+        thumbnail_filename = base_thumbnail_filename(slide_index)
         thumbnail_path = os.path.join(thumbnail_dir, thumbnail_filename)
 
         # Get slide dimensions from presentation
@@ -307,169 +391,403 @@ def generate_slide_thumbnail(slide, slide_index, thumbnail_dir, max_dimension=19
         # Export slide as image
         slide.Export(thumbnail_path, "PNG", ScaleWidth=thumb_width, ScaleHeight=thumb_height)
 
-        print(f"  [INFO] Generated thumbnail: {thumbnail_filename} ({thumb_width}x{thumb_height})")
+        logger.debug(
+            "Generated thumbnail: %s (%sx%s)",
+            thumbnail_filename, thumb_width, thumb_height,
+        )
         return thumbnail_filename
     except Exception as e:
-        print(f"  [WARN] Failed to generate thumbnail for slide {slide_index}: {e}")
+        logger.warning("Failed to generate thumbnail for slide %s: %s", slide_index, e)
         return None
 
 
-def parse_presentation(
-    ppt_path, out_dir, debug=False, progress_callback=None, preserved_data=None
-):
+def render_slide_thumbnails(ppt_path, out_dir, slide_indices=None, powerpoint=None):
+    """
+    Render the full-size slide PNGs as a stage of its own (after the JSON exists).
+
+    Opens the deck read-only and exports ``slide_indices`` (default: every
+    slide) into <out_dir>/thumbnails. Returns {slide_index: filename} for the
+    thumbnails written.
+    """
     if not os.path.exists(ppt_path):
-        print(f"[ERROR] File not found: {ppt_path}")
-        return None
+        logger.error("File not found: %s", ppt_path)
+        return {}
 
-    os.makedirs(out_dir, exist_ok=True)
-    image_dir = os.path.join(out_dir, "images")
-    os.makedirs(image_dir, exist_ok=True)
     thumbnail_dir = os.path.join(out_dir, "thumbnails")
-    os.makedirs(thumbnail_dir, exist_ok=True)
+    owns_powerpoint = powerpoint is None
+    if owns_powerpoint:
+        powerpoint = dispatch_powerpoint()
+    presentation = None
+    rendered = {}
+
+    with trace_job(project_trace_path(out_dir), truncate=False):
+        try:
+            presentation = powerpoint.Presentations.Open(
+                ppt_path, ReadOnly=True, Untitled=True, WithWindow=True
+            )
+            slides_count = presentation.Slides.Count
+            if slide_indices is None:
+                slide_indices = range(1, slides_count + 1)
+            for slide_index in slide_indices:
+                if not 1 <= slide_index <= slides_count:
+                    continue
+                filename = generate_slide_thumbnail(
+                    presentation.Slides(slide_index), slide_index, thumbnail_dir
+                )
+                if filename:
+                    rendered[slide_index] = filename
+        except Exception as e:
+            logger.error("Thumbnail rendering failed: %s", e)
+        finally:
+            if presentation is not None:
+                try:
+                    presentation.Close()
+                except Exception:
+                    pass
+            if owns_powerpoint:
+                try:
+                    powerpoint.Quit()
+                except Exception:
+                    pass
+        return rendered
 
-    print(f"=== Parsing PowerPoint: {ppt_path} ===")
 
-    powerpoint = win32.gencache.EnsureDispatch("PowerPoint.Application")
-    presentation = None
+def parse_presentation(
+    ppt_path,
+    out_dir,
+    debug=False,
+    progress_callback=None,
+    preserved_data=None,
+    powerpoint=None,
+    profile=None,
+    asset_dir=None,
+    master_cache_dir=None,
+    previous_result=None,
+    thumbnails=True,
+    progressive=False,
+    resume=False,
+):
+    """
+    Parse a whole deck into <out_dir>/<basename>.json (plus images/thumbnails).
 
-    try:
-        # Untitled=True로 열어서 사본으로 작업 (Protected View 등 회피 시도)
-        presentation = powerpoint.Presentations.Open(
-            ppt_path, ReadOnly=False, Untitled=True, WithWindow=True
-        )
+    When ``powerpoint`` is given (a warm instance owned by the COM worker pool)
+    it is left running afterwards; otherwise a private instance is dispatched
+    and quit at the end, as before.
 
-        slide_width = float(presentation.PageSetup.SlideWidth)
-        slide_height = float(presentation.PageSetup.SlideHeight)
+    ``profile`` (default: PPT_COM_PROFILE) times every COM call and writes
+    <out_dir>/<basename>.profile.json.
 
-        slides_count = presentation.Slides.Count
-        print(f"Slides Count: {slides_count}")
+    ``asset_dir`` stores images in a shared content-addressed AssetStore and
+    records them as "assets/<sha256><ext>" instead of per-project images/.
 
-        # Convert to relative path from project root (3 levels up from backend/ppt_parser)
-        project_root = os.path.dirname(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        )
-        abs_ppt_path = os.path.abspath(ppt_path)
-        try:
-            rel_ppt_path = os.path.relpath(abs_ppt_path, project_root)
-            # Convert to forward slashes
-            rel_ppt_path = rel_ppt_path.replace(os.sep, "/")
-        except ValueError:
-            # If relpath fails (different drives on Windows), use absolute path
-            rel_ppt_path = abs_ppt_path.replace(os.sep, "/")
-
-        result = {
-            "ppt_path": rel_ppt_path,
-            "slides_count": slides_count,
-            "slide_width": slide_width,
-            "slide_height": slide_height,
-            "metadata": extract_metadata(presentation),
-            "masters": [],
-            "slides": [],
-        }
+    ``master_cache_dir`` reuses the masters block of previously parsed decks
+    with the same template (see master_cache.MasterCache).
 
-        # 마스터 / 레이아웃
-        if progress_callback:
-            progress_callback(10, "Parsing Masters...")
-        masters_info = parse_masters(presentation, image_dir)
-        result["masters"] = masters_info
+    ``previous_result`` (the project's current JSON) makes the parse
+    incremental: slides whose fingerprint is unchanged are kept as they are,
+    with their thumbnails and images (see incremental.reusable_slides).
 
-        # 슬라이드
-        target_indices = list(range(1, slides_count + 1))
-        target_indices = list(range(1, slides_count + 1))
+    ``thumbnails=False`` skips the per-slide PNG export; the slides keep
+    ``"thumbnail": None`` until render_slide_thumbnails() runs as a later stage.
 
-        total_slides = len(target_indices)
-        for i, slide_index in enumerate(target_indices):
-            if progress_callback:
-                # 10% ~ 90% mapped to slides
-                percent = 10 + int((i / total_slides) * 80)
-                progress_callback(percent, f"Parsing Slide {i + 1}/{total_slides}")
+    ``progressive`` flushes every finished slide to <out_dir>/.partial so the
+    API can serve them before the JSON is complete (see storage.load_partial_result).
+    That directory is also the checkpoint: it is kept when the parse fails, and
+    ``resume`` (implies ``progressive``) carries on from it, parsing only the
+    slides that were not finished (see storage.PartialResultWriter.resume).
+    """
+    if not os.path.exists(ppt_path):
+        logger.error("File not found: %s", ppt_path)
+        return None
 
-            try:
-                slide = presentation.Slides(slide_index)
-                shapes_count = slide.Shapes.Count
+    progressive = progressive or resume
+    resumed_slides, skip_slides = (
+        open_checkpoint(out_dir, ppt_path, resume) if progressive else ({}, [])
+    )
 
-                try:
-                    design_name = slide.Design.Name
-                except Exception:
-                    design_name = None
+    logger.info("=== Parsing PowerPoint: %s ===", ppt_path)
+    snapshot_stats.reset()
 
-                try:
-                    layout_name = slide.CustomLayout.Name
-                except Exception:
-                    layout_name = None
+    owns_powerpoint = powerpoint is None
+    if owns_powerpoint:
+        powerpoint = dispatch_powerpoint()
+    profiler = start_profiler(profile)
+    if profiler is not None:
+        powerpoint = profiler.wrap(powerpoint)
 
-                # Generate thumbnail for this slide
-                thumbnail_filename = generate_slide_thumbnail(
-                    slide, slide_index, thumbnail_dir
-                )
+    document = os.path.basename(ppt_path)
+    with trace_job(project_trace_path(out_dir)), span(document, "document", engine="com"):
+        try:
+            result = parse_slide_range(
+                ppt_path,
+                out_dir,
+                powerpoint=powerpoint,
+                progress_callback=progress_callback,
+                preserved_data=preserved_data,
+                asset_dir=asset_dir,
+                master_cache_dir=master_cache_dir,
+                previous_result=previous_result,
+                thumbnails=thumbnails,
+                progressive=progressive,
+                resumed_slides=resumed_slides,
+                skip_slides=skip_slides,
+            )
+            if result is None:
+                return None
 
-                slide_info = {
-                    "slide_index": slide_index,
-                    "slide_id": slide.SlideID,
-                    "shapes_count": shapes_count,
-                    "design_name": design_name,
-                    "layout_name": layout_name,
-                    "thumbnail": thumbnail_filename,
-                    "shapes": [],
-                }
+            if progress_callback:
+                progress_callback(95, "Saving JSON...")
 
-                print(f"--- Slide {slide_index} (Design: {design_name}) ---")
+            json_path = write_presentation_json(result, out_dir)
+            if progressive:
+                PartialResultWriter(out_dir).finish()
 
-                for shape_index, shape in enumerate(slide.Shapes):
-                    shape_index += 1
-                    shape_info = parse_shape(
-                        shape,
-                        slide_index=slide_index,
-                        shape_index=shape_index,
-                        image_dir=image_dir,
-                        indent=2,
-                        max_z=shapes_count,
-                        context="slide",
-                    )
+            logger.info("JSON metadata saved to: %s", json_path)
+            logger.info("Images saved under : %s", os.path.join(out_dir, 'images'))
+            report_snapshot_stats()
+            if profiler is not None:
+                profiler.write_report(project_profile_path(out_dir))
 
-                    # Apply preserved description if available
-                    if preserved_data:
-                        key = (slide_index, shape.Name)
-                        if key in preserved_data:
-                            shape_info["description"] = preserved_data[key]
-                            print(f"  [INFO] Preserved description for {shape.Name}")
+            if progress_callback:
+                progress_callback(100, "Done")
 
-                    slide_info["shapes"].append(shape_info)
+            return json_path
 
-                result["slides"].append(slide_info)
+        except Exception as e:
+            logger.error("Parsing failed: %s", e)
+            if progress_callback:
+                progress_callback(-1, f"Error: {e}")
+            return None
+        finally:
+            if owns_powerpoint:
+                try:
+                    powerpoint.Quit()
+                except Exception:
+                    pass
+            logger.info("=== Parse Done ===")
+
+
+def parse_slide_range(
+    ppt_path,
+    out_dir,
+    powerpoint,
+    first=1,
+    last=None,
+    include_masters=True,
+    read_only=False,
+    progress_callback=None,
+    preserved_data=None,
+    asset_dir=None,
+    master_cache_dir=None,
+    previous_result=None,
+    thumbnails=True,
+    progressive=False,
+    resumed_slides=None,
+    skip_slides=(),
+):
+    """
+    Parse slides ``first``..``last`` (1-based, inclusive) into a result dict.
+
+    This is the body of parse_presentation() without writing the JSON; the
+    parallel parser (parallel.parse_presentation_parallel) runs it once per
+    slide range in separate workers and merges the dicts. Thumbnails and
+    images are written to out_dir as usual. ``include_masters=False`` leaves
+    "masters" empty, ``read_only`` opens the file read-only (workers get
+    their own copy). ``progressive`` publishes each slide through a
+    storage.PartialResultWriter as soon as it is done (the header once the
+    masters are in) and counts an attempt at each slide it starts.
+    ``resumed_slides`` ({slide_index: slide_info} from a checkpoint) are taken
+    as they are and ``skip_slides`` are left out, like slides that failed to
+    parse. Returns None if the deck could not be parsed.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    image_dir = os.path.join(out_dir, "images")
+    os.makedirs(image_dir, exist_ok=True)
+    thumbnail_dir = os.path.join(out_dir, "thumbnails")
+    os.makedirs(thumbnail_dir, exist_ok=True)
 
-            except Exception as e:
-                print(f"[ERROR] Failed to parse slide {slide_index}: {e}")
+    media = MediaExtractor(
+        ppt_path, image_dir, assets=AssetStore(asset_dir) if asset_dir else None
+    )
+    master_cache = (
+        MasterCache(master_cache_dir, assets=media.assets) if master_cache_dir else None
+    )
+    partial = PartialResultWriter(out_dir) if progressive else None
+    presentation = None
 
-        if progress_callback:
-            progress_callback(95, "Saving JSON...")
+    chunk = f"slides {first}-{last or 'end'}"
+    with trace_job(project_trace_path(out_dir), truncate=False), span(chunk, "document"):
+        try:
+            # Untitled=True로 열어서 사본으로 작업 (Protected View 등 회피 시도)
+            presentation = powerpoint.Presentations.Open(
+                ppt_path, ReadOnly=read_only, Untitled=True, WithWindow=True
+            )
 
-        base_name = os.path.splitext(os.path.basename(out_dir))[0]
-        json_path = os.path.join(out_dir, f"{base_name}.json")
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2, default=str)
+            slide_width = float(presentation.PageSetup.SlideWidth)
+            slide_height = float(presentation.PageSetup.SlideHeight)
+
+            slides_count = presentation.Slides.Count
+            logger.info("Slides Count: %s", slides_count)
+
+            result = {
+                "ppt_path": project_relative_path(ppt_path),
+                "parser_engine": "com",
+                "slides_count": slides_count,
+                "slide_width": slide_width,
+                "slide_height": slide_height,
+                "metadata": extract_metadata(presentation),
+                "masters": [],
+                "slides": [],
+            }
 
-        print(f"[INFO] JSON metadata saved to: {json_path}")
-        print(f"[INFO] Images saved under : {image_dir}")
+            # 마스터 / 레이아웃
+            if include_masters:
+                if progress_callback:
+                    progress_callback(10, "Parsing Masters...")
+                with span("masters", "master"):
+                    masters_info, template_fp = parse_masters_cached(
+                        presentation, image_dir, media=media, cache=master_cache
+                    )
+                result["masters"] = masters_info
+                if template_fp:
+                    result["template_fingerprint"] = template_fp
+                if partial is not None:
+                    partial.begin(result)
+
+            # 슬라이드
+            last = slides_count if last is None else min(last, slides_count)
+            target_indices = list(range(max(1, first), last + 1))
+            fingerprints = slide_fingerprints(media.package) if media.active else {}
+            unchanged = reusable_slides(
+                previous_result, fingerprints, out_dir, "com", asset_dir=asset_dir
+            )
+            unchanged = {i: s for i, s in unchanged.items() if i in target_indices}
+            if unchanged:
+                logger.info(
+                    "%s/%s slide(s) unchanged since last parse",
+                    len(unchanged), len(target_indices),
+                )
+            resumed = {i: s for i, s in (resumed_slides or {}).items() if i in target_indices}
+            if resumed:
+                logger.info(
+                    "Resuming: %s/%s slide(s) already parsed", len(resumed), len(target_indices)
+                )
+                unchanged.update(resumed)
+
+            total_slides = len(target_indices)
+            for i, slide_index in enumerate(target_indices):
+                if progress_callback:
+                    # 10% ~ 90% mapped to slides
+                    percent = 10 + int((i / total_slides) * 80)
+                    progress_callback(percent, f"Parsing Slide {i + 1}/{total_slides}")
+
+                if slide_index in unchanged:
+                    result["slides"].append(unchanged[slide_index])
+                    if partial is not None and slide_index not in resumed:
+                        partial.add_slide(unchanged[slide_index])
+                    continue
+
+                if slide_index in skip_slides:
+                    logger.error(
+                        "Skipping slide %s: earlier parses were interrupted on it", slide_index
+                    )
+                    # A placeholder keeps the slide count; the project lists what is missing
+                    placeholder = skipped_slide(slide_index)
+                    result["slides"].append(placeholder)
+                    result.setdefault(SKIPPED_SLIDES_KEY, []).append(slide_index)
+                    if partial is not None:
+                        partial.add_slide(placeholder)
+                    continue
 
-        if progress_callback:
-            progress_callback(100, "Done")
+                if partial is not None:
+                    partial.start_slide(slide_index)
 
-        return json_path
+                try:
+                    with span(f"slide {slide_index}", "slide"):
+                        slide = presentation.Slides(slide_index)
+                        label_com_object(slide, context="slide", slide_index=slide_index)
+                        shapes_count = slide.Shapes.Count
+
+                        try:
+                            design_name = slide.Design.Name
+                        except Exception:
+                            design_name = None
+
+                        try:
+                            layout_name = slide.CustomLayout.Name
+                        except Exception:
+                            layout_name = None
+
+                        # Generate thumbnail for this slide
+                        thumbnail_filename = None
+                        if thumbnails:
+                            thumbnail_filename = generate_slide_thumbnail(
+                                slide, slide_index, thumbnail_dir
+                            )
+
+                        slide_info = {
+                            "slide_index": slide_index,
+                            "slide_id": slide.SlideID,
+                            "shapes_count": shapes_count,
+                            "design_name": design_name,
+                            "layout_name": layout_name,
+                            "thumbnail": thumbnail_filename,
+                            "shapes": [],
+                        }
+                        if slide_index in fingerprints:
+                            slide_info["fingerprint"] = fingerprints[slide_index]
+
+                        logger.info("--- Slide %s (Design: %s) ---", slide_index, design_name)
+
+                        for shape_index, shape in enumerate(slide.Shapes):
+                            shape_index += 1
+                            shape_info = parse_shape(
+                                shape,
+                                slide_index=slide_index,
+                                shape_index=shape_index,
+                                image_dir=image_dir,
+                                indent=2,
+                                max_z=shapes_count,
+                                context="slide",
+                                media=media,
+                            )
+
+                            # Apply preserved description if available
+                            if preserved_data:
+                                key = (slide_index, shape_info["name"])
+                                if key in preserved_data:
+                                    shape_info["description"] = preserved_data[key]
+                                    logger.debug("Preserved description for %s", key[1])
+
+                            slide_info["shapes"].append(shape_info)
+
+                        result["slides"].append(slide_info)
+                        if partial is not None:
+                            # Images the slide points to must be on disk before it is served
+                            partial.add_slide(media.publish(slide_info))
+
+                except Exception as e:
+                    logger.error("Failed to parse slide %s: %s", slide_index, e)
+                    placeholder = skipped_slide(slide_index, "parse failed")
+                    result["slides"].append(placeholder)
+                    result.setdefault(SKIPPED_SLIDES_KEY, []).append(slide_index)
+                    if partial is not None:
+                        partial.add_slide(placeholder)
+
+            # Pending media copies must land before the JSON references them
+            media.publish(result["slides"])
+            media.close()
+            return result
 
-    except Exception as e:
-        print(f"[ERROR] Parsing failed: {e}")
-        if progress_callback:
-            progress_callback(-1, f"Error: {e}")
-        return None
-    finally:
-        if presentation is not None:
-            try:
-                presentation.Close()
-            except Exception:
-                pass
-        try:
-            powerpoint.Quit()
-        except Exception:
-            pass
-        print("=== Parse Done ===")
+        except Exception as e:
+            logger.error("Parsing failed: %s", e)
+            if progress_callback:
+                progress_callback(-1, f"Error: {e}")
+            return None
+        finally:
+            media.close()
+            if presentation is not None:
+                try:
+                    presentation.Close()
+                except Exception:
+                    pass
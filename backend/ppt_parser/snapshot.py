@@ -0,0 +1,128 @@
+"""
+Memoizing proxy for PowerPoint COM objects.
+
+Every property read on a COM object is a cross-process round-trip, and the
+extraction pipeline (shapes -> styles / tables / images) reads the same
+properties many times per shape (``Type`` alone five or more). ``ComSnapshot``
+wraps a COM object, fetches each property once and serves repeats from memory.
+Child objects (``TextFrame``, ``Fill``, ``Font``...) are wrapped as well, so a
+whole property path like ``shape.TextFrame.TextRange.Text`` is fetched once.
+
+Method calls (``Export``, ``Item``, ``Cell``...) always go to COM. Property
+writes go to COM too and drop the object's memoized values, because PowerPoint
+may adjust related properties (e.g. ``Height`` with a locked aspect ratio).
+
+``snapshot_stats`` counts real fetches vs. reads served from memory so parse
+runs can report how many round-trips were saved.
+"""
+
+import threading
+import types
+
+_PLAIN_TYPES = (str, bytes, int, float, bool, complex, type(None), tuple, list, dict)
+_METHOD_TYPES = (types.MethodType, types.BuiltinMethodType, types.FunctionType)
+
+
+class SnapshotStats:
+    """Per-process counters for COM property reads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fetched = 0
+        self.saved = 0
+        self.writes = 0
+
+    def reset(self):
+        with self._lock:
+            self.fetched = self.saved = self.writes = 0
+
+    def as_dict(self):
+        with self._lock:
+            return {"fetched": self.fetched, "saved": self.saved, "writes": self.writes}
+
+    def _add(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+snapshot_stats = SnapshotStats()
+
+
+class _Raised:
+    """A memoized exception: failing probes (e.g. ``Connector``) are not retried."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class ComSnapshot:
+    """Read-once view of a COM object; see the module docstring."""
+
+    __slots__ = ("_com_target", "_com_cache", "_com_stats")
+
+    def __init__(self, target, stats: SnapshotStats = snapshot_stats):
+        object.__setattr__(self, "_com_target", target)
+        object.__setattr__(self, "_com_cache", {})
+        object.__setattr__(self, "_com_stats", stats)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        cache = self._com_cache
+        if name in cache:
+            self._com_stats._add("saved")
+            value = cache[name]
+        else:
+            self._com_stats._add("fetched")
+            try:
+                value = getattr(self._com_target, name)
+            except Exception as e:
+                value = _Raised(e)
+            if not isinstance(value, _METHOD_TYPES):
+                value = _wrap(value, self._com_stats)
+                cache[name] = value
+        if isinstance(value, _Raised):
+            raise value.error
+        return value
+
+    def __setattr__(self, name, value):
+        if isinstance(value, ComSnapshot):
+            value = value._com_target
+        setattr(self._com_target, name, value)
+        self._com_cache.clear()
+        self._com_stats._add("writes")
+
+    def __call__(self, *args, **kwargs):
+        return self._com_target(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._com_target)
+
+    def __len__(self):
+        return len(self._com_target)
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return f"<ComSnapshot of {self._com_target!r}>"
+
+    @property
+    def com_object(self):
+        """The wrapped COM object (for passing back into COM calls)."""
+        return self._com_target
+
+
+def _wrap(value, stats):
+    if isinstance(value, (_PLAIN_TYPES, ComSnapshot, _Raised)):
+        return value
+    return ComSnapshot(value, stats)
+
+
+def snapshot(com_object, stats: SnapshotStats = snapshot_stats):
+    """Wrap a COM object in a ComSnapshot (no-op for None or an existing snapshot)."""
+    if com_object is None or isinstance(com_object, ComSnapshot):
+        return com_object
+    return ComSnapshot(com_object, stats)
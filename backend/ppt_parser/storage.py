@@ -0,0 +1,674 @@
+"""
+Project JSON output shared by the parsing engines.
+
+``PartialResultWriter`` flushes slides as they finish and doubles as the parse
+checkpoint; ``snapshot_project_json`` keeps the unedited parse for reuse.
+Project JSON is minified by default (PPT_PROJECT_FORMAT: ``compact``,
+``gzip``, ``zstd`` or ``pretty``) and sharded into one file per slide
+(PPT_PROJECT_LAYOUT=single keeps one file). ``load_project_json`` reads
+every form, so projects written before a switch keep loading.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import datetime
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .palette import PALETTE_KEY, intern_styles, is_interned, resolve_styles
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_DIR_NAME = ".partial"
+_SLIDE_FILE = re.compile(r"^slide_(\d+)\.json$")
+_STARTED_FILE = re.compile(r"^slide_(\d+)\.started$")
+
+# A slide that was in progress this many times when the parse died is given up on
+MAX_SLIDE_ATTEMPTS = 2
+# Project key listing the slides given up on (interrupted too often, or failed)
+SKIPPED_SLIDES_KEY = "skipped_slides"
+
+
+def skipped_slide(slide_index: int, error: str = "parse interrupted") -> Dict[str, Any]:
+    """Placeholder entry of a slide that was given up on."""
+    return {"slide_index": slide_index, "error": error, "shapes": []}
+
+
+def project_json_path(out_dir: str) -> str:
+    """<out_dir>/<basename>.json — where a parse of out_dir is stored."""
+    base_name = os.path.splitext(os.path.basename(os.path.normpath(out_dir)))[0]
+    return os.path.join(out_dir, f"{base_name}.json")
+
+
+def project_profile_path(out_dir: str) -> str:
+    """<out_dir>/<basename>.profile.json — COM profile report of the last parse."""
+    return os.path.splitext(project_json_path(out_dir))[0] + ".profile.json"
+
+
+def project_trace_path(out_dir: str) -> str:
+    """<out_dir>/<basename>.trace.jsonl — timed spans of the last parse (see tracing.py)."""
+    return os.path.splitext(project_json_path(out_dir))[0] + ".trace.jsonl"
+
+
+def project_snapshot_path(out_dir: str) -> str:
+    """<out_dir>/<basename>.parsed.json — the JSON as the parse produced it, before edits."""
+    return os.path.splitext(project_json_path(out_dir))[0] + ".parsed.json"
+
+
+def intern_styles_enabled() -> bool:
+    """PPT_INTERN_STYLES=1 stores project JSON with a style palette (see palette.py)."""
+    return os.environ.get("PPT_INTERN_STYLES", "").lower() in ("1", "true", "yes", "on")
+
+
+PROJECT_FORMATS = ("compact", "gzip", "zstd", "pretty")
+# Leading bytes of a compressed project JSON; plain JSON starts with "{"
+_MAGIC = {"gzip": b"\x1f\x8b", "zstd": b"\x28\xb5\x2f\xfd"}
+
+
+def _zstandard():
+    """The zstandard module, or None if it is not installed."""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def project_json_format() -> str:
+    """Form of newly written project JSON (PPT_PROJECT_FORMAT, default "compact")."""
+    fmt = os.environ.get("PPT_PROJECT_FORMAT", "compact").strip().lower()
+    if fmt not in PROJECT_FORMATS:
+        logger.warning("Unknown PPT_PROJECT_FORMAT %r; writing compact JSON", fmt)
+        return "compact"
+    if fmt == "zstd" and _zstandard() is None:
+        logger.warning("zstandard is not installed; writing gzip project JSON")
+        return "gzip"
+    return fmt
+
+
+def stored_encoding(head: bytes) -> Optional[str]:
+    """Content coding named by the first bytes of a project file ("gzip", "zstd" or None)."""
+    for encoding, magic in _MAGIC.items():
+        if head.startswith(magic):
+            return encoding
+    return None
+
+
+def project_json_encoding(json_path: str) -> Optional[str]:
+    """Content coding of a stored project JSON: "gzip", "zstd", or None for plain JSON."""
+    with open(json_path, "rb") as f:
+        return stored_encoding(f.read(4))
+
+
+def open_project_json(json_path: str) -> BinaryIO:
+    """Binary stream of the JSON text of a project file in any stored form."""
+    encoding = project_json_encoding(json_path)
+    if encoding == "gzip":
+        return gzip.open(json_path, "rb")
+    if encoding == "zstd":
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError(f"{json_path} is zstd-compressed; install zstandard to read it")
+        return zstandard.ZstdDecompressor().stream_reader(open(json_path, "rb"), closefd=True)
+    return open(json_path, "rb")
+
+
+def decode_project_bytes(raw: bytes) -> bytes:
+    """JSON text of the stored bytes of a project file (see ``open_project_json``)."""
+    encoding = stored_encoding(raw)
+    if encoding == "gzip":
+        return gzip.decompress(raw)
+    if encoding == "zstd":
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed project JSON; install zstandard to read it")
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(raw)) as reader:
+            return reader.read()
+    return raw
+
+
+def encode_project_json(data: Dict[str, Any], fmt: str = "compact") -> bytes:
+    """Stored bytes of a project dict in one of PROJECT_FORMATS."""
+    if fmt == "pretty":
+        text = json.dumps(data, ensure_ascii=False, indent=2, default=str)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+    raw = text.encode("utf-8")
+    if fmt == "gzip":
+        # mtime=0: the same document always gives the same bytes (and ETag)
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+    if fmt == "zstd":
+        return _zstandard().ZstdCompressor(level=3).compress(raw)
+    return raw
+
+
+PROJECT_LAYOUTS = ("sharded", "single")
+SLIDES_DIR_NAME = "slides"
+# Manifest key listing the slide files of a sharded project, in slide order
+SLIDE_FILES_KEY = "slide_files"
+_SLIDE_FILES_MARKER = json.dumps(SLIDE_FILES_KEY).encode()
+_SHARD_FILE = re.compile(r"^slide_(\d+)\.[0-9a-f]+\.json$")
+# An unreferenced slide file younger than this may belong to a save in progress
+ORPHAN_GRACE_SECONDS = 300
+
+
+def project_layout() -> str:
+    """Layout of newly written project JSON (PPT_PROJECT_LAYOUT, default "sharded")."""
+    layout = os.environ.get("PPT_PROJECT_LAYOUT", "sharded").strip().lower()
+    if layout not in PROJECT_LAYOUTS:
+        logger.warning("Unknown PPT_PROJECT_LAYOUT %r; writing sharded projects", layout)
+        return "sharded"
+    return layout
+
+
+def is_sharded(doc: Any) -> bool:
+    return isinstance(doc, dict) and SLIDE_FILES_KEY in doc
+
+
+def _read_text(path: str) -> bytes:
+    with open_project_json(path) as f:
+        return f.read()
+
+
+def _write_bytes_atomic(path: str, raw: bytes):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(raw)
+    os.replace(tmp_path, path)
+
+
+def _shard_index(name: str) -> Optional[int]:
+    match = _SHARD_FILE.match(os.path.basename(name))
+    return int(match.group(1)) if match else None
+
+
+def assemble_project(json_path: str, doc: Dict[str, Any]) -> int:
+    """Replace the slide file list of a manifest by the slides; returns the JSON bytes read."""
+    if not is_sharded(doc):
+        return 0
+    base_dir = os.path.dirname(json_path)
+    slides = []
+    size = 0
+    for name in doc.pop(SLIDE_FILES_KEY):
+        text = _read_text(os.path.join(base_dir, name))
+        size += len(text)
+        slides.append(json.loads(text))
+    doc["slides"] = slides
+    return size
+
+
+def load_project_json(json_path: str) -> Dict[str, Any]:
+    """Read a project JSON, expanding an interned style palette if there is one."""
+    with open_project_json(json_path) as f:
+        doc = json.load(f)
+    assemble_project(json_path, doc)
+    return resolve_styles(doc)
+
+
+def _in_range(slide_index: Optional[int], indices, first: int, last: Optional[int]) -> bool:
+    if slide_index is None:
+        return False
+    if indices is not None and slide_index not in indices:
+        return False
+    return first <= slide_index and (last is None or slide_index <= last)
+
+
+def project_slide_files(
+    json_path: str, indices: Optional[Iterable[int]] = None, first: int = 1,
+    last: Optional[int] = None,
+) -> Optional[List[str]]:
+    """Slide files of the selected slides of a sharded project; None for a single file."""
+    with open_project_json(json_path) as f:
+        doc = json.load(f)
+    if not is_sharded(doc):
+        return None
+    indices = set(indices) if indices is not None else None
+    return [
+        name for name in doc[SLIDE_FILES_KEY]
+        if _in_range(_shard_index(name), indices, first, last)
+    ]
+
+
+def load_project_slides(
+    json_path: str, indices: Optional[Iterable[int]] = None, first: int = 1,
+    last: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[List[str]]]:
+    """The slides with ``slide_index`` in ``indices`` and between ``first`` and ``last``.
+
+    Only their slide files are read from a sharded project. Returns (slides,
+    slide files read), the files being None for a single-file project.
+    """
+    indices = set(indices) if indices is not None else None
+    with open_project_json(json_path) as f:
+        doc = json.load(f)
+    if not is_sharded(doc):
+        slides = [
+            slide for slide in resolve_styles(doc).get("slides") or []
+            if _in_range(slide.get("slide_index"), indices, first, last)
+        ]
+        return slides, None
+
+    base_dir = os.path.dirname(json_path)
+    names = [
+        name for name in doc[SLIDE_FILES_KEY]
+        if _in_range(_shard_index(name), indices, first, last)
+    ]
+    slides = [json.loads(_read_text(os.path.join(base_dir, name))) for name in names]
+    if is_interned(doc):
+        # Style references point into the palette kept in the manifest
+        slides = resolve_styles({PALETTE_KEY: doc[PALETTE_KEY], "slides": slides})["slides"]
+    return slides, names
+
+
+def iter_project_document(
+    json_path: str,
+    chunk_size: int = 256 * 1024,
+    overlay: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    overlay_slides: Iterable[int] = (),
+) -> Iterator[bytes]:
+    """JSON text of a whole project, sharded or not, without decoding the slides.
+
+    The slides whose index is in ``overlay_slides`` are the exception: they
+    are decoded, passed through ``overlay`` and encoded again (for a
+    single-file project that means the whole document).
+    """
+    overlay_slides = set(overlay_slides) if overlay else set()
+    text = _read_text(json_path)
+    doc = json.loads(text) if _SLIDE_FILES_MARKER in text or overlay_slides else None
+    if not is_sharded(doc):
+        if overlay_slides:
+            doc["slides"] = [
+                overlay(slide) if slide.get("slide_index") in overlay_slides else slide
+                for slide in doc.get("slides") or []
+            ]
+            text = encode_project_json(doc)
+        for offset in range(0, len(text), chunk_size):
+            yield text[offset:offset + chunk_size]
+        return
+
+    base_dir = os.path.dirname(json_path)
+    names = doc.pop(SLIDE_FILES_KEY)
+    header = json.dumps(doc, ensure_ascii=False, separators=(",", ":"), default=str).encode()
+    # Slides are small: they are sent in chunks of about chunk_size, not one by one
+    buffer = bytearray(header[:-1] + (b',"slides":[' if doc else b'"slides":['))
+    for position, name in enumerate(names):
+        if position:
+            buffer += b","
+        raw = _read_text(os.path.join(base_dir, name))
+        if _shard_index(name) in overlay_slides:
+            raw = encode_project_json(overlay(json.loads(raw)))
+        buffer += raw
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    yield bytes(buffer + b"]}")
+
+
+def _write_slide_files(
+    project_dir: str, slides: List[Dict[str, Any]], fmt: str
+) -> List[str]:
+    slides_dir = os.path.join(project_dir, SLIDES_DIR_NAME)
+    os.makedirs(slides_dir, exist_ok=True)
+    names = []
+    for position, slide in enumerate(slides, start=1):
+        raw = encode_project_json(slide, fmt)
+        slide_index = slide.get("slide_index") or position
+        name = f"slide_{slide_index:03d}.{hashlib.sha256(raw).hexdigest()[:16]}.json"
+        path = os.path.join(slides_dir, name)
+        try:
+            # Unchanged slide: keep the file, and keep it from being collected meanwhile
+            os.utime(path)
+        except FileNotFoundError:
+            _write_bytes_atomic(path, raw)
+        names.append(f"{SLIDES_DIR_NAME}/{name}")
+    return names
+
+
+def _manifest_slide_files(path: str) -> List[str]:
+    try:
+        with open_project_json(path) as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return doc.get(SLIDE_FILES_KEY) or [] if isinstance(doc, dict) else []
+
+
+def collect_slide_files(project_dir: str, grace: float = ORPHAN_GRACE_SECONDS) -> int:
+    """Remove slide files neither the project JSON nor its snapshot refers to; returns count."""
+    slides_dir = os.path.join(project_dir, SLIDES_DIR_NAME)
+    try:
+        names = os.listdir(slides_dir)
+    except OSError:
+        return 0
+    referenced = set()
+    for manifest in (project_json_path(project_dir), project_snapshot_path(project_dir)):
+        referenced.update(os.path.basename(name) for name in _manifest_slide_files(manifest))
+    cutoff = time.time() - grace
+    removed = 0
+    for name in names:
+        path = os.path.join(slides_dir, name)
+        if name in referenced or not _SHARD_FILE.match(name):
+            continue
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def save_project_json(
+    json_path: str, data: Dict[str, Any], fmt: Optional[str] = None,
+    layout: Optional[str] = None,
+) -> str:
+    """Write a project JSON, interned when PPT_INTERN_STYLES is on; returns the path.
+
+    ``fmt`` defaults to ``project_json_format()``, ``layout`` to ``project_layout()``.
+    """
+    if intern_styles_enabled():
+        data = intern_styles(data)
+    fmt = fmt or project_json_format()
+    project_dir = os.path.dirname(json_path)
+    if (layout or project_layout()) == "sharded":
+        manifest = {key: value for key, value in data.items() if key != "slides"}
+        manifest[SLIDE_FILES_KEY] = _write_slide_files(project_dir, data.get("slides") or [], fmt)
+        data = manifest
+    # Replaced, not rewritten in place: a snapshot linked to the old file keeps it
+    _write_bytes_atomic(json_path, encode_project_json(data, fmt))
+    collect_slide_files(project_dir)
+    return json_path
+
+
+def save_project_slides(
+    json_path: str, slides: List[Dict[str, Any]], fmt: Optional[str] = None
+) -> str:
+    """Store changed slides of a project, replacing those with the same ``slide_index``.
+
+    In a sharded project <basename>.json is a manifest whose ``"slide_files"``
+    lists slides/slide_NNN.<hash>.json in slide order. Files are named by
+    their content, so only these slides and a new manifest are written; the
+    manifest is replaced last, so readers see the old or the new version.
+    Slide files no manifest refers to are removed on a later save. Other
+    projects (single file, or an interned palette that may need new styles)
+    are loaded and saved whole.
+    """
+    with open_project_json(json_path) as f:
+        doc = json.load(f)
+    if not is_sharded(doc) or is_interned(doc) or intern_styles_enabled():
+        data = load_project_json(json_path)
+        _replace_slides(data.setdefault("slides", []), slides)
+        return save_project_json(json_path, data, fmt)
+
+    fmt = fmt or project_json_format()
+    project_dir = os.path.dirname(json_path)
+    by_index = {_shard_index(name): name for name in doc[SLIDE_FILES_KEY]}
+    for slide, name in zip(slides, _write_slide_files(project_dir, slides, fmt)):
+        by_index[slide.get("slide_index")] = name
+    doc[SLIDE_FILES_KEY] = [by_index[index] for index in sorted(by_index, key=lambda i: i or 0)]
+    _write_bytes_atomic(json_path, encode_project_json(doc, fmt))
+    collect_slide_files(project_dir)
+    return json_path
+
+
+def _replace_slides(current: List[Dict[str, Any]], slides: List[Dict[str, Any]]):
+    position = {slide.get("slide_index"): i for i, slide in enumerate(current)}
+    for slide in slides:
+        index = slide.get("slide_index")
+        if index in position:
+            current[position[index]] = slide
+        else:
+            current.append(slide)
+    current.sort(key=lambda slide: slide.get("slide_index") or 0)
+
+
+def write_presentation_json(result: dict, out_dir: str) -> str:
+    """Write a parse result to <out_dir>/<basename>.json and return the path."""
+    return save_project_json(project_json_path(out_dir), result)
+
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Other volume, or a file system without hard links
+        shutil.copy2(src, dst)
+
+
+def snapshot_project_json(out_dir: str) -> str:
+    """Keep the current project JSON of out_dir as its parse snapshot; returns the path.
+
+    The snapshot (<basename>.parsed.json) is a hard link to the JSON as the
+    parser wrote it. Edits live in the annotations DB and later writes replace
+    <basename>.json through a temporary file, so the link keeps the unedited
+    parse (and shares its slide files) for ``clone_project_artifacts``.
+    """
+    snapshot_path = project_snapshot_path(out_dir)
+    tmp_path = f"{snapshot_path}.tmp{os.getpid()}"
+    _link_or_copy(project_json_path(out_dir), tmp_path)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+# Parse output besides the JSON; shared read-only between clones of a project
+ARTIFACT_DIRS = ("images", "thumbnails", SLIDES_DIR_NAME)
+
+
+def clone_project_artifacts(src_dir: str, dst_dir: str) -> Optional[str]:
+    """Start dst_dir as a copy of the parse snapshot of src_dir.
+
+    The snapshot, images and thumbnails are hard-linked (copied where links
+    are not possible). Returns the new project JSON path, or None if src_dir
+    has no snapshot.
+    """
+    snapshot_path = project_snapshot_path(src_dir)
+    if not os.path.exists(snapshot_path):
+        return None
+    os.makedirs(dst_dir, exist_ok=True)
+    for name in ARTIFACT_DIRS:
+        for root, _, files in os.walk(os.path.join(src_dir, name)):
+            target_dir = os.path.join(dst_dir, os.path.relpath(root, src_dir))
+            os.makedirs(target_dir, exist_ok=True)
+            for filename in files:
+                target = os.path.join(target_dir, filename)
+                if not os.path.exists(target):
+                    _link_or_copy(os.path.join(root, filename), target)
+
+    json_path = project_json_path(dst_dir)
+    for target in (json_path, project_snapshot_path(dst_dir)):
+        tmp_path = f"{target}.tmp{os.getpid()}"
+        _link_or_copy(snapshot_path, tmp_path)
+        os.replace(tmp_path, target)
+    return json_path
+
+
+def _write_json_atomic(path: str, data: Any):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, default=str)
+    os.replace(tmp_path, path)
+
+
+def source_signature(ppt_path: str) -> Dict[str, Any]:
+    """Size and mtime of a deck; a checkpoint is only resumed for the same file."""
+    stats = os.stat(ppt_path)
+    return {"size": stats.st_size, "mtime": stats.st_mtime}
+
+
+def _ready_slides(partial_dir: str) -> List[int]:
+    try:
+        names = os.listdir(partial_dir)
+    except OSError:
+        return []
+    return sorted(int(m.group(1)) for m in map(_SLIDE_FILE.match, names) if m)
+
+
+class PartialResultWriter:
+    """Flushes parsed slides of one project as they finish.
+
+    Slides go to <out_dir>/.partial/slide_NNN.json next to a manifest.json with
+    the document header and the slides ready so far; ``load_partial_result``
+    serves them as a ``"partial": true`` project until the full JSON exists.
+    The directory is also the checkpoint: it records the source deck's
+    ``source_signature`` and a slide_NNN.started file counts the attempts at
+    each slide. ``resume`` hands finished slides to the next run of the same
+    file, and a slide interrupted ``MAX_SLIDE_ATTEMPTS`` times is skipped: it
+    gets a ``skipped_slide`` placeholder and is listed under
+    ``"skipped_slides"``, so the slide count still matches the deck.
+
+    Only holds the output path, so it can be handed to pool workers; slide
+    files are named by index and the ready list is rebuilt from the directory,
+    so workers parsing different slide ranges can share one writer.
+    """
+
+    def __init__(self, out_dir: str):
+        self.partial_dir = os.path.join(out_dir, PARTIAL_DIR_NAME)
+
+    def begin(self, header: Dict[str, Any]):
+        """Record the document header (everything but "slides")."""
+        os.makedirs(self.partial_dir, exist_ok=True)
+        self._write_manifest({k: v for k, v in header.items() if k != "slides"})
+
+    def reset(self, source: Dict[str, Any]):
+        """Drop any earlier checkpoint and start one for ``source`` (see source_signature)."""
+        self.finish()
+        os.makedirs(self.partial_dir, exist_ok=True)
+        _write_json_atomic(os.path.join(self.partial_dir, "source.json"), source)
+
+    def resume(
+        self, source: Dict[str, Any], max_attempts: int = MAX_SLIDE_ATTEMPTS
+    ) -> Optional[Tuple[Dict[int, Dict[str, Any]], List[int]]]:
+        """(finished slides by index, slides to skip) of a checkpoint of ``source``.
+
+        Returns None, after clearing the directory, when there is no checkpoint
+        or it was written for another version of the file.
+        """
+        try:
+            with open(os.path.join(self.partial_dir, "source.json"), "r", encoding="utf-8") as f:
+                checkpoint_source = json.load(f)
+        except (OSError, ValueError):
+            checkpoint_source = None
+        if checkpoint_source != source:
+            self.reset(source)
+            return None
+
+        slides = {}
+        for slide_index in _ready_slides(self.partial_dir):
+            try:
+                with open(self._slide_path(slide_index), "r", encoding="utf-8") as f:
+                    slides[slide_index] = json.load(f)
+            except (OSError, ValueError):
+                continue
+        skipped = [
+            slide_index
+            for slide_index, attempts in self._attempts().items()
+            if slide_index not in slides and attempts >= max_attempts
+        ]
+        return slides, sorted(skipped)
+
+    def start_slide(self, slide_index: int) -> int:
+        """Count one more attempt at ``slide_index``; returns the attempt number."""
+        attempts = self._attempts().get(slide_index, 0) + 1
+        os.makedirs(self.partial_dir, exist_ok=True)
+        started_path = os.path.join(self.partial_dir, f"slide_{slide_index:03d}.started")
+        with open(started_path, "w", encoding="utf-8") as f:
+            f.write(str(attempts))
+        return attempts
+
+    def add_slide(self, slide_info: Dict[str, Any]):
+        os.makedirs(self.partial_dir, exist_ok=True)
+        _write_json_atomic(self._slide_path(int(slide_info["slide_index"])), slide_info)
+        manifest = self._read_manifest()
+        if manifest is not None:
+            self._write_manifest(manifest.get("header") or {})
+
+    def finish(self):
+        shutil.rmtree(self.partial_dir, ignore_errors=True)
+
+    def _slide_path(self, slide_index: int) -> str:
+        return os.path.join(self.partial_dir, f"slide_{slide_index:03d}.json")
+
+    def _attempts(self) -> Dict[int, int]:
+        try:
+            names = os.listdir(self.partial_dir)
+        except OSError:
+            return {}
+        attempts = {}
+        for match in filter(None, map(_STARTED_FILE.match, names)):
+            try:
+                started_path = os.path.join(self.partial_dir, match.group(0))
+                with open(started_path, "r", encoding="utf-8") as f:
+                    attempts[int(match.group(1))] = int(f.read() or 0)
+            except (OSError, ValueError):
+                continue
+        return attempts
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.partial_dir, "manifest.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, header: Dict[str, Any]):
+        _write_json_atomic(
+            os.path.join(self.partial_dir, "manifest.json"),
+            {
+                "header": header,
+                "ready": _ready_slides(self.partial_dir),
+                "updated_at": datetime.now().isoformat(),
+            },
+        )
+
+
+def open_checkpoint(
+    out_dir: str, ppt_path: str, resume: bool = False
+) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+    """Start the checkpoint of a parse of ``ppt_path`` into ``out_dir``.
+
+    With ``resume``, the checkpoint an interrupted parse of the same file left
+    behind is kept, and its (finished slides, slides to skip) are returned.
+    """
+    writer = PartialResultWriter(out_dir)
+    source = source_signature(ppt_path)
+    if resume:
+        restored = writer.resume(source)
+        if restored is not None:
+            return restored
+    else:
+        writer.reset(source)
+    return {}, []
+
+
+def read_partial_manifest(out_dir: str) -> Optional[Dict[str, Any]]:
+    """{"header", "ready", "updated_at"} of a parse in progress, or None."""
+    return PartialResultWriter(out_dir)._read_manifest()
+
+
+def load_partial_result(out_dir: str) -> Optional[Dict[str, Any]]:
+    """The slides parsed so far as a project dict, or None if nothing is ready."""
+    partial_dir = os.path.join(out_dir, PARTIAL_DIR_NAME)
+    manifest = read_partial_manifest(out_dir)
+    if manifest is None:
+        return None
+
+    result = dict(manifest.get("header") or {})
+    result["slides"] = []
+    for slide_index in _ready_slides(partial_dir):
+        try:
+            with open(
+                os.path.join(partial_dir, f"slide_{slide_index:03d}.json"), "r", encoding="utf-8"
+            ) as f:
+                result["slides"].append(json.load(f))
+        except (OSError, ValueError):
+            # Removed by finish() while reading: the full JSON is there now
+            continue
+    result["partial"] = True
+    result["ready_slides"] = [s.get("slide_index") for s in result["slides"]]
+    return result
@@ -1,3 +1,4 @@
+import logging
 from .utils import rgb_from_com_rgb
 from .styles import (
     extract_line_format,
@@ -5,11 +6,15 @@ from .styles import (
     get_text_and_style_from_shape,
 )
 from .images import export_shape_image
+from .snapshot import snapshot
+from .ooxml import _q, table_merges, text_of_body
 from .constants import (
     MSO_TYPE_PICTURE,
     MSO_TYPE_LINKED_PICTURE,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def extract_cell_borders(cell):
     borders_info = {}
@@ -55,29 +60,83 @@ def extract_cell_borders(cell):
     return borders_info or None
 
 
-def parse_table(shape, slide_index, shape_index, image_dir, indent=0):
+def _grid_offsets(shape, table, rows, cols):
+    """Column / row edges in slide points from one Width / Height read per column / row."""
+    try:
+        col_offsets = [float(shape.Left)]
+        for c in range(1, cols + 1):
+            col_offsets.append(col_offsets[-1] + float(table.Columns(c).Width))
+        row_offsets = [float(shape.Top)]
+        for r in range(1, rows + 1):
+            row_offsets.append(row_offsets[-1] + float(table.Rows(r).Height))
+    except Exception as e:
+        logger.warning("table grid failed, reading cell positions one by one: %s", e)
+        return None
+    return col_offsets, row_offsets
+
+
+def _span_over(offsets, start, extent):
+    """Number of grid steps from ``start`` (1-based) that a merged cell's extent covers."""
+    span = 1
+    while start + span < len(offsets) and offsets[start - 1 + span] - offsets[start - 1] < extent - 0.5:
+        span += 1
+    return span
+
+
+def _xml_cell_texts(tbl):
+    """{(row, col): text} from a:tbl, used to skip COM text reads of empty cells."""
+    texts = {}
+    for r, tr in enumerate(tbl.findall(_q("a:tr")), start=1):
+        for c, tc in enumerate(tr.findall(_q("a:tc")), start=1):
+            texts[(r, c)] = text_of_body(tc.find(_q("a:txBody")))
+    return texts
+
+
+def parse_table(shape, slide_index, shape_index, image_dir, indent=0, media=None):
+    """
+    {"rows","cols","cells"} for a COM table shape, one entry per grid position.
+
+    Geometry comes from one read per row and column instead of four per
+    cell. Merged areas are read once at their origin cell; covered
+    positions repeat the origin's entry, as parse_table_element() does.
+    With the package at hand (``media.active``) spans and empty cells come
+    from the slide XML, otherwise spans are derived from the origin cell's
+    extent against the grid.
+    """
     prefix = " " * indent
     table = shape.Table
     rows = table.Rows.Count
     cols = table.Columns.Count
 
-    print(f"{prefix}Table: {rows} rows x {cols} cols")
+    logger.debug("%sTable: %s rows x %s cols", prefix, rows, cols)
+
+    grid = _grid_offsets(shape, table, rows, cols)
+    tbl = media.table_element(shape, slide_index) if media is not None else None
+    span_of, origin_of, xml_texts = None, {}, None
+    if tbl is not None:
+        span_of, origin_of = table_merges(tbl)
+        xml_texts = _xml_cell_texts(tbl)
 
     cells = []
+    parsed = {}
     for r in range(1, rows + 1):
         for c in range(1, cols + 1):
+            origin = origin_of.get((r, c), (r, c))
+            if origin != (r, c) and origin in parsed:
+                cells.append({**parsed[origin], "row": r, "col": c})
+                continue
             try:
-                cell = table.Cell(r, c)
+                cell = snapshot(table.Cell(r, c))
 
                 try:
                     cell_shape = cell.Shape
                 except Exception as e_shape:
-                    print(f"{prefix}  [WARN] cell.Shape failed at ({r},{c}): {e_shape}")
+                    logger.warning("cell.Shape failed at (%s,%s): %s", r, c, e_shape)
                     cell_shape = None
 
                 cell_text = ""
                 cell_style = None
-                if cell_shape is not None:
+                if cell_shape is not None and (xml_texts is None or xml_texts.get((r, c))):
                     cell_text, cell_style = get_text_and_style_from_shape(cell_shape)
 
                 preview = ""
@@ -87,16 +146,38 @@ def parse_table(shape, slide_index, shape_index, image_dir, indent=0):
                         preview = preview[:80] + "..."
 
                 left = top = width = height = None
-                if cell_shape is not None:
+                if grid is not None:
+                    col_offsets, row_offsets = grid
+                    if span_of is not None:
+                        row_span, col_span = span_of.get((r, c), (1, 1))
+                    else:
+                        row_span = col_span = 1
+                        if cell_shape is not None:
+                            try:
+                                col_span = _span_over(col_offsets, c, float(cell_shape.Width))
+                                row_span = _span_over(row_offsets, r, float(cell_shape.Height))
+                            except Exception as e_pos:
+                                logger.warning(
+                                    "cell extent failed at (%s,%s): %s",
+                                    r, c, e_pos,
+                                )
+                        for dr in range(row_span):
+                            for dc in range(col_span):
+                                origin_of[(r + dr, c + dc)] = (r, c)
+                    end_r = min(r - 1 + row_span, rows)
+                    end_c = min(c - 1 + col_span, cols)
+                    left = col_offsets[c - 1]
+                    top = row_offsets[r - 1]
+                    width = col_offsets[end_c] - left
+                    height = row_offsets[end_r] - top
+                elif cell_shape is not None:
                     try:
                         left = float(cell_shape.Left)
                         top = float(cell_shape.Top)
                         width = float(cell_shape.Width)
                         height = float(cell_shape.Height)
                     except Exception as e_pos:
-                        print(
-                            f"{prefix}  [WARN] cell position failed at ({r},{c}): {e_pos}"
-                        )
+                        logger.warning("cell position failed at (%s,%s): %s", r, c, e_pos)
 
                 cell_fill = None
                 if cell_shape is not None:
@@ -144,19 +225,22 @@ def parse_table(shape, slide_index, shape_index, image_dir, indent=0):
                                 slide_index,
                                 cell_shape_index,
                                 image_dir,
+                                media=media,
                             )
                             if rel_img:
                                 cell_info["image_file"] = rel_img
-                                print(f"{prefix}  Cell ({r},{c}) Image : {rel_img}")
+                                logger.debug("%s  Cell (%s,%s) Image : %s", prefix, r, c, rel_img)
                         except Exception as e_img:
-                            print(
-                                f"{prefix}  [WARN] cell image export failed at ({r},{c}): {e_img}"
+                            logger.warning(
+                                "cell image export failed at (%s,%s): %s",
+                                r, c, e_img,
                             )
 
                 cells.append(cell_info)
+                parsed[(r, c)] = cell_info
 
             except Exception as e:
-                print(f"{prefix}  [WARN] Failed to parse cell ({r},{c}): {e}")
+                logger.warning("Failed to parse cell (%s,%s): %s", r, c, e)
 
     return {
         "rows": rows,
@@ -0,0 +1,115 @@
+"""
+Slide thumbnail variants.
+
+PowerPoint renders one full-size PNG per slide
+(``thumbnails/slide_NNN_thumb.png``, which the viewer loads directly).
+Smaller variants are derived from it with Pillow, outside the parse loop:
+
+- grid:   320px WebP for slide lists
+- viewer: 1280px WebP for the slide viewer
+- llm:    1024px JPEG sent along with summary prompts
+
+Variants are written as ``thumbnails/slide_NNN_<variant>.<ext>`` and listed
+per slide under ``"thumbnails"`` in the project JSON. ``ensure_variant``
+(re)creates one on first request when it is missing or older than the PNG,
+so projects parsed before variants existed get them lazily.
+"""
+
+import logging
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_VARIANTS: Dict[str, Dict[str, Any]] = {
+    "grid": {"max_dimension": 320, "format": "WEBP", "ext": ".webp", "quality": 80},
+    "viewer": {"max_dimension": 1280, "format": "WEBP", "ext": ".webp", "quality": 85},
+    "llm": {"max_dimension": 1024, "format": "JPEG", "ext": ".jpg", "quality": 85},
+}
+
+
+def base_thumbnail_filename(slide_index: int) -> str:
+    """Full-size PNG rendered by PowerPoint (see slides.generate_slide_thumbnail)."""
+    return f"slide_{slide_index:03d}_thumb.png"
+
+
+def variant_filename(slide_index: int, variant: str) -> str:
+    return f"slide_{slide_index:03d}_{variant}{THUMBNAIL_VARIANTS[variant]['ext']}"
+
+
+@traced("thumbnail", lambda src_path, dst_path, variant, *args, **kwargs: f"{variant} {os.path.basename(dst_path)}")
+def render_variant(src_path: str, dst_path: str, variant: str) -> bool:
+    """Downscale the full-size PNG into one variant; False if it could not be written."""
+    spec = THUMBNAIL_VARIANTS[variant]
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.warning("Pillow is not installed; thumbnail variants are unavailable")
+        return False
+
+    tmp_path = f"{dst_path}.tmp{os.getpid()}"
+    try:
+        with Image.open(src_path) as img:
+            img.thumbnail((spec["max_dimension"], spec["max_dimension"]))
+            if spec["format"] == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            img.save(tmp_path, format=spec["format"], quality=spec["quality"])
+        os.replace(tmp_path, dst_path)
+        return True
+    except Exception as e:
+        logger.warning(
+            "Failed to render %s thumbnail %s: %s",
+            variant, os.path.basename(dst_path), e,
+        )
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def ensure_variant(project_dir: str, slide_index: int, variant: str) -> Optional[str]:
+    """Path of an up-to-date variant, rendering it if needed (None without a base PNG)."""
+    if variant not in THUMBNAIL_VARIANTS:
+        raise ValueError(f"Unknown thumbnail variant '{variant}'")
+    thumbnail_dir = os.path.join(project_dir, "thumbnails")
+    src_path = os.path.join(thumbnail_dir, base_thumbnail_filename(slide_index))
+    dst_path = os.path.join(thumbnail_dir, variant_filename(slide_index, variant))
+    try:
+        src_mtime = os.path.getmtime(src_path)
+    except OSError:
+        return None
+    try:
+        if os.path.getmtime(dst_path) >= src_mtime:
+            return dst_path
+    except OSError:
+        pass
+    return dst_path if render_variant(src_path, dst_path, variant) else None
+
+
+def generate_thumbnail_variants(
+    project_dir: str,
+    data: Dict[str, Any],
+    variants: Optional[Iterable[str]] = None,
+    slide_indices: Optional[Iterable[int]] = None,
+) -> int:
+    """Render variants for the slides of ``data`` and record them; returns slides updated."""
+    variants = list(variants or THUMBNAIL_VARIANTS)
+    wanted = set(slide_indices) if slide_indices is not None else None
+    updated = 0
+    for slide in data.get("slides") or []:
+        slide_index = slide.get("slide_index")
+        if wanted is not None and slide_index not in wanted:
+            continue
+        if not slide.get("thumbnail"):
+            continue
+        rendered = {}
+        for variant in variants:
+            if ensure_variant(project_dir, slide_index, variant):
+                rendered[variant] = variant_filename(slide_index, variant)
+        if rendered:
+            slide["thumbnails"] = {**(slide.get("thumbnails") or {}), **rendered}
+            updated += 1
+    return updated
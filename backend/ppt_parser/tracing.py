@@ -0,0 +1,220 @@
+"""
+Timed spans for the parse / reconstruct pipeline.
+
+``trace_job(path)`` opens a JSONL trace for one job; inside it, ``span(name,
+cat)`` blocks are timed and written as one Trace Event Format "complete"
+event per line:
+
+    {"name": "slide 3", "cat": "slide", "ph": "X", "ts": ..., "dur": ...,
+     "pid": ..., "tid": ..., "args": {...}}
+
+Categories are ``document``, ``master``, ``slide``, ``shape``, ``image`` and
+``thumbnail``. Outside a job, or for a category the trace level leaves out,
+``span`` costs one context-variable lookup. Events are buffered and written
+every ``FLUSH_EVENTS`` events and when the job ends; pool workers parsing
+slide ranges of the same deck append to the same file (each flush is a single
+write of whole lines), so a parallel parse shows one row per process.
+
+``python -m ppt_parser.tracing <trace.jsonl>`` wraps the events into a
+``<trace>.json`` that chrome://tracing, Perfetto and speedscope load as a
+flame graph.
+
+``PPT_TRACE`` picks the level: ``slide`` (the default, also ``1``) records the
+document, master, slide and thumbnail spans, ``shape`` (also ``2``) adds the
+per-shape and per-image ones, and ``0`` turns tracing off. Log output is
+separate: the parser logs through ``logging`` (logger ``ppt_parser``), and
+per-shape lines are DEBUG, so they only show with ``PPT_LOG_LEVEL=DEBUG``.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar = contextvars.ContextVar("ppt_trace", default=None)
+
+LOGGERS = ("ppt_parser", "ppt_reconstructor", "com_pool", "job_queue")
+
+# Span categories recorded at the default level; "shape" records every category
+SLIDE_CATEGORIES = frozenset({"document", "master", "slide", "thumbnail"})
+
+# Buffered events written at once
+FLUSH_EVENTS = 1000
+
+
+def configure_logging(level: Optional[str] = None):
+    """Show the LOGGERS at PPT_LOG_LEVEL (default INFO) on stderr."""
+    logging.basicConfig(format="[%(levelname)s] %(name)s: %(message)s")
+    level = (level or os.environ.get("PPT_LOG_LEVEL") or "INFO").upper()
+    for name in LOGGERS:
+        logging.getLogger(name).setLevel(level)
+
+
+def trace_level() -> str:
+    """``off``, ``slide`` or ``shape``, from PPT_TRACE (default ``slide``)."""
+    value = os.environ.get("PPT_TRACE", "slide").lower()
+    if value in ("0", "false", "no", "off"):
+        return "off"
+    if value in ("2", "shape", "shapes", "all"):
+        return "shape"
+    return "slide"
+
+
+def tracing_enabled() -> bool:
+    return trace_level() != "off"
+
+
+class TraceWriter:
+    """Appends complete events of one job to a JSONL file.
+
+    ``categories`` limits the recorded spans (None records all of them).
+    """
+
+    def __init__(
+        self, path: str, truncate: bool = True, categories: Optional[FrozenSet[str]] = None
+    ):
+        self.path = path
+        self.categories = categories
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if truncate:
+            open(path, "wb").close()
+        # Unbuffered append: a flush is one write, after other processes' lines
+        self._file = open(path, "ab", buffering=0)
+
+    def records(self, cat: str) -> bool:
+        return self.categories is None or cat in self.categories
+
+    def complete(self, name: str, cat: str, started: float, duration: float, args: Dict[str, Any]):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round(started * 1e6),
+            "dur": round(duration * 1e6),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            if len(self._events) >= FLUSH_EVENTS:
+                self._flush()
+
+    def _flush(self):
+        if not self._events:
+            return
+        lines = "".join(
+            json.dumps(event, ensure_ascii=False, default=str) + "\n" for event in self._events
+        )
+        self._events = []
+        self._file.write(lines.encode("utf-8"))
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                self._file.close()
+
+
+@contextmanager
+def trace_job(
+    path: str, enabled: Optional[bool] = None, truncate: bool = True, level: Optional[str] = None
+):
+    """Collect the spans of the enclosed job in ``path`` (``enabled`` and ``level``: PPT_TRACE)."""
+    if level is None:
+        level = trace_level()
+    if enabled is None:
+        enabled = level != "off"
+    if not enabled or _current.get() is not None:
+        # Nested jobs (e.g. parse_slide_range inside parse_presentation) share the outer trace
+        yield _current.get()
+        return
+    try:
+        writer = TraceWriter(
+            path, truncate=truncate, categories=None if level == "shape" else SLIDE_CATEGORIES
+        )
+    except OSError as e:
+        logger.warning("Could not open trace %s: %s", path, e)
+        yield None
+        return
+    token = _current.set(writer)
+    try:
+        yield writer
+    finally:
+        _current.reset(token)
+        writer.close()
+
+
+@contextmanager
+def span(name: str, cat: str, **args):
+    """Time the enclosed block as one event of the current job's trace."""
+    writer = _current.get()
+    if writer is None or not writer.records(cat):
+        yield
+        return
+    started = time.time()
+    clock = time.perf_counter()
+    try:
+        yield
+    finally:
+        writer.complete(name, cat, started, time.perf_counter() - clock, args)
+
+
+def traced(cat: str, label: Callable[..., str]):
+    """Decorator form of span(); ``label`` gets the call's arguments and names the span."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            writer = _current.get()
+            if writer is None or not writer.records(cat):
+                return func(*args, **kwargs)
+            with span(label(*args, **kwargs), cat):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def load_trace(path: str) -> list:
+    """Events of a JSONL trace (lines cut short by a crash are skipped)."""
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return events
+
+
+def export_chrome_trace(path: str, out_path: Optional[str] = None) -> str:
+    """Write the events of a JSONL trace as a Trace Event Format JSON file."""
+    if out_path is None:
+        base = path[: -len(".jsonl")] if path.endswith(".jsonl") else path
+        out_path = base + ".json"
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": load_trace(path), "displayTimeUnit": "ms"}, f)
+    return out_path
+
+
+if __name__ == "__main__":
+    for trace_path in sys.argv[1:]:
+        print(export_chrome_trace(trace_path))
@@ -1,3 +1,4 @@
+import os
 import re
 from .constants import shape_type_map
 
@@ -21,3 +22,27 @@ def rgb_from_com_rgb(rgb_val):
 
 def get_shape_type_name(shape):
     return shape_type_map.get(shape.Type, f"Unknown({shape.Type})")
+
+
+def dispatch_powerpoint():
+    """Start (or attach to) PowerPoint through win32com.
+
+    Imported lazily so the parser modules stay importable where pywin32 is absent.
+    """
+    import win32com.client as win32
+
+    return win32.gencache.EnsureDispatch("PowerPoint.Application")
+
+
+def project_relative_path(ppt_path: str) -> str:
+    """Path of the source deck relative to the project root, with forward slashes."""
+    # Project root is 3 levels up from backend/ppt_parser/utils.py
+    project_root = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    abs_ppt_path = os.path.abspath(ppt_path)
+    try:
+        return os.path.relpath(abs_ppt_path, project_root).replace(os.sep, "/")
+    except ValueError:
+        # If relpath fails (different drives on Windows), use absolute path
+        return abs_ppt_path.replace(os.sep, "/")
@@ -1,6 +1,15 @@
+import copy
+import logging
 import os
-import win32com.client as win32
+from contextlib import ExitStack
+from ppt_parser.assets import AssetStore
 from ppt_parser.constants import SHAPE_PNG_SIZE
+from ppt_parser.palette import is_interned, resolve_styles
+from ppt_parser.profiler import label_com_object, start_profiler
+from ppt_parser.tracing import span, trace_job, traced
+from ppt_parser.utils import dispatch_powerpoint
+
+logger = logging.getLogger(__name__)
 
 
 def rgb_to_com_int(rgb_list):
@@ -34,7 +43,7 @@ def apply_fill_format(shape, fill_data):
                 shape.Fill.Transparency = 1.0
 
     except Exception as e:
-        print(f"[WARN] Failed to apply fill format: {e}")
+        logger.warning("Failed to apply fill format: %s", e)
 
 
 def apply_line_format(shape, line_data):
@@ -67,7 +76,7 @@ def apply_line_format(shape, line_data):
             shape.Line.Visible = visible
 
     except Exception as e:
-        print(f"[WARN] Failed to apply line format: {e}")
+        logger.warning("Failed to apply line format: %s", e)
 
 
 def apply_text_style(shape, text_style):
@@ -101,7 +110,7 @@ def apply_text_style(shape, text_style):
             font.Color.RGB = rgb_to_com_int(text_style["color_rgb"])
 
     except Exception as e:
-        print(f"[WARN] Failed to apply text style: {e}")
+        logger.warning("Failed to apply text style: %s", e)
 
 
 def get_shape_type_from_name(name, default_type=1):
@@ -139,7 +148,8 @@ def get_shape_type_from_name(name, default_type=1):
     return default_type
 
 
-def reconstruct_shape(slide, shape_data, image_dir=None):
+@traced("shape", lambda slide, shape_data, *args, **kwargs: f"shape {shape_data.get('shape_index')}")
+def reconstruct_shape(slide, shape_data, image_dir=None, asset_dir=None):
     try:
         # Basic properties
         left = shape_data.get("left", 0)
@@ -171,7 +181,7 @@ def reconstruct_shape(slide, shape_data, image_dir=None):
         if children:
             child_names = []
             for child_data in children:
-                child_shape = reconstruct_shape(slide, child_data, image_dir)
+                child_shape = reconstruct_shape(slide, child_data, image_dir, asset_dir)
                 if child_shape:
                     child_names.append(child_shape.Name)
 
@@ -181,7 +191,7 @@ def reconstruct_shape(slide, shape_data, image_dir=None):
                     # Note: In win32com, Range() accepts a list of names
                     shape = slide.Shapes.Range(child_names).Group()
                 except Exception as e:
-                    print(f"[WARN] Failed to group shapes {child_names}: {e}")
+                    logger.warning("Failed to group shapes %s: %s", child_names, e)
                     # If grouping fails, the children still exist, so we don't return None.
                     pass
 
@@ -196,7 +206,11 @@ def reconstruct_shape(slide, shape_data, image_dir=None):
 
             if not prefer_text:
                 full_image_path = image_file
-                if image_dir:
+                # "assets/<sha256><ext>" lives in the shared asset store
+                asset_path = AssetStore(asset_dir).resolve(image_file) if asset_dir else None
+                if asset_path:
+                    full_image_path = asset_path
+                elif image_dir:
                     full_image_path = os.path.join(image_dir, image_file)
 
                 # Ensure absolute path for AddPicture
@@ -215,9 +229,9 @@ def reconstruct_shape(slide, shape_data, image_dir=None):
                         shape.Height = height
                         shape.Rotation = rotation
                     except Exception as e:
-                        print(f"[WARN] Failed to add picture {full_image_path}: {e}")
+                        logger.warning("Failed to add picture %s: %s", full_image_path, e)
                 else:
-                    print(f"[WARN] Image file not found: {full_image_path}")
+                    logger.warning("Image file not found: %s", full_image_path)
 
         # 3. Handle Standard Shapes (if not a group and not an image, or image failed)
         if shape is None and not children:
@@ -244,21 +258,24 @@ def reconstruct_shape(slide, shape_data, image_dir=None):
                     shape = slide.Shapes.AddShape(type_code, left, top, width, height)
                     shape.Rotation = rotation
                 except Exception:
-                    print(
-                        f"[WARN] Failed to add shape type {type_code}, falling back to Rectangle"
+                    logger.warning(
+                        "Failed to add shape type %s, falling back to Rectangle",
+                        type_code,
                     )
                     shape = slide.Shapes.AddShape(1, left, top, width, height)
                     shape.Rotation = rotation
 
         # Common Post-Creation Logic
         if shape:
+            label_com_object(shape, shape_type=shape_data.get("type_name", "-"))
+
             # Set Name
             if name:
                 try:
                     shape.Name = name
                 except Exception as e:
                     # Better logging for name failures
-                    print(f"[WARN] Failed to set shape name to '{name}': {e}")
+                    logger.warning("Failed to set shape name to '%s': %s", name, e)
 
             # Embed original shape_index in AlternativeText for preservation
             original_index = shape_data.get("shape_index")
@@ -266,8 +283,9 @@ def reconstruct_shape(slide, shape_data, image_dir=None):
                 try:
                     shape.AlternativeText = f"##idx_{original_index}##"
                 except Exception as e:
-                    print(
-                        f"[WARN] Failed to set AlternativeText for shape '{name}': {e}"
+                    logger.warning(
+                        "Failed to set AlternativeText for shape '%s': %s",
+                        name, e,
                     )
 
             # Text - validate HasTextFrame first
@@ -277,11 +295,12 @@ def reconstruct_shape(slide, shape_data, image_dir=None):
                     if shape.HasTextFrame:
                         shape.TextFrame.TextRange.Text = text
                     else:
-                        print(
-                            f"[WARN] Shape '{name}' does not support text frame, skipping text"
+                        logger.warning(
+                            "Shape '%s' does not support text frame, skipping text",
+                            name,
                         )
                 except Exception as e:
-                    print(f"[WARN] Failed to set text for shape '{name}': {e}")
+                    logger.warning("Failed to set text for shape '%s': %s", name, e)
 
             # Styles
             # Tables handle their own styles per cell
@@ -303,12 +322,12 @@ def reconstruct_shape(slide, shape_data, image_dir=None):
                         for _ in range(current_z - target_z):
                             shape.ZOrder(1)  # msoSendBackward
                 except Exception as e:
-                    print(f"[WARN] Failed to adjust z-order for shape '{name}': {e}")
+                    logger.warning("Failed to adjust z-order for shape '%s': %s", name, e)
 
         return shape
 
     except Exception as e:
-        print(f"[WARN] Failed to reconstruct shape: {e}")
+        logger.warning("Failed to reconstruct shape: %s", e)
         return None
 
 
@@ -401,34 +420,55 @@ def reconstruct_table(slide, shape_data):
                                     if style:
                                         border.Style = style
                             except Exception as e:
-                                print(
-                                    f"[WARN] Failed to set {side_name} border for cell ({r},{c}): {e}"
+                                logger.warning(
+                                    "Failed to set %s border for cell (%s,%s): %s",
+                                    side_name, r, c, e,
                                 )
 
         return shape
 
     except Exception as e:
-        print(f"[WARN] Failed to reconstruct table: {e}")
+        logger.warning("Failed to reconstruct table: %s", e)
         return None
 
 
-def reconstruct_presentation(json_data, output_path, image_dir=None):
+def reconstruct_presentation(
+    json_data,
+    output_path,
+    image_dir=None,
+    powerpoint=None,
+    profile=None,
+    asset_dir=None,
+):
     """
     Reconstructs a PowerPoint presentation from the parsed JSON data.
 
     Args:
-        json_data: Dictionary containing slide data
+        json_data: Dictionary containing slide data (inline or interned styles)
         output_path: Path to save the reconstructed PPT
         image_dir: Base directory for resolving relative image paths (optional)
+        powerpoint: Warm PowerPoint.Application from the COM worker pool (optional)
+        profile: Time COM calls and write <output>.profile.json (default: PPT_COM_PROFILE)
+        asset_dir: Asset store root for "assets/<sha256><ext>" image paths (optional)
     """
-    print(f"=== Reconstructing PowerPoint: {output_path} ===")
+    logger.info("=== Reconstructing PowerPoint: %s ===", output_path)
+
+    if is_interned(json_data):
+        json_data = resolve_styles(copy.deepcopy(json_data))
 
-    app = win32.gencache.EnsureDispatch("PowerPoint.Application")
+    app = powerpoint if powerpoint is not None else dispatch_powerpoint()
+    profiler = start_profiler(profile)
+    if profiler is not None:
+        app = profiler.wrap(app)
     # app.Visible = True # Optional: make it visible during processing
     # For server-side generation, we want it invisible.
     # Note: app.Visible = False might throw error if no window is open,
     # but Add(WithWindow=False) is the key.
 
+    trace = ExitStack()
+    trace.enter_context(trace_job(os.path.splitext(output_path)[0] + ".trace.jsonl"))
+    trace.enter_context(span(os.path.basename(output_path), "document", job="reconstruct"))
+
     try:
         # WithWindow=0 (False) to keep it invisible
         pres = app.Presentations.Add(WithWindow=0)
@@ -444,39 +484,48 @@ def reconstruct_presentation(json_data, output_path, image_dir=None):
 
         for slide_data in slides_data:
             slide_index = slide_data.get("slide_index")
-            print(f"Creating Slide {slide_index}...")
+            logger.debug("Creating Slide %s...", slide_index)
 
-            # Add a blank slide (Layout 12 is usually blank)
-            # ppLayoutBlank = 12
-            slide = pres.Slides.Add(pres.Slides.Count + 1, 12)
+            with span(f"slide {slide_index}", "slide"):
+                # Add a blank slide (Layout 12 is usually blank)
+                # ppLayoutBlank = 12
+                slide = pres.Slides.Add(pres.Slides.Count + 1, 12)
+                label_com_object(slide, context="slide", slide_index=slide_index)
 
-            shapes_data = slide_data.get("shapes", [])
+                shapes_data = slide_data.get("shapes", [])
 
-            for shape_data in shapes_data:
-                reconstruct_shape(slide, shape_data, image_dir=image_dir)
+                for shape_data in shapes_data:
+                    reconstruct_shape(
+                        slide, shape_data, image_dir=image_dir, asset_dir=asset_dir
+                    )
 
         pres.SaveAs(os.path.abspath(output_path))
-        print(f"[SUCCESS] Reconstructed PPT saved to: {output_path}")
+        logger.info("Reconstructed PPT saved to: %s", output_path)
 
         # Export slides as images to 'recon' folder
         output_dir = os.path.dirname(os.path.abspath(output_path))
         recon_dir = os.path.join(output_dir, "recon")
         os.makedirs(recon_dir, exist_ok=True)
-        print(f"Exporting reconstructed slides to: {recon_dir}")
+        logger.info("Exporting reconstructed slides to: %s", recon_dir)
 
         for i, slide in enumerate(pres.Slides):
             slide_num = i + 1
             image_path = os.path.join(recon_dir, f"slide_{slide_num:02d}.png")
             try:
                 # slide.Export(image_path, "PNG")
-                slide.Export(image_path, "PNG", SHAPE_PNG_SIZE, SHAPE_PNG_SIZE)
+                with span(f"thumbnail {slide_num}", "thumbnail"):
+                    slide.Export(image_path, "PNG", SHAPE_PNG_SIZE, SHAPE_PNG_SIZE)
             except Exception as e:
-                print(f"[WARN] Failed to export slide {slide_num}: {e}")
+                logger.warning("Failed to export slide %s: %s", slide_num, e)
+
+        if profiler is not None:
+            profiler.write_report(os.path.splitext(output_path)[0] + ".profile.json")
         return True
 
     except Exception as e:
-        print(f"[ERROR] Reconstruction failed: {e}")
+        logger.error("Reconstruction failed: %s", e)
         return False
     finally:
         if "pres" in locals():
             pres.Close()
+        trace.close()
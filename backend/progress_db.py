@@ -0,0 +1,154 @@
+"""
+Parse progress shared by every API worker process.
+
+One row per project (percent, message, status) in a small SQLite table.
+Each write takes the next value of a global revision counter, so a reader
+that remembers the last revision it saw (the SSE ``Last-Event-ID``) gets
+exactly the rows that changed since. Finished rows are dropped once they
+are older than the retention period; the status endpoint then falls back
+to the project JSON on disk.
+"""
+
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+FINISHED = ("done", "error")
+
+
+class ProgressDatabase:
+    def __init__(self, db_path: str, retention_seconds: float = 24 * 3600):
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+        self._last_purge = 0.0
+        self._init_db()
+
+    def _init_db(self):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        # WAL: the SSE readers of other workers don't block the parse writing progress
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS progress (
+                project_id TEXT PRIMARY KEY,
+                percent INTEGER NOT NULL DEFAULT 0,
+                message TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL DEFAULT 'processing',
+                rev INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_progress_rev ON progress(rev)")
+        # Kept apart from the rows so purging the newest row never reuses its revision
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS progress_rev (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                rev INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("INSERT OR IGNORE INTO progress_rev (id, rev) VALUES (1, 0)")
+        conn.commit()
+        conn.close()
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def set(
+        self, project_id: str, percent: int, message: str, status: Optional[str] = None
+    ) -> dict:
+        """Record a progress update; returns the stored row.
+
+        Without ``status`` a percent of 100 or more means "done", a negative
+        one "error", and anything else keeps the current status ("processing"
+        for a new row).
+        """
+        if status is None:
+            if percent >= 100:
+                status = "done"
+            elif percent < 0:
+                status = "error"
+        now = time.time()
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("UPDATE progress_rev SET rev = rev + 1 WHERE id = 1")
+                rev = conn.execute("SELECT rev FROM progress_rev WHERE id = 1").fetchone()[0]
+                conn.execute(
+                    """
+                    INSERT INTO progress (project_id, percent, message, status, rev, updated_at)
+                    VALUES (?, ?, ?, COALESCE(?, 'processing'), ?, ?)
+                    ON CONFLICT(project_id) DO UPDATE SET
+                        percent = excluded.percent,
+                        message = excluded.message,
+                        status = COALESCE(?, progress.status),
+                        rev = excluded.rev,
+                        updated_at = excluded.updated_at
+                    """,
+                    (project_id, int(percent), message or "", status, rev, now, status),
+                )
+                row = conn.execute(
+                    "SELECT * FROM progress WHERE project_id = ?", (project_id,)
+                ).fetchone()
+        finally:
+            conn.close()
+
+        if now - self._last_purge > min(self.retention_seconds, 3600):
+            self.purge()
+        return dict(row)
+
+    def get(self, project_id: str) -> Optional[dict]:
+        conn = self.get_connection()
+        try:
+            row = conn.execute(
+                "SELECT * FROM progress WHERE project_id = ?", (project_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def changes(
+        self, since_rev: int = 0, project_ids: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """Rows written after revision ``since_rev`` (optionally of ``project_ids``), oldest first."""
+        query = "SELECT * FROM progress WHERE rev > ?"
+        params: list = [since_rev]
+        if project_ids is not None:
+            project_ids = list(project_ids)
+            if not project_ids:
+                return []
+            query += f" AND project_id IN ({', '.join('?' for _ in project_ids)})"
+            params.extend(project_ids)
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(query + " ORDER BY rev", params).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def latest_rev(self) -> int:
+        conn = self.get_connection()
+        try:
+            return conn.execute("SELECT rev FROM progress_rev WHERE id = 1").fetchone()[0]
+        finally:
+            conn.close()
+
+    def purge(self, older_than: Optional[float] = None) -> int:
+        """Drop finished rows not updated for ``older_than`` seconds (default: the retention)."""
+        if older_than is None:
+            older_than = self.retention_seconds
+        now = time.time()
+        self._last_purge = now
+        conn = self.get_connection()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    f"DELETE FROM progress WHERE status IN ({', '.join('?' for _ in FINISHED)})"
+                    " AND updated_at < ?",
+                    (*FINISHED, now - older_than),
+                )
+            return cursor.rowcount
+        finally:
+            conn.close()
@@ -0,0 +1,254 @@
+"""
+In-process cache of parsed project documents.
+
+Entries are keyed by the JSON path and validated against the file's mtime
+and size on every lookup, so a file rewritten by a parse worker or another
+API process is read again.
+
+The budget is counted in JSON text bytes, after decompression (the parsed
+objects take a few times that); the least recently used documents are
+dropped first. Writers in this process call ``invalidate`` after saving.
+Every entry carries a strong ETag, the SHA-256 of the stored file. For a
+sharded project that file is the manifest, which names every slide file
+by its content, so the key and ETag of the manifest cover the slides too.
+
+Cached documents are shared between requests: read them, never modify them.
+Code that edits a project loads its own copy with ``load_project_json``.
+
+A plain read does not need the document at all: ``file_info`` gives the
+ETag, the content coding of the stored file, whether it is sharded and
+whether it is interned (and so must be resolved before it is sent) from a
+streaming pass over the bytes, remembered per file version.
+``gzip_variant`` keeps a precompressed <file>.gz of the whole document.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+from ppt_parser.palette import PALETTE_KEY, resolve_styles
+from ppt_parser.storage import (
+    SLIDE_FILES_KEY,
+    assemble_project,
+    decode_project_bytes,
+    iter_project_document,
+    open_project_json,
+    stored_encoding,
+)
+
+CHUNK_SIZE = 1024 * 1024
+# File versions whose ETag / stored form are remembered
+MAX_FILE_INFO = 4096
+_PALETTE_MARKER = json.dumps(PALETTE_KEY).encode()
+_SLIDE_FILES_MARKER = json.dumps(SLIDE_FILES_KEY).encode()
+
+
+def _file_key(path: str) -> Tuple[int, int]:
+    stats = os.stat(path)
+    return stats.st_mtime_ns, stats.st_size
+
+
+def _find_markers(stream: BinaryIO, markers: Tuple[bytes, ...]) -> Dict[bytes, bool]:
+    found = dict.fromkeys(markers, False)
+    overlap = max(len(marker) for marker in markers)
+    tail = b""
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        # Keep the last bytes read to find a marker split across chunks
+        window = tail + chunk
+        for marker in markers:
+            found[marker] = found[marker] or marker in window
+        tail = window[-overlap:]
+    return found
+
+
+def _etag(digest) -> str:
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names ``etag`` (weak comparison, as for GET)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def accepts_encoding(accept_encoding: Optional[str], coding: str) -> bool:
+    """Whether an Accept-Encoding header allows ``coding`` (q=0 refuses it)."""
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() not in (coding, "*"):
+            continue
+        params = params.replace(" ", "")
+        if not params.startswith("q="):
+            return True
+        try:
+            return float(params[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+
+class ProjectDocumentCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._bytes = 0
+        self._info: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str) -> Tuple[Dict[str, Any], str]:
+        """(document, ETag) of a project JSON; raises OSError / ValueError like json.load."""
+        path = os.path.abspath(path)
+        key = _file_key(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry["key"] == key:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry["data"], entry["etag"]
+            self.misses += 1
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        text = decode_project_bytes(raw)
+        # As load_project_json: slides of a sharded project are read, an interned
+        # style palette is expanded
+        interned = _PALETTE_MARKER in text
+        data = json.loads(text)
+        sharded = SLIDE_FILES_KEY in data
+        size = len(text) + assemble_project(path, data)
+        data = resolve_styles(data)
+        etag = _etag(hashlib.sha256(raw))
+        if _file_key(path) == key:
+            # Not kept if the file changed while it was read
+            self._put(path, key, data, etag, size)
+            self._remember(
+                path,
+                key,
+                {
+                    "etag": etag,
+                    "encoding": None if sharded else stored_encoding(raw),
+                    "sharded": sharded,
+                    "interned": interned,
+                },
+            )
+        return data, etag
+
+    def file_info(self, path: str) -> Dict[str, Any]:
+        """{"etag", "encoding", "sharded", "interned"} of a project JSON, without decoding it.
+
+        "encoding" is the content coding the whole document is stored in: None
+        for plain or sharded JSON (the slide files are assembled on the way out).
+        """
+        path = os.path.abspath(path)
+        key = _file_key(path)
+        with self._lock:
+            known = self._info.get(path)
+            if known is not None and known[0] == key:
+                self._info.move_to_end(path)
+                return known[1]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            encoding = stored_encoding(f.read(4))
+            f.seek(0)
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        with open_project_json(path) as f:
+            found = _find_markers(f, (_PALETTE_MARKER, _SLIDE_FILES_MARKER))
+        sharded = found[_SLIDE_FILES_MARKER]
+        info = {
+            "etag": _etag(digest),
+            "encoding": None if sharded else encoding,
+            "sharded": sharded,
+            "interned": found[_PALETTE_MARKER],
+        }
+        if _file_key(path) == key:
+            self._remember(path, key, info)
+        return info
+
+    def gzip_variant(self, path: str) -> str:
+        """<path>.gz of the whole document as of the current ``path``, compressed on first use."""
+        gz_path = path + ".gz"
+        mtime_ns = os.stat(path).st_mtime_ns
+        try:
+            if os.stat(gz_path).st_mtime_ns == mtime_ns:
+                return gz_path
+        except OSError:
+            pass
+        tmp_path = f"{gz_path}.tmp{os.getpid()}.{threading.get_ident()}"
+        with gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+            for chunk in iter_project_document(path, CHUNK_SIZE):
+                dst.write(chunk)
+        # The variant carries the mtime of the version it was made from
+        os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp_path, gz_path)
+        return gz_path
+
+    def etag(self, path: str) -> Optional[str]:
+        """ETag of the cached document if the file is unchanged (no disk read), else None."""
+        path = os.path.abspath(path)
+        try:
+            key = _file_key(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry["key"] == key:
+                return entry["etag"]
+        return None
+
+    def invalidate(self, path: str):
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._bytes -= entry["size"]
+            self._info.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._info.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "documents": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remember(self, path: str, key: Tuple[int, int], info: Dict[str, Any]):
+        with self._lock:
+            self._info[path] = (key, info)
+            self._info.move_to_end(path)
+            while len(self._info) > MAX_FILE_INFO:
+                self._info.popitem(last=False)
+
+    def _put(self, path: str, key: Tuple[int, int], data: Dict[str, Any], etag: str, size: int):
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old["size"]
+            if size > self.max_bytes:
+                # Bigger than the whole budget: serve it, don't keep it
+                return
+            self._entries[path] = {"key": key, "data": data, "etag": etag, "size": size}
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["size"]
@@ -3,14 +3,26 @@
 from .file_resolver import PPTFileResolver, create_file_resolver
 from .shape_utils import (
     find_shape_by_index,
+    resolve_shape_styles,
     update_shape_property,
     extract_preserved_descriptions,
+    shape_annotation_keys,
+    apply_annotations,
+    annotated_descriptions,
 )
+from .static_files import ResultStaticFiles
+from .upload_store import store_upload
 
 __all__ = [
     "PPTFileResolver",
     "create_file_resolver",
     "find_shape_by_index",
+    "resolve_shape_styles",
     "update_shape_property",
     "extract_preserved_descriptions",
+    "shape_annotation_keys",
+    "apply_annotations",
+    "annotated_descriptions",
+    "ResultStaticFiles",
+    "store_upload",
 ]
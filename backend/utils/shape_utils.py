@@ -5,11 +5,34 @@ This module provides utilities for navigating and manipulating hierarchical shap
 in parsed PowerPoint data structures.
 """
 
+import copy
+from collections import Counter
 from typing import Dict, List, Any, Optional, Tuple
 
+from ppt_parser.palette import PALETTE_KEY, resolve_styles
+
+
+def resolve_shape_styles(
+    shape: Dict[str, Any], palette: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Copy of a shape whose {"$style": n} references are expanded from a style palette.
+
+    Args:
+        shape: Shape dictionary taken from an interned project JSON
+        palette: The project's "style_palette" list
+
+    Returns:
+        Shape dictionary with inline text_style / fill / line / borders
+    """
+    resolved = resolve_styles({"shape": copy.deepcopy(shape), PALETTE_KEY: palette})
+    return resolved["shape"]
+
 
 def find_shape_by_index(
-    shapes: List[Dict[str, Any]], target_id: str
+    shapes: List[Dict[str, Any]],
+    target_id: str,
+    palette: Optional[List[Dict[str, Any]]] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Find a shape in the shape tree by its shape_index.
@@ -17,6 +40,8 @@ def find_shape_by_index(
     Args:
         shapes: List of shape dictionaries (may contain nested children)
         target_id: Target shape_index to find
+        palette: Style palette of an interned project; the match is returned
+            as a resolved copy (optional)
 
     Returns:
         Shape dictionary if found, None otherwise
@@ -24,11 +49,11 @@ def find_shape_by_index(
     for shape in shapes:
         # shape_index can be integer or string, normalize to string for comparison
         if str(shape.get("shape_index")) == str(target_id):
-            return shape
+            return resolve_shape_styles(shape, palette) if palette else shape
 
         # Recursively search in children
         if "children" in shape:
-            found = find_shape_by_index(shape["children"], target_id)
+            found = find_shape_by_index(shape["children"], target_id, palette)
             if found:
                 return found
 
@@ -87,3 +112,85 @@ def extract_preserved_descriptions(
             extract_preserved_descriptions(
                 shape["children"], slide_index, preserved_data
             )
+
+
+def shape_annotation_keys(shapes: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Map the shapes of one slide (children included) by their annotation key.
+
+    The key is the shape's name when no other shape on the slide has that
+    name, and "#<shape_index>" otherwise.
+
+    Args:
+        shapes: Top-level shapes of a slide
+
+    Returns:
+        Dictionary mapping annotation key to shape dictionary
+    """
+    flat = []
+
+    def walk(level):
+        for shape in level:
+            flat.append(shape)
+            if "children" in shape:
+                walk(shape["children"])
+
+    walk(shapes)
+    names = Counter(shape.get("name") for shape in flat)
+    return {
+        (
+            shape["name"]
+            if shape.get("name") and names[shape["name"]] == 1
+            else f"#{shape.get('shape_index')}"
+        ): shape
+        for shape in flat
+    }
+
+
+def apply_annotations(
+    slides: List[Dict[str, Any]], annotations: Dict[int, Dict[str, Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Lay user annotations (descriptions, positions) over parsed slides.
+
+    Args:
+        slides: Slide dictionaries; they are not modified, so they may come
+            from the shared document cache
+        annotations: {slide_index: {annotation key: {field: value}}}
+
+    Returns:
+        The slides, with annotated ones replaced by updated copies
+    """
+    if not annotations:
+        return slides
+    overlaid = []
+    for slide in slides:
+        slide_annotations = annotations.get(slide.get("slide_index"))
+        if slide_annotations:
+            slide = copy.deepcopy(slide)
+            shapes = shape_annotation_keys(slide.get("shapes", []))
+            for key, fields in slide_annotations.items():
+                if key in shapes:
+                    shapes[key].update(fields)
+        overlaid.append(slide)
+    return overlaid
+
+
+def annotated_descriptions(slides: List[Dict[str, Any]]) -> List[Tuple[int, str, Any, str]]:
+    """
+    Descriptions written into parsed slides, as annotation rows.
+
+    Args:
+        slides: Slide dictionaries
+
+    Returns:
+        List of (slide_index, annotation key, shape_index, description)
+    """
+    rows = []
+    for slide in slides:
+        for key, shape in shape_annotation_keys(slide.get("shapes", [])).items():
+            if shape.get("description"):
+                rows.append(
+                    (slide.get("slide_index"), key, shape.get("shape_index"), shape["description"])
+                )
+    return rows
@@ -0,0 +1,37 @@
+"""
+Static file serving for parse results.
+
+``/api/results/<project_id>/...`` is served from the results directory, except
+``/api/results/<project_id>/assets/<sha256><ext>``, which is looked up in the
+shared content-addressed AssetStore (see ``ppt_parser.assets``).
+"""
+
+import os
+import re
+
+from fastapi.staticfiles import StaticFiles
+
+ASSET_NAME_RE = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+
+
+class ResultStaticFiles(StaticFiles):
+    """StaticFiles that resolves hash-named asset paths to the asset store."""
+
+    def __init__(self, *args, asset_store=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.asset_store = asset_store
+
+    def lookup_path(self, path: str):
+        parts = path.replace("\\", "/").split("/")
+        if (
+            self.asset_store is not None
+            and len(parts) == 3
+            and parts[1] == "assets"
+            and ASSET_NAME_RE.match(parts[2])
+        ):
+            full_path = self.asset_store.path(parts[2])
+            try:
+                return full_path, os.stat(full_path)
+            except (FileNotFoundError, NotADirectoryError):
+                return "", None
+        return super().lookup_path(path)
@@ -0,0 +1,54 @@
+"""
+Content-Addressed Upload Storage
+
+Uploaded decks are stored as uploads/<sha256><ext>. The digest is computed
+while the upload is streamed to disk, so identical files share one copy no
+matter what they were called, and a file uploaded before is recognised
+before it is opened in PowerPoint.
+"""
+
+import hashlib
+import os
+import uuid
+from typing import BinaryIO, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def store_upload(source: BinaryIO, upload_dir: str, filename: str) -> Tuple[str, str]:
+    """
+    Stream an uploaded file into content-addressed storage.
+
+    Args:
+        source: File object of the upload (read in chunks)
+        upload_dir: Directory where uploaded files are stored
+        filename: Original filename; only its extension is kept
+
+    Returns:
+        (path, sha256 hex digest) of the stored file
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    tmp_path = os.path.join(upload_dir, f".upload-{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    try:
+        with open(tmp_path, "wb") as buffer:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                buffer.write(chunk)
+
+        content_hash = digest.hexdigest()
+        path = os.path.join(upload_dir, content_hash + os.path.splitext(filename)[1].lower())
+        if os.path.exists(path):
+            # Same bytes already stored
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        return path, content_hash
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
@@ -16,6 +16,9 @@ import type {
     AttributeDefinition,
     Project,
     ProjectListItem,
+    Job,
+    JobAccepted,
+    ProjectProgress,
 } from '$lib/types/api';
 
 // ========== Project Management ==========
@@ -28,6 +31,17 @@ export async function fetchProject(id: string): Promise<Response> {
     return apiFetch(`/api/project/${id}`);
 }
 
+export async function fetchProjectSlide(id: string, slideIndex: number): Promise<Response> {
+    return apiFetch(`/api/project/${id}/slides/${slideIndex}`);
+}
+
+/** Slides `start` to `end` (inclusive, by slide_index); responds with `{ slides: [...] }`. */
+export async function fetchProjectSlides(id: string, start: number, end?: number): Promise<Response> {
+    const params = new URLSearchParams({ start: String(start) });
+    if (end !== undefined) params.set('end', String(end));
+    return apiFetch(`/api/project/${id}/slides?${params}`);
+}
+
 export async function uploadProject(file: File): Promise<Response> {
     const formData = new FormData();
     formData.append('file', file);
@@ -41,6 +55,23 @@ export async function fetchProjectStatus(id: string): Promise<Response> {
     return apiFetch(`/api/project/${id}/status`);
 }
 
+/**
+ * Subscribe to the progress of one or more projects (Server-Sent Events).
+ * The browser reconnects on its own and resumes from the last event it saw.
+ * Returns a function that closes the stream.
+ */
+export function watchProjectProgress(
+    ids: string[],
+    onProgress: (progress: ProjectProgress) => void,
+): () => void {
+    const query = encodeURIComponent(ids.join(','));
+    const source = new EventSource(`${BASE_URL}/api/progress/stream?project_ids=${query}`);
+    source.addEventListener('progress', (event) => {
+        onProgress(JSON.parse((event as MessageEvent).data));
+    });
+    return () => source.close();
+}
+
 // ========== Shape Operations ==========
 
 export async function updateShapePositions(id: string, updates: ShapePosition[]): Promise<Response> {
@@ -59,14 +90,54 @@ export async function updateShapeDescription(id: string, data: ShapeDescription)
     });
 }
 
+// ========== Jobs ==========
+
+export async function fetchJob(jobId: string): Promise<Response> {
+    return apiFetch(`/api/jobs/${jobId}`);
+}
+
+/**
+ * Poll a queued job until it finishes.
+ * Resolves with the finished job; rejects if it failed or was cancelled.
+ */
+export async function waitForJob<TResult = Record<string, unknown>>(
+    jobId: string,
+    onProgress?: (job: Job<TResult>) => void,
+    intervalMs: number = 1000,
+): Promise<Job<TResult>> {
+    while (true) {
+        const res = await fetchJob(jobId);
+        if (!res.ok) {
+            throw new Error(`Failed to fetch job ${jobId}: ${res.statusText}`);
+        }
+        const job: Job<TResult> = await res.json();
+        onProgress?.(job);
+        if (job.status === 'done') {
+            return job;
+        }
+        if (job.status === 'error' || job.status === 'cancelled') {
+            throw new Error(job.error || `Job ${job.status}`);
+        }
+        await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+}
+
+/** Read the job id from the 202 response of an endpoint that queues a job */
+export async function acceptedJobId(res: Response): Promise<string> {
+    const accepted: JobAccepted = await res.json();
+    return accepted.job_id;
+}
+
 // ========== Reparse Operations ==========
 
+/** Queues a reparse; the response carries the job id (see waitForJob) */
 export async function reparseProject(id: string): Promise<Response> {
     return apiFetch(`/api/project/${id}/reparse_all`, {
         method: 'POST',
     });
 }
 
+/** Queues a single-slide reparse; the finished job's result holds the new `slide` */
 export async function reparseSlide(id: string, slideIndex: number): Promise<Response> {
     return apiFetch(`/api/project/${id}/slides/${slideIndex}/reparse`, {
         method: 'POST',
@@ -75,8 +146,14 @@ export async function reparseSlide(id: string, slideIndex: number): Promise<Resp
 
 // ========== Download ==========
 
+/** Queue the reconstruction, wait for it, then save the generated deck */
 export async function downloadProject(id: string): Promise<Response> {
-    const res = await apiFetch(`/api/project/${id}/download`);
+    const queued = await apiFetch(`/api/project/${id}/download`, { method: 'POST' });
+    if (!queued.ok) {
+        return queued;
+    }
+    const job = await waitForJob(await acceptedJobId(queued));
+    const res = await apiFetch(`/api/jobs/${job.id}/file`);
     if (res.ok) {
         const blob = await res.blob();
         const url = window.URL.createObjectURL(blob);
@@ -51,6 +51,8 @@ export interface Slide {
     slide_index: number;
     shapes: Shape[];
     thumbnail_path?: string;
+    /** Smaller renders under thumbnails/, keyed by variant (grid / viewer / llm) */
+    thumbnails?: Partial<Record<'grid' | 'viewer' | 'llm', string>>;
 }
 
 // ========== Project Types ==========
@@ -65,6 +67,9 @@ export interface Project {
     slide_width: number;
     slide_height: number;
     status?: 'pending' | 'processing' | 'completed' | 'error';
+    /** Set while parsing is still running: only ready_slides are in `slides` */
+    partial?: boolean;
+    ready_slides?: number[];
 }
 
 export interface ProjectListItem {
@@ -151,6 +156,49 @@ export interface UploadProgress {
     message?: string;
 }
 
+// ========== Job Types ==========
+
+export type JobStatus = 'queued' | 'running' | 'done' | 'error' | 'cancelled';
+
+/** A queued COM job (parse, reparse, reconstruction) from /api/jobs/{id} */
+export interface Job<TResult = Record<string, unknown>> {
+    id: string;
+    kind: 'parse' | 'reparse_all' | 'reparse_slide' | 'reconstruct';
+    project_id: string | null;
+    status: JobStatus;
+    priority: number;
+    attempts: number;
+    progress: number;
+    message: string | null;
+    result: TResult | null;
+    error: string | null;
+    created_at: string;
+    started_at: string | null;
+    finished_at: string | null;
+    /** Jobs that start before this one (queued jobs only) */
+    queue_position?: number;
+}
+
+/** 202 response of an endpoint that queues a job */
+export interface JobAccepted {
+    job_id: string;
+    status: JobStatus;
+    deduplicated: boolean;
+    message: string;
+}
+
+// ========== Progress Types ==========
+
+/** Parse progress of a project (/api/project/{id}/status and the progress stream) */
+export interface ProjectProgress {
+    project_id: string;
+    percent: number;
+    message: string;
+    status: 'processing' | 'done' | 'error';
+    /** Slides a progressive parse has ready so far */
+    ready_slides?: number;
+}
+
 // ========== Batch Generation Types ==========
 
 export interface BatchGenerationStatus {
@@ -1,8 +1,9 @@
 import os
 import sys
+import json
 import sqlite3
-import time
 import argparse
+from contextlib import ExitStack
 
 import requests
 from requests.exceptions import HTTPError, RequestException
@@ -14,62 +15,78 @@ PROXIES = {
     "http": None,
     "https": None,
 }
-
-
-def upload_file(file_path):
-    """Upload a single file to the backend and return the project ID."""
-    url = f"{API_BASE_URL}/upload"
-    filename = os.path.basename(file_path)
-
-    files = {
-        "file": (
-            filename,
-            open(file_path, "rb"),
-            "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-        )
-    }
-
-    try:
-        with requests.post(url, files=files, timeout=60, proxies=PROXIES) as response:
-            response.raise_for_status()
-            result = response.json()
-            return result.get("id")
-
-    except HTTPError as e:
-        print(f"Error uploading {filename}: {e.response.status_code} {e.response.reason}")
+# Files sent per POST /api/upload/batch request
+DEFAULT_BATCH_SIZE = 20
+PPT_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+def upload_batch(file_paths):
+    """Upload several files in one request; returns the per-file results (None on failure)."""
+    url = f"{API_BASE_URL}/upload/batch"
+
+    with ExitStack() as stack:
+        files = [
+            (
+                "files",
+                (os.path.basename(path), stack.enter_context(open(path, "rb")), PPT_CONTENT_TYPE),
+            )
+            for path in file_paths
+        ]
         try:
-            print(e.response.text)
-        except Exception:
-            pass
-        return None
-    except RequestException as e:
-        print(f"Error uploading {filename}: {str(e)}")
-        return None
-    except Exception as e:
-        print(f"Unexpected error uploading {filename}: {str(e)}")
-        return None
-
-
-def check_status(project_id):
-    """Check the processing status of a project."""
-    url = f"{API_BASE_URL}/project/{project_id}/status"
-    try:
-        response = requests.get(url, timeout=10, proxies=PROXIES)
-        response.raise_for_status()
-        return response.json()
-    except HTTPError as e:
-        print(f"Error checking status for {project_id}: {e.response.status_code} {e.response.reason}")
+            # Generous timeout: the server hashes and probes every file before answering
+            with requests.post(
+                url, files=files, timeout=60 + 10 * len(file_paths), proxies=PROXIES
+            ) as response:
+                response.raise_for_status()
+                return response.json()["results"]
+
+        except HTTPError as e:
+            print(f"Error uploading batch: {e.response.status_code} {e.response.reason}")
+            try:
+                print(e.response.text)
+            except Exception:
+                pass
+            return None
+        except RequestException as e:
+            print(f"Error uploading batch: {str(e)}")
+            return None
+        except Exception as e:
+            print(f"Unexpected error uploading batch: {str(e)}")
+            return None
+
+
+def wait_for_projects(project_ids):
+    """Follow the progress stream until every project is done or failed."""
+    pending = set(project_ids)
+    url = f"{API_BASE_URL}/progress/stream"
+    print(f"\nWaiting for {len(pending)} project(s) to finish processing...")
+    while pending:
         try:
-            print(e.response.text)
-        except Exception:
-            pass
-        return None
-    except RequestException as e:
-        print(f"Error checking status for {project_id}: {str(e)}")
-        return None
-    except Exception as e:
-        print(f"Unexpected error checking status for {project_id}: {str(e)}")
-        return None
+            # All projects: thousands of ids do not fit in the query string
+            with requests.get(url, stream=True, timeout=(10, 60), proxies=PROXIES) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data: "):
+                        continue
+                    status = json.loads(line[len("data: "):])
+                    project_id = status.get("project_id")
+                    if project_id not in pending or status.get("status") == "processing":
+                        continue
+                    pending.discard(project_id)
+                    if status.get("status") == "done":
+                        print(f"  -> {project_id}: Done! ({len(pending)} left)")
+                    else:
+                        print(f"  -> {project_id}: Processing failed: {status.get('message')}")
+                    if not pending:
+                        return
+        except RequestException as e:
+            # Also the read timeout of an idle stream: reconnect and catch up
+            print(f"Progress stream interrupted ({e}); reconnecting...")
+            for project_id in list(pending):
+                status = check_status(project_id)
+                if status and status.get("status") in ("done", "error"):
+                    pending.discard(project_id)
+                    print(f"  -> {project_id}: {status.get('status')}")
 
 
 def check_duplicate_by_db(filename: str) -> tuple[bool, str | None]:
@@ -137,12 +154,15 @@ def analyze_files(files_to_check, directory_path):
     return results
 
 
-def process_directory(directory_path, dry_run=True, max_upload=None):
+def process_directory(
+    directory_path, dry_run=True, max_upload=None, batch_size=DEFAULT_BATCH_SIZE, wait=True
+):
     """
     Process a directory:
     1. Find all PPT files recursively
     2. Check for duplicates in DB
-    3. Upload new files (respecting max_upload limit)
+    3. Upload new files in batches (respecting max_upload limit)
+    4. Wait until the backend has processed them
     """
     if not os.path.isdir(directory_path):
         print(f"Error: Directory '{directory_path}' not found.")
@@ -200,36 +220,37 @@ def process_directory(directory_path, dry_run=True, max_upload=None):
         print("\nNo new files to upload after duplicate check. Exiting.")
         return
 
-    print(f"\nStarting upload of {num_to_upload} files...")
+    print(f"\nStarting upload of {num_to_upload} files in batches of {batch_size}...")
 
-    for i, file_path in enumerate(files_to_upload, 1):
-        rel_path = os.path.relpath(file_path, directory_path)
-        print(f"\n[{i}/{num_to_upload}] Uploading '{rel_path}'...")
-
-        project_id = upload_file(file_path)
+    queued = []
+    for start in range(0, num_to_upload, batch_size):
+        batch = files_to_upload[start:start + batch_size]
+        end = start + len(batch)
+        print(f"\n[{start + 1}-{end}/{num_to_upload}] Uploading {len(batch)} file(s)...")
 
-        if not project_id:
-            print("  -> Upload failed. Skipping.")
+        results = upload_batch(batch)
+        if results is None:
+            print("  -> Upload failed. Skipping batch.")
             continue
 
-        print(f"  -> Uploaded. Project ID: {project_id}")
-        print("  -> Waiting for processing...", end="", flush=True)
-
-        while True:
-            status = check_status(project_id)
-            if not status:
-                print("\n  -> Status check failed.")
-                break
-
-            if status.get("status") == "done":
-                print(" Done!")
-                break
-            elif status.get("status") == "error":
-                print(f"\n  -> Processing failed: {status.get('message')}")
-                break
-
-            print(".", end="", flush=True)
-            time.sleep(1)
+        for file_path, result in zip(batch, results):
+            rel_path = os.path.relpath(file_path, directory_path)
+            status = result.get("status")
+            if status == "queued":
+                print(f"  -> {rel_path}: Uploaded. Project ID: {result['id']}")
+                queued.append(result["id"])
+            elif status == "reused":
+                print(
+                    f"  -> {rel_path}: Reused the parse of {result['reused_from']}. "
+                    f"Project ID: {result['id']}"
+                )
+            elif status == "duplicate":
+                print(f"  -> {rel_path}: Skipped duplicate. Project ID: {result['id']}")
+            else:
+                print(f"  -> {rel_path}: Upload failed: {result.get('detail')}")
+
+    if queued and wait:
+        wait_for_projects(queued)
 
 
 if __name__ == "__main__":
@@ -249,10 +270,24 @@ if __name__ == "__main__":
         help="Maximum number of PPT files to upload (default: all)",
     )
 
+    parser.add_argument(
+        "-b", "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Files per upload request (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="Exit once uploaded instead of waiting for processing",
+    )
+
     args = parser.parse_args()
 
     process_directory(
         args.directory,
         dry_run=not args.upload,
         max_upload=args.max,
+        batch_size=max(1, args.batch_size),
+        wait=not args.no_wait,
     )
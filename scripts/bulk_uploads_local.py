@@ -1,13 +1,10 @@
 import argparse
 import os
-import shutil
 import sqlite3
 import sys
 import time
 import uuid
 
-import pythoncom
-
 
 # Ensure backend modules are importable
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,20 +13,30 @@ sys.path.append(BASE_DIR)
 sys.path.append(BACKEND_DIR)
 
 from backend import ppt_parser as parsing  # noqa: E402
+from backend.com_pool import PowerPointPool  # noqa: E402
 from backend.attributes.manager import AttributeManager  # noqa: E402
 from backend.database import Database  # noqa: E402
+from backend.utils.upload_store import store_upload  # noqa: E402
 
 DB_PATH = os.path.join(BASE_DIR, "backend", "data", "projects.db")
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
 RESULT_DIR = os.path.join(BASE_DIR, "results")
+ASSET_DIR = os.environ.get("PPT_ASSET_DIR") or os.path.join(BASE_DIR, "assets")
+MASTER_CACHE_DIR = os.environ.get("PPT_MASTER_CACHE_DIR") or os.path.join(
+    BASE_DIR, "cache", "masters"
+)
 ATTR_DEFINITIONS_DIR = os.path.join(BASE_DIR, "backend", "attributes", "definitions")
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(RESULT_DIR, exist_ok=True)
 
 db = Database(DB_PATH)
+asset_store = parsing.AssetStore(ASSET_DIR)
 attr_manager = AttributeManager(db, ATTR_DEFINITIONS_DIR)
 
+# One warm PowerPoint worker reused for every file in the run
+com_pool = PowerPointPool(size=1)
+
 
 def check_duplicate_by_db(filename: str) -> tuple[bool, str | None]:
     """Check if a project with the same original filename exists in DB."""
@@ -99,12 +106,19 @@ def analyze_files(files_to_check, directory_path):
 
 
 def get_metadata_with_com(file_path):
-    """Run metadata extraction with COM initialization."""
-    pythoncom.CoInitialize()
+    """Run metadata extraction on the warm PowerPoint worker."""
     try:
-        return parsing.get_presentation_metadata(file_path)
-    finally:
-        pythoncom.CoUninitialize()
+        return com_pool.run(parsing.get_presentation_metadata, file_path)
+    except Exception as e:
+        print(f"[ERROR] Metadata job failed for {file_path}: {e}")
+        return None
+
+
+def get_upload_metadata(file_path):
+    """Probe .pptx metadata from the package XML; COM only for legacy .ppt."""
+    if parsing.is_legacy_ppt(file_path):
+        return get_metadata_with_com(file_path)
+    return parsing.probe_presentation_metadata(file_path)
 
 
 def generate_project_id(filename: str, metadata: dict | None) -> tuple[str, dict]:
@@ -134,7 +148,7 @@ def generate_project_id(filename: str, metadata: dict | None) -> tuple[str, dict
     }
 
 
-def register_project(project_id: str, filename: str, metadata: dict):
+def register_project(project_id: str, filename: str, metadata: dict, content_hash: str):
     """Register the project in the DB and calculate attributes."""
     project_data = {
         "id": project_id,
@@ -147,6 +161,7 @@ def register_project(project_id: str, filename: str, metadata: dict):
         "author": metadata.get("author", ""),
         "last_modified_by": metadata.get("last_modified_by", ""),
         "revision_number": metadata.get("revision_number", ""),
+        "content_hash": content_hash,
     }
 
     db.add_project(project_data)
@@ -159,14 +174,19 @@ def register_project(project_id: str, filename: str, metadata: dict):
 
 
 def parse_presentation(project_id: str, upload_path: str, project_dir: str):
-    """Parse the uploaded presentation using backend parser directly."""
-    pythoncom.CoInitialize()
+    """Parse the uploaded presentation on the warm PowerPoint worker."""
     try:
         def callback(percent, message):
             print(f"\r    Progress: {percent}% - {message}", end="", flush=True)
 
-        json_path = parsing.parse_presentation(
-            upload_path, project_dir, debug=False, progress_callback=callback
+        json_path = com_pool.run(
+            parsing.parse_presentation,
+            upload_path,
+            project_dir,
+            debug=False,
+            progress_callback=callback,
+            asset_dir=ASSET_DIR,
+            master_cache_dir=MASTER_CACHE_DIR,
         )
 
         if not json_path:
@@ -174,25 +194,53 @@ def parse_presentation(project_id: str, upload_path: str, project_dir: str):
             print("\n    Parsing failed: No JSON produced.")
             return False
 
+        asset_store.sync_project(project_id, parsing.load_project_json(json_path))
+
         db.update_project_status(project_id, "done")
+        # Later uploads of the same file start from this parse
+        parsing.snapshot_project_json(project_dir)
         print("\n    Parsing completed.")
         return True
     except Exception as e:
         db.update_project_status(project_id, "error")
         print(f"\n    Parsing error for {project_id}: {e}")
         return False
-    finally:
-        pythoncom.CoUninitialize()
+
+
+def find_reusable_parse(content_hash: str):
+    """A finished project parsed from the same file, or None."""
+    for project in db.find_projects_by_hash(content_hash):
+        project_dir = os.path.join(RESULT_DIR, project["id"])
+        if project.get("status") == "done" and os.path.exists(
+            parsing.project_snapshot_path(project_dir)
+        ):
+            return project
+    return None
 
 
 def process_file(file_path: str, directory_path: str):
     filename = os.path.basename(file_path)
     print(f"\nUploading '{os.path.relpath(file_path, directory_path)}'")
 
-    upload_path = os.path.join(UPLOAD_DIR, filename)
-    shutil.copyfile(file_path, upload_path)
-
-    metadata_raw = get_metadata_with_com(upload_path)
+    with open(file_path, "rb") as f:
+        upload_path, content_hash = store_upload(f, UPLOAD_DIR, filename)
+
+    source = find_reusable_parse(content_hash)
+    if source is not None:
+        # Same bytes as an earlier upload: no PowerPoint work at all
+        metadata_raw = {
+            key: source.get(key) or ""
+            for key in ("title", "subject", "author", "last_modified_by", "revision_number")
+        }
+        metadata_raw["slide_count"] = source.get("slide_count") or 0
+    else:
+        try:
+            metadata_raw = get_upload_metadata(upload_path)
+        except parsing.OOXMLError as e:
+            print(f"  -> Skipped invalid PowerPoint file: {e}")
+            if not db.find_projects_by_hash(content_hash):
+                os.remove(upload_path)
+            return
     project_id, metadata = generate_project_id(filename, metadata_raw)
 
     existing = db.get_project(project_id)
@@ -203,9 +251,19 @@ def process_file(file_path: str, directory_path: str):
     project_dir = os.path.join(RESULT_DIR, project_id)
     os.makedirs(project_dir, exist_ok=True)
 
-    register_project(project_id, filename, metadata)
+    register_project(project_id, filename, metadata, content_hash)
     print(f"  -> Registered project ID: {project_id}")
 
+    if source is not None:
+        json_path = parsing.clone_project_artifacts(
+            os.path.join(RESULT_DIR, source["id"]), project_dir
+        )
+        if json_path:
+            asset_store.sync_project(project_id, parsing.load_project_json(json_path))
+            db.update_project_status(project_id, "done")
+            print(f"  -> Reused the parse of {source['id']}")
+            return
+
     success = parse_presentation(project_id, upload_path, project_dir)
     if not success:
         print("  -> Processing failed.")
@@ -275,9 +333,12 @@ def process_directory(directory_path, dry_run=True, max_upload=None):
 
     print(f"\nStarting direct upload of {num_to_upload} files...")
 
-    for i, file_path in enumerate(files_to_upload, 1):
-        print(f"[{i}/{num_to_upload}] Processing...")
-        process_file(file_path, directory_path)
+    try:
+        for i, file_path in enumerate(files_to_upload, 1):
+            print(f"[{i}/{num_to_upload}] Processing...")
+            process_file(file_path, directory_path)
+    finally:
+        com_pool.shutdown()
 
 
 if __name__ == "__main__":
@@ -9,7 +9,6 @@ This script consolidates the behaviors of `cleanup_storage.py` and
 """
 
 import argparse
-import json
 import os
 import shutil
 import sys
@@ -21,11 +20,16 @@ sys.path.append(
     os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
 )
 
+from annotations_db import AnnotationsDatabase
 from database import Database
+from ppt_parser.assets import AssetStore
+from ppt_parser.storage import load_project_json
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RESULT_DIR = os.path.join(BASE_DIR, "results")
 DB_PATH = os.path.join(BASE_DIR, "backend", "data", "projects.db")
+ANNOTATIONS_DB_PATH = os.path.join(BASE_DIR, "backend", "data", "annotations.db")
+ASSET_DIR = os.environ.get("PPT_ASSET_DIR") or os.path.join(BASE_DIR, "assets")
 
 
 @dataclass
@@ -49,8 +53,7 @@ def validate_result_folder(project_id: str, folder_path: str) -> Tuple[bool, str
         return False, "Missing JSON file"
 
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_project_json(json_path)
     except Exception as exc:  # noqa: BLE001 - surface exact parsing errors for troubleshooting
         return False, f"Invalid JSON ({exc})"
 
@@ -137,10 +140,16 @@ def plan_cleanup(
 
 
 def delete_folders(folders: List[FolderIssue]):
+    asset_store = AssetStore(ASSET_DIR)
+    annotations_db = AnnotationsDatabase(ANNOTATIONS_DB_PATH)
     for issue in folders:
         try:
             shutil.rmtree(issue.path)
             print(f"Deleted folder: {issue.project_id} ({issue.path})")
+            # Shared images only this project used are removed with it
+            asset_store.release_project(issue.project_id)
+            # So are the descriptions and positions laid over its JSON
+            annotations_db.delete_project(issue.project_id)
         except Exception as exc:  # noqa: BLE001 - surface exact deletion errors for troubleshooting
             print(f"Failed to delete folder {issue.project_id}: {exc}")
 
@@ -0,0 +1,109 @@
+"""Rewrite stored project JSON in another storage format or layout.
+
+Projects keep loading in whatever form they were written (see the
+ppt_parser.storage docstring); this converts existing result folders, e.g.
+the single indented JSON file of older releases, to compact or compressed,
+sharded (manifest plus one file per slide) or single-file projects.
+Dry-run by default; use `--apply` to rewrite the files.
+
+Usage:
+    python scripts/convert_project_json.py --format gzip --layout sharded --apply
+"""
+
+import argparse
+import os
+import sys
+from typing import Optional
+
+# Add backend to path to import ppt_parser
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+)
+
+from ppt_parser.storage import (  # noqa: E402
+    PROJECT_FORMATS,
+    PROJECT_LAYOUTS,
+    encode_project_json,
+    load_project_json,
+    project_slide_files,
+    project_snapshot_path,
+    save_project_json,
+    snapshot_project_json,
+)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_DIR = os.path.join(BASE_DIR, "results")
+
+
+def stored_size(path: str) -> int:
+    """Bytes of a project JSON on disk, with the slide files of a sharded one."""
+    size = os.path.getsize(path)
+    slide_files = project_slide_files(path)
+    for name in slide_files or []:
+        size += os.path.getsize(os.path.join(os.path.dirname(path), name))
+    return size
+
+
+def convert_project(project_dir: str, fmt: str, layout: str, apply: bool) -> Optional[int]:
+    """Rewrite the JSON (and parse snapshot) of one result folder; returns bytes saved."""
+    project_id = os.path.basename(project_dir)
+    json_path = os.path.join(project_dir, f"{project_id}.json")
+    if not os.path.exists(json_path):
+        return None
+    paths = [json_path]
+    snapshot_path = project_snapshot_path(project_dir)
+    # An unedited project shares one file with its snapshot; keep it that way
+    linked = os.path.exists(snapshot_path) and os.path.samefile(json_path, snapshot_path)
+    if os.path.exists(snapshot_path) and not linked:
+        paths.append(snapshot_path)
+
+    saved = 0
+    for path in paths:
+        data = load_project_json(path)
+        # Slide files shared with the snapshot are counted for both
+        saved += stored_size(path) - len(encode_project_json(data, fmt))
+        if apply:
+            save_project_json(path, data, fmt, layout)
+    if apply:
+        if linked:
+            snapshot_project_json(project_dir)
+        # A precompressed variant of the old file is no longer current
+        if os.path.exists(json_path + ".gz"):
+            os.remove(json_path + ".gz")
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite stored project JSON in another format or layout.")
+    parser.add_argument("--format", choices=PROJECT_FORMATS, default="compact")
+    parser.add_argument("--layout", choices=PROJECT_LAYOUTS, default="sharded")
+    parser.add_argument("--result-dir", default=RESULT_DIR)
+    parser.add_argument("--apply", action="store_true", help="rewrite the files (default: dry run)")
+    args = parser.parse_args()
+
+    total = 0
+    converted = 0
+    for entry in sorted(os.listdir(args.result_dir)):
+        project_dir = os.path.join(args.result_dir, entry)
+        if not os.path.isdir(project_dir):
+            continue
+        try:
+            saved = convert_project(project_dir, args.format, args.layout, args.apply)
+        except Exception as exc:  # noqa: BLE001 - keep converting the other projects
+            print(f"Failed to convert {entry}: {exc}")
+            continue
+        if saved is None:
+            continue
+        converted += 1
+        total += saved
+        print(f" - {entry}: {saved / 1e6:+.2f} MB saved")
+
+    action = "Converted" if args.apply else "Dry run (nothing written):"
+    print(
+        f"\n{action} {converted} project(s) to {args.layout} {args.format},"
+        f" {total / 1e6:.1f} MB saved."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 import argparse
 import os
 import sys
-import json
 import pythoncom
 import win32com.client as win32
 
@@ -12,6 +11,8 @@ sys.path.append(BASE_DIR)
 sys.path.append(BACKEND_DIR)
 
 from backend.database import Database  # noqa: E402
+from ppt_parser.storage import load_project_json, save_project_json  # noqa: E402
+from ppt_parser.thumbnails import generate_thumbnail_variants  # noqa: E402
 
 DB_PATH = os.path.join(BASE_DIR, "backend", "data", "projects.db")
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
@@ -75,8 +76,7 @@ def regenerate_thumbnails_for_project(project_id, ppt_path, project_dir):
         return False
 
     # Load existing JSON
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_project_json(json_path)
 
     thumbnail_dir = os.path.join(project_dir, "thumbnails")
     os.makedirs(thumbnail_dir, exist_ok=True)
@@ -113,9 +113,11 @@ def regenerate_thumbnails_for_project(project_id, ppt_path, project_dir):
                     print(f"    [ERROR] Failed to process slide {slide_index}: {e}")
 
             if updated:
+                # grid / viewer / llm renders derived from the new PNGs
+                generate_thumbnail_variants(project_dir, data)
+
                 # Save updated JSON
-                with open(json_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+                save_project_json(json_path, data)
                 print("  [INFO] Updated JSON with thumbnail information")
                 return True
             else:
@@ -26,6 +26,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RESULT_DIR = os.path.join(BASE_DIR, "results")
 DB_PATH = os.path.join(BASE_DIR, "backend", "data", "projects.db")
 ATTACHMENTS_DB_PATH = os.path.join(BASE_DIR, "backend", "data", "attachments.db")
+ANNOTATIONS_DB_PATH = os.path.join(BASE_DIR, "backend", "data", "annotations.db")
 BACKUP_DIR = os.path.join(BASE_DIR, "backend", "data", "backups")
 
 # Columns that come from the PPT file or are user-entered about that PPT's content.
@@ -48,12 +49,16 @@ SWAP_COLUMNS = [
 
 
 def backup_databases():
-    """Create timestamped backup copies of both DB files."""
+    """Create timestamped backup copies of the DB files."""
     os.makedirs(BACKUP_DIR, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     backed_up = []
-    for src_path, label in [(DB_PATH, "projects"), (ATTACHMENTS_DB_PATH, "attachments")]:
+    for src_path, label in [
+        (DB_PATH, "projects"),
+        (ATTACHMENTS_DB_PATH, "attachments"),
+        (ANNOTATIONS_DB_PATH, "annotations"),
+    ]:
         if os.path.exists(src_path):
             dst = os.path.join(BACKUP_DIR, f"{label}_{ts}.db")
             shutil.copy2(src_path, dst)
@@ -199,6 +204,51 @@ def swap_attachment_project_ids(id1, id2, dry_run):
     print(f"  Attachment project_ids swapped ({len(imgs_1)} <-> {len(imgs_2)} images).")
 
 
+def swap_annotation_project_ids(id1, id2, dry_run):
+    """Swap project_id of the shape annotations (they describe the swapped result JSON)."""
+    if not os.path.exists(ANNOTATIONS_DB_PATH):
+        print("  Annotations DB not found. Skipping.")
+        return
+
+    conn = sqlite3.connect(ANNOTATIONS_DB_PATH)
+    cur = conn.cursor()
+
+    cur.execute("SELECT COUNT(*) FROM shape_annotations WHERE project_id = ?", (id1,))
+    count_1 = cur.fetchone()[0]
+
+    cur.execute("SELECT COUNT(*) FROM shape_annotations WHERE project_id = ?", (id2,))
+    count_2 = cur.fetchone()[0]
+
+    if not count_1 and not count_2:
+        print("  No shape annotations for either project. Skipping.")
+        conn.close()
+        return
+
+    if dry_run:
+        print("\n[DRY-RUN] Would swap shape annotation project_ids:")
+        print(f"    Project {id1}: {count_1} annotation(s) -> will become {id2}")
+        print(f"    Project {id2}: {count_2} annotation(s) -> will become {id1}")
+        conn.close()
+        return
+
+    # Use a temporary sentinel to avoid primary-key conflicts
+    tmp_id = f"_swap_tmp_{id1}"
+    cur.execute("UPDATE shape_annotations SET project_id = ? WHERE project_id = ?", (tmp_id, id1))
+    cur.execute("UPDATE shape_annotations SET project_id = ? WHERE project_id = ?", (id1, id2))
+    cur.execute("UPDATE shape_annotations SET project_id = ? WHERE project_id = ?", (id2, tmp_id))
+    # New revisions, so cached project responses are not reused
+    cur.execute("UPDATE annotations_rev SET rev = rev + 1 WHERE id = 1")
+    cur.execute(
+        "UPDATE shape_annotations SET rev = (SELECT rev FROM annotations_rev WHERE id = 1)"
+        " WHERE project_id IN (?, ?)",
+        (id1, id2),
+    )
+    conn.commit()
+    conn.close()
+
+    print(f"  Shape annotation project_ids swapped ({count_1} <-> {count_2} annotations).")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Swap PPT-derived data between two projects"
@@ -267,6 +317,10 @@ def main():
     print("\n── Attachment Image Swap ──")
     swap_attachment_project_ids(id1, id2, dry_run)
 
+    # ── Swap shape annotations ──────────────────────────────────────
+    print("\n── Shape Annotation Swap ──")
+    swap_annotation_project_ids(id1, id2, dry_run)
+
     # ── Verification ────────────────────────────────────────────────
     if not dry_run:
         print("\n── Verification (After Swap) ──")
@@ -18,6 +18,7 @@ import shutil
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.ppt_parser.slides import parse_presentation, parse_single_slide
+from backend.ppt_parser.storage import load_project_json
 from backend.ppt_reconstructor import reconstruct_presentation
 
 
@@ -94,8 +95,7 @@ def cycle_test(
 
     try:
         if slide_index is None:
-            with open(ab_json_path, "r", encoding="utf-8") as f:
-                ab_data = json.load(f)
+            ab_data = load_project_json(ab_json_path)
         # If slide_index is not None, ab_data is already in memory from previous step
 
         reconstruct_presentation(ab_data, str(ab_recon_path), image_dir=str(ab_dir))
@@ -147,15 +147,13 @@ def cycle_test(
 
     try:
         if slide_index is None:
-            with open(ba_json_path, "r", encoding="utf-8") as f:
-                ba_data = json.load(f)
+            ba_data = load_project_json(ba_json_path)
         # If slide_index is not None, ba_data is already in memory or we should load it?
         # Actually we constructed ba_data in the previous block if slide_index is not None.
         # But to be safe and consistent (and if we want to ensure we use what's on disk), let's reload it or just use it.
         # The original code loaded it. Let's just ensure ba_data is available.
         if "ba_data" not in locals():
-            with open(ba_json_path, "r", encoding="utf-8") as f:
-                ba_data = json.load(f)
+            ba_data = load_project_json(ba_json_path)
 
         reconstruct_presentation(ba_data, str(ba_recon_path), image_dir=str(ba_dir))
         print(f"[OK] Reconstruction complete: {ba_recon_path}")
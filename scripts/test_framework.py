@@ -5,7 +5,7 @@ import json
 # Add backend to sys.path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.ppt_parser import parse_presentation, parse_single_slide
+from backend.ppt_parser import load_project_json, parse_presentation, parse_single_slide
 from backend.ppt_reconstructor import reconstruct_presentation
 
 
@@ -79,8 +79,7 @@ def main(ppt_path_raw, slide_index):
 
             # Reconstruction Step
             print("Reconstructing presentation...")
-            with open(json_path, "r", encoding="utf-8") as f:
-                json_data = json.load(f)
+            json_data = load_project_json(json_path)
 
             reconstruct_path = os.path.join(out_dir, f"{base_name}_reconstructed.pptx")
             if reconstruct_presentation(json_data, reconstruct_path, image_dir=out_dir):
@@ -0,0 +1,79 @@
+"""
+Benchmark: sequential vs slide-range parallel parsing of one large deck.
+
+Builds a synthetic .pptx, then parses it through a PowerPointPool backed by
+the fake COM object model, once as a single parse_presentation() job and
+once split across worker processes with parse_presentation_parallel().
+``--latency`` imitates the cost of a cross-process COM call.
+
+Usage:
+    python tests/backend/benchmarks/bench_parallel_parse.py --slides 300 --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from com_pool import PowerPointPool  # noqa: E402
+from mocks.fake_powerpoint import fake_dispatcher, set_latency  # noqa: E402
+from mocks.ooxml_builder import write_pptx_deck  # noqa: E402
+
+
+def timed_parse(deck, out_dir, workers):
+    pool = PowerPointPool(
+        size=workers,
+        max_jobs_per_worker=0,
+        dispatcher=fake_dispatcher,
+        mp_context=multiprocessing.get_context("fork"),
+    )
+    try:
+        # Warm the workers so both runs skip process start-up
+        pool.run(ppt_parser.get_presentation_metadata, deck)
+        started = time.perf_counter()
+        json_path = ppt_parser.parse_presentation_parallel(
+            deck, out_dir, pool=pool, workers=workers, min_slides_per_worker=1
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        pool.shutdown()
+    with open(json_path, encoding="utf-8") as f:
+        return elapsed, len(json.load(f)["slides"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--slides", type=int, default=300)
+    parser.add_argument("--shapes", type=int, default=6, help="Shapes per slide")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--latency", type=float, default=0.0002, help="Seconds per fake COM call"
+    )
+    args = parser.parse_args()
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        sys.exit("The fake COM pool needs the fork start method")
+
+    set_latency(args.latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        deck = write_pptx_deck(
+            os.path.join(tmp, "deck.pptx"), slides=args.slides, shapes_per_slide=args.shapes
+        )
+        print(f"Deck: {args.slides} slides x {args.shapes} shapes, latency {args.latency}s/call")
+
+        sequential, count = timed_parse(deck, os.path.join(tmp, "seq"), 1)
+        print(f"  sequential          : {sequential:7.2f}s ({count} slides)")
+        parallel, count = timed_parse(deck, os.path.join(tmp, "par"), args.workers)
+        print(f"  parallel x{args.workers:<2}        : {parallel:7.2f}s ({count} slides)")
+        print(f"  speedup             : {sequential / parallel:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: serving a large project JSON from the stored bytes vs decoding it.
+
+Writes a synthetic project (1000 slides by default, as one file or sharded
+with ``--layout sharded``) and requests it through GET /api/project/{id} in
+each mode, every mode in a fresh process so its peak RSS is its own:
+
+    passthrough   stored bytes sent as they are (FileResponse), or the slide
+                  files joined without decoding them for a sharded project
+    gzip          the precompressed <id>.json.gz variant
+    decode        the document decoded and serialized again (a ``fields``
+                  filter naming every key; served from the document cache)
+    decode-cold   as ``decode`` with the cache cleared before every request,
+                  i.e. json.load + serialization per request
+
+Usage:
+    python tests/backend/benchmarks/bench_project_serving.py --slides 1000 --requests 20
+    python tests/backend/benchmarks/bench_project_serving.py --layout sharded
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+
+import ppt_parser  # noqa: E402
+
+PROJECT_ID = "bench"
+MODES = ("passthrough", "gzip", "decode", "decode-cold")
+
+
+def synthetic_project(slides, shapes_per_slide):
+    style = {"font_name": "Calibri", "font_size": 18, "bold": False, "color": "#1F1F1F"}
+    return {
+        "ppt_path": "bench.pptx",
+        "parser_engine": "com",
+        "title": "Synthetic deck",
+        "slides": [
+            {
+                "slide_index": s,
+                "layout_name": "Title and Content",
+                "shapes": [
+                    {
+                        "shape_index": i,
+                        "name": f"Shape {i}",
+                        "type": "text",
+                        "left": 40.0 * i,
+                        "top": 30.0 * i,
+                        "width": 320.0,
+                        "height": 48.0,
+                        "text": f"Slide {s} shape {i}: " + "lorem ipsum dolor sit amet " * 4,
+                        "text_style": dict(style),
+                        "fill": {"color": "#FFFFFF", "transparency": 0.0},
+                        "line": {"color": "#000000", "weight": 0.75},
+                    }
+                    for i in range(1, shapes_per_slide + 1)
+                ],
+            }
+            for s in range(1, slides + 1)
+        ],
+    }
+
+
+def run_mode(mode, result_dir, requests, queue):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    main.RESULT_DIR = result_dir
+    client = TestClient(main.app)
+    url = f"/api/project/{PROJECT_ID}"
+    headers = {"Accept-Encoding": "gzip" if mode == "gzip" else "identity"}
+    params = {"fields": "ppt_path,parser_engine,title,slides"} if mode.startswith("decode") else {}
+
+    # Warm-up: builds the .gz variant / fills the cache
+    client.get(url, headers=headers, params=params)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(requests):
+        if mode == "decode-cold":
+            main.project_cache.clear()
+        started = time.perf_counter()
+        response = client.get(url, headers=headers, params=params)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings.sort()
+    queue.put(
+        {
+            "mode": mode,
+            "median_ms": timings[len(timings) // 2] * 1000,
+            "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+            "peak_rss_mb": peak_kb / 1024,
+            "rss_growth_mb": (peak_kb - baseline_kb) / 1024,
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--slides", type=int, default=1000)
+    parser.add_argument("--shapes", type=int, default=12, help="shapes per slide")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--layout", choices=ppt_parser.storage.PROJECT_LAYOUTS, default="single")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as result_dir:
+        project_dir = os.path.join(result_dir, PROJECT_ID)
+        os.makedirs(project_dir)
+        json_path = ppt_parser.save_project_json(
+            os.path.join(project_dir, f"{PROJECT_ID}.json"),
+            synthetic_project(args.slides, args.shapes),
+            layout=args.layout,
+        )
+        size = sum(len(chunk) for chunk in ppt_parser.iter_project_document(json_path))
+        print(f"{args.slides} slides ({args.layout}), {size / 1e6:.1f} MB of JSON")
+
+        context = multiprocessing.get_context("spawn")
+        for mode in args.modes.split(","):
+            queue = context.Queue()
+            process = context.Process(
+                target=run_mode, args=(mode, result_dir, args.requests, queue)
+            )
+            process.start()
+            result = queue.get()
+            process.join()
+            print(
+                f"{result['mode']:<12} median {result['median_ms']:8.1f} ms"
+                f"  p95 {result['p95_ms']:8.1f} ms"
+                f"  peak RSS {result['peak_rss_mb']:7.1f} MB"
+                f" (+{result['rss_growth_mb']:.1f} MB while serving)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: per-cell vs grid-based table extraction.
+
+Builds one large table on the fake COM object model and reads it three ways:
+the old cell-by-cell walk (four geometry reads and a full read of every
+position, merged or not), parse_table() on COM alone, and parse_table()
+with the slide XML of a matching .pptx for spans and empty cells.
+``--latency`` imitates the cost of a cross-process COM call.
+
+Usage:
+    python tests/backend/benchmarks/bench_table_extraction.py --rows 40 --cols 15
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ppt_parser.media import MediaExtractor  # noqa: E402
+from ppt_parser.snapshot import snapshot  # noqa: E402
+from ppt_parser.styles import extract_fill_format, get_text_and_style_from_shape  # noqa: E402
+from ppt_parser.tables import extract_cell_borders, parse_table  # noqa: E402
+from mocks.fake_powerpoint import CALLS, FakeShape, FakeTable, set_latency  # noqa: E402
+from mocks.ooxml_builder import table_xml, write_pptx  # noqa: E402
+
+
+def per_cell_table(shape):
+    """The previous extraction: every grid position read on its own."""
+    table = shape.Table
+    rows, cols = table.Rows.Count, table.Columns.Count
+    cells = []
+    for r in range(1, rows + 1):
+        for c in range(1, cols + 1):
+            cell = snapshot(table.Cell(r, c))
+            cell_shape = cell.Shape
+            text, style = get_text_and_style_from_shape(cell_shape)
+            cells.append(
+                {
+                    "row": r,
+                    "col": c,
+                    "left": float(cell_shape.Left),
+                    "top": float(cell_shape.Top),
+                    "width": float(cell_shape.Width),
+                    "height": float(cell_shape.Height),
+                    "text": text,
+                    "text_style": style,
+                    "fill": extract_fill_format(cell_shape.Fill),
+                    "borders": extract_cell_borders(cell),
+                    "type": cell_shape.Type,
+                }
+            )
+    return {"rows": rows, "cols": cols, "cells": cells}
+
+
+def merged_header_spans(rows, cols):
+    """A title row across the table and a label column merged in blocks of four rows."""
+    spans = {(1, 1): (1, cols)}
+    for r in range(2, rows + 1, 4):
+        spans[(r, 1)] = (min(4, rows - r + 1), 1)
+    return spans
+
+
+def measure(label, run, repeat):
+    CALLS.reset()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        info = run()
+    elapsed = (time.perf_counter() - started) / repeat
+    calls = CALLS.count // repeat
+    print(f"  {label:<22}: {elapsed * 1000:8.1f} ms  {calls:7d} COM reads  ({len(info['cells'])} cells)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--cols", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--latency", type=float, default=0.00005, help="Seconds per fake COM call"
+    )
+    args = parser.parse_args()
+
+    spans = merged_header_spans(args.rows, args.cols)
+
+    def table_shape():
+        table = FakeTable(args.rows, args.cols, left=40.0, top=80.0, spans=spans)
+        return FakeShape(name="Table 1", shape_type=19, shape_id=2, left=40.0, top=80.0, table=table)
+
+    set_latency(args.latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        pptx = write_pptx(
+            os.path.join(tmp, "deck.pptx"),
+            [[table_xml(2, "Table 1", args.rows, args.cols, left=40.0, top=80.0, spans=spans)]],
+        )
+        print(f"Table: {args.rows} x {args.cols}, latency {args.latency}s/call")
+
+        baseline = measure("per cell", lambda: per_cell_table(table_shape()), args.repeat)
+        com = measure(
+            "grid (COM only)", lambda: parse_table(table_shape(), 1, 1, tmp), args.repeat
+        )
+        with MediaExtractor(pptx, os.path.join(tmp, "images")) as media:
+            xml = measure(
+                "grid + slide XML",
+                lambda: parse_table(table_shape(), 1, 1, tmp, media=media),
+                args.repeat,
+            )
+        print(f"  speedup               : {baseline / com:8.2f}x COM only, {baseline / xml:.2f}x with XML")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: parse time at each PPT_TRACE level.
+
+Times a loop of bare shape spans, then parses one synthetic deck with the
+OOXML parser and with the fake COM object model, with tracing off, at the
+default ``slide`` level and at the ``shape`` level, and reports the time and
+the number of trace events of each run.
+
+Usage:
+    python tests/backend/benchmarks/bench_tracing.py --slides 200 --shapes 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.storage import project_trace_path  # noqa: E402
+from ppt_parser.tracing import load_trace, span, trace_job  # noqa: E402
+from mocks.fake_powerpoint import fake_dispatcher, set_latency, write_fake_deck  # noqa: E402
+from mocks.ooxml_builder import write_pptx_deck  # noqa: E402
+
+LEVELS = ("0", "slide", "shape")
+
+
+def timed_spans(path, level, count):
+    os.environ["PPT_TRACE"] = level
+    started = time.perf_counter()
+    with trace_job(path):
+        for index in range(count):
+            with span(f"shape {index}", "shape", slide=1):
+                pass
+    return time.perf_counter() - started
+
+
+def timed_parse(parse, out_dir, level, repeat):
+    os.environ["PPT_TRACE"] = level
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(out_dir)
+        best = min(best, time.perf_counter() - started)
+    trace_path = project_trace_path(out_dir)
+    events = len(load_trace(trace_path)) if os.path.exists(trace_path) else 0
+    return best, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--shapes", type=int, default=20, help="Shapes per slide")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs")
+    parser.add_argument("--spans", type=int, default=100000, help="Spans in the span loop")
+    args = parser.parse_args()
+
+    set_latency(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{args.spans} shape spans")
+        for level in LEVELS:
+            elapsed = timed_spans(os.path.join(tmp, f"spans-{level}.jsonl"), level, args.spans)
+            print(f"  PPT_TRACE={level:<5}: {elapsed:7.3f}s ({elapsed / args.spans * 1e6:.2f}us/span)")
+
+        pptx = write_pptx_deck(
+            os.path.join(tmp, "deck.pptx"), slides=args.slides, shapes_per_slide=args.shapes
+        )
+        fake = write_fake_deck(
+            os.path.join(tmp, "fake.pptx"), slides=args.slides, shapes_per_slide=args.shapes
+        )
+        engines = {
+            "ooxml": lambda out_dir: ppt_parser.parse_presentation_ooxml(pptx, out_dir),
+            "com": lambda out_dir: ppt_parser.parse_presentation(
+                fake, out_dir, powerpoint=fake_dispatcher()
+            ),
+        }
+        print(f"Deck: {args.slides} slides x {args.shapes} shapes, best of {args.repeat}")
+        for engine, parse in engines.items():
+            baseline = None
+            for level in LEVELS:
+                out_dir = os.path.join(tmp, f"{engine}-{level}")
+                elapsed, events = timed_parse(parse, out_dir, level, args.repeat)
+                baseline = baseline or elapsed
+                print(
+                    f"  {engine:<5} PPT_TRACE={level:<5}: {elapsed:7.3f}s "
+                    f"({elapsed / baseline - 1:+6.1%}, {events} events)"
+                )
+
+
+if __name__ == "__main__":
+    main()
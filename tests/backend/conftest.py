@@ -2,7 +2,9 @@
 Pytest fixtures for backend tests.
 """
 
+import atexit
 import os
+import shutil
 import sys
 import tempfile
 from datetime import datetime
@@ -15,6 +17,52 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"
 
 from database import Database
 
+# main.py opens its SQLite databases on import; keep them out of backend/data
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="ppt-test-data-")
+os.environ["PPT_DATA_DIR"] = TEST_DATA_DIR
+atexit.register(shutil.rmtree, TEST_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def main(tmp_path, monkeypatch):
+    """backend/main.py with its uploads, results, caches and databases under tmp_path.
+
+    Projects live directly in tmp_path (``tmp_path / "<id>" / "<id>.json"``);
+    the job queue is not started, so submitted jobs stay queued.
+    """
+    pytest.importorskip("fastapi")
+    import main
+    import ppt_parser
+    from annotations_db import AnnotationsDatabase
+    from attachments_db import AttachmentsDatabase
+    from job_queue import JobQueue
+    from progress_db import ProgressDatabase
+    from project_cache import ProjectDocumentCache
+
+    monkeypatch.setattr(main, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(main, "RESULT_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "db", Database(str(tmp_path / "projects.db")))
+    monkeypatch.setattr(
+        main, "attachments_db", AttachmentsDatabase(str(tmp_path / "attachments.db"))
+    )
+    monkeypatch.setattr(main, "progress_db", ProgressDatabase(str(tmp_path / "progress.db")))
+    monkeypatch.setattr(
+        main, "annotations_db", AnnotationsDatabase(str(tmp_path / "annotations.db"))
+    )
+    monkeypatch.setattr(main, "job_queue", JobQueue(str(tmp_path / "jobs.db")))
+    monkeypatch.setattr(main, "asset_store", ppt_parser.AssetStore(str(tmp_path / "assets")))
+    monkeypatch.setattr(main, "project_cache", ProjectDocumentCache(1 << 20))
+    return main
+
+
+@pytest.fixture
+def client(main):
+    """TestClient of the isolated ``main`` app."""
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    return TestClient(main.app)
+
 
 @pytest.fixture
 def temp_db() -> Generator[Database, None, None]:
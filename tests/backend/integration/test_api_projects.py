@@ -40,6 +40,22 @@ class TestListProjectsEndpoint:
         pass
 
 
+class TestUploadEndpoint:
+    """Tests for POST /api/upload endpoint."""
+
+    def test_rejects_corrupt_file_without_com(self, main, client, mocker):
+        """A non-OOXML upload should get 400 before any PowerPoint work."""
+        com_metadata = mocker.patch("main.get_metadata_with_com")
+
+        response = client.post(
+            "/api/upload", files={"file": ("broken.pptx", b"not a zip", "application/octet-stream")}
+        )
+
+        assert response.status_code == 400
+        com_metadata.assert_not_called()
+        assert not os.path.exists(os.path.join(main.UPLOAD_DIR, "broken.pptx"))
+
+
 class TestGetProjectEndpoint:
     """Tests for GET /api/project/{id} endpoint."""
 
@@ -122,17 +138,21 @@ class TestHelperFunctions:
         try:
             from main import calculate_prompt_version
 
+            # The version covers the prompts of the summary fields
             settings1 = {
-                "llm": {"system_prompt": "test prompt"},
-                "summary_fields": [{"id": "f1", "prompt": "prompt1"}],
+                "summary_fields": [
+                    {"id": "f1", "system_prompt": "test prompt", "user_prompt": "prompt1"}
+                ],
             }
             settings2 = {
-                "llm": {"system_prompt": "test prompt"},
-                "summary_fields": [{"id": "f1", "prompt": "prompt1"}],
+                "summary_fields": [
+                    {"id": "f1", "system_prompt": "test prompt", "user_prompt": "prompt1"}
+                ],
             }
             settings3 = {
-                "llm": {"system_prompt": "different prompt"},
-                "summary_fields": [{"id": "f1", "prompt": "prompt1"}],
+                "summary_fields": [
+                    {"id": "f1", "system_prompt": "different prompt", "user_prompt": "prompt1"}
+                ],
             }
 
             v1 = calculate_prompt_version(settings1)
@@ -0,0 +1,449 @@
+"""
+Fake PowerPoint COM object model for backend tests and benchmarks.
+
+Mirrors the small subset of the PowerPoint object model that ``ppt_parser`` and
+``ppt_reconstructor`` touch (Application / Presentations / Slides / Shapes /
+TextFrame / Fill / Line / Table ...), so parsing code can run on Linux.
+
+Every read of a capitalized (COM-style) attribute is counted in ``CALLS`` and can
+optionally sleep ``LATENCY`` seconds to imitate a cross-process COM round-trip.
+"""
+
+import json
+import os
+import time
+import zipfile
+from typing import Any, Dict, List, Optional
+
+
+class _CallCounter:
+    """Counts COM-style attribute reads across all fake objects."""
+
+    def __init__(self):
+        self.count = 0
+
+    def reset(self):
+        self.count = 0
+
+
+CALLS = _CallCounter()
+LATENCY = {"seconds": 0.0}
+
+
+def set_latency(seconds: float):
+    """Simulate a per-call COM round-trip cost (seconds)."""
+    LATENCY["seconds"] = seconds
+
+
+class FakeComObject:
+    """Base class: counts (and optionally delays) every COM-style attribute read."""
+
+    def __getattribute__(self, name):
+        if name[:1].isupper():
+            CALLS.count += 1
+            delay = LATENCY["seconds"]
+            if delay:
+                time.sleep(delay)
+        return object.__getattribute__(self, name)
+
+
+class FakeCollection(FakeComObject):
+    """1-based COM collection supporting ``Count``, ``Item(i)``, ``coll(i)`` and iteration."""
+
+    def __init__(self, items=None):
+        self._items = list(items or [])
+
+    @property
+    def Count(self):
+        return len(self._items)
+
+    def Item(self, index):
+        if isinstance(index, str):
+            for item in self._items:
+                if getattr(item, "Name", None) == index:
+                    return item
+            raise KeyError(index)
+        if index < 1 or index > len(self._items):
+            raise IndexError(f"Item {index} out of range")
+        return self._items[index - 1]
+
+    def __call__(self, index):
+        return self.Item(index)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def append(self, item):
+        self._items.append(item)
+
+
+class FakeColor(FakeComObject):
+    def __init__(self, rgb=0):
+        self.RGB = rgb
+
+
+class FakeFont(FakeComObject):
+    def __init__(self, size=18.0, name="Calibri", bold=0, italic=0, underline=0, rgb=0):
+        self.Size = size
+        self.Name = name
+        self.Bold = bold
+        self.Italic = italic
+        self.Underline = underline
+        self.Color = FakeColor(rgb)
+
+
+class FakeTextRange(FakeComObject):
+    def __init__(self, text="", font=None):
+        self.Text = text
+        self.Font = font or FakeFont()
+
+
+class FakeTextFrame(FakeComObject):
+    def __init__(self, text="", font=None):
+        self.TextRange = FakeTextRange(text, font)
+
+    @property
+    def HasText(self):
+        return -1 if self.TextRange.Text else 0
+
+
+class FakeFill(FakeComObject):
+    def __init__(self, visible=-1, fore_rgb=0xFFFFFF, back_rgb=0, fill_type=1):
+        self.Visible = visible
+        self.ForeColor = FakeColor(fore_rgb)
+        self.BackColor = FakeColor(back_rgb)
+        self.Type = fill_type
+        self.Transparency = 0.0
+
+
+class FakeLine(FakeComObject):
+    def __init__(self, visible=-1, weight=0.75, dash_style=1, style=1, rgb=0):
+        self.Visible = visible
+        self.Weight = weight
+        self.DashStyle = dash_style
+        self.Style = style
+        self.ForeColor = FakeColor(rgb)
+
+
+class FakeBorders(FakeComObject):
+    def __init__(self):
+        self.Top = FakeLine()
+        self.Bottom = FakeLine()
+        self.Left = FakeLine()
+        self.Right = FakeLine()
+
+
+class FakeAdjustments(FakeComObject):
+    def __init__(self, values=None):
+        self._values = list(values or [])
+
+    @property
+    def Count(self):
+        return len(self._values)
+
+    def Item(self, index):
+        return self._values[index - 1]
+
+
+class FakeShape(FakeComObject):
+    """A slide/master/layout shape, table cell shape or group child."""
+
+    def __init__(
+        self,
+        name="Shape",
+        shape_type=1,
+        left=0.0,
+        top=0.0,
+        width=100.0,
+        height=50.0,
+        text="",
+        shape_id=1,
+        auto_shape_type=1,
+        z_order=1,
+        children=None,
+        table=None,
+    ):
+        self.Name = name
+        self.Id = shape_id
+        self.Type = shape_type
+        self.AutoShapeType = auto_shape_type
+        self.Left = left
+        self.Top = top
+        self.Width = width
+        self.Height = height
+        self.Rotation = 0.0
+        self.ZOrderPosition = z_order
+        self.AlternativeText = ""
+        self.Connector = 0
+        self.HorizontalFlip = 0
+        self.VerticalFlip = 0
+        self.Adjustments = FakeAdjustments()
+        self.HasTextFrame = -1
+        self.TextFrame = FakeTextFrame(text)
+        self.TextFrame2 = self.TextFrame
+        self.Fill = FakeFill()
+        self.Line = FakeLine()
+        self.GroupItems = FakeCollection(children or [])
+        self.Table = table
+        self.exports: List[str] = []
+
+    def Export(self, path, fmt=None, *args, **kwargs):
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\nfake-shape:" + self.Name.encode("utf-8"))
+        self.exports.append(path)
+
+
+class FakeCell(FakeComObject):
+    def __init__(self, shape):
+        self.Shape = shape
+        self.Borders = FakeBorders()
+
+
+class FakeRow(FakeComObject):
+    def __init__(self, height):
+        self.Height = height
+
+
+class FakeColumn(FakeComObject):
+    def __init__(self, width):
+        self.Width = width
+
+
+class FakeTable(FakeComObject):
+    """Table whose cells are laid out on a regular grid starting at (left, top).
+
+    ``spans`` merges areas ({(r, c): (row_span, col_span)}): the origin cell
+    covers the whole area and covered positions return the origin's cell.
+    """
+
+    def __init__(
+        self, rows, cols, left=0.0, top=0.0, row_height=20.0, col_width=60.0, spans=None
+    ):
+        self.Rows = FakeCollection([FakeRow(row_height) for _ in range(rows)])
+        self.Columns = FakeCollection([FakeColumn(col_width) for _ in range(cols)])
+        self._cells = {}
+        spans = spans or {}
+        for r in range(1, rows + 1):
+            for c in range(1, cols + 1):
+                if (r, c) in self._cells:
+                    continue
+                row_span, col_span = spans.get((r, c), (1, 1))
+                cell_shape = FakeShape(
+                    name=f"Cell {r},{c}",
+                    left=left + (c - 1) * col_width,
+                    top=top + (r - 1) * row_height,
+                    width=col_width * col_span,
+                    height=row_height * row_span,
+                    text=f"r{r}c{c}",
+                )
+                cell = FakeCell(cell_shape)
+                for dr in range(row_span):
+                    for dc in range(col_span):
+                        self._cells[(r + dr, c + dc)] = cell
+
+    def Cell(self, row, col):
+        return self._cells[(row, col)]
+
+
+class FakeNamed(FakeComObject):
+    def __init__(self, name):
+        self.Name = name
+
+
+class FakeLayout(FakeComObject):
+    def __init__(self, name="Blank", shapes=None):
+        self.Name = name
+        self.Shapes = FakeCollection(shapes or [])
+
+
+class FakeMaster(FakeComObject):
+    def __init__(self, name="Office Theme", shapes=None, layouts=None):
+        self.Name = name
+        self.Shapes = FakeCollection(shapes or [])
+        self.CustomLayouts = FakeCollection(layouts or [FakeLayout()])
+
+
+class FakeDesign(FakeComObject):
+    def __init__(self, name="Office Theme", master=None):
+        self.Name = name
+        self.SlideMaster = master or FakeMaster(name)
+
+
+class FakePageSetup(FakeComObject):
+    def __init__(self, width=960.0, height=540.0):
+        self.SlideWidth = width
+        self.SlideHeight = height
+
+
+class FakeSlide(FakeComObject):
+    def __init__(self, slide_id, shapes=None, design_name="Office Theme", layout_name="Blank"):
+        self.SlideID = slide_id
+        self.Shapes = FakeCollection(shapes or [])
+        self.Design = FakeNamed(design_name)
+        self.CustomLayout = FakeNamed(layout_name)
+        self.Parent = None
+        self.exports: List[str] = []
+
+    def Export(self, path, fmt=None, *args, **kwargs):
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\nfake-slide:" + str(self.SlideID).encode())
+        self.exports.append(path)
+
+
+class FakeDocumentProperty(FakeComObject):
+    def __init__(self, name, value):
+        self.Name = name
+        self.Value = value
+
+
+class FakeDocumentProperties(FakeCollection):
+    """BuiltInDocumentProperties: iterable and callable by property name."""
+
+    def __call__(self, name):
+        return self.Item(name)
+
+
+class FakePresentation(FakeComObject):
+    def __init__(self, slides=None, designs=None, properties=None, width=960.0, height=540.0):
+        self.Slides = FakeCollection(slides or [])
+        for slide in self.Slides:
+            slide.Parent = self
+        self.Designs = FakeCollection(designs or [FakeDesign()])
+        self.SlideMaster = self.Designs.Item(1).SlideMaster
+        self.PageSetup = FakePageSetup(width, height)
+        self.BuiltInDocumentProperties = FakeDocumentProperties(
+            [FakeDocumentProperty(k, v) for k, v in (properties or {}).items()]
+        )
+        self.CustomDocumentProperties = FakeDocumentProperties([])
+        self.closed = False
+        self.FullName = ""
+
+    def Close(self):
+        self.closed = True
+
+    def SaveAs(self, path):
+        with open(path, "wb") as f:
+            f.write(b"fake-pptx")
+
+
+def build_fake_presentation(
+    slide_count: int = 3,
+    shapes_per_slide: int = 4,
+    table_size: Optional[tuple] = None,
+    properties: Optional[Dict[str, Any]] = None,
+    master_pictures: int = 0,
+    design_name: str = "Office Theme",
+) -> FakePresentation:
+    """Build a synthetic deck: text boxes and rectangles, plus an optional table per slide.
+
+    ``master_pictures`` puts that many picture shapes (logos) on the slide master.
+    """
+    slides = []
+    for s in range(1, slide_count + 1):
+        shapes = []
+        for i in range(1, shapes_per_slide + 1):
+            shape_type = 17 if i % 2 else 1
+            shapes.append(
+                FakeShape(
+                    name=f"Shape {i}",
+                    shape_type=shape_type,
+                    left=10.0 * i,
+                    top=5.0 * i,
+                    text=f"Slide {s} shape {i}",
+                    shape_id=i + 1,
+                    z_order=i,
+                )
+            )
+        if table_size:
+            rows, cols = table_size
+            shapes.append(
+                FakeShape(
+                    name="Table 1",
+                    shape_type=19,
+                    shape_id=shapes_per_slide + 2,
+                    z_order=shapes_per_slide + 1,
+                    table=FakeTable(rows, cols),
+                )
+            )
+        slides.append(FakeSlide(256 + s, shapes))
+
+    master = FakeMaster(
+        design_name,
+        shapes=[
+            FakeShape(name=f"Logo {i}", shape_type=13, shape_id=100 + i, z_order=i)
+            for i in range(1, master_pictures + 1)
+        ],
+    )
+    return FakePresentation(
+        slides,
+        designs=[FakeDesign(design_name, master)],
+        properties=properties
+        or {"Title": "Fake Deck", "Author": "Tester", "Revision Number": 3},
+    )
+
+
+# Part of a write_pptx_deck() package holding the spec FakePresentations.Open reads
+FAKE_SPEC_PART = "fake/deck.json"
+
+
+class FakePresentations(FakeComObject):
+    """``Application.Presentations``: Open() reads a JSON deck spec from disk."""
+
+    def __init__(self):
+        self.opened: List[FakePresentation] = []
+
+    @property
+    def Count(self):
+        return len([p for p in self.opened if not p.closed])
+
+    def Open(self, path, ReadOnly=False, Untitled=False, WithWindow=True):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        if zipfile.is_zipfile(path):
+            # Real package from ooxml_builder.write_pptx_deck with the spec embedded
+            with zipfile.ZipFile(path) as zf:
+                spec = json.loads(zf.read(FAKE_SPEC_PART))
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                spec = json.load(f)
+        presentation = build_fake_presentation(
+            slide_count=spec.get("slides", 3),
+            shapes_per_slide=spec.get("shapes_per_slide", 4),
+            table_size=tuple(spec["table"]) if spec.get("table") else None,
+            properties=spec.get("properties"),
+            master_pictures=spec.get("master_pictures", 0),
+            design_name=spec.get("design_name", "Office Theme"),
+        )
+        presentation.FullName = path
+        self.opened.append(presentation)
+        return presentation
+
+    def Add(self, WithWindow=True):
+        presentation = FakePresentation()
+        self.opened.append(presentation)
+        return presentation
+
+
+class FakeApplication(FakeComObject):
+    def __init__(self):
+        self.Presentations = FakePresentations()
+        self.quit_called = False
+
+    def Quit(self):
+        self.quit_called = True
+
+
+def fake_dispatcher() -> FakeApplication:
+    """Drop-in replacement for ``win32.gencache.EnsureDispatch('PowerPoint.Application')``."""
+    return FakeApplication()
+
+
+def write_fake_deck(path: str, slides: int = 3, shapes_per_slide: int = 4, **spec) -> str:
+    """Write a JSON deck spec that ``FakePresentations.Open`` turns into a fake deck."""
+    spec.update({"slides": slides, "shapes_per_slide": shapes_per_slide})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(spec, f)
+    return path
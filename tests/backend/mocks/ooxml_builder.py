@@ -0,0 +1,357 @@
+"""
+Minimal .pptx writer for OOXML engine tests.
+
+``write_pptx_deck`` produces a real package with the same content as the
+fake COM deck from ``fake_powerpoint.write_fake_deck`` (same shapes, geometry,
+text, table and document properties), so both parsing engines can be compared
+on one deck. Lower-level helpers build individual shape XML for targeted tests.
+"""
+
+import json
+import zipfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+EMU = 12700  # EMU per point
+
+NSDECL = (
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+)
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# Fake COM defaults: white fill, 0.75pt black line, 18pt black Calibri text
+FILL_XML = '<a:solidFill><a:srgbClr val="FFFFFF"/></a:solidFill>'
+LINE_XML = '<a:ln w="9525"><a:solidFill><a:srgbClr val="000000"/></a:solidFill></a:ln>'
+
+
+def _emu(points: float) -> int:
+    return int(round(points * EMU))
+
+
+def _xfrm(left, top, width, height, tag="a:xfrm", extra=""):
+    return (
+        f'<{tag}{extra}><a:off x="{_emu(left)}" y="{_emu(top)}"/>'
+        f'<a:ext cx="{_emu(width)}" cy="{_emu(height)}"/></{tag}>'
+    )
+
+
+def text_body_xml(text: str, size: float = 18.0, tag: str = "p:txBody") -> str:
+    paragraphs = "".join(
+        f'<a:p><a:r><a:rPr lang="en-US" sz="{int(size * 100)}"/><a:t>{line}</a:t></a:r></a:p>'
+        for line in text.split("\r")
+    ) or "<a:p/>"
+    return f"<{tag}><a:bodyPr/><a:lstStyle/>{paragraphs}</{tag}>"
+
+
+def shape_xml(
+    shape_id: int,
+    name: str,
+    left: float,
+    top: float,
+    width: float = 100.0,
+    height: float = 50.0,
+    text: str = "",
+    text_box: bool = False,
+    preset: str = "rect",
+    descr: str = "",
+) -> str:
+    c_nv_sp_pr = '<p:cNvSpPr txBox="1"/>' if text_box else "<p:cNvSpPr/>"
+    descr_attr = f' descr="{descr}"' if descr else ""
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="{name}"{descr_attr}/>'
+        f"{c_nv_sp_pr}<p:nvPr/></p:nvSpPr>"
+        f"<p:spPr>{_xfrm(left, top, width, height)}"
+        f'<a:prstGeom prst="{preset}"><a:avLst/></a:prstGeom>{FILL_XML}{LINE_XML}</p:spPr>'
+        f"{text_body_xml(text)}</p:sp>"
+    )
+
+
+def picture_xml(shape_id: int, name: str, r_id: str, left, top, width, height) -> str:
+    return (
+        f'<p:pic><p:nvPicPr><p:cNvPr id="{shape_id}" name="{name}"/>'
+        f"<p:cNvPicPr/><p:nvPr/></p:nvPicPr>"
+        f'<p:blipFill><a:blip r:embed="{r_id}"/><a:stretch><a:fillRect/></a:stretch></p:blipFill>'
+        f'<p:spPr>{_xfrm(left, top, width, height)}<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr>'
+        f"</p:pic>"
+    )
+
+
+def group_xml(shape_id: int, name: str, box, child_box, children: Sequence[str]) -> str:
+    left, top, width, height = box
+    c_left, c_top, c_width, c_height = child_box
+    xfrm = (
+        f'<a:xfrm><a:off x="{_emu(left)}" y="{_emu(top)}"/>'
+        f'<a:ext cx="{_emu(width)}" cy="{_emu(height)}"/>'
+        f'<a:chOff x="{_emu(c_left)}" y="{_emu(c_top)}"/>'
+        f'<a:chExt cx="{_emu(c_width)}" cy="{_emu(c_height)}"/></a:xfrm>'
+    )
+    return (
+        f'<p:grpSp><p:nvGrpSpPr><p:cNvPr id="{shape_id}" name="{name}"/>'
+        f"<p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr><p:grpSpPr>{xfrm}</p:grpSpPr>"
+        f'{"".join(children)}</p:grpSp>'
+    )
+
+
+def table_xml(
+    shape_id: int,
+    name: str,
+    rows: int,
+    cols: int,
+    left: float = 0.0,
+    top: float = 0.0,
+    width: float = 100.0,
+    height: float = 50.0,
+    row_height: float = 20.0,
+    col_width: float = 60.0,
+    spans: Optional[Dict[Tuple[int, int], Tuple[int, int]]] = None,
+) -> str:
+    """graphicFrame table with "r{r}c{c}" cell text; spans: {(r, c): (rowSpan, gridSpan)}."""
+    spans = spans or {}
+    covered = {}
+    for (r, c), (row_span, grid_span) in spans.items():
+        for dr in range(row_span):
+            for dc in range(grid_span):
+                if dr or dc:
+                    covered[(r + dr, c + dc)] = (dr > 0, dc > 0)
+
+    grid = "".join(f'<a:gridCol w="{_emu(col_width)}"/>' for _ in range(cols))
+    rows_xml = []
+    for r in range(1, rows + 1):
+        cells = []
+        for c in range(1, cols + 1):
+            attrs = ""
+            if (r, c) in spans:
+                row_span, grid_span = spans[(r, c)]
+                if row_span > 1:
+                    attrs += f' rowSpan="{row_span}"'
+                if grid_span > 1:
+                    attrs += f' gridSpan="{grid_span}"'
+            if (r, c) in covered:
+                v_merge, h_merge = covered[(r, c)]
+                attrs += ' vMerge="1"' if v_merge else ""
+                attrs += ' hMerge="1"' if h_merge else ""
+            cells.append(
+                f"<a:tc{attrs}>{text_body_xml(f'r{r}c{c}', tag='a:txBody')}"
+                f"<a:tcPr>{FILL_XML}</a:tcPr></a:tc>"
+            )
+        rows_xml.append(f'<a:tr h="{_emu(row_height)}">{"".join(cells)}</a:tr>')
+
+    return (
+        f'<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="{shape_id}" name="{name}"/>'
+        f"<p:cNvGraphicFramePr/><p:nvPr/></p:nvGraphicFramePr>"
+        f"{_xfrm(left, top, width, height, tag='p:xfrm')}"
+        f'<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table">'
+        f"<a:tbl><a:tblPr/><a:tblGrid>{grid}</a:tblGrid>{''.join(rows_xml)}</a:tbl>"
+        f"</a:graphicData></a:graphic></p:graphicFrame>"
+    )
+
+
+def _sp_tree(shapes: Sequence[str]) -> str:
+    return (
+        '<p:spTree><p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+        f'<p:grpSpPr/>{"".join(shapes)}</p:spTree>'
+    )
+
+
+def _rels(entries: Sequence[Tuple[str, str, str]]) -> str:
+    body = "".join(
+        f'<Relationship Id="{r_id}" Type="{DOC_REL}/{kind}" Target="{target}"/>'
+        for r_id, kind, target in entries
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="{REL_NS}">{body}</Relationships>'
+
+
+THEME_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" name="Office Theme">'
+    '<a:themeElements><a:clrScheme name="Office">'
+    '<a:dk1><a:srgbClr val="000000"/></a:dk1><a:lt1><a:srgbClr val="FFFFFF"/></a:lt1>'
+    '<a:dk2><a:srgbClr val="44546A"/></a:dk2><a:lt2><a:srgbClr val="E7E6E6"/></a:lt2>'
+    '<a:accent1><a:srgbClr val="4472C4"/></a:accent1></a:clrScheme>'
+    '<a:fontScheme name="Office"><a:majorFont><a:latin typeface="Calibri Light"/></a:majorFont>'
+    '<a:minorFont><a:latin typeface="Calibri"/></a:minorFont></a:fontScheme>'
+    "<a:fmtScheme><a:lnStyleLst>"
+    '<a:ln w="6350"/><a:ln w="12700"/><a:ln w="19050"/></a:lnStyleLst></a:fmtScheme>'
+    "</a:themeElements></a:theme>"
+)
+
+
+def write_pptx(
+    path: str,
+    slides: List[List[str]],
+    properties: Optional[Dict[str, Any]] = None,
+    media: Optional[Dict[str, bytes]] = None,
+    slide_rels: Optional[Dict[int, List[Tuple[str, str, str]]]] = None,
+    width: float = 960.0,
+    height: float = 540.0,
+) -> str:
+    """Write a package with one master/layout ("Office Theme" / "Blank") and the given slides.
+
+    slides: shape XML strings per slide
+    media: {"ppt/media/<name>": bytes}
+    slide_rels: extra (rId, type, target) relationships per 1-based slide index
+    """
+    properties = properties or {}
+    media = media or {}
+    slide_rels = slide_rels or {}
+
+    slide_overrides = "".join(
+        f'<Override PartName="/ppt/slides/slide{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.presentationml.slide+xml"/>'
+        for i in range(1, len(slides) + 1)
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Default Extension="png" ContentType="image/png"/>'
+        '<Override PartName="/ppt/presentation.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"/>'
+        f"{slide_overrides}</Types>"
+    )
+
+    sld_ids = "".join(
+        f'<p:sldId id="{256 + i}" r:id="rId{100 + i}"/>' for i in range(1, len(slides) + 1)
+    )
+    presentation = (
+        f'<?xml version="1.0" encoding="UTF-8"?><p:presentation {NSDECL}>'
+        '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+        f"<p:sldIdLst>{sld_ids}</p:sldIdLst>"
+        f'<p:sldSz cx="{_emu(width)}" cy="{_emu(height)}"/><p:notesSz cx="6858000" cy="9144000"/>'
+        "</p:presentation>"
+    )
+    presentation_rels = [("rId1", "slideMaster", "slideMasters/slideMaster1.xml")] + [
+        (f"rId{100 + i}", "slide", f"slides/slide{i}.xml") for i in range(1, len(slides) + 1)
+    ]
+
+    master = (
+        f'<?xml version="1.0" encoding="UTF-8"?><p:sldMaster {NSDECL}>'
+        f'<p:cSld name="Office Theme">{_sp_tree([])}</p:cSld>'
+        '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" accent2="accent2" '
+        'accent3="accent3" accent4="accent4" accent5="accent5" accent6="accent6" hlink="hlink" folHlink="folHlink"/>'
+        '<p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/></p:sldLayoutIdLst>'
+        "<p:txStyles><p:titleStyle/><p:bodyStyle/><p:otherStyle>"
+        '<a:lvl1pPr><a:defRPr sz="1800"><a:solidFill><a:schemeClr val="tx1"/></a:solidFill>'
+        '<a:latin typeface="+mn-lt"/></a:defRPr></a:lvl1pPr>'
+        "</p:otherStyle></p:txStyles></p:sldMaster>"
+    )
+    layout = (
+        f'<?xml version="1.0" encoding="UTF-8"?><p:sldLayout {NSDECL}>'
+        f'<p:cSld name="Blank">{_sp_tree([])}</p:cSld></p:sldLayout>'
+    )
+
+    core_fields = {
+        "Title": "dc:title",
+        "Subject": "dc:subject",
+        "Author": "dc:creator",
+        "Last Author": "cp:lastModifiedBy",
+        "Revision Number": "cp:revision",
+    }
+    core_body = "".join(
+        f"<{tag}>{properties[name]}</{tag}>"
+        for name, tag in core_fields.items()
+        if name in properties
+    )
+    core = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/">'
+        f"{core_body}</cp:coreProperties>"
+    )
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr(
+            "_rels/.rels",
+            _rels(
+                [
+                    ("rId1", "officeDocument", "ppt/presentation.xml"),
+                    ("rId2", "metadata/core-properties", "docProps/core.xml"),
+                ]
+            ),
+        )
+        zf.writestr("docProps/core.xml", core)
+        zf.writestr("ppt/presentation.xml", presentation)
+        zf.writestr("ppt/_rels/presentation.xml.rels", _rels(presentation_rels))
+        zf.writestr("ppt/slideMasters/slideMaster1.xml", master)
+        zf.writestr(
+            "ppt/slideMasters/_rels/slideMaster1.xml.rels",
+            _rels(
+                [
+                    ("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml"),
+                    ("rId2", "theme", "../theme/theme1.xml"),
+                ]
+            ),
+        )
+        zf.writestr("ppt/slideLayouts/slideLayout1.xml", layout)
+        zf.writestr(
+            "ppt/slideLayouts/_rels/slideLayout1.xml.rels",
+            _rels([("rId1", "slideMaster", "../slideMasters/slideMaster1.xml")]),
+        )
+        zf.writestr("ppt/theme/theme1.xml", THEME_XML)
+        for i, shapes in enumerate(slides, start=1):
+            zf.writestr(
+                f"ppt/slides/slide{i}.xml",
+                f'<?xml version="1.0" encoding="UTF-8"?><p:sld {NSDECL}>'
+                f"<p:cSld>{_sp_tree(shapes)}</p:cSld></p:sld>",
+            )
+            rels = [("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml")]
+            rels += slide_rels.get(i, [])
+            zf.writestr(f"ppt/slides/_rels/slide{i}.xml.rels", _rels(rels))
+        for name, data in media.items():
+            zf.writestr(name, data)
+    return path
+
+
+def write_pptx_deck(
+    path: str,
+    slides: int = 3,
+    shapes_per_slide: int = 4,
+    table: Optional[Sequence[int]] = None,
+    properties: Optional[Dict[str, Any]] = None,
+    edits: Optional[Dict[int, str]] = None,
+    width: float = 960.0,
+    height: float = 540.0,
+) -> str:
+    """Package equivalent of ``write_fake_deck(path, slides, shapes_per_slide, ...)``.
+
+    The fake deck spec is embedded too, so ``FakePresentations.Open`` can open
+    the same file. ``edits`` appends text to the first shape of given slides
+    (1-based) to simulate editing them in the package only; ``width`` and
+    ``height`` (points) set the slide size in the package only.
+    """
+    edits = edits or {}
+    slide_shapes = []
+    for s in range(1, slides + 1):
+        shapes = [
+            shape_xml(
+                i + 1,
+                f"Shape {i}",
+                left=10.0 * i,
+                top=5.0 * i,
+                text=f"Slide {s} shape {i}" + (edits.get(s, "") if i == 1 else ""),
+                text_box=bool(i % 2),
+            )
+            for i in range(1, shapes_per_slide + 1)
+        ]
+        if table:
+            shapes.append(table_xml(shapes_per_slide + 2, "Table 1", *table))
+        slide_shapes.append(shapes)
+    properties = properties or {"Title": "Fake Deck", "Author": "Tester", "Revision Number": 3}
+    spec = {
+        "slides": slides,
+        "shapes_per_slide": shapes_per_slide,
+        "table": list(table) if table else None,
+        "properties": properties,
+    }
+    return write_pptx(
+        path,
+        slide_shapes,
+        properties=properties,
+        media={"fake/deck.json": json.dumps(spec).encode("utf-8")},
+        width=width,
+        height=height,
+    )
@@ -0,0 +1,203 @@
+"""
+Tests for user annotations kept apart from the parse output
+(backend/annotations_db.py, utils.shape_utils.apply_annotations) and how the
+project endpoints lay them over the stored JSON
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+
+import ppt_parser  # noqa: E402
+from annotations_db import AnnotationsDatabase  # noqa: E402
+from utils.shape_utils import (  # noqa: E402
+    annotated_descriptions,
+    apply_annotations,
+    shape_annotation_keys,
+)
+
+
+def project(slides=2):
+    return {
+        "title": "Plan",
+        "slides": [
+            {
+                "slide_index": s,
+                "shapes": [
+                    {"shape_index": 1, "name": "Title", "left": 10, "top": 20},
+                    {
+                        "shape_index": 2,
+                        "name": "Group",
+                        "children": [
+                            {"shape_index": 3, "name": "Box", "left": 0, "top": 0},
+                            {"shape_index": 4, "name": "Box", "left": 5, "top": 5},
+                        ],
+                    },
+                ],
+            }
+            for s in range(1, slides + 1)
+        ],
+    }
+
+
+@pytest.fixture
+def annotations(tmp_path):
+    return AnnotationsDatabase(str(tmp_path / "annotations.db"))
+
+
+class TestAnnotationsDatabase:
+    """Tests for AnnotationsDatabase."""
+
+    def test_description_and_position_share_a_row(self, annotations):
+        annotations.set_description("p1", 1, "Title", 1, "Heading")
+        annotations.set_positions("p1", [(1, "Title", 1, 50.0, 60.0)])
+
+        assert annotations.for_project("p1") == {
+            1: {"Title": {"description": "Heading", "left": 50.0, "top": 60.0}}
+        }
+        assert annotations.for_project("p2") == {}
+
+    def test_revision_follows_the_slides_asked_for(self, annotations):
+        assert annotations.revision("p1") == 0
+        annotations.set_description("p1", 1, "Title", 1, "a")
+        first = annotations.revision("p1", 1, 1)
+        annotations.set_description("p1", 2, "Title", 1, "b")
+
+        assert annotations.revision("p1", 1, 1) == first
+        assert annotations.revision("p1", 2, 2) > first
+        assert annotations.revision("p1") == annotations.revision("p1", 2)
+
+    def test_import_keeps_existing_descriptions(self, annotations):
+        annotations.set_description("p1", 1, "Title", 1, "edited")
+        annotations.set_positions("p1", [(1, "#3", 3, 1.0, 2.0)])
+
+        annotations.import_descriptions(
+            "p1", [(1, "Title", 1, "legacy"), (1, "#3", 3, "legacy box")]
+        )
+
+        rows = annotations.for_project("p1")[1]
+        assert rows["Title"]["description"] == "edited"
+        assert rows["#3"] == {"description": "legacy box", "left": 1.0, "top": 2.0}
+
+    def test_delete_project(self, annotations):
+        annotations.set_description("p1", 1, "Title", 1, "a")
+        assert annotations.delete_project("p1") == 1
+        assert annotations.for_project("p1") == {}
+
+
+class TestApplyAnnotations:
+    """Tests for shape_annotation_keys() / apply_annotations()."""
+
+    def test_keys_use_unique_names(self):
+        keys = shape_annotation_keys(project(1)["slides"][0]["shapes"])
+        assert sorted(keys) == ["#3", "#4", "Group", "Title"]
+
+    def test_overlay_copies_the_annotated_slides(self):
+        slides = project()["slides"]
+        overlaid = apply_annotations(
+            slides, {2: {"#4": {"left": 99.0}, "Title": {"description": "Heading"}}}
+        )
+
+        assert overlaid[0] is slides[0]
+        assert overlaid[1]["shapes"][0]["description"] == "Heading"
+        assert overlaid[1]["shapes"][1]["children"][1]["left"] == 99.0
+        assert slides[1] == project()["slides"][1]
+
+    def test_legacy_descriptions(self):
+        slides = project(1)["slides"]
+        slides[0]["shapes"][1]["children"][0]["description"] = "old"
+        assert annotated_descriptions(slides) == [(1, "#3", 3, "old")]
+
+    def test_stream_overlays_only_annotated_slides(self, tmp_path):
+        (tmp_path / "p1").mkdir()
+        path = str(tmp_path / "p1" / "p1.json")
+        expected = project()
+        expected["slides"][0]["shapes"][0]["description"] = "Heading"
+        for layout in ppt_parser.storage.PROJECT_LAYOUTS:
+            ppt_parser.save_project_json(path, project(), layout=layout)
+            raw = b"".join(
+                ppt_parser.iter_project_document(
+                    path,
+                    overlay=lambda slide: dict(
+                        slide,
+                        shapes=[dict(slide["shapes"][0], description="Heading")]
+                        + slide["shapes"][1:],
+                    ),
+                    overlay_slides=[1],
+                )
+            )
+            assert json.loads(raw) == expected
+
+
+class TestAnnotationEndpoints:
+    """Edits are upserts; the project endpoints lay them over the stored JSON."""
+
+    @pytest.fixture(params=["sharded", "single"])
+    def client(self, request, client, tmp_path):
+        (tmp_path / "p1").mkdir()
+        ppt_parser.save_project_json(
+            str(tmp_path / "p1" / "p1.json"), project(), layout=request.param
+        )
+        return client
+
+    def test_edits_are_overlaid_not_written(self, client, tmp_path):
+        stored = (tmp_path / "p1" / "p1.json").read_bytes()
+        etag = client.get("/api/project/p1").headers["etag"]
+
+        assert client.post(
+            "/api/project/p1/update_description",
+            json={"slide_index": 2, "shape_index": "3", "description": "Left box"},
+        ).status_code == 200
+        moved = client.post(
+            "/api/project/p1/update_positions",
+            json={"updates": [{"slide_index": 2, "shape_index": "1", "left": 7, "top": 8}]},
+        )
+
+        assert moved.json()["updated"] == 1
+        assert (tmp_path / "p1" / "p1.json").read_bytes() == stored
+        response = client.get("/api/project/p1", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        shapes = response.json()["slides"][1]["shapes"]
+        assert (shapes[0]["left"], shapes[0]["top"]) == (7, 8)
+        assert shapes[1]["children"][0]["description"] == "Left box"
+        assert client.get("/api/project/p1/slides/2").json()["shapes"] == shapes
+
+    def test_slide_etag_follows_its_annotations(self, client):
+        first = client.get("/api/project/p1/slides/1").headers["etag"]
+        second = client.get("/api/project/p1/slides/2").headers["etag"]
+
+        client.post(
+            "/api/project/p1/update_description",
+            json={"slide_index": 2, "shape_index": "1", "description": "Heading"},
+        )
+
+        unchanged = client.get("/api/project/p1/slides/1", headers={"If-None-Match": first})
+        assert unchanged.status_code == 304
+        edited = client.get("/api/project/p1/slides/2", headers={"If-None-Match": second})
+        assert edited.json()["shapes"][0]["description"] == "Heading"
+
+    def test_unknown_shape(self, client):
+        response = client.post(
+            "/api/project/p1/update_description",
+            json={"slide_index": 1, "shape_index": "9", "description": "x"},
+        )
+        assert response.status_code == 404
+
+    def test_annotations_survive_a_new_parse(self, client, tmp_path):
+        client.post(
+            "/api/project/p1/update_description",
+            json={"slide_index": 1, "shape_index": "1", "description": "Heading"},
+        )
+        # A reparse writes new output; shapes are matched by name again
+        reparsed = project()
+        reparsed["slides"][0]["shapes"][0]["shape_index"] = 7
+        ppt_parser.save_project_json(str(tmp_path / "p1" / "p1.json"), reparsed)
+
+        shape = client.get("/api/project/p1").json()["slides"][0]["shapes"][0]
+        assert shape == {
+            "shape_index": 7, "name": "Title", "left": 10, "top": 20, "description": "Heading"
+        }
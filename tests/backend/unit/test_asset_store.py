@@ -0,0 +1,239 @@
+"""
+Tests for backend/ppt_parser/assets.py (content-addressed image store)
+"""
+
+import hashlib
+import io
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ppt_parser.assets import AssetStore, iter_image_files  # noqa: E402
+from ppt_parser.images import export_shape_image  # noqa: E402
+from ppt_parser.media import MediaExtractor  # noqa: E402
+from ppt_parser.ooxml import parse_presentation_ooxml  # noqa: E402
+from ppt_parser.storage import load_project_json  # noqa: E402
+from utils.static_files import ResultStaticFiles  # noqa: E402
+from mocks.fake_powerpoint import FakeShape  # noqa: E402
+from mocks.ooxml_builder import picture_xml, write_pptx  # noqa: E402
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def png_bytes(color=(255, 0, 0)):
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def logo_deck(path, slides=2, data=None):
+    """Every slide shows the same embedded logo."""
+    return write_pptx(
+        str(path),
+        [[picture_xml(2, "Logo", "rId2", 10, 10, 40, 40)] for _ in range(slides)],
+        media={"ppt/media/image1.png": data or png_bytes()},
+        slide_rels={
+            i: [("rId2", "image", "../media/image1.png")] for i in range(1, slides + 1)
+        },
+    )
+
+
+def project(*image_files):
+    return {"slides": [{"shapes": [{"image_file": f} for f in image_files]}]}
+
+
+class TestAssetStore:
+    """Tests for AssetStore files and reference counts."""
+
+    def test_put_bytes_is_content_addressed(self, tmp_path):
+        """Identical bytes should be stored once under their SHA-256."""
+        store = AssetStore(str(tmp_path))
+        data = png_bytes()
+        first = store.put_bytes(data, ".PNG")
+        second = store.put_bytes(data, ".png")
+
+        assert first == second == hashlib.sha256(data).hexdigest() + ".png"
+        assert open(store.path(first), "rb").read() == data
+        assert store.stats()["assets"] == 1
+
+    def test_put_file_moves_or_drops_duplicates(self, tmp_path):
+        """Exported files are moved in, and removed when already stored."""
+        store = AssetStore(str(tmp_path / "store"))
+        for name in ("a.png", "b.png"):
+            (tmp_path / name).write_bytes(b"same")
+        first = store.put_file(str(tmp_path / "a.png"))
+        second = store.put_file(str(tmp_path / "b.png"))
+
+        assert first == second
+        assert not (tmp_path / "a.png").exists()
+        assert not (tmp_path / "b.png").exists()
+        assert store.exists(first)
+
+    def test_refcounts_across_projects(self, tmp_path):
+        """Shared assets survive until the last referencing project drops them."""
+        store = AssetStore(str(tmp_path))
+        name = store.put_bytes(b"logo", ".png")
+        path = f"assets/{name}"
+
+        store.sync_project("p1", project(path, path))
+        store.sync_project("p2", project(path))
+        assert store.refcount(name) == 3
+
+        assert store.release_project("p1", grace_seconds=0) == 0
+        assert store.exists(name)
+        assert store.release_project("p2", grace_seconds=0) == 1
+        assert not store.exists(name)
+
+    def test_grace_period_protects_fresh_assets(self, tmp_path):
+        """Unreferenced assets written moments ago may belong to a running parse."""
+        store = AssetStore(str(tmp_path))
+        name = store.put_bytes(b"fresh", ".png")
+        assert store.collect_garbage() == 0
+        assert store.exists(name)
+        assert store.collect_garbage(grace_seconds=0) == 1
+
+    def test_iter_image_files_walks_everything(self):
+        """Masters, layouts, group children and table cells are all counted."""
+        data = {
+            "masters": [
+                {
+                    "shapes": [{"image_file": "assets/m.png"}],
+                    "layouts": [{"shapes": [{"image_file": "assets/l.png"}]}],
+                }
+            ],
+            "slides": [
+                {
+                    "shapes": [
+                        {"children": [{"image_file": "assets/c.png"}]},
+                        {"table": {"cells": [{"image_file": "assets/t.png"}]}},
+                    ]
+                }
+            ],
+        }
+        assert sorted(iter_image_files(data)) == [
+            "assets/c.png",
+            "assets/l.png",
+            "assets/m.png",
+            "assets/t.png",
+        ]
+
+
+class TestParsersUseStore:
+    """Parsers writing into an AssetStore."""
+
+    def test_media_extractor_dedupes_and_skips_writes(self, tmp_path):
+        """The same logo on every slide is written once; later parses reuse it."""
+        pptx = logo_deck(tmp_path / "deck.pptx")
+        store = AssetStore(str(tmp_path / "assets"))
+
+        with MediaExtractor(pptx, str(tmp_path / "images"), assets=store) as media:
+            paths = [media.extract(FakeShape(name="Logo", shape_type=13, shape_id=2), i, 1) for i in (1, 2)]
+        assert paths[0] == paths[1]
+        assert paths[0].startswith("assets/")
+        assert media.extracted == 1 and media.reused == 1
+        assert not (tmp_path / "images").exists()
+
+        with MediaExtractor(pptx, str(tmp_path / "images"), assets=store) as media:
+            media.extract(FakeShape(name="Logo", shape_type=13, shape_id=2), 1, 1)
+        assert media.extracted == 0 and media.reused == 1
+
+    def test_failed_conversion_publishes_no_asset(self, tmp_path, monkeypatch):
+        """Every shape showing media that cannot be converted is exported instead."""
+        monkeypatch.setattr("ppt_parser.media.media_image_bytes", lambda *args: None)
+        pptx = logo_deck(tmp_path / "deck.pptx")
+        store = AssetStore(str(tmp_path / "assets"))
+        shapes = [FakeShape(name="Logo", shape_type=13, shape_id=2) for _ in (1, 2)]
+
+        with MediaExtractor(pptx, str(tmp_path / "images"), assets=store) as media:
+            paths = [
+                export_shape_image(shape, i, 1, str(tmp_path / "images"), media=media)
+                for i, shape in enumerate(shapes, start=1)
+            ]
+
+        assert all(len(shape.exports) == 1 for shape in shapes)
+        assert all(os.path.exists(store.resolve(path)) for path in paths)
+        assert media.extracted == 0 and media.reused == 0
+
+    def test_failed_write_publishes_no_asset(self, tmp_path, monkeypatch):
+        """A store write that fails is dropped from the slide rather than left dangling."""
+        pptx = logo_deck(tmp_path / "deck.pptx")
+        store = AssetStore(str(tmp_path / "assets"))
+
+        def full_disk(*args, **kwargs):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(store, "put_bytes", full_disk)
+        with MediaExtractor(pptx, str(tmp_path / "images"), assets=store) as media:
+            rel_path = media.extract(FakeShape(name="Logo", shape_type=13, shape_id=2), 1, 1)
+            slide = {"shapes": [{"name": "Group", "children": [{"image_file": rel_path}]}]}
+            media.publish(slide)
+
+        assert rel_path.startswith("assets/")
+        assert "image_file" not in slide["shapes"][0]["children"][0]
+
+    def test_pending_write_is_reused(self, tmp_path):
+        """A picture repeated before its write lands is queued only once."""
+        pptx = logo_deck(tmp_path / "deck.pptx")
+        store = AssetStore(str(tmp_path / "assets"))
+        with MediaExtractor(pptx, str(tmp_path / "images"), assets=store) as media:
+            first = media.extract(FakeShape(name="Logo", shape_type=13, shape_id=2), 1, 1)
+            second = media.extract(FakeShape(name="Logo", shape_type=13, shape_id=2), 1, 2)
+            slide = media.publish({"shapes": [{"image_file": first}, {"image_file": second}]})
+
+        assert first == second
+        assert media.extracted == 1 and media.reused == 1
+        assert os.path.exists(store.resolve(slide["shapes"][0]["image_file"]))
+
+    def test_export_fallback_moves_render_into_store(self, tmp_path):
+        """Shape.Export output should be interned too."""
+        store = AssetStore(str(tmp_path / "assets"))
+        media = MediaExtractor(str(tmp_path / "missing.pptx"), str(tmp_path / "images"), assets=store)
+        rel_path = export_shape_image(
+            FakeShape(name="Chart", shape_type=3), 1, 1, str(tmp_path / "images"), media=media
+        )
+        media.close()
+
+        assert rel_path.startswith("assets/")
+        assert os.path.exists(store.resolve(rel_path))
+        assert os.listdir(tmp_path / "images") == []
+
+    def test_ooxml_engine_writes_asset_paths(self, tmp_path):
+        """The OOXML engine records hash paths shared by both slides."""
+        pptx = logo_deck(tmp_path / "deck.pptx")
+        out_dir = tmp_path / "out"
+        json_path = parse_presentation_ooxml(
+            pptx, str(out_dir), asset_dir=str(tmp_path / "assets")
+        )
+        data = load_project_json(json_path)
+
+        files = list(iter_image_files(data))
+        assert len(files) == 2 and files[0] == files[1]
+        assert files[0].startswith("assets/")
+        assert AssetStore(str(tmp_path / "assets")).stats()["assets"] == 1
+
+
+class TestResultStaticFiles:
+    """The /api/results mount resolving asset URLs."""
+
+    def test_serves_assets_and_project_files(self, tmp_path):
+        results = tmp_path / "results"
+        (results / "p1" / "images").mkdir(parents=True)
+        (results / "p1" / "images" / "legacy.png").write_bytes(b"legacy")
+        store = AssetStore(str(tmp_path / "assets"))
+        name = store.put_bytes(b"shared", ".png")
+
+        app = FastAPI()
+        app.mount("/api/results", ResultStaticFiles(directory=str(results), asset_store=store))
+        client = TestClient(app)
+
+        assert client.get(f"/api/results/p1/assets/{name}").content == b"shared"
+        assert client.get(f"/api/results/other/assets/{name}").content == b"shared"
+        assert client.get("/api/results/p1/images/legacy.png").content == b"legacy"
+        assert client.get("/api/results/p1/assets/" + "0" * 64 + ".png").status_code == 404
+        assert client.get("/api/results/p1/assets/..%2Fassets.db").status_code == 404
@@ -0,0 +1,252 @@
+"""
+Tests for parse checkpoints (storage.PartialResultWriter.resume) and resumed parses
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.storage import (  # noqa: E402
+    MAX_SLIDE_ATTEMPTS,
+    SKIPPED_SLIDES_KEY,
+    PartialResultWriter,
+    load_partial_result,
+    skipped_slide,
+    source_signature,
+)
+from mocks.fake_powerpoint import fake_dispatcher, write_fake_deck  # noqa: E402
+from mocks.ooxml_builder import write_pptx_deck  # noqa: E402
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_at(message):
+    """Progress callback that kills the parse when it reaches ``message``."""
+
+    def callback(percent, text):
+        if text == message:
+            raise Interrupted(text)
+
+    return callback
+
+
+class TestCheckpoint:
+    """Tests for PartialResultWriter.reset / start_slide / resume."""
+
+    def test_resume_returns_finished_slides(self, tmp_path):
+        source = {"size": 10, "mtime": 1.0}
+        writer = PartialResultWriter(str(tmp_path))
+        writer.reset(source)
+        writer.begin({"slides_count": 3})
+        for slide_index in (1, 2):
+            writer.start_slide(slide_index)
+            writer.add_slide({"slide_index": slide_index, "shapes": []})
+        writer.start_slide(3)
+
+        slides, skipped = PartialResultWriter(str(tmp_path)).resume(source)
+        assert sorted(slides) == [1, 2]
+        assert skipped == []
+
+    def test_slide_interrupted_repeatedly_is_skipped(self, tmp_path):
+        source = {"size": 10, "mtime": 1.0}
+        writer = PartialResultWriter(str(tmp_path))
+        writer.reset(source)
+        for _ in range(MAX_SLIDE_ATTEMPTS):
+            writer.start_slide(2)
+
+        assert writer.resume(source) == ({}, [2])
+
+    def test_other_source_discards_checkpoint(self, tmp_path):
+        writer = PartialResultWriter(str(tmp_path))
+        writer.reset({"size": 10, "mtime": 1.0})
+        writer.begin({"slides_count": 1})
+        writer.add_slide({"slide_index": 1})
+
+        assert writer.resume({"size": 11, "mtime": 2.0}) is None
+        assert load_partial_result(str(tmp_path)) is None
+
+
+class TestResumedParse:
+    """An interrupted parse leaves its checkpoint and the next run picks it up."""
+
+    def interrupted_parse(self, tmp_path, slides=4, at="Parsing Slide 3/4"):
+        deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=slides, shapes_per_slide=2)
+        out_dir = str(tmp_path / "project")
+        json_path = ppt_parser.parse_presentation(
+            deck,
+            out_dir,
+            powerpoint=fake_dispatcher(),
+            progress_callback=interrupt_at(at),
+            progressive=True,
+        )
+        assert json_path is None
+        return deck, out_dir
+
+    def test_failed_parse_keeps_checkpoint(self, tmp_path):
+        _, out_dir = self.interrupted_parse(tmp_path)
+        assert load_partial_result(out_dir)["ready_slides"] == [1, 2]
+
+    def test_resume_parses_only_missing_slides(self, tmp_path):
+        deck, out_dir = self.interrupted_parse(tmp_path)
+        # Mark a checkpointed slide to tell it apart from a fresh parse
+        slide_path = os.path.join(out_dir, ".partial", "slide_001.json")
+        with open(slide_path, "r", encoding="utf-8") as f:
+            slide = json.load(f)
+        slide["checkpointed"] = True
+        with open(slide_path, "w", encoding="utf-8") as f:
+            json.dump(slide, f)
+
+        json_path = ppt_parser.parse_presentation(
+            deck, out_dir, powerpoint=fake_dispatcher(), resume=True
+        )
+
+        data = ppt_parser.load_project_json(json_path)
+        assert [s["slide_index"] for s in data["slides"]] == [1, 2, 3, 4]
+        assert data["slides"][0].get("checkpointed") is True
+        assert "checkpointed" not in data["slides"][2]
+        assert not os.path.exists(os.path.join(out_dir, ".partial"))
+
+    def test_changed_deck_is_parsed_from_scratch(self, tmp_path):
+        deck, out_dir = self.interrupted_parse(tmp_path)
+        stats = os.stat(deck)
+        os.utime(deck, (stats.st_atime, stats.st_mtime + 10))
+        assert source_signature(deck)["mtime"] != stats.st_mtime
+
+        resumed = []
+        ppt_parser.parse_presentation(
+            deck,
+            out_dir,
+            powerpoint=fake_dispatcher(),
+            resume=True,
+            progress_callback=lambda p, m: resumed.append(m),
+        )
+        assert "Parsing Slide 1/4" in resumed
+        assert not os.path.exists(os.path.join(out_dir, ".partial"))
+
+    def test_poison_slide_is_skipped(self, tmp_path):
+        deck, out_dir = self.interrupted_parse(tmp_path)
+        writer = PartialResultWriter(out_dir)
+        for _ in range(MAX_SLIDE_ATTEMPTS):
+            writer.start_slide(3)  # the worker died on slide 3 each time
+
+        json_path = ppt_parser.parse_presentation(
+            deck, out_dir, powerpoint=fake_dispatcher(), resume=True
+        )
+        data = ppt_parser.load_project_json(json_path)
+        assert [s["slide_index"] for s in data["slides"]] == [1, 2, 3, 4]
+        assert data["slides"][2] == skipped_slide(3)
+        assert data[SKIPPED_SLIDES_KEY] == [3]
+
+
+class TestFailedSlide:
+    """A slide that raises keeps a placeholder in both engines."""
+
+    def assert_placeholder(self, json_path, slides=3, failed=2):
+        data = ppt_parser.load_project_json(json_path)
+        assert [s["slide_index"] for s in data["slides"]] == list(range(1, slides + 1))
+        assert data["slides"][failed - 1] == skipped_slide(failed, "parse failed")
+        assert data[SKIPPED_SLIDES_KEY] == [failed]
+
+    def test_ooxml_failed_slide_keeps_placeholder(self, tmp_path, monkeypatch):
+        deck = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=3)
+        parse_slide_part = ppt_parser.ooxml.parse_slide_part
+
+        def fail_on_second(package, slide_index, *args, **kwargs):
+            if slide_index == 2:
+                raise ValueError("broken slide")
+            return parse_slide_part(package, slide_index, *args, **kwargs)
+
+        monkeypatch.setattr(ppt_parser.ooxml, "parse_slide_part", fail_on_second)
+        json_path = ppt_parser.parse_presentation_ooxml(
+            deck, str(tmp_path / "project"), progressive=True
+        )
+        self.assert_placeholder(json_path)
+
+    def test_com_failed_slide_keeps_placeholder(self, tmp_path, monkeypatch):
+        deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=3, shapes_per_slide=2)
+        label_com_object = ppt_parser.slides.label_com_object
+
+        def fail_on_second(obj, **kwargs):
+            if kwargs.get("context") == "slide" and kwargs.get("slide_index") == 2:
+                raise ValueError("broken slide")
+            return label_com_object(obj, **kwargs)
+
+        monkeypatch.setattr(ppt_parser.slides, "label_com_object", fail_on_second)
+        json_path = ppt_parser.parse_presentation(
+            deck, str(tmp_path / "project"), powerpoint=fake_dispatcher()
+        )
+        self.assert_placeholder(json_path)
+
+
+class TestRunParsingTask:
+    """main.run_parsing_task resumes after a worker crash or slide timeout."""
+
+    class Projects:
+        def __init__(self):
+            self.status = {}
+
+        def update_project_status(self, project_id, status):
+            self.status[project_id] = status
+
+    def test_retries_with_resume(self, main, tmp_path, monkeypatch):
+        from com_pool import PowerPointJobTimeout
+
+        calls = []
+
+        def parser(engine, file_path, project_dir, **kwargs):
+            calls.append(kwargs["resume"])
+            if len(calls) == 1:
+                raise PowerPointJobTimeout("no progress")
+            return str(tmp_path / "p.json")
+
+        projects = self.Projects()
+        monkeypatch.setattr(main, "db", projects)
+        monkeypatch.setattr(main, "run_presentation_parser", parser)
+        monkeypatch.setattr(main, "sync_project_assets", lambda project_id: None)
+        monkeypatch.setattr(main, "run_thumbnail_stage", lambda *args: None)
+
+        main.run_parsing_task("deck.pptx", str(tmp_path), "p1", "com")
+
+        assert calls == [False, True]
+        assert projects.status["p1"] == "done"
+        assert main.progress_db.get("p1")["status"] == "done"
+
+    def test_reports_skipped_slides(self, main, tmp_path, monkeypatch):
+        json_path = str(tmp_path / "p3.json")
+        ppt_parser.save_project_json(
+            json_path,
+            {"slides": [{"slide_index": 1}, skipped_slide(2)], SKIPPED_SLIDES_KEY: [2]},
+        )
+
+        monkeypatch.setattr(main, "db", self.Projects())
+        monkeypatch.setattr(main, "run_presentation_parser", lambda *args, **kwargs: json_path)
+        monkeypatch.setattr(main, "sync_project_assets", lambda project_id: None)
+        monkeypatch.setattr(main, "run_thumbnail_stage", lambda *args: None)
+
+        assert main.run_parsing_task("deck.pptx", str(tmp_path), "p3", "com")
+
+        progress = main.progress_db.get("p3")
+        assert progress["status"] == "done"
+        assert progress["message"] == "Done (slide(s) 2 could not be parsed)"
+
+    def test_gives_up_after_retries(self, main, tmp_path, monkeypatch):
+        from com_pool import PowerPointJobTimeout
+
+        def parser(engine, file_path, project_dir, **kwargs):
+            raise PowerPointJobTimeout("no progress")
+
+        projects = self.Projects()
+        monkeypatch.setattr(main, "db", projects)
+        monkeypatch.setattr(main, "run_presentation_parser", parser)
+        monkeypatch.setattr(main, "PARSE_RETRIES", 1)
+
+        main.run_parsing_task("deck.pptx", str(tmp_path), "p2", "com")
+
+        assert projects.status["p2"] == "error"
+        assert main.progress_db.get("p2")["status"] == "error"
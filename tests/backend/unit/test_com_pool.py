@@ -0,0 +1,275 @@
+"""
+Tests for backend/com_pool.py
+
+Runs the PowerPoint worker pool against the fake COM object model.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from com_pool import (  # noqa: E402
+    PowerPointJobError,
+    PowerPointJobTimeout,
+    PowerPointPool,
+    PowerPointWorkerCrashed,
+)
+from mocks.fake_powerpoint import FakeApplication, fake_dispatcher, write_fake_deck  # noqa: E402
+
+pytestmark = [
+    pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="pool tests use the fork start method",
+    ),
+    pytest.mark.filterwarnings("ignore::DeprecationWarning"),
+]
+
+
+# Job targets must be module-level so they can be sent to worker processes
+
+
+def job_app_type(powerpoint=None):
+    return type(powerpoint).__name__
+
+
+def job_pid(powerpoint=None):
+    return os.getpid()
+
+
+def job_with_progress(steps, powerpoint=None, progress_callback=None):
+    for i in range(steps):
+        progress_callback(i * 10, f"step {i}")
+    return steps
+
+
+def job_slow_steps(steps, delay, powerpoint=None, progress_callback=None):
+    for i in range(steps):
+        time.sleep(delay)
+        progress_callback(i * 10, f"step {i}")
+    return steps
+
+
+def job_hangs(powerpoint=None, progress_callback=None):
+    progress_callback(10, "started")
+    time.sleep(60)
+
+
+def job_loses_powerpoint(marker, seen, powerpoint=None, progress_callback=None):
+    """Fails once the (test's) PowerPoint restart happens; succeeds when run again."""
+    if os.path.exists(seen):
+        return "retried"
+    progress_callback(0, "started")
+    deadline = time.monotonic() + 30
+    while not os.path.exists(marker) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    open(seen, "w").close()
+    raise RuntimeError("The RPC server is unavailable")
+
+
+def job_raises(powerpoint=None):
+    raise ValueError("boom")
+
+
+def job_crash(powerpoint=None):
+    os._exit(3)
+
+
+def worker_process_id(app):
+    # Every worker on its own "PowerPoint" instance
+    return os.getpid()
+
+
+def always_unhealthy(app):
+    return False
+
+
+def failing_dispatcher():
+    raise OSError("PowerPoint is not installed")
+
+
+@pytest.fixture
+def pool():
+    pool = PowerPointPool(
+        size=1,
+        max_jobs_per_worker=0,
+        dispatcher=fake_dispatcher,
+        mp_context=multiprocessing.get_context("fork"),
+        restart_backoff=0,
+    )
+    yield pool
+    pool.shutdown()
+
+
+def make_pool(**kwargs):
+    kwargs.setdefault("dispatcher", fake_dispatcher)
+    kwargs.setdefault("mp_context", multiprocessing.get_context("fork"))
+    kwargs.setdefault("restart_backoff", 0)
+    return PowerPointPool(**kwargs)
+
+
+class TestPowerPointPool:
+    """Tests for PowerPointPool."""
+
+    def test_job_receives_warm_application(self, pool):
+        """Jobs should get the worker's dispatched Application as `powerpoint`."""
+        assert pool.run(job_app_type, timeout=30) == FakeApplication.__name__
+
+    def test_reuses_worker_between_jobs(self, pool):
+        """Without recycling, consecutive jobs should run in the same process."""
+        pids = {pool.run(job_pid, timeout=30) for _ in range(3)}
+        assert len(pids) == 1
+
+    def test_forwards_progress(self, pool):
+        """Progress callbacks from the worker should reach the submitter."""
+        seen = []
+        result = pool.run(
+            job_with_progress,
+            3,
+            progress_callback=lambda p, m: seen.append((p, m)),
+            timeout=30,
+        )
+        assert result == 3
+        assert seen == [(0, "step 0"), (10, "step 1"), (20, "step 2")]
+
+    def test_job_exception_is_reported(self, pool):
+        """Exceptions in the job should surface as PowerPointJobError."""
+        with pytest.raises(PowerPointJobError, match="boom"):
+            pool.run(job_raises, timeout=30)
+        # The worker keeps serving afterwards
+        assert pool.run(job_app_type, timeout=30) == FakeApplication.__name__
+
+    def test_recycles_after_max_jobs(self):
+        """Workers should be replaced after max_jobs_per_worker documents."""
+        pool = make_pool(size=1, max_jobs_per_worker=2)
+        try:
+            pids = [pool.run(job_pid, timeout=30) for _ in range(4)]
+        finally:
+            pool.shutdown()
+        assert pids[0] == pids[1]
+        assert pids[2] == pids[3]
+        assert pids[0] != pids[2]
+
+    def test_recycles_after_failed_health_check(self):
+        """An unhealthy PowerPoint instance should cost its worker."""
+        pool = make_pool(size=1, max_jobs_per_worker=0, health_check=always_unhealthy)
+        try:
+            pids = [pool.run(job_pid, timeout=30) for _ in range(2)]
+        finally:
+            pool.shutdown()
+        assert pids[0] != pids[1]
+
+    def test_worker_crash_fails_job_and_pool_recovers(self, pool):
+        """A dying worker should fail its job and be replaced."""
+        with pytest.raises(PowerPointWorkerCrashed):
+            pool.run(job_crash, timeout=30)
+        assert pool.run(job_app_type, timeout=30) == FakeApplication.__name__
+
+    def test_dispatch_failure_fails_job(self):
+        """If PowerPoint cannot start, the job should fail instead of hanging."""
+        pool = make_pool(size=1, dispatcher=failing_dispatcher)
+        try:
+            with pytest.raises(PowerPointJobError, match="not installed"):
+                pool.run(job_app_type, timeout=30)
+        finally:
+            pool.shutdown()
+
+    def test_parse_presentation_on_pool(self, pool, tmp_path):
+        """parse_presentation should run on a pooled instance and keep it alive."""
+        deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=2, shapes_per_slide=3)
+        out_dir = str(tmp_path / "project")
+        progress = []
+
+        json_path = pool.run(
+            ppt_parser.parse_presentation,
+            deck,
+            out_dir,
+            progress_callback=lambda p, m: progress.append(p),
+            timeout=60,
+        )
+
+        data = ppt_parser.load_project_json(json_path)
+        assert data["slides_count"] == 2
+        assert len(data["slides"][0]["shapes"]) == 3
+        assert progress[-1] == 100
+
+        metadata = pool.run(ppt_parser.get_presentation_metadata, deck, timeout=30)
+        assert metadata["title"] == "Fake Deck"
+        assert metadata["slide_count"] == 2
+        assert pool.stats()["recycled"] == 0
+
+    def test_stalled_job_is_killed(self):
+        """A job silent for longer than its stall timeout should fail and cost its worker."""
+        restarts = []
+        pool = make_pool(
+            size=1,
+            max_jobs_per_worker=0,
+            restart_powerpoint=restarts.append,
+            process_id=worker_process_id,
+        )
+        try:
+            pid = pool.run(job_pid, timeout=30)
+            started = time.monotonic()
+            with pytest.raises(PowerPointJobTimeout):
+                pool.run(job_hangs, stall_timeout=0.5, timeout=30)
+            assert time.monotonic() - started < 10
+            # Only the stalled worker's PowerPoint is restarted
+            assert restarts == [pid]
+            assert pool.run(job_pid, timeout=30) != pid
+            assert pool.stats()["timed_out"] == 1
+        finally:
+            pool.shutdown()
+
+    def test_jobs_sharing_the_restarted_powerpoint_are_requeued(self, tmp_path):
+        """A job whose PowerPoint is restarted for another worker's stall runs again."""
+        marker, seen = str(tmp_path / "restarted"), str(tmp_path / "seen")
+        restarts = []
+
+        def restart(pid):
+            restarts.append(pid)
+            open(marker, "w").close()
+
+        pool = make_pool(size=2, max_jobs_per_worker=0, restart_powerpoint=restart)
+        try:
+            victim = pool.submit(
+                job_loses_powerpoint, marker, seen, progress_callback=lambda p, m: None
+            )
+            time.sleep(0.3)
+            with pytest.raises(PowerPointJobTimeout):
+                pool.run(job_hangs, stall_timeout=0.5, timeout=30)
+
+            assert victim.result(timeout=30) == "retried"
+            # The fake instance has no process id, so the whole session was restarted
+            assert restarts == [None]
+            assert pool.stats()["requeued"] == 1
+        finally:
+            pool.shutdown()
+
+    def test_jobs_on_other_instances_keep_running(self):
+        """Workers on another PowerPoint process are left alone by a restart."""
+        pool = make_pool(
+            size=2,
+            max_jobs_per_worker=0,
+            restart_powerpoint=lambda pid: None,
+            process_id=worker_process_id,
+        )
+        try:
+            slow = pool.submit(job_slow_steps, 10, 0.2, progress_callback=lambda p, m: None)
+            time.sleep(0.3)
+            with pytest.raises(PowerPointJobTimeout):
+                pool.run(job_hangs, stall_timeout=0.5, timeout=30)
+
+            assert slow.result(timeout=30) == 10
+            assert pool.stats()["requeued"] == 0
+        finally:
+            pool.shutdown()
+
+    def test_progress_resets_stall_timeout(self, pool):
+        """Only the time between progress reports counts against the stall timeout."""
+        assert pool.run(job_slow_steps, 4, 0.3, stall_timeout=1.0, timeout=30) == 4
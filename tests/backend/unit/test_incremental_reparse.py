@@ -0,0 +1,125 @@
+"""
+Tests for backend/ppt_parser/incremental.py (per-slide fingerprints and reuse)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.incremental import slide_fingerprints  # noqa: E402
+from ppt_parser.ooxml import OOXMLPackage, parse_presentation_ooxml  # noqa: E402
+from mocks.fake_powerpoint import fake_dispatcher  # noqa: E402
+from mocks.ooxml_builder import write_pptx_deck  # noqa: E402
+
+
+def parse(deck, out_dir, previous=None):
+    """COM parse through the fake; returns (json data, slides exported as thumbnails)."""
+    app = fake_dispatcher()
+    json_path = ppt_parser.parse_presentation(
+        deck, str(out_dir), powerpoint=app, previous_result=previous
+    )
+    data = ppt_parser.load_project_json(json_path)
+    slides = app.Presentations.opened[0].Slides
+    exported = [i for i, s in enumerate(slides, start=1) if s.exports]
+    return data, exported
+
+
+class TestIncrementalReparse:
+    """Reparsing only the slides that changed."""
+
+    def test_unchanged_deck_reuses_every_slide(self, tmp_path):
+        deck = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=3, shapes_per_slide=2)
+        first, exported = parse(deck, tmp_path / "out")
+        assert exported == [1, 2, 3]
+        assert all(s["fingerprint"] for s in first["slides"])
+
+        second, exported = parse(deck, tmp_path / "out", previous=first)
+        assert exported == []
+        assert second["slides"] == first["slides"]
+
+    def test_only_edited_slide_is_reparsed(self, tmp_path):
+        deck = str(tmp_path / "deck.pptx")
+        write_pptx_deck(deck, slides=3, shapes_per_slide=2)
+        first, _ = parse(deck, tmp_path / "out")
+
+        write_pptx_deck(deck, slides=3, shapes_per_slide=2, edits={2: " (edited)"})
+        second, exported = parse(deck, tmp_path / "out", previous=first)
+
+        assert exported == [2]
+        assert [s["slide_index"] for s in second["slides"]] == [1, 2, 3]
+        assert second["slides"][1]["fingerprint"] != first["slides"][1]["fingerprint"]
+        assert second["slides"][0] == first["slides"][0]
+
+    def test_descriptions_carried_over(self, tmp_path):
+        """Descriptions written after the first parse stay on reused slides."""
+        deck = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=2, shapes_per_slide=1)
+        first, _ = parse(deck, tmp_path / "out")
+        first["slides"][0]["shapes"][0]["description"] = "kept"
+
+        second, _ = parse(deck, tmp_path / "out", previous=first)
+        assert second["slides"][0]["shapes"][0]["description"] == "kept"
+
+    def test_missing_thumbnail_forces_reparse(self, tmp_path):
+        deck = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=2, shapes_per_slide=1)
+        first, _ = parse(deck, tmp_path / "out")
+        os.remove(tmp_path / "out" / "thumbnails" / first["slides"][1]["thumbnail"])
+
+        _, exported = parse(deck, tmp_path / "out", previous=first)
+        assert exported == [2]
+
+    def test_other_engine_is_not_reused(self, tmp_path):
+        deck = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=2, shapes_per_slide=1)
+        first, _ = parse(deck, tmp_path / "out")
+        first["parser_engine"] = "ooxml"
+
+        _, exported = parse(deck, tmp_path / "out", previous=first)
+        assert exported == [1, 2]
+
+    def test_ooxml_engine_reuses_slides(self, tmp_path):
+        deck = str(tmp_path / "deck.pptx")
+        write_pptx_deck(deck, slides=2, shapes_per_slide=1)
+        first = ppt_parser.load_project_json(parse_presentation_ooxml(deck, str(tmp_path / "out")))
+        first["slides"][0]["shapes"][0]["description"] = "kept"
+
+        write_pptx_deck(deck, slides=2, shapes_per_slide=1, edits={2: "!"})
+        json_path = parse_presentation_ooxml(deck, str(tmp_path / "out"), previous_result=first)
+        second = ppt_parser.load_project_json(json_path)
+
+        assert second["slides"][0] == first["slides"][0]
+        assert second["slides"][1]["fingerprint"] != first["slides"][1]["fingerprint"]
+
+    def test_resized_deck_is_reparsed(self, tmp_path):
+        """Slide size lives in presentation.xml; changing it invalidates every slide."""
+        deck = str(tmp_path / "deck.pptx")
+        write_pptx_deck(deck, slides=2, shapes_per_slide=1)
+        first = ppt_parser.load_project_json(parse_presentation_ooxml(deck, str(tmp_path / "out")))
+
+        write_pptx_deck(deck, slides=2, shapes_per_slide=1, width=720.0)
+        json_path = parse_presentation_ooxml(deck, str(tmp_path / "out"), previous_result=first)
+        second = ppt_parser.load_project_json(json_path)
+
+        assert second["slide_width"] == 720.0
+        for before, after in zip(first["slides"], second["slides"]):
+            assert after["fingerprint"] != before["fingerprint"]
+
+
+class TestSlideFingerprints:
+    """Package-level slide fingerprints."""
+
+    def test_stable_and_content_sensitive(self, tmp_path):
+        a = write_pptx_deck(str(tmp_path / "a.pptx"), slides=2, shapes_per_slide=1)
+        b = write_pptx_deck(str(tmp_path / "b.pptx"), slides=2, shapes_per_slide=1)
+        c = write_pptx_deck(
+            str(tmp_path / "c.pptx"), slides=2, shapes_per_slide=1, edits={1: "x"}
+        )
+        prints = []
+        for path in (a, b, c):
+            with OOXMLPackage(path) as package:
+                prints.append(slide_fingerprints(package))
+
+        assert prints[0] == prints[1]
+        assert prints[0][1] != prints[0][2]
+        assert prints[2][1] != prints[0][1] and prints[2][2] == prints[0][2]
@@ -0,0 +1,270 @@
+"""
+Tests for backend/job_queue.py (persistent COM job scheduler)
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+
+from job_queue import (  # noqa: E402
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NORMAL,
+    JobQueue,
+)
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(**kwargs):
+        kwargs.setdefault("poll_interval", 0.05)
+        queue = JobQueue(str(tmp_path / "jobs.db"), **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.shutdown()
+
+
+class TestJobQueue:
+    """Tests for JobQueue."""
+
+    def test_runs_by_priority_then_submission(self, make_queue):
+        queue = make_queue(max_running=1)
+        order = []
+        queue.register("work", lambda job, report: order.append(job["params"]["name"]))
+
+        queue.submit("work", params={"name": "bulk"}, priority=PRIORITY_BULK)
+        queue.submit("work", params={"name": "normal 1"}, priority=PRIORITY_NORMAL)
+        queue.submit("work", params={"name": "slide"}, priority=PRIORITY_INTERACTIVE)
+        queue.submit("work", params={"name": "normal 2"}, priority=PRIORITY_NORMAL)
+        queue.start()
+
+        assert wait_for(lambda: len(order) == 4)
+        assert order == ["slide", "normal 1", "normal 2", "bulk"]
+
+    def test_result_and_progress_are_stored(self, make_queue):
+        queue = make_queue()
+
+        def handler(job, report):
+            report(50, "half way")
+            return {"answer": job["params"]["x"] * 2}
+
+        queue.register("double", handler)
+        job = queue.submit("double", "p1", {"x": 21})
+        assert queue.get(job["id"])["queue_position"] == 0
+        queue.start()
+
+        assert wait_for(lambda: queue.get(job["id"])["status"] == "done")
+        done = queue.get(job["id"])
+        assert done["result"] == {"answer": 42}
+        assert (done["progress"], done["attempts"]) == (100, 1)
+        assert [j["id"] for j in queue.list_jobs(project_id="p1")] == [job["id"]]
+
+    def test_failed_job_records_error(self, make_queue, caplog):
+        queue = make_queue()
+
+        def handler(job, report):
+            raise RuntimeError("PowerPoint said no")
+
+        queue.register("fail", handler)
+        job = queue.submit("fail")
+        with caplog.at_level(logging.ERROR, logger="job_queue"):
+            queue.start()
+            assert wait_for(lambda: queue.get(job["id"])["status"] == "error")
+
+        assert "PowerPoint said no" in queue.get(job["id"])["error"]
+        (record,) = [r for r in caplog.records if r.name == "job_queue"]
+        assert record.exc_info[0] is RuntimeError
+
+    def test_identical_pending_jobs_are_deduplicated(self, make_queue):
+        queue = make_queue()
+        first = queue.submit("parse", "p1", priority=PRIORITY_BULK, dedupe_key="parse:p1")
+        second = queue.submit("parse", "p1", priority=PRIORITY_INTERACTIVE, dedupe_key="parse:p1")
+        other = queue.submit("parse", "p2", dedupe_key="parse:p2")
+
+        assert second["id"] == first["id"]
+        assert (first["deduplicated"], second["deduplicated"]) == (False, True)
+        assert second["priority"] == PRIORITY_INTERACTIVE
+        assert other["id"] != first["id"]
+
+    def test_finished_job_is_not_deduplicated(self, make_queue):
+        queue = make_queue()
+        queue.register("work", lambda job, report: None)
+        first = queue.submit("work", dedupe_key="k")
+        queue.start()
+        assert wait_for(lambda: queue.get(first["id"])["status"] == "done")
+
+        assert queue.submit("work", dedupe_key="k")["id"] != first["id"]
+
+    def test_concurrency_limits(self, make_queue):
+        queue = make_queue(max_running=3, limits={"parse": 1})
+        release = threading.Event()
+        queue.register("parse", lambda job, report: release.wait(10))
+        queue.register("slide", lambda job, report: release.wait(10))
+
+        for project_id in ("p1", "p2"):
+            queue.submit("parse", project_id)
+        slides = [queue.submit("slide", "p3"), queue.submit("slide", "p4")]
+        queue.start()
+
+        def running(kind):
+            return len([j for j in queue.list_jobs(status="running") if j["kind"] == kind])
+
+        assert wait_for(lambda: running("slide") == 2)
+        assert running("parse") == 1
+        release.set()
+        assert wait_for(lambda: all(queue.get(j["id"])["status"] == "done" for j in slides))
+
+    def test_one_job_per_project_at_a_time(self, make_queue):
+        queue = make_queue(max_running=2)
+        release = threading.Event()
+        queue.register("work", lambda job, report: release.wait(10))
+
+        first = queue.submit("work", "p1")
+        second = queue.submit("work", "p1")
+        queue.start()
+
+        assert wait_for(lambda: queue.get(first["id"])["status"] == "running")
+        time.sleep(0.2)
+        assert queue.get(second["id"])["status"] == "queued"
+        release.set()
+        assert wait_for(lambda: queue.get(second["id"])["status"] == "done")
+
+    def test_cancel_queued_job(self, make_queue):
+        queue = make_queue()
+        job = queue.submit("work", dedupe_key="k")
+
+        assert queue.cancel(job["id"]) is True
+        assert queue.get(job["id"])["status"] == "cancelled"
+        assert queue.submit("work", dedupe_key="k")["id"] != job["id"]
+
+    def test_orphaned_running_jobs_are_requeued(self, make_queue, tmp_path):
+        crashed = make_queue()
+        crashed.register("parse", lambda job, report: None)
+        job = crashed.submit("parse", "p1", {"file": "deck.pptx"})
+        # "running" when the process died: its heartbeat is never renewed
+        assert crashed._claim_next()["id"] == job["id"]
+
+        seen = []
+        restarted = make_queue(stale_after=0.3)
+        restarted.register("parse", lambda job, report: seen.append(job["attempts"]))
+        restarted.start()
+
+        assert wait_for(lambda: restarted.get(job["id"])["status"] == "done")
+        assert seen == [2]
+
+    def test_jobs_of_a_live_worker_are_not_requeued(self, make_queue):
+        """A second worker process starting up leaves the first one's running job alone."""
+        release = threading.Event()
+        runs = []
+
+        def slow(job, report):
+            runs.append(job["id"])
+            release.wait(5)
+
+        first = make_queue(stale_after=0.3)
+        first.register("parse", slow)
+        job = first.submit("parse", "p1")
+        first.start()
+        assert wait_for(lambda: first.get(job["id"])["status"] == "running")
+
+        second = make_queue(stale_after=0.3)
+        second.register("parse", slow)
+        second.start()
+        time.sleep(1.0)
+        release.set()
+
+        assert wait_for(lambda: first.get(job["id"])["status"] == "done")
+        assert runs == [job["id"]]
+        assert first.get(job["id"])["attempts"] == 1
+
+    def test_limits_hold_across_workers(self, make_queue):
+        """The running jobs of every process count against max_running."""
+        first = make_queue(max_running=1)
+        second = make_queue(max_running=1)
+        for queue in (first, second):
+            queue.register("work", lambda job, report: None)
+        first.submit("work", "p1")
+        second.submit("work", "p2")
+
+        claimed = first._claim_next()
+        assert claimed["owner"] == first.owner
+        assert second._claim_next() is None
+
+    def test_only_the_owner_finishes_a_job(self, make_queue):
+        first = make_queue()
+        second = make_queue()
+        first.register("work", lambda job, report: None)
+        job = first.submit("work")
+        first._claim_next()
+
+        second._finish(job["id"], "error", error="not mine")
+
+        assert first.get(job["id"])["status"] == "running"
+        first._finish(job["id"], "done")
+        assert first.get(job["id"])["status"] == "done"
+
+
+class TestJobEndpoints:
+    """Long COM endpoints return a job id right away."""
+
+    @pytest.fixture
+    def client(self, client, tmp_path):
+        deck = tmp_path / "deck.pptx"
+        deck.write_bytes(b"pptx")
+        (tmp_path / "p1").mkdir()
+        with open(tmp_path / "p1" / "p1.json", "w", encoding="utf-8") as f:
+            json.dump({"ppt_path": str(deck), "parser_engine": "com", "slides": []}, f)
+        return client
+
+    def test_reparse_slide_returns_job(self, client):
+        response = client.post("/api/project/p1/slides/2/reparse")
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        again = client.post("/api/project/p1/slides/2/reparse").json()
+        assert again["job_id"] == job_id
+        assert again["deduplicated"] is True
+
+        job = client.get(f"/api/jobs/{job_id}").json()
+        assert (job["kind"], job["status"], job["params"]["slide_index"]) == (
+            "reparse_slide",
+            "queued",
+            2,
+        )
+
+    def test_slide_reparse_queued_ahead_of_reparse_all(self, client):
+        full = client.post("/api/project/p1/reparse_all").json()["job_id"]
+        slide = client.post("/api/project/p1/slides/1/reparse").json()["job_id"]
+
+        assert client.get(f"/api/jobs/{slide}").json()["queue_position"] == 0
+        assert client.get(f"/api/jobs/{full}").json()["queue_position"] == 1
+
+    def test_download_file_needs_finished_job(self, client):
+        job_id = client.post("/api/project/p1/download").json()["job_id"]
+        assert client.get(f"/api/jobs/{job_id}/file").status_code == 409
+        assert client.delete(f"/api/jobs/{job_id}").json() == {"status": "cancelled"}
+        assert client.get("/api/jobs/unknown").status_code == 404
+
+    def test_missing_project_is_rejected_before_queueing(self, client):
+        assert client.post("/api/project/nope/reparse_all").status_code == 404
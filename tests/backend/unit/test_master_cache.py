@@ -0,0 +1,124 @@
+"""
+Tests for backend/ppt_parser/master_cache.py (master/layout parse cache)
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.master_cache import MasterCache, template_fingerprint  # noqa: E402
+from ppt_parser.ooxml import OOXMLPackage  # noqa: E402
+from mocks.fake_powerpoint import fake_dispatcher, write_fake_deck  # noqa: E402
+from mocks.ooxml_builder import shape_xml, write_pptx  # noqa: E402
+
+
+def parse(deck, out_dir, cache_dir, **kwargs):
+    app = fake_dispatcher()
+    json_path = ppt_parser.parse_presentation(
+        deck, str(out_dir), powerpoint=app, master_cache_dir=str(cache_dir), **kwargs
+    )
+    data = ppt_parser.load_project_json(json_path)
+    master_shapes = list(app.Presentations.opened[0].Designs.Item(1).SlideMaster.Shapes)
+    return data, master_shapes
+
+
+@pytest.fixture
+def decks(tmp_path):
+    """Two different decks built on the same template."""
+    return (
+        write_fake_deck(
+            str(tmp_path / "a.pptx"), slides=2, shapes_per_slide=2, master_pictures=2
+        ),
+        write_fake_deck(
+            str(tmp_path / "b.pptx"), slides=3, shapes_per_slide=1, master_pictures=2
+        ),
+    )
+
+
+class TestMasterCache:
+    """Reusing masters blocks across COM parses."""
+
+    def test_hit_reuses_masters_without_exports(self, tmp_path, decks):
+        """The second deck with the same template should skip the master walk."""
+        cache_dir = tmp_path / "cache"
+        first, first_shapes = parse(decks[0], tmp_path / "p1", cache_dir)
+        second, second_shapes = parse(decks[1], tmp_path / "p2", cache_dir)
+
+        assert all(len(shape.exports) == 1 for shape in first_shapes)
+        assert all(shape.exports == [] for shape in second_shapes)
+        assert second["masters"] == first["masters"]
+        assert second["template_fingerprint"] == first["template_fingerprint"]
+
+        # Per-project master images are restored into the new project
+        for shape in second["masters"][0]["shapes"]:
+            assert (tmp_path / "p2" / shape["image_file"]).exists()
+
+        stats = MasterCache(str(cache_dir)).stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["templates"][0]["design_names"] == "Office Theme"
+
+    def test_different_template_misses(self, tmp_path, decks):
+        """A deck with another design should be parsed and cached separately."""
+        cache_dir = tmp_path / "cache"
+        other = write_fake_deck(
+            str(tmp_path / "c.pptx"),
+            slides=1,
+            shapes_per_slide=1,
+            master_pictures=2,
+            design_name="Corporate",
+        )
+        parse(decks[0], tmp_path / "p1", cache_dir)
+        data, shapes = parse(other, tmp_path / "p3", cache_dir)
+
+        assert data["masters"][0]["design_name"] == "Corporate"
+        assert all(len(shape.exports) == 1 for shape in shapes)
+        assert MasterCache(str(cache_dir)).stats()["misses"] == 2
+
+    def test_missing_asset_forces_reparse(self, tmp_path, decks):
+        """Entries whose shared assets were collected must not be served."""
+        cache_dir, asset_dir = tmp_path / "cache", tmp_path / "assets"
+        first, _ = parse(decks[0], tmp_path / "p1", cache_dir, asset_dir=str(asset_dir))
+        asset = first["masters"][0]["shapes"][0]["image_file"]
+        assert asset.startswith("assets/")
+        os.remove(ppt_parser.AssetStore(str(asset_dir)).resolve(asset))
+
+        _, shapes = parse(decks[1], tmp_path / "p2", cache_dir, asset_dir=str(asset_dir))
+        assert all(len(shape.exports) == 1 for shape in shapes)
+
+    def test_cache_is_opt_in(self, tmp_path, decks):
+        """Without a cache directory no fingerprint is recorded."""
+        json_path = ppt_parser.parse_presentation(
+            decks[0], str(tmp_path / "p1"), powerpoint=fake_dispatcher()
+        )
+        with open(json_path, encoding="utf-8") as f:
+            assert "template_fingerprint" not in json.load(f)
+
+
+class TestTemplateFingerprint:
+    """Package-level fingerprints for .pptx files."""
+
+    @staticmethod
+    def fingerprint(path, slides, **kwargs):
+        write_pptx(str(path), slides, **kwargs)
+        with OOXMLPackage(str(path)) as package:
+            return template_fingerprint(package)
+
+    def test_slides_do_not_change_fingerprint(self, tmp_path):
+        """Decks differing only in slide content share the template fingerprint."""
+        a = self.fingerprint(tmp_path / "a.pptx", [[shape_xml(2, "Box", 0, 0, text="A")]])
+        b = self.fingerprint(
+            tmp_path / "b.pptx", [[], [shape_xml(3, "Title", 5, 5, text="B")]]
+        )
+        assert a == b
+
+    def test_engine_is_part_of_fingerprint(self, tmp_path):
+        """COM and OOXML masters blocks differ, so their keys must too."""
+        write_pptx(str(tmp_path / "a.pptx"), [[]])
+        with OOXMLPackage(str(tmp_path / "a.pptx")) as package:
+            assert template_fingerprint(package, "com") != template_fingerprint(package, "ooxml")
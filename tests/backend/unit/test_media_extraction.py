@@ -0,0 +1,168 @@
+"""
+Tests for backend/ppt_parser/media.py (direct picture extraction)
+"""
+
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ppt_parser.images import export_shape_image  # noqa: E402
+from ppt_parser.media import MediaExtractor  # noqa: E402
+from ppt_parser.shapes import parse_shape  # noqa: E402
+from mocks.fake_powerpoint import FakeShape, write_fake_deck  # noqa: E402
+from mocks.ooxml_builder import group_xml, picture_xml, write_pptx  # noqa: E402
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def png_bytes(size=(8, 4), color=(255, 0, 0)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def picture_deck(tmp_path, media_name="image1.png", data=None, pictures=None, name="Picture 1"):
+    pictures = pictures or [picture_xml(2, name, "rId2", 10, 10, 40, 40)]
+    return write_pptx(
+        str(tmp_path / "deck.pptx"),
+        [pictures],
+        media={f"ppt/media/{media_name}": data if data is not None else png_bytes()},
+        slide_rels={1: [("rId2", "image", f"../media/{media_name}")]},
+    )
+
+
+class TestMediaExtractor:
+    """Tests for MediaExtractor."""
+
+    def test_copies_embedded_media_without_export(self, tmp_path):
+        """A slide picture should be copied from ppt/media, not exported via COM."""
+        data = png_bytes()
+        pptx = picture_deck(tmp_path, data=data)
+        image_dir = tmp_path / "images"
+        shape = FakeShape(name="Picture 1", shape_type=13, shape_id=2)
+
+        with MediaExtractor(pptx, str(image_dir)) as media:
+            rel_path = export_shape_image(shape, 1, 1, str(image_dir), media=media)
+
+        assert rel_path == "images/slide01_shape1_Picture_1.png"
+        assert (tmp_path / rel_path).read_bytes() == data
+        assert shape.exports == []
+        # Geometry untouched: no resize round-trip
+        assert (shape.Width, shape.Height) == (100.0, 50.0)
+
+    def test_keeps_native_jpeg_extension(self, tmp_path):
+        """Web formats should keep their own extension."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, format="JPEG")
+        pptx = picture_deck(
+            tmp_path, media_name="image1.jpeg", data=buffer.getvalue(), name="Photo"
+        )
+        shape = FakeShape(name="Photo", shape_type=13, shape_id=2)
+
+        with MediaExtractor(pptx, str(tmp_path / "images")) as media:
+            rel_path = media.extract(shape, 1, 3)
+
+        assert rel_path == "images/slide01_shape3_Photo.jpeg"
+        assert (tmp_path / rel_path).exists()
+
+    def test_non_web_format_converted_to_png(self, tmp_path):
+        """Formats browsers cannot show (e.g. BMP) should be written as PNG."""
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, format="BMP")
+        pptx = picture_deck(
+            tmp_path, media_name="image1.bmp", data=buffer.getvalue(), name="Bitmap"
+        )
+        shape = FakeShape(name="Bitmap", shape_type=13, shape_id=2)
+
+        with MediaExtractor(pptx, str(tmp_path / "images")) as media:
+            rel_path = media.extract(shape, 1, 1)
+
+        assert rel_path == "images/slide01_shape1_Bitmap.png"
+        with Image.open(tmp_path / rel_path) as img:
+            assert img.format == "PNG"
+
+    def test_group_child_picture(self, tmp_path):
+        """Pictures inside groups are found by their shape id too."""
+        child = picture_xml(5, "Inner", "rId2", 0, 0, 10, 10)
+        pptx = picture_deck(
+            tmp_path,
+            pictures=[group_xml(4, "Group 1", (0, 0, 10, 10), (0, 0, 10, 10), [child])],
+        )
+        shape = FakeShape(name="Inner", shape_type=13, shape_id=5)
+
+        with MediaExtractor(pptx, str(tmp_path / "images")) as media:
+            assert media.extract(shape, 1, "1_1") == "images/slide01_shape1_1_Inner.png"
+
+    @pytest.mark.parametrize(
+        "media_name,shape_type,shape_id,name",
+        [
+            ("image1.emf", 13, 2, "Picture 1"),  # vector media
+            ("image1.png", 3, 2, "Picture 1"),  # chart / other non-picture types
+            ("image1.png", 13, 99, "Picture 1"),  # no matching p:pic on the slide
+            ("image1.png", 13, 2, "Cell"),  # same id, different shape (table cell)
+        ],
+    )
+    def test_falls_back_to_export(self, tmp_path, media_name, shape_type, shape_id, name):
+        """Shapes the package cannot serve should still be exported through COM."""
+        pptx = picture_deck(tmp_path, media_name=media_name, data=b"not-an-image")
+        image_dir = tmp_path / "images"
+        shape = FakeShape(name=name, shape_type=shape_type, shape_id=shape_id)
+
+        with MediaExtractor(pptx, str(image_dir)) as media:
+            rel_path = export_shape_image(shape, 1, 1, str(image_dir), media=media)
+
+        assert rel_path == f"images/slide01_shape1_{name.replace(' ', '_')}.png"
+        assert len(shape.exports) == 1
+
+    def test_unconvertible_media_is_exported(self, tmp_path):
+        """A picture Pillow cannot convert gets no media path; it is exported instead."""
+        pptx = picture_deck(tmp_path, media_name="image1.bmp", data=b"not-an-image")
+        image_dir = tmp_path / "images"
+        shape = FakeShape(name="Picture 1", shape_type=13, shape_id=2)
+
+        with MediaExtractor(pptx, str(image_dir)) as media:
+            rel_path = export_shape_image(shape, 1, 1, str(image_dir), media=media)
+
+        assert rel_path == "images/slide01_shape1_Picture_1.png"
+        assert len(shape.exports) == 1
+        assert media.extracted == 0
+
+    def test_inactive_for_non_ooxml_files(self, tmp_path):
+        """Legacy / non-zip decks should leave every picture to Export."""
+        deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=1, shapes_per_slide=1)
+        media = MediaExtractor(deck, str(tmp_path / "images"))
+        assert not media.active
+        assert media.extract(FakeShape(shape_type=13, shape_id=2), 1, 1) is None
+        media.close()
+
+    def test_parse_shape_uses_media(self, tmp_path):
+        """parse_shape should record the copied media path."""
+        pptx = picture_deck(tmp_path)
+        image_dir = tmp_path / "images"
+        shape = FakeShape(name="Picture 1", shape_type=13, shape_id=2)
+
+        with MediaExtractor(pptx, str(image_dir)) as media:
+            info = parse_shape(shape, 1, 1, str(image_dir), media=media)
+
+        assert info["image_file"] == "images/slide01_shape1_Picture_1.png"
+        assert shape.exports == []
+
+
+class TestExportFallback:
+    """Tests for the Shape.Export path of export_shape_image."""
+
+    def test_restores_size_when_export_fails(self, tmp_path):
+        """A failing Export must not leave the shape resized."""
+
+        class BrokenExport(FakeShape):
+            def Export(self, path, fmt=None, *args, **kwargs):
+                raise RuntimeError("render failed")
+
+        shape = BrokenExport(name="Chart", shape_type=3, width=200.0, height=100.0)
+        assert export_shape_image(shape, 1, 1, str(tmp_path)) is None
+        assert (shape.Width, shape.Height) == (200.0, 100.0)
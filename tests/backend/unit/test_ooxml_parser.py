@@ -0,0 +1,295 @@
+"""
+Tests for backend/ppt_parser/ooxml.py
+
+The differential tests parse the same deck twice: with the COM engine against
+the fake PowerPoint object model, and with the OOXML engine against an
+equivalent .pptx package written by ``mocks.ooxml_builder``.
+"""
+
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.ooxml import OOXMLError, OOXMLPackage, text_of_body  # noqa: E402
+from mocks.fake_powerpoint import fake_dispatcher, write_fake_deck  # noqa: E402
+from mocks.ooxml_builder import (  # noqa: E402
+    group_xml,
+    picture_xml,
+    shape_xml,
+    table_xml,
+    write_pptx,
+    write_pptx_deck,
+)
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..", "..", "..")
+SAMPLE_PPTX = os.path.join(REPO_ROOT, "reconstructed_presentation.pptx")
+
+GEOMETRY_KEYS = ("left", "top", "width", "height", "rotation")
+SHAPE_KEYS = (
+    "shape_index",
+    "name",
+    "context",
+    "type_code",
+    "type_name",
+    "auto_shape_type",
+    "text",
+    "text_style",
+    "fill",
+    "line",
+    "z_order_position",
+    "z_order_level",
+    "is_connector",
+)
+CELL_KEYS = ("row", "col", "text", "left", "top", "width", "height")
+
+
+def load(json_path):
+    return ppt_parser.load_project_json(json_path)
+
+
+def normalize_fill(fill):
+    # COM always reports BackColor; OOXML only when the fill defines one
+    return {k: v for k, v in (fill or {}).items() if k != "back_color_rgb"}
+
+
+def assert_shapes_match(com_shape, ooxml_shape):
+    for key in SHAPE_KEYS:
+        if key in ("fill", "line") and com_shape["table"]:
+            # The fake model gives every shape a fill/line; graphic frames have none
+            continue
+        com_value, ooxml_value = com_shape[key], ooxml_shape[key]
+        if key == "fill":
+            com_value, ooxml_value = normalize_fill(com_value), normalize_fill(ooxml_value)
+        assert ooxml_value == com_value, f"{com_shape['name']}.{key}"
+    for key in GEOMETRY_KEYS:
+        assert ooxml_shape[key] == pytest.approx(com_shape[key], abs=0.01)
+
+    assert (com_shape["table"] is None) == (ooxml_shape["table"] is None)
+    if com_shape["table"]:
+        assert ooxml_shape["table"]["rows"] == com_shape["table"]["rows"]
+        assert ooxml_shape["table"]["cols"] == com_shape["table"]["cols"]
+        for com_cell, ooxml_cell in zip(
+            com_shape["table"]["cells"], ooxml_shape["table"]["cells"]
+        ):
+            for key in CELL_KEYS:
+                assert ooxml_cell[key] == pytest.approx(com_cell[key])
+
+
+@pytest.fixture
+def parse_both(tmp_path):
+    """Parse one deck spec with both engines and return (com_data, ooxml_data)."""
+
+    def _parse(**spec):
+        fake_deck = write_fake_deck(str(tmp_path / "fake.pptx"), **spec)
+        pptx = write_pptx_deck(str(tmp_path / "deck.pptx"), **spec)
+        com_json = ppt_parser.parse_presentation(
+            fake_deck, str(tmp_path / "com"), powerpoint=fake_dispatcher()
+        )
+        ooxml_json = ppt_parser.parse_presentation_ooxml(pptx, str(tmp_path / "ooxml"))
+        return load(com_json), load(ooxml_json)
+
+    return _parse
+
+
+class TestOOXMLMatchesCom:
+    """Differential tests: OOXML engine output vs. COM engine output."""
+
+    def test_presentation_level_fields(self, parse_both):
+        """Slide count, size, slide ids, design/layout names and properties should agree."""
+        com, ooxml = parse_both(slides=3, shapes_per_slide=2)
+
+        assert ooxml["parser_engine"] == "ooxml"
+        assert com["parser_engine"] == "com"
+        for key in ("slides_count", "slide_width", "slide_height"):
+            assert ooxml[key] == pytest.approx(com[key])
+        for com_slide, ooxml_slide in zip(com["slides"], ooxml["slides"]):
+            for key in ("slide_index", "slide_id", "shapes_count", "design_name", "layout_name"):
+                assert ooxml_slide[key] == com_slide[key]
+
+        com_props = com["metadata"]["builtin_properties"]
+        ooxml_props = ooxml["metadata"]["builtin_properties"]
+        for name, value in com_props.items():
+            assert str(ooxml_props[name]) == str(value)
+
+    def test_masters_and_layouts(self, parse_both):
+        """Master/layout structure should agree."""
+        com, ooxml = parse_both(slides=1, shapes_per_slide=1)
+        assert [m["design_name"] for m in ooxml["masters"]] == [
+            m["design_name"] for m in com["masters"]
+        ]
+        assert [l["layout_name"] for l in ooxml["masters"][0]["layouts"]] == [
+            l["layout_name"] for l in com["masters"][0]["layouts"]
+        ]
+
+    def test_shapes_and_tables(self, parse_both):
+        """Shapes (type, geometry, text, style, fill, line) and table cells should agree."""
+        com, ooxml = parse_both(slides=2, shapes_per_slide=4, table=[2, 3])
+        for com_slide, ooxml_slide in zip(com["slides"], ooxml["slides"]):
+            assert len(ooxml_slide["shapes"]) == len(com_slide["shapes"])
+            for com_shape, ooxml_shape in zip(com_slide["shapes"], ooxml_slide["shapes"]):
+                assert_shapes_match(com_shape, ooxml_shape)
+
+
+class TestOOXMLParser:
+    """Tests for OOXML-specific behaviour."""
+
+    def test_rejects_non_ooxml_file(self, tmp_path):
+        """A file that is not a zip package should raise OOXMLError."""
+        path = tmp_path / "bad.pptx"
+        path.write_bytes(b"not a zip")
+        with pytest.raises(OOXMLError):
+            OOXMLPackage(str(path))
+
+    def test_parse_failure_reports_progress_error(self, tmp_path):
+        """Parsing a corrupt file should return None and report -1 progress."""
+        path = tmp_path / "bad.pptx"
+        path.write_bytes(b"not a zip")
+        progress = []
+        result = ppt_parser.parse_presentation_ooxml(
+            str(path), str(tmp_path / "out"), progress_callback=lambda p, m: progress.append(p)
+        )
+        assert result is None
+        assert progress[-1] == -1
+
+    def test_progress_contract(self, tmp_path):
+        """Progress should follow the COM engine's 10 -> slides -> 95 -> 100 sequence."""
+        pptx = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=2, shapes_per_slide=1)
+        progress = []
+        ppt_parser.parse_presentation_ooxml(
+            pptx, str(tmp_path / "out"), progress_callback=lambda p, m: progress.append(p)
+        )
+        assert progress == [10, 10, 50, 95, 100]
+
+    def test_group_children_use_slide_coordinates(self, tmp_path):
+        """Group children should be mapped from the group's child space to the slide."""
+        child = shape_xml(3, "Child", left=0, top=0, width=50, height=50)
+        group = group_xml(2, "Group 1", (100, 100, 200, 100), (0, 0, 100, 50), [child])
+        pptx = write_pptx(str(tmp_path / "deck.pptx"), [[group]])
+
+        data = load(ppt_parser.parse_presentation_ooxml(pptx, str(tmp_path / "out")))
+        group_info = data["slides"][0]["shapes"][0]
+        assert group_info["type_code"] == 6
+        child_info = group_info["children"][0]
+        assert child_info["shape_index"] == "1_1"
+        assert (child_info["left"], child_info["top"]) == pytest.approx((100, 100))
+        assert (child_info["width"], child_info["height"]) == pytest.approx((100, 100))
+
+    def test_table_spans(self, tmp_path):
+        """Merged cells should report the merge origin's text and full extent."""
+        table = table_xml(2, "Table 1", 2, 2, spans={(1, 1): (1, 2)})
+        pptx = write_pptx(str(tmp_path / "deck.pptx"), [[table]])
+
+        data = load(ppt_parser.parse_presentation_ooxml(pptx, str(tmp_path / "out")))
+        cells = data["slides"][0]["shapes"][0]["table"]["cells"]
+        first_row = [c for c in cells if c["row"] == 1]
+        assert [c["text"] for c in first_row] == ["r1c1", "r1c1"]
+        assert first_row[0]["width"] == pytest.approx(120.0)
+
+    def test_picture_extracted_from_media(self, tmp_path):
+        """Pictures should be written from ppt/media under the COM image naming."""
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 4), (255, 0, 0)).save(buffer, format="PNG")
+        pptx = write_pptx(
+            str(tmp_path / "deck.pptx"),
+            [[picture_xml(2, "Picture 1", "rId2", 10, 10, 40, 40)]],
+            media={"ppt/media/image1.png": buffer.getvalue()},
+            slide_rels={1: [("rId2", "image", "../media/image1.png")]},
+        )
+
+        out_dir = tmp_path / "out"
+        data = load(ppt_parser.parse_presentation_ooxml(pptx, str(out_dir)))
+        shape = data["slides"][0]["shapes"][0]
+        assert shape["type_code"] == 13
+        assert shape["image_file"] == "images/slide01_shape1_Picture_1.png"
+        assert (out_dir / shape["image_file"]).read_bytes() == buffer.getvalue()
+
+    def test_preserved_descriptions_and_index(self, tmp_path):
+        """Descriptions and ##idx_N## indices should survive a reparse."""
+        shape = shape_xml(2, "Box", 0, 0, descr="##idx_7##")
+        pptx = write_pptx(str(tmp_path / "deck.pptx"), [[shape]])
+
+        slide = ppt_parser.parse_single_slide_ooxml(
+            pptx, 1, str(tmp_path / "out"), preserved_data={(1, "Box"): "kept"}
+        )
+        assert slide["shapes"][0]["shape_index"] == "7"
+        assert slide["shapes"][0]["description"] == "kept"
+        assert ppt_parser.parse_single_slide_ooxml(pptx, 2, str(tmp_path / "out")) is None
+
+    def test_text_paragraphs_and_breaks(self):
+        """Paragraphs join with \\r and line breaks become \\v, like TextRange.Text."""
+        import xml.etree.ElementTree as ET
+
+        body = ET.fromstring(
+            '<p:txBody xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+            'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+            "<a:p><a:r><a:t>one</a:t></a:r><a:br/><a:r><a:t>two</a:t></a:r></a:p>"
+            "<a:p><a:r><a:t>three</a:t></a:r></a:p></p:txBody>"
+        )
+        assert text_of_body(body) == "one\vtwo\rthree"
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_PPTX), reason="sample deck missing")
+    def test_parses_sample_presentation(self, tmp_path):
+        """The repository's sample deck should parse end-to-end."""
+        data = load(ppt_parser.parse_presentation_ooxml(SAMPLE_PPTX, str(tmp_path / "out")))
+        assert data["slides_count"] == 13
+        assert len(data["slides"]) == 13
+        assert data["slide_width"] == pytest.approx(960.0)
+        assert all(slide["shapes"] for slide in data["slides"])
+        assert data["masters"][0]["layouts"]
+
+
+class TestProbePresentationMetadata:
+    """Tests for the COM-free metadata probe used on upload."""
+
+    def test_matches_com_metadata(self, tmp_path):
+        """The probe should return exactly what get_presentation_metadata returns."""
+        spec = {
+            "slides": 4,
+            "shapes_per_slide": 1,
+            "properties": {
+                "Title": "Quarterly",
+                "Subject": "Numbers",
+                "Author": "Kim",
+                "Last Author": "Lee",
+                "Revision Number": 12,
+            },
+        }
+        fake_deck = write_fake_deck(str(tmp_path / "fake.pptx"), **spec)
+        pptx = write_pptx_deck(str(tmp_path / "deck.pptx"), **spec)
+
+        expected = ppt_parser.get_presentation_metadata(fake_deck, powerpoint=fake_dispatcher())
+        assert ppt_parser.probe_presentation_metadata(pptx) == expected
+
+    def test_missing_properties_are_empty_strings(self, tmp_path):
+        """Absent core properties should come back as "" like the COM helper."""
+        pptx = write_pptx(str(tmp_path / "deck.pptx"), [[], []], properties={"Title": "Only"})
+        metadata = ppt_parser.probe_presentation_metadata(pptx)
+        assert metadata["title"] == "Only"
+        assert metadata["author"] == ""
+        assert metadata["slide_count"] == 2
+
+    def test_rejects_non_presentation_zip(self, tmp_path):
+        """A zip without ppt/presentation.xml (e.g. a .docx) should be rejected."""
+        import zipfile
+
+        path = str(tmp_path / "doc.pptx")
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("word/document.xml", "<w:document/>")
+        with pytest.raises(OOXMLError):
+            ppt_parser.probe_presentation_metadata(path)
+
+    def test_detects_legacy_ppt(self, tmp_path):
+        """OLE compound files should be routed to COM; .pptx packages should not."""
+        legacy = tmp_path / "old.ppt"
+        legacy.write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 64)
+        pptx = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=1, shapes_per_slide=1)
+        assert ppt_parser.is_legacy_ppt(str(legacy))
+        assert not ppt_parser.is_legacy_ppt(pptx)
@@ -0,0 +1,111 @@
+"""
+Tests for backend/ppt_parser/parallel.py (slide-range parallel parsing)
+
+Runs the slide ranges on a PowerPointPool against the fake COM object model.
+"""
+
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from com_pool import PowerPointPool  # noqa: E402
+from ppt_parser.parallel import parse_presentation_parallel, split_slide_range  # noqa: E402
+from mocks.fake_powerpoint import fake_dispatcher, write_fake_deck  # noqa: E402
+from mocks.ooxml_builder import write_pptx_deck  # noqa: E402
+
+pytestmark = [
+    pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="pool tests use the fork start method",
+    ),
+    pytest.mark.filterwarnings("ignore::DeprecationWarning"),
+]
+
+
+@pytest.fixture
+def pool():
+    pool = PowerPointPool(
+        size=3,
+        max_jobs_per_worker=0,
+        dispatcher=fake_dispatcher,
+        mp_context=multiprocessing.get_context("fork"),
+        restart_backoff=0,
+    )
+    yield pool
+    pool.shutdown()
+
+
+def load(json_path):
+    return ppt_parser.load_project_json(json_path)
+
+
+class TestSplitSlideRange:
+    """Tests for split_slide_range."""
+
+    def test_even_contiguous_chunks(self):
+        assert split_slide_range(10, 3, min_slides=1) == [(1, 4), (5, 7), (8, 10)]
+
+    def test_small_decks_stay_whole(self):
+        assert split_slide_range(30, 4, min_slides=20) == [(1, 30)]
+        assert split_slide_range(0, 4) == []
+
+
+class TestParallelParse:
+    """parse_presentation_parallel against a sequential parse."""
+
+    def test_matches_sequential_parse(self, tmp_path, pool):
+        deck = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=12, shapes_per_slide=2)
+        sequential = load(
+            ppt_parser.parse_presentation(deck, str(tmp_path / "seq"), powerpoint=fake_dispatcher())
+        )
+
+        seen = []
+        json_path = parse_presentation_parallel(
+            deck,
+            str(tmp_path / "par"),
+            pool=pool,
+            workers=3,
+            min_slides_per_worker=2,
+            progress_callback=lambda p, m: seen.append(p),
+        )
+        parallel = load(json_path)
+
+        assert parallel["slides"] == sequential["slides"]
+        assert parallel["masters"] == sequential["masters"]
+        assert parallel["slides_count"] == 12
+        assert parallel["ppt_path"].endswith("deck.pptx")
+        assert len(os.listdir(tmp_path / "par" / "thumbnails")) == 12
+        # Read-only copies are cleaned up
+        assert not [n for n in os.listdir(tmp_path / "par") if n.startswith(".parallel-")]
+        assert seen == sorted(seen) and seen[-1] == 100
+
+    def test_descriptions_preserved_per_range(self, tmp_path, pool):
+        deck = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=6, shapes_per_slide=1)
+        data = load(
+            parse_presentation_parallel(
+                deck,
+                str(tmp_path / "out"),
+                pool=pool,
+                workers=3,
+                min_slides_per_worker=1,
+                preserved_data={(5, "Shape 1"): "kept"},
+            )
+        )
+        assert data["slides"][4]["shapes"][0]["description"] == "kept"
+
+    def test_legacy_deck_runs_as_one_job(self, tmp_path, pool):
+        """Without a package to count slides in, the deck is parsed sequentially."""
+        deck = write_fake_deck(str(tmp_path / "deck.ppt"), slides=4, shapes_per_slide=1)
+        data = load(
+            parse_presentation_parallel(
+                deck, str(tmp_path / "out"), pool=pool, workers=3, min_slides_per_worker=1
+            )
+        )
+        assert [s["slide_index"] for s in data["slides"]] == [1, 2, 3, 4]
+        assert pool.stats()["completed"] == 1
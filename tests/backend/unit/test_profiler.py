@@ -0,0 +1,103 @@
+"""
+Tests for backend/ppt_parser/profiler.py
+
+Profiles run against the fake COM object model, with a fixed per-call latency
+so timings are reproducible enough to rank.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.profiler import ComProfiler, label_com_object  # noqa: E402
+from ppt_parser.snapshot import snapshot  # noqa: E402
+from mocks.fake_powerpoint import (  # noqa: E402
+    FakeShape,
+    fake_dispatcher,
+    set_latency,
+    write_fake_deck,
+)
+
+
+@pytest.fixture
+def parsed_profile(tmp_path):
+    deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=2, shapes_per_slide=3, table=[2, 2])
+    out_dir = tmp_path / "project"
+    set_latency(0.0001)
+    try:
+        ppt_parser.parse_presentation(
+            deck, str(out_dir), powerpoint=fake_dispatcher(), profile=True
+        )
+    finally:
+        set_latency(0.0)
+    with open(out_dir / "project.profile.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestComProfiler:
+    """Tests for ComProfiler and its proxies."""
+
+    def test_counts_gets_sets_and_calls(self, tmp_path):
+        """Property gets, sets and method calls should be recorded separately."""
+        profiler = ComProfiler()
+        shape = profiler.wrap(FakeShape(name="Box"))
+        shape.Type
+        shape.Width = 10.0
+        shape.Export(str(tmp_path / "box.png"))
+
+        by_kind = profiler.report()["by_kind"]
+        assert by_kind["get"]["calls"] == 1
+        assert by_kind["set"]["calls"] == 1
+        assert by_kind["call"]["calls"] == 1
+
+    def test_labels_by_shape_type_and_context(self):
+        """Reads should be keyed by the shape's own Type and the parser's context."""
+        profiler = ComProfiler()
+        shape = profiler.wrap(FakeShape(shape_type=17))
+        label_com_object(snapshot(shape), context="layout")
+        shape.Type
+        shape.Fill.Type  # a Fill's Type must not relabel the shape
+        shape.TextFrame.TextRange.Text
+
+        report = profiler.report()
+        assert report["by_shape_type"]["Text box"]["calls"] == 5
+        assert report["by_context"]["layout"]["calls"] == 6
+
+    def test_exceptions_are_recorded(self):
+        """Failing property reads should still be counted."""
+        profiler = ComProfiler()
+        shape = profiler.wrap(FakeShape())
+        with pytest.raises(AttributeError):
+            shape.Nodes
+        assert profiler.report()["total"]["calls"] == 1
+
+
+class TestParseProfile:
+    """Profile report written by parse_presentation."""
+
+    def test_report_written_next_to_project_json(self, parsed_profile):
+        """The report should rank members and split time per slide and shape type."""
+        assert parsed_profile["total"]["calls"] > 0
+        assert [s["slide_index"] for s in parsed_profile["slides"]] == [1, 2]
+        assert {"Text box", "AutoShape", "Table"} <= set(parsed_profile["by_shape_type"])
+        assert {"slide", "master"} <= set(parsed_profile["by_context"])
+
+        seconds = [m["seconds"] for m in parsed_profile["top_members"]]
+        assert seconds == sorted(seconds, reverse=True)
+
+    def test_profile_is_opt_in(self, tmp_path, monkeypatch):
+        """Without profile=True or PPT_COM_PROFILE no report should be written."""
+        monkeypatch.delenv("PPT_COM_PROFILE", raising=False)
+        deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=1, shapes_per_slide=1)
+        ppt_parser.parse_presentation(deck, str(tmp_path / "off"), powerpoint=fake_dispatcher())
+        assert not (tmp_path / "off" / "off.profile.json").exists()
+
+        monkeypatch.setenv("PPT_COM_PROFILE", "1")
+        ppt_parser.parse_presentation(deck, str(tmp_path / "on"), powerpoint=fake_dispatcher())
+        assert (tmp_path / "on" / "on.profile.json").exists()
@@ -0,0 +1,134 @@
+"""
+Tests for backend/progress_db.py (shared parse progress) and the progress event stream
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+
+from progress_db import ProgressDatabase  # noqa: E402
+
+
+@pytest.fixture
+def progress(tmp_path):
+    return ProgressDatabase(str(tmp_path / "progress.db"))
+
+
+class TestProgressDatabase:
+    """Tests for ProgressDatabase."""
+
+    def test_status_follows_percent(self, progress):
+        assert progress.set("p1", 0, "Uploaded")["status"] == "processing"
+        assert progress.set("p1", 40, "Parsing Slide 2/5")["status"] == "processing"
+        assert progress.set("p1", 100, "Done")["status"] == "done"
+        assert progress.set("p2", -1, "PowerPoint said no")["status"] == "error"
+
+    def test_update_keeps_status_unless_given(self, progress):
+        progress.set("p1", -1, "crashed")
+        assert progress.set("p1", 20, "still failed")["status"] == "error"
+        assert progress.set("p1", 20, "resuming", status="processing")["status"] == "processing"
+
+    def test_changes_since_revision(self, progress):
+        first = progress.set("p1", 10, "a")
+        progress.set("p2", 10, "b")
+        progress.set("p1", 20, "c")
+
+        changes = progress.changes(first["rev"])
+        assert [(c["project_id"], c["message"]) for c in changes] == [("p2", "b"), ("p1", "c")]
+        assert [c["project_id"] for c in progress.changes(0, ["p2"])] == ["p2"]
+        assert progress.changes(0, []) == []
+        assert progress.latest_rev() == changes[-1]["rev"]
+
+    def test_visible_to_other_connections(self, tmp_path, progress):
+        # Another API worker process opens the same file
+        other = ProgressDatabase(str(tmp_path / "progress.db"))
+        progress.set("p1", 50, "half way")
+        assert other.get("p1")["percent"] == 50
+
+    def test_purge_drops_only_old_finished_rows(self, progress):
+        progress.set("done", 100, "Done")
+        progress.set("running", 50, "half way")
+        time.sleep(0.05)
+        progress.set("fresh", 100, "Done")
+
+        assert progress.purge(older_than=0.02) == 1
+        assert progress.get("done") is None
+        assert progress.get("running") is not None
+        assert progress.get("fresh") is not None
+
+    def test_revisions_not_reused_after_purge(self, progress):
+        latest = progress.set("p1", 100, "Done")["rev"]
+        progress.purge(older_than=0)
+        assert progress.set("p2", 0, "Uploaded")["rev"] > latest
+
+
+class TestProgressStream:
+    """main.progress_events / the status endpoint read the shared table."""
+
+    @pytest.fixture
+    def main(self, main, progress, monkeypatch):
+        monkeypatch.setattr(main, "progress_db", progress)
+        monkeypatch.setattr(main, "PROGRESS_POLL_INTERVAL", 0.01)
+        return main
+
+    def collect(self, main, project_ids, last_rev, count):
+        """The first ``count`` progress events of a stream, then disconnect."""
+
+        async def run():
+            events = []
+
+            async def is_disconnected():
+                return len(events) >= count
+
+            async for chunk in main.progress_events(project_ids, last_rev, is_disconnected):
+                if "event: progress" in chunk:
+                    lines = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+                    events.append((lines.get("id"), json.loads(lines["data"])))
+            return events
+
+        return asyncio.run(asyncio.wait_for(run(), 10))
+
+    def test_stream_sends_current_state_then_updates(self, main, progress):
+        progress.set("p1", 10, "Starting...")
+        progress.set("other", 10, "Starting...")
+        resumed_from = progress.set("p2", 30, "Parsing Slide 1/3")["rev"]
+        progress.set("p1", 100, "Done")
+
+        events = self.collect(main, ["p1", "p2"], None, 2)
+        assert [(e["project_id"], e["status"]) for _, e in events] == [
+            ("p2", "processing"),
+            ("p1", "done"),
+        ]
+
+        # A reconnecting EventSource resumes after the last id it saw
+        events = self.collect(main, None, resumed_from, 1)
+        assert events == [(str(progress.latest_rev()), events[0][1])]
+        assert events[0][1]["message"] == "Done"
+
+    def test_untracked_project_reports_stored_state(self, main, progress, tmp_path):
+        (tmp_path / "old").mkdir()
+        (tmp_path / "old" / "old.json").write_text("{}")
+
+        events = self.collect(main, ["old", "nope"], None, 2)
+        # No progress row, so no event id
+        assert [(rev, e["project_id"], e["status"]) for rev, e in events] == [
+            (None, "old", "done"),
+            (None, "nope", "error"),
+        ]
+
+    def test_status_endpoint(self, main, progress):
+        pytest.importorskip("httpx")
+        from fastapi.testclient import TestClient
+
+        progress.set("p1", 40, "Parsing Slide 2/5")
+        client = TestClient(main.app)
+
+        status = client.get("/api/project/p1/status").json()
+        assert (status["percent"], status["status"]) == (40, "processing")
+        assert client.get("/api/project/nope/status").json()["status"] == "error"
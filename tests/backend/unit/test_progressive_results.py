@@ -0,0 +1,104 @@
+"""
+Tests for per-slide flushing of parse results (storage.PartialResultWriter)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.ooxml import parse_presentation_ooxml  # noqa: E402
+from ppt_parser.storage import PartialResultWriter, load_partial_result  # noqa: E402
+from mocks.fake_powerpoint import fake_dispatcher, write_fake_deck  # noqa: E402
+from mocks.ooxml_builder import write_pptx_deck  # noqa: E402
+
+
+class TestPartialResultWriter:
+    """Tests for PartialResultWriter / load_partial_result."""
+
+    def test_serves_ready_slides_in_order(self, tmp_path):
+        writer = PartialResultWriter(str(tmp_path))
+        writer.add_slide({"slide_index": 3, "shapes": []})
+        assert load_partial_result(str(tmp_path)) is None  # no header yet
+
+        writer.begin({"slides_count": 4, "masters": [{"design_name": "X"}], "slides": []})
+        writer.add_slide({"slide_index": 1, "shapes": []})
+
+        data = load_partial_result(str(tmp_path))
+        assert data["partial"] is True
+        assert data["ready_slides"] == [1, 3]
+        assert [s["slide_index"] for s in data["slides"]] == [1, 3]
+        assert data["masters"] == [{"design_name": "X"}]
+        assert ppt_parser.read_partial_manifest(str(tmp_path))["ready"] == [1, 3]
+
+    def test_finish_removes_partial_files(self, tmp_path):
+        writer = PartialResultWriter(str(tmp_path))
+        writer.begin({"slides_count": 1})
+        writer.add_slide({"slide_index": 1})
+        writer.finish()
+        assert load_partial_result(str(tmp_path)) is None
+        assert os.listdir(tmp_path) == []
+
+
+class TestProgressiveParse:
+    """Slides become readable while the rest of the deck is parsed."""
+
+    @staticmethod
+    def snapshots(out_dir):
+        seen = {}
+
+        def callback(percent, message):
+            if message.startswith("Parsing Slide "):
+                partial = load_partial_result(str(out_dir))
+                seen[message] = partial["ready_slides"] if partial else None
+
+        return seen, callback
+
+    def test_com_parse_flushes_each_slide(self, tmp_path):
+        deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=3, shapes_per_slide=1)
+        out_dir = tmp_path / "out"
+        seen, callback = self.snapshots(out_dir)
+
+        json_path = ppt_parser.parse_presentation(
+            deck,
+            str(out_dir),
+            powerpoint=fake_dispatcher(),
+            progress_callback=callback,
+            progressive=True,
+        )
+
+        assert seen == {
+            "Parsing Slide 1/3": [],
+            "Parsing Slide 2/3": [1],
+            "Parsing Slide 3/3": [1, 2],
+        }
+        assert os.path.exists(json_path)
+        assert not (out_dir / ".partial").exists()
+
+    def test_ooxml_parse_flushes_each_slide(self, tmp_path):
+        deck = write_pptx_deck(str(tmp_path / "deck.pptx"), slides=2, shapes_per_slide=1)
+        out_dir = tmp_path / "out"
+        seen, callback = self.snapshots(out_dir)
+
+        parse_presentation_ooxml(deck, str(out_dir), progress_callback=callback, progressive=True)
+
+        assert seen == {"Parsing Slide 1/2": [], "Parsing Slide 2/2": [1]}
+        assert not (out_dir / ".partial").exists()
+
+
+class TestProjectEndpoint:
+    """GET /api/project/{id} while the JSON is not written yet."""
+
+    def test_serves_partial_project(self, client, tmp_path):
+        writer = PartialResultWriter(str(tmp_path / "p1"))
+        writer.begin({"slides_count": 2, "slides": []})
+        writer.add_slide({"slide_index": 1, "shapes": []})
+
+        response = client.get("/api/project/p1")
+        assert response.status_code == 200
+        assert response.json()["partial"] is True
+        assert response.json()["ready_slides"] == [1]
+
+        assert client.get("/api/project/missing").status_code == 404
@@ -0,0 +1,207 @@
+"""
+Tests for backend/project_cache.py (parsed project documents, ETags)
+"""
+
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+
+import project_cache  # noqa: E402
+from ppt_parser.palette import intern_styles  # noqa: E402
+from project_cache import ProjectDocumentCache, accepts_encoding, etag_matches  # noqa: E402
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return str(path)
+
+
+class TestProjectDocumentCache:
+    """Tests for ProjectDocumentCache."""
+
+    def test_second_read_is_a_hit(self, tmp_path):
+        cache = ProjectDocumentCache(max_bytes=1 << 20)
+        path = write_json(tmp_path / "p1.json", {"slides": [1]})
+
+        first, etag = cache.get(path)
+        second, again = cache.get(path)
+
+        assert second is first
+        assert again == etag and etag.startswith('"')
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+    def test_changed_file_is_read_again(self, tmp_path):
+        cache = ProjectDocumentCache(max_bytes=1 << 20)
+        path = write_json(tmp_path / "p1.json", {"slides": [1]})
+        _, etag = cache.get(path)
+
+        write_json(path, {"slides": [1, 2]})
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+
+        data, new_etag = cache.get(path)
+        assert data == {"slides": [1, 2]}
+        assert new_etag != etag
+
+    def test_same_content_same_etag(self, tmp_path):
+        cache = ProjectDocumentCache(max_bytes=1 << 20)
+        first = write_json(tmp_path / "a.json", {"slides": []})
+        second = write_json(tmp_path / "b.json", {"slides": []})
+        assert cache.get(first)[1] == cache.get(second)[1]
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        paths = [write_json(tmp_path / f"p{i}.json", {"pad": "x" * 100}) for i in range(3)]
+        size = os.path.getsize(paths[0])
+        cache = ProjectDocumentCache(max_bytes=2 * size)
+
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])  # p1 is now the oldest
+        cache.get(paths[2])
+
+        assert cache.etag(paths[0]) is not None
+        assert cache.etag(paths[1]) is None
+        assert cache.stats()["bytes"] == 2 * size
+
+    def test_document_over_budget_is_not_kept(self, tmp_path):
+        cache = ProjectDocumentCache(max_bytes=10)
+        path = write_json(tmp_path / "big.json", {"pad": "x" * 100})
+        assert cache.get(path)[0]["pad"]
+        assert cache.stats()["documents"] == 0
+
+    def test_invalidate(self, tmp_path):
+        cache = ProjectDocumentCache(max_bytes=1 << 20)
+        path = write_json(tmp_path / "p1.json", {})
+        cache.get(path)
+        cache.invalidate(path)
+        assert cache.etag(path) is None
+        assert cache.stats()["bytes"] == 0
+
+
+class TestStoredForm:
+    """Tests for file_info() / gzip_variant()."""
+
+    def test_file_info_matches_get(self, tmp_path):
+        cache = ProjectDocumentCache(max_bytes=1 << 20)
+        path = write_json(tmp_path / "p1.json", {"slides": [1]})
+        info = cache.file_info(path)
+        assert info == {
+            "etag": cache.get(path)[1],
+            "encoding": None,
+            "sharded": False,
+            "interned": False,
+        }
+
+    def test_marker_split_across_chunks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(project_cache, "CHUNK_SIZE", 7)
+        cache = ProjectDocumentCache(max_bytes=1 << 20)
+        shape = {"fill": {"color": "#FF0000"}}
+        data = intern_styles({"slides": [{"shapes": [dict(shape), dict(shape)]}]})
+        path = write_json(tmp_path / "p1.json", data)
+        assert cache.file_info(path)["interned"] is True
+
+    def test_gzip_variant_follows_the_file(self, tmp_path):
+        cache = ProjectDocumentCache(max_bytes=1 << 20)
+        path = write_json(tmp_path / "p1.json", {"slides": [1]})
+        gz_path = cache.gzip_variant(path)
+        assert gzip.decompress(open(gz_path, "rb").read()) == open(path, "rb").read()
+        assert cache.gzip_variant(path) == gz_path
+
+        write_json(path, {"slides": [1, 2]})
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+        assert json.loads(gzip.decompress(open(cache.gzip_variant(path), "rb").read())) == {
+            "slides": [1, 2]
+        }
+
+
+class TestEtagMatches:
+    """Tests for etag_matches()."""
+
+    def test_forms(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('"x", W/"abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"abd"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+    def test_accepts_encoding(self):
+        assert accepts_encoding("gzip, deflate, br", "gzip")
+        assert accepts_encoding("br;q=1.0, *;q=0.5", "gzip")
+        assert not accepts_encoding("gzip;q=0", "gzip")
+        assert not accepts_encoding("identity", "gzip")
+        assert not accepts_encoding(None, "gzip")
+
+
+class TestGetProjectEndpoint:
+    """GET /api/project/{id} answers repeat loads with 304."""
+
+    @pytest.fixture
+    def client(self, client, tmp_path):
+        (tmp_path / "p1").mkdir()
+        write_json(
+            tmp_path / "p1" / "p1.json",
+            {
+                "title": "Plan",
+                "slides": [{"slide_index": 1, "shapes": [{"shape_index": 1, "name": "Box"}]}],
+                "notes": "x" * 2000,
+            },
+        )
+        return client
+
+    def test_etag_and_not_modified(self, client):
+        response = client.get("/api/project/p1")
+        etag = response.headers["etag"]
+        assert response.json()["slides"][0]["slide_index"] == 1
+
+        cached = client.get("/api/project/p1", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert cached.content == b""
+
+    def test_edit_changes_etag(self, client):
+        etag = client.get("/api/project/p1").headers["etag"]
+
+        client.post(
+            "/api/project/p1/update_description",
+            json={"slide_index": 1, "shape_index": "1", "description": "Title"},
+        )
+
+        response = client.get("/api/project/p1", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["slides"][0]["shapes"][0]["description"] == "Title"
+
+    def test_stored_bytes_are_sent(self, client, tmp_path, mocker):
+        load = mocker.spy(project_cache.ProjectDocumentCache, "get")
+        raw = (tmp_path / "p1" / "p1.json").read_bytes()
+
+        plain = client.get("/api/project/p1", headers={"Accept-Encoding": "identity"})
+        assert plain.content == raw
+        assert "content-encoding" not in plain.headers
+
+        compressed = client.get("/api/project/p1", headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.content == raw  # decoded by the client
+        assert compressed.headers["etag"] != plain.headers["etag"]
+        assert (tmp_path / "p1" / "p1.json.gz").exists()
+        assert load.call_count == 0
+
+    def test_fields_filter(self, client):
+        response = client.get("/api/project/p1?fields=title,missing")
+        assert response.json() == {"title": "Plan"}
+        assert response.headers["etag"] != client.get("/api/project/p1").headers["etag"]
+
+    def test_interned_file_is_resolved(self, client, tmp_path):
+        shape = {"shape_index": 1, "fill": {"color": "#FF0000"}}
+        write_json(
+            tmp_path / "p1" / "p1.json",
+            intern_styles({"slides": [{"shapes": [dict(shape), dict(shape, shape_index=2)]}]}),
+        )
+        body = client.get("/api/project/p1").json()
+        assert "style_palette" not in body
+        assert body["slides"][0]["shapes"][1]["fill"] == {"color": "#FF0000"}
@@ -0,0 +1,109 @@
+"""
+Tests for the stored forms of project JSON (compact / gzip / zstd / pretty) in
+backend/ppt_parser/storage.py and how GET /api/project/{id} serves them
+"""
+
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+
+import ppt_parser  # noqa: E402
+from ppt_parser import storage  # noqa: E402
+
+DATA = {"title": "Plan", "slides": [{"slide_index": i, "text": "x" * 50} for i in range(1, 40)]}
+
+
+class TestStoredForms:
+    """Tests for save_project_json() / load_project_json() across formats."""
+
+    @pytest.mark.parametrize("fmt", ["compact", "gzip", "pretty"])
+    def test_round_trip(self, tmp_path, fmt):
+        path = str(tmp_path / "p1.json")
+        ppt_parser.save_project_json(path, DATA, fmt)
+        assert ppt_parser.load_project_json(path) == DATA
+        assert ppt_parser.project_json_encoding(path) == ("gzip" if fmt == "gzip" else None)
+
+    def test_compact_is_default_and_minified(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("PPT_PROJECT_FORMAT", raising=False)
+        path = str(tmp_path / "p1.json")
+        ppt_parser.save_project_json(path, DATA)
+        with open(path, "rb") as f:
+            raw = f.read()
+        assert b"\n" not in raw and b'": ' not in raw
+        assert os.path.getsize(path) < len(json.dumps(DATA, indent=2))
+
+    def test_format_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PPT_PROJECT_FORMAT", "gzip")
+        monkeypatch.setenv("PPT_PROJECT_LAYOUT", "single")
+        path = str(tmp_path / "p1.json")
+        ppt_parser.save_project_json(path, DATA)
+        with open(path, "rb") as f:
+            assert json.loads(gzip.decompress(f.read())) == DATA
+
+    def test_zstd_falls_back_to_gzip_without_zstandard(self, monkeypatch):
+        monkeypatch.setenv("PPT_PROJECT_FORMAT", "zstd")
+        monkeypatch.setattr(storage, "_zstandard", lambda: None)
+        assert storage.project_json_format() == "gzip"
+
+    def test_legacy_indented_file_loads(self, tmp_path):
+        path = tmp_path / "p1.json"
+        path.write_text(json.dumps(DATA, indent=2), encoding="utf-8")
+        assert ppt_parser.load_project_json(str(path)) == DATA
+        with ppt_parser.open_project_json(str(path)) as f:
+            assert json.load(f) == DATA
+
+    def test_same_document_same_gzip_bytes(self):
+        assert storage.encode_project_json(DATA, "gzip") == storage.encode_project_json(
+            DATA, "gzip"
+        )
+
+
+class TestServeStoredForm:
+    """GET /api/project/{id} sends a compressed file as stored."""
+
+    @pytest.fixture
+    def client(self, client, tmp_path):
+        (tmp_path / "p1").mkdir()
+        ppt_parser.save_project_json(
+            str(tmp_path / "p1" / "p1.json"), DATA, "gzip", layout="single"
+        )
+        return client
+
+    def test_compressed_bytes_sent_as_stored(self, client, tmp_path):
+        response = client.get("/api/project/p1", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == DATA
+        assert not (tmp_path / "p1" / "p1.json.gz").exists()
+
+    def test_decompressed_for_other_clients(self, client):
+        response = client.get("/api/project/p1", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert json.loads(response.content) == DATA
+        etag = response.headers["etag"]
+        assert etag != client.get("/api/project/p1").headers["etag"]
+        cached = client.get(
+            "/api/project/p1", headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+
+    def test_edit_leaves_the_stored_file_alone(self, client, tmp_path, monkeypatch):
+        monkeypatch.setenv("PPT_PROJECT_FORMAT", "gzip")
+        json_path = str(tmp_path / "p1" / "p1.json")
+        data = dict(DATA, slides=[{"slide_index": 1, "shapes": [{"shape_index": 1}]}])
+        ppt_parser.save_project_json(json_path, data)
+        stored = (tmp_path / "p1" / "p1.json").read_bytes()
+
+        response = client.post(
+            "/api/project/p1/update_description",
+            json={"slide_index": 1, "shape_index": "1", "description": "Title"},
+        )
+
+        assert response.status_code == 200
+        assert (tmp_path / "p1" / "p1.json").read_bytes() == stored
+        shape = client.get("/api/project/p1").json()["slides"][0]["shapes"][0]
+        assert shape["description"] == "Title"
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "ba
 
 from utils.shape_utils import (
     find_shape_by_index,
+    resolve_shape_styles,
     update_shape_property,
     extract_preserved_descriptions,
 )
@@ -148,3 +149,20 @@ class TestExtractPreservedDescriptions:
 
         assert (0, "Existing") in preserved
         assert (1, "Title") in preserved
+
+
+class TestResolveShapeStyles:
+    """Tests for shapes of projects stored with a style palette."""
+
+    def test_find_shape_resolves_palette_references(self):
+        """Should return an inline copy of the shape when given the palette."""
+        palette = [{"font_name": "Arial"}, {"visible": True}]
+        shapes = [
+            {"shape_index": 1, "text_style": {"$style": 0}},
+            {"shape_index": 2, "children": [{"shape_index": "2_1", "fill": {"$style": 1}}]},
+        ]
+
+        result = find_shape_by_index(shapes, "2_1", palette=palette)
+        assert result["fill"] == {"visible": True}
+        assert shapes[1]["children"][0]["fill"] == {"$style": 1}
+        assert resolve_shape_styles(shapes[0], palette)["text_style"] == {"font_name": "Arial"}
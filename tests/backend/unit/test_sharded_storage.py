@@ -0,0 +1,159 @@
+"""
+Tests for sharded project storage (manifest plus one file per slide) in
+backend/ppt_parser/storage.py and the slide endpoints
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+
+import ppt_parser  # noqa: E402
+from ppt_parser import storage  # noqa: E402
+
+
+def project(slides=3):
+    return {
+        "title": "Plan",
+        "masters": [{"name": "Office"}],
+        "slides": [
+            {
+                "slide_index": s,
+                "shapes": [
+                    {"shape_index": 1, "left": 10, "top": 20, "fill": {"color": "#FFFFFF"}}
+                ],
+            }
+            for s in range(1, slides + 1)
+        ],
+    }
+
+
+def slide_files(project_dir):
+    return sorted(os.listdir(os.path.join(project_dir, "slides")))
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    (tmp_path / "p1").mkdir()
+    path = str(tmp_path / "p1" / "p1.json")
+    ppt_parser.save_project_json(path, project(), layout="sharded")
+    return path
+
+
+class TestShardedStorage:
+    """Tests for save_project_json() / save_project_slides() with the sharded layout."""
+
+    def test_manifest_and_round_trip(self, json_path):
+        with open(json_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        assert "slides" not in manifest
+        assert manifest["masters"] == [{"name": "Office"}]
+        assert [name.split(".")[0] for name in manifest["slide_files"]] == [
+            "slides/slide_001",
+            "slides/slide_002",
+            "slides/slide_003",
+        ]
+        assert ppt_parser.load_project_json(json_path) == project()
+
+    def test_whole_document_stream(self, json_path):
+        text = b"".join(ppt_parser.iter_project_document(json_path, chunk_size=16))
+        assert json.loads(text) == project()
+
+    def test_save_slides_writes_only_that_slide(self, json_path, tmp_path):
+        project_dir = str(tmp_path / "p1")
+        before = slide_files(project_dir)
+        slide, = ppt_parser.load_project_slides(json_path, indices=[2])[0]
+        slide["shapes"][0]["left"] = 99
+
+        ppt_parser.save_project_slides(json_path, [slide])
+
+        after = slide_files(project_dir)
+        assert len(set(after) - set(before)) == 1
+        assert ppt_parser.load_project_json(json_path)["slides"][1]["shapes"][0]["left"] == 99
+        # The old version is collected once nothing refers to it
+        storage.collect_slide_files(project_dir, grace=0)
+        assert len(slide_files(project_dir)) == 3
+
+    def test_snapshot_keeps_its_slide_files(self, json_path, tmp_path):
+        project_dir = str(tmp_path / "p1")
+        snapshot_path = ppt_parser.snapshot_project_json(project_dir)
+        slide, = ppt_parser.load_project_slides(json_path, indices=[1])[0]
+        slide["shapes"][0]["description"] = "edited"
+        ppt_parser.save_project_slides(json_path, [slide])
+
+        storage.collect_slide_files(project_dir, grace=0)
+
+        assert ppt_parser.load_project_json(snapshot_path) == project()
+        assert len(slide_files(project_dir)) == 4
+
+    def test_range_reads_only_its_files(self, json_path):
+        slides, names = ppt_parser.load_project_slides(json_path, first=2, last=3)
+        assert [s["slide_index"] for s in slides] == [2, 3]
+        assert len(names) == 2
+        assert ppt_parser.project_slide_files(json_path, first=2, last=3) == names
+
+    def test_interned_slides_are_resolved(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PPT_INTERN_STYLES", "1")
+        (tmp_path / "p2").mkdir()
+        path = str(tmp_path / "p2" / "p2.json")
+        ppt_parser.save_project_json(path, project(), layout="sharded")
+
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["style_palette"] == [{"color": "#FFFFFF"}]
+        slides, _ = ppt_parser.load_project_slides(path, indices=[3])
+        assert slides[0]["shapes"][0]["fill"] == {"color": "#FFFFFF"}
+
+    def test_single_file_project_is_sharded_on_save(self, tmp_path):
+        (tmp_path / "p3").mkdir()
+        path = str(tmp_path / "p3" / "p3.json")
+        ppt_parser.save_project_json(path, project(), layout="single")
+        assert ppt_parser.project_slide_files(path) is None
+
+        slide, = ppt_parser.load_project_slides(path, indices=[1])[0]
+        ppt_parser.save_project_slides(path, [slide])
+
+        assert len(ppt_parser.project_slide_files(path)) == 3
+        assert ppt_parser.load_project_json(path) == project()
+
+
+class TestSlideEndpoints:
+    """GET /api/project/{id}/slides[/{index}] and edits on a sharded project."""
+
+    @pytest.fixture
+    def client(self, json_path, client):
+        return client
+
+    def test_slide_and_range(self, client):
+        assert client.get("/api/project/p1/slides/2").json()["slide_index"] == 2
+        body = client.get("/api/project/p1/slides?start=2&end=3").json()
+        assert [s["slide_index"] for s in body["slides"]] == [2, 3]
+        assert client.get("/api/project/p1/slides/9").status_code == 404
+
+    def test_whole_project(self, client):
+        assert client.get("/api/project/p1").json() == project()
+        response = client.get("/api/project/p1", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == project()
+
+    def test_edit_changes_only_that_slides_etag(self, client, tmp_path):
+        first = client.get("/api/project/p1/slides/1").headers["etag"]
+        second = client.get("/api/project/p1/slides/2").headers["etag"]
+        before = slide_files(str(tmp_path / "p1"))
+        manifest = (tmp_path / "p1" / "p1.json").read_bytes()
+
+        response = client.post(
+            "/api/project/p1/update_positions",
+            json={"updates": [{"slide_index": 2, "shape_index": "1", "left": 5, "top": 6}]},
+        )
+
+        assert response.json()["updated"] == 1
+        # The edit is an annotation: the parse output is not rewritten
+        assert slide_files(str(tmp_path / "p1")) == before
+        assert (tmp_path / "p1" / "p1.json").read_bytes() == manifest
+        unchanged = client.get("/api/project/p1/slides/1", headers={"If-None-Match": first})
+        assert unchanged.status_code == 304
+        edited = client.get("/api/project/p1/slides/2", headers={"If-None-Match": second})
+        assert edited.json()["shapes"][0]["left"] == 5
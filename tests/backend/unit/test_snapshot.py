@@ -0,0 +1,109 @@
+"""
+Tests for backend/ppt_parser/snapshot.py
+"""
+
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ppt_parser.shapes import parse_shape  # noqa: E402
+from ppt_parser.snapshot import ComSnapshot, SnapshotStats, snapshot  # noqa: E402
+from mocks.fake_powerpoint import CALLS, FakeShape, FakeTable  # noqa: E402
+
+
+class RecordingShape(FakeShape):
+    """FakeShape that records which COM properties are read on it."""
+
+    def __init__(self, *args, **kwargs):
+        object.__setattr__(self, "reads", Counter())
+        super().__init__(*args, **kwargs)
+
+    def __getattribute__(self, name):
+        if name[:1].isupper():
+            object.__getattribute__(self, "reads")[name] += 1
+        return super().__getattribute__(name)
+
+
+class TestComSnapshot:
+    """Tests for ComSnapshot."""
+
+    def test_property_fetched_once(self):
+        """Repeated reads should hit COM once and be counted as saved."""
+        stats = SnapshotStats()
+        shape = FakeShape(name="Box")
+        proxy = snapshot(shape, stats)
+
+        CALLS.reset()
+        assert [proxy.Type for _ in range(5)] == [1] * 5
+        assert CALLS.count == 1
+        assert stats.as_dict() == {"fetched": 1, "saved": 4, "writes": 0}
+
+    def test_nested_objects_are_snapshotted(self):
+        """Property paths like TextFrame.TextRange.Text should be memoized end to end."""
+        proxy = snapshot(FakeShape(text="hello"), SnapshotStats())
+        proxy.TextFrame.TextRange.Text
+        CALLS.reset()
+        assert proxy.TextFrame.TextRange.Text == "hello"
+        assert CALLS.count == 0
+        assert isinstance(proxy.TextFrame, ComSnapshot)
+
+    def test_write_goes_to_com_and_invalidates(self):
+        """Setting a property should update the COM object and drop memoized values."""
+        shape = FakeShape(width=100.0)
+        proxy = snapshot(shape, SnapshotStats())
+        assert proxy.Width == 100.0
+        proxy.Width = 250.0
+        assert shape.Width == 250.0
+        assert proxy.Width == 250.0
+
+    def test_failing_property_is_not_retried(self):
+        """A property that raises should keep raising without another COM call."""
+
+        class Broken(FakeShape):
+            def __getattribute__(self, name):
+                if name == "Connector":
+                    CALLS.count += 1
+                    raise RuntimeError("not a connector")
+                return super().__getattribute__(name)
+
+        proxy = snapshot(Broken(), SnapshotStats())
+        with pytest.raises(RuntimeError):
+            proxy.Connector
+        CALLS.reset()
+        with pytest.raises(RuntimeError):
+            proxy.Connector
+        assert CALLS.count == 0
+
+    def test_methods_and_collections_pass_through(self):
+        """Method calls and collection access should still reach COM."""
+        table = FakeTable(2, 2)
+        proxy = snapshot(FakeShape(table=table), SnapshotStats())
+        assert proxy.Table.Rows.Count == 2
+        assert proxy.Table.Cell(2, 1).Shape.TextFrame.TextRange.Text == "r2c1"
+        assert len(list(proxy.GroupItems)) == 0
+
+    def test_snapshot_is_idempotent(self):
+        """Wrapping a snapshot or None should return it unchanged."""
+        proxy = snapshot(FakeShape())
+        assert snapshot(proxy) is proxy
+        assert snapshot(None) is None
+
+
+class TestParseShapeWithSnapshot:
+    """parse_shape should read each shape property from COM at most once."""
+
+    def test_no_property_read_twice(self, tmp_path):
+        """Type, Left/Top, TextFrame... are each fetched once per shape."""
+        shape = RecordingShape(name="Box", text="hello")
+        shape.reads.clear()  # ignore reads made by the fake constructor
+        info = parse_shape(shape, slide_index=1, shape_index=1, image_dir=str(tmp_path))
+
+        assert info["text"] == "hello"
+        assert info["type_code"] == 1
+        repeated = {name: n for name, n in shape.reads.items() if n > 1}
+        assert repeated == {}
@@ -0,0 +1,105 @@
+"""
+Tests for backend/ppt_parser/palette.py (interned style palette) and the
+project JSON readers/writers in storage.py
+"""
+
+import copy
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.palette import PALETTE_KEY, intern_styles, resolve_styles  # noqa: E402
+from mocks.fake_powerpoint import fake_dispatcher, write_fake_deck  # noqa: E402
+
+FONT = {"font_name": "Arial", "font_size": 18.0, "color_rgb": [0, 0, 0]}
+FILL = {"visible": True, "fore_color_rgb": [255, 255, 255]}
+
+
+def project(slides=3):
+    shapes = [
+        {
+            "shape_index": i,
+            "text_style": dict(FONT),
+            "fill": dict(FILL),
+            "line": None,
+            "table": {"cells": [{"row": 1, "col": 1, "text_style": dict(FONT), "fill": dict(FILL)}]},
+        }
+        for i in range(1, 4)
+    ]
+    return {
+        "slides_count": slides,
+        "slides": [{"slide_index": s, "shapes": copy.deepcopy(shapes)} for s in range(1, slides + 1)],
+    }
+
+
+class TestPalette:
+    """Tests for intern_styles / resolve_styles."""
+
+    def test_round_trip(self):
+        data = project()
+        interned = intern_styles(data)
+
+        assert interned[PALETTE_KEY] == [FONT, FILL]
+        shape = interned["slides"][2]["shapes"][1]
+        assert shape["text_style"] == {"$style": 0}
+        assert shape["table"]["cells"][0]["fill"] == {"$style": 1}
+        assert shape["line"] is None
+        assert "$style" not in json.dumps(data)  # input untouched
+
+        assert resolve_styles(interned) == data
+
+    def test_resolved_shapes_do_not_share_styles(self):
+        data = resolve_styles(intern_styles(project(slides=1)))
+        first, second = data["slides"][0]["shapes"][:2]
+        first["text_style"]["font_size"] = 40.0
+        assert second["text_style"]["font_size"] == 18.0
+
+    def test_legacy_json_unchanged(self):
+        data = project()
+        assert resolve_styles(copy.deepcopy(data)) == data
+
+    def test_interned_json_is_smaller(self):
+        data = project(slides=20)
+        assert len(json.dumps(intern_styles(data))) < len(json.dumps(data)) * 0.6
+
+
+class TestProjectJson:
+    """load_project_json / save_project_json with PPT_INTERN_STYLES."""
+
+    def test_parse_writes_interned_json(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PPT_INTERN_STYLES", "1")
+        deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=2, shapes_per_slide=3)
+        json_path = ppt_parser.parse_presentation(deck, str(tmp_path / "out"), powerpoint=fake_dispatcher())
+
+        with open(json_path, encoding="utf-8") as f:
+            stored = json.load(f)
+        assert stored[PALETTE_KEY]
+        loaded = ppt_parser.load_project_json(json_path)
+        assert PALETTE_KEY not in loaded
+        assert loaded["slides"][0]["shapes"][0]["text_style"]["font_name"]
+
+    def test_save_keeps_inline_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("PPT_INTERN_STYLES", raising=False)
+        json_path = str(tmp_path / "p.json")
+        ppt_parser.save_project_json(json_path, project())
+
+        with open(json_path, encoding="utf-8") as f:
+            assert PALETTE_KEY not in json.load(f)
+        assert ppt_parser.load_project_json(json_path) == project()
+
+
+class TestProjectEndpoint:
+    """The API serves interned projects with styles resolved."""
+
+    def test_get_project_resolves_styles(self, client, tmp_path):
+        (tmp_path / "p1").mkdir()
+        with open(tmp_path / "p1" / "p1.json", "w", encoding="utf-8") as f:
+            json.dump(intern_styles(project(slides=1)), f)
+
+        response = client.get("/api/project/p1")
+        assert response.status_code == 200
+        assert response.json() == project(slides=1)
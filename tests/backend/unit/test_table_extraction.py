@@ -0,0 +1,75 @@
+"""
+Tests for backend/ppt_parser/tables.py (grid-based table extraction)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ppt_parser.media import MediaExtractor  # noqa: E402
+from ppt_parser.tables import parse_table  # noqa: E402
+from mocks.fake_powerpoint import CALLS, FakeShape, FakeTable  # noqa: E402
+from mocks.ooxml_builder import table_xml, write_pptx  # noqa: E402
+
+SPANS = {(1, 1): (1, 2), (2, 3): (2, 1)}
+
+
+def table_shape(rows=3, cols=3, spans=None, left=100.0, top=50.0):
+    table = FakeTable(rows, cols, left=left, top=top, spans=spans)
+    return FakeShape(name="Table 1", shape_type=19, shape_id=2, left=left, top=top, table=table)
+
+
+def by_position(table_info):
+    return {(cell["row"], cell["col"]): cell for cell in table_info["cells"]}
+
+
+class TestParseTable:
+    """Tests for parse_table() with and without the package XML."""
+
+    def test_geometry_from_rows_and_columns(self, tmp_path):
+        info = parse_table(table_shape(), 1, 1, str(tmp_path))
+
+        assert (info["rows"], info["cols"]) == (3, 3)
+        cell = by_position(info)[(2, 3)]
+        assert (cell["left"], cell["top"]) == pytest.approx((220.0, 70.0))
+        assert (cell["width"], cell["height"]) == pytest.approx((60.0, 20.0))
+        assert cell["text"] == "r2c3"
+
+    def test_spans_detected_from_cell_extent(self, tmp_path):
+        cells = by_position(parse_table(table_shape(spans=SPANS), 1, 1, str(tmp_path)))
+
+        assert len(cells) == 9
+        assert cells[(1, 2)]["text"] == "r1c1"
+        assert cells[(1, 1)]["width"] == pytest.approx(120.0)
+        assert cells[(1, 2)]["left"] == cells[(1, 1)]["left"]
+        assert cells[(3, 3)]["text"] == "r2c3"
+        assert cells[(3, 3)]["height"] == pytest.approx(40.0)
+
+    def test_spans_from_package_match_com(self, tmp_path):
+        pptx = write_pptx(
+            str(tmp_path / "deck.pptx"),
+            [[table_xml(2, "Table 1", 3, 3, left=100.0, top=50.0, spans=SPANS)]],
+        )
+        shape = table_shape(spans=SPANS)
+        with MediaExtractor(pptx, str(tmp_path / "images")) as media:
+            assert media.table_element(shape, 1) is not None
+            xml_cells = by_position(parse_table(shape, 1, 1, "", media=media))
+        com_cells = by_position(parse_table(table_shape(spans=SPANS), 1, 1, ""))
+
+        assert xml_cells == com_cells
+
+    def test_merged_areas_are_read_once(self, tmp_path):
+        CALLS.reset()
+        parse_table(table_shape(spans=None), 1, 1, str(tmp_path))
+        plain = CALLS.count
+
+        CALLS.reset()
+        parse_table(table_shape(spans={(1, 1): (3, 3)}), 1, 1, str(tmp_path))
+        merged = CALLS.count
+
+        # One origin cell plus the row/column grid instead of nine cells
+        assert merged < plain / 4
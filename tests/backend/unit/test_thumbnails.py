@@ -0,0 +1,97 @@
+"""
+Tests for backend/ppt_parser/thumbnails.py (thumbnail variants) and the
+deferred slide rendering stage
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.thumbnails import (  # noqa: E402
+    ensure_variant,
+    generate_thumbnail_variants,
+    variant_filename,
+)
+from mocks.fake_powerpoint import fake_dispatcher, write_fake_deck  # noqa: E402
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def write_base(project_dir, slide_index, size=(1920, 1080)):
+    thumbnail_dir = project_dir / "thumbnails"
+    thumbnail_dir.mkdir(parents=True, exist_ok=True)
+    path = thumbnail_dir / f"slide_{slide_index:03d}_thumb.png"
+    Image.new("RGBA", size, (10, 20, 30, 255)).save(path)
+    return path
+
+
+class TestThumbnailVariants:
+    """Tests for ensure_variant / generate_thumbnail_variants."""
+
+    @pytest.mark.parametrize(
+        "variant,fmt,longest", [("grid", "WEBP", 320), ("viewer", "WEBP", 1280), ("llm", "JPEG", 1024)]
+    )
+    def test_renders_variant_from_base_png(self, tmp_path, variant, fmt, longest):
+        write_base(tmp_path, 1)
+        path = ensure_variant(str(tmp_path), 1, variant)
+
+        assert os.path.basename(path) == variant_filename(1, variant)
+        with Image.open(path) as img:
+            assert img.format == fmt
+            assert max(img.size) == longest
+            assert img.size[0] / img.size[1] == pytest.approx(16 / 9, rel=0.01)
+
+    def test_rerenders_when_base_is_newer(self, tmp_path):
+        base = write_base(tmp_path, 2)
+        path = ensure_variant(str(tmp_path), 2, "grid")
+        os.utime(path, (0, 0))
+
+        assert ensure_variant(str(tmp_path), 2, "grid") == path
+        assert os.path.getmtime(path) >= os.path.getmtime(base)
+
+    def test_missing_base_or_unknown_variant(self, tmp_path):
+        assert ensure_variant(str(tmp_path), 3, "grid") is None
+        with pytest.raises(ValueError):
+            ensure_variant(str(tmp_path), 3, "poster")
+
+    def test_records_variants_in_slide_json(self, tmp_path):
+        write_base(tmp_path, 1)
+        data = {
+            "slides": [
+                {"slide_index": 1, "thumbnail": "slide_001_thumb.png"},
+                {"slide_index": 2, "thumbnail": None},
+            ]
+        }
+        assert generate_thumbnail_variants(str(tmp_path), data) == 1
+        assert data["slides"][0]["thumbnails"] == {
+            "grid": "slide_001_grid.webp",
+            "viewer": "slide_001_viewer.webp",
+            "llm": "slide_001_llm.jpg",
+        }
+        assert "thumbnails" not in data["slides"][1]
+
+
+class TestDeferredThumbnails:
+    """Parsing without thumbnails, then rendering them as a stage of their own."""
+
+    def test_parse_skips_export_then_stage_renders(self, tmp_path):
+        deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=3, shapes_per_slide=1)
+        app = fake_dispatcher()
+        json_path = ppt_parser.parse_presentation(
+            deck, str(tmp_path / "out"), powerpoint=app, thumbnails=False
+        )
+        data = ppt_parser.load_project_json(json_path)
+
+        assert all(s["thumbnail"] is None for s in data["slides"])
+        assert not any(s.exports for s in app.Presentations.opened[0].Slides)
+
+        rendered = ppt_parser.render_slide_thumbnails(
+            deck, str(tmp_path / "out"), slide_indices=[1, 3, 9], powerpoint=app
+        )
+        assert rendered == {1: "slide_001_thumb.png", 3: "slide_003_thumb.png"}
+        assert (tmp_path / "out" / "thumbnails" / "slide_003_thumb.png").exists()
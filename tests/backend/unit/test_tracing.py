@@ -0,0 +1,125 @@
+"""
+Tests for backend/ppt_parser/tracing.py (JSONL trace spans) and parser logging levels
+"""
+
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.tracing import export_chrome_trace, load_trace, span, trace_job  # noqa: E402
+from mocks.fake_powerpoint import fake_dispatcher, write_fake_deck  # noqa: E402
+
+
+def parse_fake_deck(tmp_path):
+    deck = write_fake_deck(str(tmp_path / "deck.pptx"), slides=2, shapes_per_slide=3)
+    out_dir = str(tmp_path / "out")
+    ppt_parser.parse_presentation(deck, out_dir, powerpoint=fake_dispatcher())
+    return os.path.join(out_dir, "out.trace.jsonl")
+
+
+class TestSpans:
+    """Tests for trace_job() / span()."""
+
+    def test_span_outside_job_is_noop(self, tmp_path):
+        with span("slide 1", "slide"):
+            pass
+        assert list(tmp_path.iterdir()) == []
+
+    def test_nested_jobs_share_outer_trace(self, tmp_path):
+        outer, inner = str(tmp_path / "outer.jsonl"), str(tmp_path / "inner.jsonl")
+        with trace_job(outer, enabled=True):
+            with trace_job(inner, enabled=True), span("slide 1", "slide", shapes=3):
+                pass
+
+        assert not os.path.exists(inner)
+        (event,) = load_trace(outer)
+        assert event["ph"] == "X"
+        assert (event["name"], event["cat"], event["args"]) == ("slide 1", "slide", {"shapes": 3})
+        assert event["dur"] >= 0
+
+    def test_events_are_written_when_the_job_ends(self, tmp_path):
+        path = str(tmp_path / "job.trace.jsonl")
+        with trace_job(path, enabled=True):
+            with span("slide 1", "slide"):
+                pass
+            assert load_trace(path) == []
+
+        assert [e["name"] for e in load_trace(path)] == ["slide 1"]
+
+    def test_shape_spans_are_opt_in(self, tmp_path):
+        slide_level, shape_level = str(tmp_path / "slide.jsonl"), str(tmp_path / "shape.jsonl")
+        for path, level in ((slide_level, "slide"), (shape_level, "shape")):
+            with trace_job(path, enabled=True, level=level), span("slide 1", "slide"):
+                with span("shape 1", "shape"):
+                    pass
+
+        assert [e["cat"] for e in load_trace(slide_level)] == ["slide"]
+        assert [e["cat"] for e in load_trace(shape_level)] == ["shape", "slide"]
+
+    def test_export_chrome_trace(self, tmp_path):
+        path = str(tmp_path / "job.trace.jsonl")
+        with trace_job(path, enabled=True), span("deck.pptx", "document"):
+            pass
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"name": "cut sh')  # crashed mid-write
+
+        out = export_chrome_trace(path)
+        assert out.endswith("job.trace.json")
+        with open(out, encoding="utf-8") as f:
+            assert [e["name"] for e in json.load(f)["traceEvents"]] == ["deck.pptx"]
+
+
+class TestParseTrace:
+    """A parse writes one trace per job next to the project JSON."""
+
+    def test_parse_writes_span_hierarchy(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PPT_TRACE", "shape")
+        events = load_trace(parse_fake_deck(tmp_path))
+
+        categories = {event["cat"] for event in events}
+        assert {"document", "master", "slide", "shape"} <= categories
+        # The whole deck, and the slide range parse_presentation() hands it to
+        document, chunk = sorted((e for e in events if e["cat"] == "document"), key=lambda e: (e["ts"], -e["dur"]))
+        assert (document["name"], chunk["name"]) == ("deck.pptx", "slides 1-end")
+        slides = [e for e in events if e["cat"] == "slide"]
+        assert [e["name"] for e in slides] == ["slide 1", "slide 2"]
+        for slide in slides:
+            assert document["ts"] <= slide["ts"]
+            assert slide["ts"] + slide["dur"] <= document["ts"] + document["dur"]
+
+    def test_default_level_skips_shapes(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("PPT_TRACE", raising=False)
+        events = load_trace(parse_fake_deck(tmp_path))
+
+        assert {event["cat"] for event in events} == {"document", "master", "slide", "thumbnail"}
+
+    def test_trace_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PPT_TRACE", "0")
+        assert not os.path.exists(parse_fake_deck(tmp_path))
+
+
+class TestLogging:
+    """Per-shape chatter is DEBUG; the default INFO level hides it."""
+
+    def test_shape_lines_are_debug(self, tmp_path, monkeypatch, caplog):
+        monkeypatch.setenv("PPT_TRACE", "0")
+        with caplog.at_level(logging.DEBUG, logger="ppt_parser"):
+            parse_fake_deck(tmp_path)
+        shape_records = [r for r in caplog.records if "Shape Name" in r.getMessage()]
+        assert shape_records
+        assert {r.levelno for r in shape_records} == {logging.DEBUG}
+
+    def test_configure_logging_defaults_to_info(self, monkeypatch):
+        monkeypatch.delenv("PPT_LOG_LEVEL", raising=False)
+        ppt_parser.configure_logging()
+        assert logging.getLogger("ppt_parser").getEffectiveLevel() == logging.INFO
+
+        monkeypatch.setenv("PPT_LOG_LEVEL", "debug")
+        ppt_parser.configure_logging()
+        assert logging.getLogger("ppt_parser.shapes").isEnabledFor(logging.DEBUG)
+        logging.getLogger("ppt_parser").setLevel(logging.NOTSET)
@@ -0,0 +1,177 @@
+"""
+Tests for content-hashed uploads (utils/upload_store.py), reuse of an earlier parse
+and the batch upload endpoint
+"""
+
+import hashlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "..", "backend"))
+
+import ppt_parser  # noqa: E402
+from ppt_parser.storage import clone_project_artifacts, snapshot_project_json  # noqa: E402
+from utils.upload_store import store_upload  # noqa: E402
+
+DECK = b"PK\x03\x04 pretend this is a deck"
+
+
+def write_parsed_project(project_dir, project_id, ppt_path="deck.pptx"):
+    os.makedirs(os.path.join(project_dir, "images"))
+    os.makedirs(os.path.join(project_dir, "thumbnails"))
+    with open(os.path.join(project_dir, "images", "pic.png"), "wb") as f:
+        f.write(b"png")
+    with open(os.path.join(project_dir, "thumbnails", "slide_001.png"), "wb") as f:
+        f.write(b"thumb")
+    data = {"ppt_path": ppt_path, "parser_engine": "com", "slides": [{"slide_index": 1}]}
+    ppt_parser.save_project_json(os.path.join(project_dir, f"{project_id}.json"), data)
+
+
+class TestStoreUpload:
+    """Tests for store_upload()."""
+
+    def test_same_bytes_share_one_file(self, tmp_path):
+        first, digest = store_upload(io.BytesIO(DECK), str(tmp_path), "Quarterly.PPTX")
+        second, again = store_upload(io.BytesIO(DECK), str(tmp_path), "copy of it.pptx")
+
+        assert digest == again == hashlib.sha256(DECK).hexdigest()
+        assert first == second == str(tmp_path / f"{digest}.pptx")
+        assert os.listdir(tmp_path) == [f"{digest}.pptx"]
+
+    def test_failed_read_leaves_nothing(self, tmp_path):
+        class Broken(io.BytesIO):
+            def read(self, size=-1):
+                raise OSError("connection reset")
+
+        with pytest.raises(OSError):
+            store_upload(Broken(), str(tmp_path), "deck.pptx")
+        assert os.listdir(tmp_path) == []
+
+
+class TestParseSnapshot:
+    """Tests for snapshot_project_json() / clone_project_artifacts()."""
+
+    def test_snapshot_survives_edits(self, tmp_path):
+        project_dir = str(tmp_path / "p1")
+        write_parsed_project(project_dir, "p1")
+        snapshot_path = snapshot_project_json(project_dir)
+
+        json_path = os.path.join(project_dir, "p1.json")
+        data = ppt_parser.load_project_json(json_path)
+        data["slides"][0]["description"] = "edited"
+        ppt_parser.save_project_json(json_path, data)
+
+        assert "description" not in ppt_parser.load_project_json(snapshot_path)["slides"][0]
+
+    def test_clone_links_artifacts(self, tmp_path):
+        source, target = str(tmp_path / "p1"), str(tmp_path / "p2")
+        write_parsed_project(source, "p1")
+        assert clone_project_artifacts(source, target) is None  # no snapshot yet
+
+        snapshot_project_json(source)
+        json_path = clone_project_artifacts(source, target)
+
+        assert json_path == os.path.join(target, "p2.json")
+        assert ppt_parser.load_project_json(json_path)["slides"] == [{"slide_index": 1}]
+        for rel_path in ("images/pic.png", "thumbnails/slide_001.png"):
+            assert os.path.samefile(os.path.join(source, rel_path), os.path.join(target, rel_path))
+        # The clone can be the source of the next one
+        assert os.path.exists(os.path.join(target, "p2.parsed.json"))
+
+
+class TestUploadReuse:
+    """A second upload of the same bytes reuses the first parse."""
+
+    def test_known_hash_skips_metadata_and_parse(self, main, client, mocker):
+        metadata = mocker.patch(
+            "main.get_upload_metadata", return_value={"title": "Plan", "slide_count": 1}
+        )
+        submit = mocker.patch("main.submit_parse_job", return_value={"id": "job-1"})
+
+        first = client.post("/api/upload", files={"file": ("plan.pptx", DECK)}).json()
+        assert first["job_id"] == "job-1"
+        (_, file_path, engine), _ = submit.call_args
+        stored = main.db.get_project(first["id"])
+        assert stored["content_hash"] == hashlib.sha256(DECK).hexdigest()
+
+        # The parse job finishes
+        project_dir = os.path.join(main.RESULT_DIR, first["id"])
+        write_parsed_project(project_dir, first["id"], ppt_path=file_path)
+        snapshot_project_json(project_dir)
+        main.db.update_project_status(first["id"], "done")
+
+        second = client.post("/api/upload", files={"file": ("renamed.pptx", DECK)}).json()
+
+        assert second["reused_from"] == first["id"]
+        assert second["id"] != first["id"]
+        assert metadata.call_count == 1
+        assert submit.call_count == 1
+        assert main.db.get_project(second["id"])["status"] == "done"
+        assert main.db.get_project(second["id"])["title"] == "Plan"
+        assert client.get(f"/api/project/{second['id']}/status").json()["status"] == "done"
+        assert len(os.listdir(main.UPLOAD_DIR)) == 1
+
+    def test_unfinished_parse_is_not_reused(self, main, client, mocker):
+        mocker.patch("main.get_upload_metadata", return_value={"title": "Plan", "slide_count": 1})
+        submit = mocker.patch("main.submit_parse_job", return_value={"id": "job-1"})
+
+        client.post("/api/upload", files={"file": ("plan.pptx", DECK)})
+        second = client.post("/api/upload", files={"file": ("renamed.pptx", DECK)}).json()
+
+        assert "reused_from" not in second
+        assert submit.call_count == 2
+
+
+class TestBatchUpload:
+    """POST /api/upload/batch answers per file and registers the batch at once."""
+
+    def test_per_file_results(self, main, client, mocker):
+        def metadata(file_path):
+            with open(file_path, "rb") as f:
+                if not f.read().startswith(b"PK"):
+                    raise ppt_parser.OOXMLError("not a zip")
+            return {"title": "Plan", "slide_count": 1}
+
+        mocker.patch("main.get_upload_metadata", side_effect=metadata)
+        submit = mocker.patch("main.submit_parse_job", return_value={"id": "job-1"})
+        add_projects = mocker.spy(main.db, "add_projects")
+
+        response = client.post(
+            "/api/upload/batch",
+            files=[
+                ("files", ("a.pptx", DECK)),
+                ("files", ("broken.pptx", b"not a zip")),
+                ("files", ("a.pptx", DECK)),
+                ("files", ("b.pptx", DECK + b"2")),
+            ],
+        )
+
+        body = response.json()
+        assert [(r["filename"], r["status"]) for r in body["results"]] == [
+            ("a.pptx", "queued"),
+            ("broken.pptx", "error"),
+            ("a.pptx", "duplicate"),
+            ("b.pptx", "queued"),
+        ]
+        assert (body["queued"], body["errors"], body["duplicates"]) == (2, 1, 1)
+        assert body["results"][2]["id"] == body["results"][0]["id"]
+        assert add_projects.call_count == 1
+        assert submit.call_count == 2
+        assert main.db.get_project(body["results"][3]["id"])["original_filename"] == "b.pptx"
+
+    def test_previous_upload_is_duplicate(self, main, client, mocker):
+        mocker.patch("main.get_upload_metadata", return_value={"title": "Plan", "slide_count": 1})
+        mocker.patch("main.submit_parse_job", return_value={"id": "job-1"})
+
+        first = client.post("/api/upload", files={"file": ("a.pptx", DECK)}).json()
+        body = client.post("/api/upload/batch", files=[("files", ("a.pptx", DECK))]).json()
+
+        (result,) = body["results"]
+        assert (result["id"], result["status"], result["project_status"]) == (
+            first["id"],
+            "duplicate",
+            "processing",
+        )